@@ -35,9 +35,9 @@ class BroadcastGlobalVariablesCallbackImpl(object):
         with tf.device(self.device):
             if hvd._executing_eagerly() and hasattr(self.model, 'variables'):
                 # TensorFlow 2.0 or TensorFlow eager
-                hvd.broadcast_variables(self.model.variables,
-                                        root_rank=self.root_rank)
-                hvd.broadcast_variables(self.model.optimizer.variables(),
+                # Model and optimizer variables share one fused broadcast
+                hvd.broadcast_variables(list(self.model.variables) +
+                                        list(self.model.optimizer.variables()),
                                         root_rank=self.root_rank)
             else:
                 bcast_op = hvd.broadcast_global_variables(self.root_rank)
@@ -17,6 +17,7 @@ import atexit
 import ctypes
 
 from horovod.common import util as util
+from horovod.common.process_sets import GLOBAL_PROCESS_SET_ID, ProcessSet, global_process_set
 
 
 class HorovodBasics(object):
@@ -30,19 +31,35 @@ class HorovodBasics(object):
         self.Sum = self.MPI_LIB_CTYPES.horovod_reduce_op_sum()
         self.Adasum = self.MPI_LIB_CTYPES.horovod_reduce_op_adasum()
 
-    def init(self, comm=None):
+    def init(self, comm=None, process_sets=None):
         """A function that initializes Horovod.
 
         Args:
           comm: List specifying ranks for the communicator, relative to the MPI_COMM_WORLD
             communicator OR the MPI communicator to use. Given communicator will be duplicated.
             If None, Horovod will use MPI_COMM_WORLD Communicator.
+          process_sets: List of `hvd.ProcessSet` objects, in the same order on all processes,
+            that collectives can be performed on besides the global process set. Requires
+            the MPI or Gloo controller; collectives on them run on CPU.
         """
         if comm is None:
             comm = []
 
         atexit.register(self.shutdown)
 
+        global_process_set._setup(self, GLOBAL_PROCESS_SET_ID)
+        if process_sets and not self.is_initialized():
+            for process_set in process_sets:
+                if not isinstance(process_set, ProcessSet):
+                    raise ValueError('process_sets must contain hvd.ProcessSet objects.')
+                ranks = process_set.ranks
+                process_set_id = self.MPI_LIB_CTYPES.horovod_add_process_set(
+                    (ctypes.c_int * len(ranks))(*ranks), ctypes.c_int(len(ranks)))
+                if process_set_id == -1:
+                    raise ValueError('Process sets must be registered before Horovod is '
+                                     'initialized.')
+                process_set._setup(self, process_set_id)
+
         if not isinstance(comm, list):
             mpi_built = self.MPI_LIB_CTYPES.horovod_mpi_built()
             if not bool(mpi_built):
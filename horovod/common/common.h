@@ -47,6 +47,9 @@ namespace common {
 #define MEMCPY_OUT_FUSION_BUFFER "MEMCPY_OUT_FUSION_BUFFER"
 #define MPI_BCAST "MPI_BCAST"
 #define MPI_ALLTOALL "MPI_ALLTOALL"
+#define MPI_REDUCESCATTER "MPI_REDUCESCATTER"
+#define MPI_LOCAL_REDUCESCATTER "MPI_LOCAL_REDUCESCATTER"
+#define MPI_CROSS_REDUCESCATTER "MPI_CROSS_REDUCESCATTER"
 #define NCCL_REDUCESCATTER "NCCL_REDUCESCATTER"
 #define NCCL_ALLGATHER "NCCL_ALLGATHER"
 #define NCCL_REDUCE "NCCL_REDUCE"
@@ -61,6 +64,8 @@ namespace common {
 #define GLOO_ALLREDUCE "GLOO_ALLREDUCE"
 #define GLOO_ALLGATHER "GLOO_ALLGATHER"
 #define GLOO_BCAST "GLOO_BCAST"
+#define GLOO_REDUCESCATTER "GLOO_REDUCESCATTER"
+#define SHM_ALLREDUCE "SHM_ALLREDUCE"
 
 // Horovod knobs.
 #define HOROVOD_MPI_THREADS_DISABLE "HOROVOD_MPI_THREADS_DISABLE"
@@ -79,6 +84,8 @@ namespace common {
 #define HOROVOD_STALL_SHUTDOWN_TIME_SECONDS "HOROVOD_STALL_SHUTDOWN_TIME_SECONDS"
 #define HOROVOD_HIERARCHICAL_ALLREDUCE "HOROVOD_HIERARCHICAL_ALLREDUCE"
 #define HOROVOD_HIERARCHICAL_ALLGATHER "HOROVOD_HIERARCHICAL_ALLGATHER"
+#define HOROVOD_HIERARCHICAL_REDUCESCATTER "HOROVOD_HIERARCHICAL_REDUCESCATTER"
+#define HOROVOD_SHM_ALLREDUCE "HOROVOD_SHM_ALLREDUCE"
 #define HOROVOD_CACHE_CAPACITY "HOROVOD_CACHE_CAPACITY"
 #define HOROVOD_BATCH_D2D_MEMCOPIES "HOROVOD_BATCH_D2D_MEMCOPIES"
 #define HOROVOD_NUM_NCCL_STREAMS "HOROVOD_NUM_NCCL_STREAMS"
@@ -92,6 +99,9 @@ namespace common {
 #define HOROVOD_ADASUM_MPI_CHUNK_SIZE "HOROVOD_ADASUM_MPI_CHUNK_SIZE"
 #define HOROVOD_THREAD_AFFINITY "HOROVOD_THREAD_AFFINITY"
 #define HOROVOD_DISABLE_GROUP_FUSION "HOROVOD_DISABLE_GROUP_FUSION"
+#define HOROVOD_TENSOR_PARTITION_SIZE "HOROVOD_TENSOR_PARTITION_SIZE"
+#define HOROVOD_CPU_REDUCTION_THREADS "HOROVOD_CPU_REDUCTION_THREADS"
+#define HOROVOD_ENABLE_XLA_OPS "HOROVOD_ENABLE_XLA_OPS"
 
 // String constant for gloo interface.
 #define GLOO_DEFAULT_IFACE ""
@@ -108,7 +118,9 @@ namespace common {
 #define JOIN_TENSOR_NAME "join.noname"
 
 // List of supported frameworks.
-enum Framework { TENSORFLOW, PYTORCH, MXNET };
+// XLA ops of TensorFlow have their own fusion buffers, since their op context
+// differs from the one of regular TensorFlow ops.
+enum Framework { TENSORFLOW, PYTORCH, MXNET, XLA };
 
 enum StatusType { OK, UNKNOWN_ERROR, PRECONDITION_ERROR, ABORTED, INVALID_ARGUMENT, IN_PROGRESS };
 
@@ -261,6 +273,8 @@ struct TensorTableEntry {
   int device = CPU_DEVICE_ID;
   // A callback to call with the status.
   StatusCallback callback;
+  // Process set the operation is performed on, 0 for the global process set.
+  int32_t process_set_id = 0;
 
   // Alltoall splits (if tensor is for an Alltoall operation)
   // Note: splits are stored in TensorTableEntry to avoid N^2
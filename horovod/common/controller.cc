@@ -17,7 +17,9 @@
 
 #include "controller.h"
 
+#include <algorithm>
 #include <atomic>
+#include <limits>
 #include <map>
 #include <queue>
 #include <set>
@@ -80,6 +82,10 @@ ResponseList Controller::ComputeResponseList(std::atomic_bool& shut_down,
 
   CacheCoordinator cache_coordinator(response_cache_.num_active_bits());
 
+  // Number of joined ranks, always zero if join is disabled.
+  int no_joined_size = 0;
+  int& joined_size = join_enabled_ ? state.joined_size : no_joined_size;
+
   // message queue used only in this cycle
   std::deque<Request> message_queue_tmp;
   tensor_queue_.PopMessagesFromQueue(message_queue_tmp);
@@ -113,7 +119,7 @@ ResponseList Controller::ComputeResponseList(std::atomic_bool& shut_down,
     }
   }
 
-  if (state.joined && response_cache_.capacity() > 0) {
+  if (join_enabled_ && state.joined && response_cache_.capacity() > 0) {
     for (uint32_t bit : response_cache_.list_all_bits()) {
       cache_coordinator.record_hit(bit);
     }
@@ -252,11 +258,11 @@ ResponseList Controller::ComputeResponseList(std::atomic_bool& shut_down,
         message_queue_tmp.pop_front();
 
         if (message.request_type() == Request::JOIN) {
-          state.joined_size++;
+          joined_size++;
           continue;
         }
 
-        bool reduce = IncrementTensorCount(message, state.joined_size);
+        bool reduce = IncrementTensorCount(message, joined_size);
         stall_inspector_.RecordUncachedTensorStart(
             message.tensor_name(), message.request_rank(), size_);
         if (reduce) {
@@ -276,11 +282,11 @@ ResponseList Controller::ComputeResponseList(std::atomic_bool& shut_down,
           auto& received_name = received_message.tensor_name();
 
           if (received_message.request_type() == Request::JOIN) {
-            state.joined_size++;
+            joined_size++;
             continue;
           }
 
-          bool reduce = IncrementTensorCount(received_message, state.joined_size);
+          bool reduce = IncrementTensorCount(received_message, joined_size);
           stall_inspector_.RecordUncachedTensorStart(
               received_message.tensor_name(), received_message.request_rank(),
               size_);
@@ -295,10 +301,10 @@ ResponseList Controller::ComputeResponseList(std::atomic_bool& shut_down,
       }
 
       // Check if tensors from previous ticks are ready to reduce after Joins.
-      if (state.joined_size > 0) {
+      if (joined_size > 0) {
         for (auto& table_iter : message_table_) {
           int count = (int)table_iter.second.size();
-          if (count == (size_ - state.joined_size) &&
+          if (count == (size_ - joined_size) &&
               std::find(ready_to_reduce.begin(), ready_to_reduce.end(),
                         table_iter.first) == ready_to_reduce.end()) {
             state.timeline.NegotiateEnd(table_iter.first);
@@ -340,7 +346,7 @@ ResponseList Controller::ComputeResponseList(std::atomic_bool& shut_down,
           for (const auto &tensor_name : group_table_.GetGroupTensorNames(id)) {
             if (message_table_.find(tensor_name) != message_table_.end()) {
               // Uncached message
-              Response response = ConstructResponse(tensor_name, state.joined_size);
+              Response response = ConstructResponse(tensor_name, joined_size);
               responses.push_back(std::move(response));
 
             } else {
@@ -371,7 +377,7 @@ ResponseList Controller::ComputeResponseList(std::atomic_bool& shut_down,
         // coordinator rank calls this code, use peek instead of get here to
         // preserve cache order across workers.
         // No need to do this when all ranks did Join.
-        if (state.joined_size < size_) {
+        if (joined_size < size_) {
           for (auto bit : cache_coordinator.cache_hits()) {
             responses.push_back(response_cache_.peek_response(bit));
           }
@@ -386,16 +392,16 @@ ResponseList Controller::ComputeResponseList(std::atomic_bool& shut_down,
           continue;
         }
 
-        Response response = ConstructResponse(tensor_name, state.joined_size);
+        Response response = ConstructResponse(tensor_name, joined_size);
         responses.push_back(std::move(response));
       }
-      if (state.joined_size == size_) {
+      if (joined_size == size_) {
         // All ranks did Join(). Send the response, reset joined size.
         Response join_response;
         join_response.set_response_type(Response::JOIN);
         join_response.add_tensor_name(JOIN_TENSOR_NAME);
         responses.push_back(std::move(join_response));
-        state.joined_size = 0;
+        joined_size = 0;
       }
       FuseResponses(responses, state, response_list);
       response_list.set_shutdown(should_shut_down);
@@ -435,9 +441,11 @@ ResponseList Controller::ComputeResponseList(std::atomic_bool& shut_down,
     for (auto& response : response_list.responses()) {
       if ((response.response_type() == Response::ResponseType::ALLREDUCE ||
            response.response_type() == Response::ResponseType::ADASUM ||
-           response.response_type() == Response::ResponseType::ALLTOALL) &&
+           response.response_type() == Response::ResponseType::ALLTOALL ||
+           response.response_type() == Response::ResponseType::REDUCESCATTER) &&
           (int)response.devices().size() == size_) {
-        response_cache_.put(response, tensor_queue_, state.joined);
+        response_cache_.put(response, tensor_queue_,
+                            join_enabled_ && state.joined);
       }
     }
   }
@@ -511,10 +519,11 @@ Response Controller::ConstructResponse(const std::string& name, int joined_size)
     }
   }
 
-  // If we are doing an allreduce or broadcast, check that all tensor shapes are
-  // identical.
+  // If we are doing an allreduce, reducescatter or broadcast, check that all
+  // tensor shapes are identical.
   if (message_type == Request::ALLREDUCE ||
       message_type == Request::ADASUM ||
+      message_type == Request::REDUCESCATTER ||
       message_type == Request::BROADCAST) {
     TensorShape tensor_shape;
     for (auto dim : requests[0].tensor_shape()) {
@@ -542,12 +551,13 @@ Response Controller::ConstructResponse(const std::string& name, int joined_size)
     }
   }
 
-  // If we are doing an allreduce, check that prescaling and postscaling factors
-  // are identical across ranks.
+  // If we are doing an allreduce or reducescatter, check that prescaling and
+  // postscaling factors are identical across ranks.
   double prescale_factor;
   double postscale_factor;
   if (message_type == Request::ALLREDUCE ||
-      message_type == Request::ADASUM) {
+      message_type == Request::ADASUM ||
+      message_type == Request::REDUCESCATTER) {
     prescale_factor = requests[0].prescale_factor();
     postscale_factor = requests[0].postscale_factor();
 
@@ -656,6 +666,26 @@ Response Controller::ConstructResponse(const std::string& name, int joined_size)
     tensor_sizes.push_back(tensor_shape.num_elements());
   }
 
+  if (message_type == Request::REDUCESCATTER) {
+    if (joined_size > 0) {
+      error = true;
+      error_message_stream << "Reducescatter is not supported with Join at this time.";
+    }
+
+    // Reducescatter splits tensors along the first dimension.
+    TensorShape tensor_shape;
+    for (auto dim : requests[0].tensor_shape()) {
+      tensor_shape.AddDim(dim);
+    }
+    if (tensor_shape.dims() == 0) {
+      error = true;
+      error_message_stream << "Rank zero tried to "
+                           << Request::RequestType_Name(message_type)
+                           << " a rank-zero tensor.";
+    }
+    tensor_sizes.push_back(tensor_shape.num_elements());
+  }
+
   if (message_type == Request::BROADCAST) {
     if (joined_size > 0) {
       error = true;
@@ -705,6 +735,12 @@ Response Controller::ConstructResponse(const std::string& name, int joined_size)
     devices[request.request_rank()] = request.device();
   }
 
+  // Schedule by the highest priority any rank requested this tensor with.
+  int32_t priority = requests[0].priority();
+  for (auto& request : requests) {
+    priority = std::max(priority, request.priority());
+  }
+
   Response response;
   response.add_tensor_name(name);
   if (error) {
@@ -728,6 +764,14 @@ Response Controller::ConstructResponse(const std::string& name, int joined_size)
     response.set_response_type(Response::BROADCAST);
   } else if (message_type == Request::ALLTOALL) {
     response.set_response_type(Response::ALLTOALL);
+  } else if (message_type == Request::REDUCESCATTER) {
+    response.set_response_type(Response::REDUCESCATTER);
+    for (auto dim : tensor_sizes) {
+      response.add_tensor_size(dim);
+    }
+    response.set_tensor_type(data_type);
+    response.set_prescale_factor(prescale_factor);
+    response.set_postscale_factor(postscale_factor);
   } else if (message_type == Request::ADASUM) {
     response.set_response_type(Response::ADASUM);
     for (auto dim : tensor_sizes) {
@@ -738,6 +782,7 @@ Response Controller::ConstructResponse(const std::string& name, int joined_size)
     response.set_postscale_factor(postscale_factor);
   }
   response.set_devices(devices);
+  response.set_priority(priority);
 
   // Clear all queued up requests for this name. They are now taken care of
   // by the constructed response.
@@ -777,6 +822,21 @@ void Controller::CoordinateCacheAndState(CacheCoordinator& cache_coordinator) {
 void Controller::FuseResponses(std::deque<Response>& responses,
                                HorovodGlobalState& state,
                                ResponseList& response_list) {
+  // Process higher priority responses first, so that tensors needed early in
+  // the next iteration (e.g. gradients of the first layers) are not held up
+  // behind others. The sort is stable to preserve the existing, globally
+  // consistent order among responses of equal priority, and keeps the JOIN
+  // response last.
+  std::stable_sort(responses.begin(), responses.end(),
+                   [](const Response& a, const Response& b) {
+                     auto priority = [](const Response& r) {
+                       return r.response_type() == Response::JOIN
+                                  ? std::numeric_limits<int32_t>::min()
+                                  : r.priority();
+                     };
+                     return priority(a) > priority(b);
+                   });
+
   while (!responses.empty()) {
 
     auto response = responses.front();
@@ -784,7 +844,8 @@ void Controller::FuseResponses(std::deque<Response>& responses,
     responses.pop_front();
     int64_t tensor_size = 0;
     if (response.response_type() == Response::ResponseType::ALLREDUCE ||
-        response.response_type() == Response::ResponseType::ADASUM) {
+        response.response_type() == Response::ResponseType::ADASUM ||
+        response.response_type() == Response::ResponseType::REDUCESCATTER) {
       // Attempt to add more responses to this fused response.
 
       tensor_size = response.tensor_sizes()[0] * GetTypeSize(response.tensor_type());
@@ -848,6 +909,54 @@ void Controller::FuseResponses(std::deque<Response>& responses,
         skipped_responses.pop_back();
       }
 
+    } else if (response.response_type() == Response::ResponseType::BROADCAST &&
+               response.devices()[0] == CPU_DEVICE_ID) {
+      // Attempt to add more responses to this fused response. Only CPU
+      // broadcasts from the same root rank are fused, through the host
+      // fusion buffer.
+      const auto& entry =
+          tensor_queue_.GetTensorEntry(response.tensor_names()[0]);
+      tensor_size = entry.tensor->size();
+
+      std::deque<Response> skipped_responses;
+      int64_t skipped_size = 0;
+      while (!responses.empty()) {
+        auto& new_response = responses.front();
+        assert(new_response.tensor_names().size() == 1);
+
+        if (new_response.response_type() != Response::ResponseType::BROADCAST) {
+          break;
+        }
+        const auto& new_entry =
+            tensor_queue_.GetTensorEntry(new_response.tensor_names()[0]);
+        int64_t new_tensor_size = new_entry.tensor->size();
+
+        if (response.devices() == new_response.devices() &&
+            entry.tensor->dtype() == new_entry.tensor->dtype() &&
+            entry.root_rank == new_entry.root_rank &&
+            tensor_size + new_tensor_size <= TensorFusionThresholdBytes()) {
+          // These tensors will fuse together well.
+          tensor_size += new_tensor_size;
+          response.add_tensor_name(std::move(new_response.tensor_names()[0]));
+          responses.pop_front();
+        } else {
+          // Look ahead for broadcasts of other dtypes or root ranks, as done
+          // for allreduce.
+          skipped_size += new_tensor_size;
+          if (tensor_size + skipped_size <= TensorFusionThresholdBytes()) {
+            skipped_responses.push_back(std::move(new_response));
+            responses.pop_front();
+          } else {
+            break;
+          }
+        }
+      }
+      // Replace any skipped responses.
+      while (!skipped_responses.empty()) {
+        responses.push_front(std::move(skipped_responses.back()));
+        skipped_responses.pop_back();
+      }
+
     } else if (response.response_type() == Response::ResponseType::ALLGATHER) {
       // Attempt to add more responses to this fused response.
       const auto& entry =
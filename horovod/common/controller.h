@@ -135,6 +135,10 @@ public:
   void SynchronizeTimelineEnabled();
   StallInspector& GetStallInspector() { return stall_inspector_; };
 
+  // Join only applies to the global process set, the controllers of other
+  // process sets ignore the joined state of this process.
+  void SetJoinEnabled(bool value) { join_enabled_ = value; };
+
 protected:
   // Functions must be overridden by concrete controller
   virtual void DoInitialization() = 0;
@@ -209,6 +213,7 @@ protected:
   bool mark_cycles_in_timeline_pending_ = false;
   std::recursive_mutex timeline_mutex_;
 
+  bool join_enabled_ = true;
 
   // Outside dependencies
   TensorQueue& tensor_queue_;
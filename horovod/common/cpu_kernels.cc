@@ -0,0 +1,294 @@
+// Copyright 2021 Uber Technologies, Inc. All Rights Reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+// =============================================================================
+
+#include "cpu_kernels.h"
+
+#include <algorithm>
+#include <condition_variable>
+#include <exception>
+#include <mutex>
+#include <stdexcept>
+
+#include "half.h"
+#include "thread_pool.h"
+
+// AVX-512 kernels are compiled for the target with function attributes and
+// selected at runtime, so that the library still runs on older CPUs.
+#if defined(__x86_64__) && (defined(__GNUC__) || defined(__clang__))
+#define HVD_AVX512_DISPATCH 1
+#endif
+
+#if HVD_AVX512_DISPATCH || (__AVX__ && __F16C__)
+#include <immintrin.h>
+#endif
+
+namespace horovod {
+namespace common {
+
+namespace {
+
+ThreadPool cpu_kernel_pool;
+int cpu_kernel_threads = 1;
+
+#if HVD_AVX512_DISPATCH
+bool has_avx512f() {
+  static bool result = __builtin_cpu_supports("avx512f");
+  return result;
+}
+#endif
+
+template <typename T>
+void SumRange(const T* __restrict__ input, T* __restrict__ inout,
+              int64_t num_elements) {
+  for (int64_t i = 0; i < num_elements; ++i) {
+    inout[i] += input[i];
+  }
+}
+
+#if HVD_AVX512_DISPATCH
+// Same loop as SumRange, vectorized by the compiler with 512-bit registers.
+template <typename T>
+__attribute__((target("avx512f"))) void
+SumRangeAVX512(const T* __restrict__ input, T* __restrict__ inout,
+               int64_t num_elements) {
+  for (int64_t i = 0; i < num_elements; ++i) {
+    inout[i] += input[i];
+  }
+}
+
+__attribute__((target("avx512f"))) int64_t
+Float16SumAVX512(const uint16_t* input, uint16_t* inout,
+                 int64_t num_elements) {
+  int64_t i = 0;
+  for (; i < (num_elements / 16) * 16; i += 16) {
+    __m512 in_m512 =
+        _mm512_cvtph_ps(_mm256_loadu_si256((const __m256i*)(input + i)));
+    __m512 inout_m512 =
+        _mm512_cvtph_ps(_mm256_loadu_si256((const __m256i*)(inout + i)));
+    __m256i result = _mm512_cvtps_ph(_mm512_add_ps(in_m512, inout_m512), 0);
+    _mm256_storeu_si256((__m256i*)(inout + i), result);
+  }
+  return i;
+}
+
+__attribute__((target("avx512f"))) int64_t
+Float16ScaleAVX512(const uint16_t* input, uint16_t* output,
+                   int64_t num_elements, float scale_factor) {
+  int64_t i = 0;
+  __m512 scale_factor_m512 = _mm512_set1_ps(scale_factor);
+  for (; i < (num_elements / 16) * 16; i += 16) {
+    __m512 in_m512 =
+        _mm512_cvtph_ps(_mm256_loadu_si256((const __m256i*)(input + i)));
+    __m256i result = _mm512_cvtps_ph(_mm512_mul_ps(in_m512, scale_factor_m512), 0);
+    _mm256_storeu_si256((__m256i*)(output + i), result);
+  }
+  return i;
+}
+#endif
+
+template <typename T>
+void Sum(const void* input, void* inout, int64_t num_elements) {
+#if HVD_AVX512_DISPATCH
+  if (has_avx512f()) {
+    SumRangeAVX512((const T*)input, (T*)inout, num_elements);
+    return;
+  }
+#endif
+  SumRange((const T*)input, (T*)inout, num_elements);
+}
+
+void SumFloat16(const void* input, void* inout, int64_t num_elements) {
+  Float16Sum((const uint16_t*)input, (uint16_t*)inout, num_elements);
+}
+
+void SumBool(const void* input, void* inout, int64_t num_elements) {
+  auto* in = (const bool*)input;
+  auto* out = (bool*)inout;
+  for (int64_t i = 0; i < num_elements; ++i) {
+    out[i] = out[i] || in[i];
+  }
+}
+
+using SumFunction = void (*)(const void*, void*, int64_t);
+
+SumFunction GetSumFunction(DataType dtype) {
+  switch (dtype) {
+  case HOROVOD_UINT8:
+    return &Sum<uint8_t>;
+  case HOROVOD_INT8:
+    return &Sum<int8_t>;
+  case HOROVOD_UINT16:
+    return &Sum<uint16_t>;
+  case HOROVOD_INT16:
+    return &Sum<int16_t>;
+  case HOROVOD_INT32:
+    return &Sum<int32_t>;
+  case HOROVOD_INT64:
+    return &Sum<int64_t>;
+  case HOROVOD_FLOAT16:
+    return &SumFloat16;
+  case HOROVOD_FLOAT32:
+    return &Sum<float>;
+  case HOROVOD_FLOAT64:
+    return &Sum<double>;
+  case HOROVOD_BOOL:
+    return &SumBool;
+  default:
+    throw std::logic_error("Type " + DataType_Name(dtype) +
+                           " is not supported by SumBufferCPU.");
+  }
+}
+
+} // namespace
+
+void InitializeCPUKernels(int num_threads) {
+  cpu_kernel_threads = std::max(num_threads, 1);
+  if (cpu_kernel_threads > 1) {
+    // The calling thread processes the first chunk itself.
+    cpu_kernel_pool.create(cpu_kernel_threads - 1);
+  }
+}
+
+void FinalizeCPUKernels() {
+  if (cpu_kernel_threads > 1) {
+    cpu_kernel_pool.reset();
+  }
+  cpu_kernel_threads = 1;
+}
+
+int ParallelChunks(int64_t num_elements, int64_t element_size) {
+  int64_t chunks = num_elements * element_size / CPU_KERNEL_MIN_CHUNK_BYTES;
+  return (int)std::max((int64_t)1,
+                       std::min(chunks, (int64_t)cpu_kernel_threads));
+}
+
+void ParallelFor(int64_t num_elements, int64_t element_size,
+                 const std::function<void(int, int64_t, int64_t)>& fn) {
+  int chunks = ParallelChunks(num_elements, element_size);
+  if (chunks == 1) {
+    fn(0, 0, num_elements);
+    return;
+  }
+
+  // Align the chunks to cache lines, so that threads never write to the
+  // same line.
+  int64_t line_elements = std::max((int64_t)1, 64 / element_size);
+  int64_t chunk_elements = (num_elements + chunks - 1) / chunks;
+  chunk_elements =
+      (chunk_elements + line_elements - 1) / line_elements * line_elements;
+
+  std::mutex mutex;
+  std::condition_variable cond;
+  int pending = chunks - 1;
+  std::exception_ptr error;
+  auto run_chunk = [&](int chunk) {
+    int64_t begin = std::min(num_elements, chunk * chunk_elements);
+    int64_t end = std::min(num_elements, begin + chunk_elements);
+    try {
+      fn(chunk, begin, end);
+    } catch (...) {
+      std::lock_guard<std::mutex> guard(mutex);
+      if (!error) {
+        error = std::current_exception();
+      }
+    }
+  };
+
+  for (int chunk = 1; chunk < chunks; ++chunk) {
+    cpu_kernel_pool.execute([&, chunk]() {
+      run_chunk(chunk);
+      // Notify under the lock, the waiting thread destroys the condition
+      // variable as soon as it observes pending == 0.
+      std::lock_guard<std::mutex> guard(mutex);
+      --pending;
+      cond.notify_one();
+    });
+  }
+  run_chunk(0);
+
+  std::unique_lock<std::mutex> lock(mutex);
+  cond.wait(lock, [&] { return pending == 0; });
+  if (error) {
+    std::rethrow_exception(error);
+  }
+}
+
+void SumBufferCPU(DataType dtype, const void* input, void* inout,
+                  int64_t num_elements) {
+  SumFunction sum = GetSumFunction(dtype);
+  int64_t element_size = DataType_Size(dtype);
+  ParallelFor(num_elements, element_size,
+              [&](int chunk, int64_t begin, int64_t end) {
+                sum((const uint8_t*)input + begin * element_size,
+                    (uint8_t*)inout + begin * element_size, end - begin);
+              });
+}
+
+void Float16Sum(const uint16_t* input, uint16_t* inout, int64_t num_elements) {
+  int64_t i = 0;
+#if HVD_AVX512_DISPATCH
+  if (has_avx512f()) {
+    i = Float16SumAVX512(input, inout, num_elements);
+  }
+#endif
+#if __AVX__ && __F16C__
+  if (is_avx_and_f16c()) {
+    for (; i < (num_elements / 8) * 8; i += 8) {
+      __m256 in_m256 = _mm256_cvtph_ps(_mm_loadu_si128((__m128i*)(input + i)));
+      __m256 inout_m256 =
+          _mm256_cvtph_ps(_mm_loadu_si128((__m128i*)(inout + i)));
+      __m128i result = _mm256_cvtps_ph(_mm256_add_ps(in_m256, inout_m256), 0);
+      _mm_storeu_si128((__m128i*)(inout + i), result);
+    }
+  }
+#endif
+  for (; i < num_elements; ++i) {
+    float in_float;
+    float inout_float;
+    HalfBits2Float(input + i, &in_float);
+    HalfBits2Float(inout + i, &inout_float);
+    inout_float += in_float;
+    Float2HalfBits(&inout_float, inout + i);
+  }
+}
+
+void Float16Scale(const uint16_t* input, uint16_t* output,
+                  int64_t num_elements, float scale_factor) {
+  int64_t i = 0;
+#if HVD_AVX512_DISPATCH
+  if (has_avx512f()) {
+    i = Float16ScaleAVX512(input, output, num_elements, scale_factor);
+  }
+#endif
+#if __AVX__ && __F16C__
+  if (is_avx_and_f16c()) {
+    __m256 scale_factor_m256 = _mm256_broadcast_ss(&scale_factor);
+    for (; i < (num_elements / 8) * 8; i += 8) {
+      __m256 in_m256 = _mm256_cvtph_ps(_mm_loadu_si128((__m128i*)(input + i)));
+      __m128i result = _mm256_cvtps_ph(_mm256_mul_ps(in_m256, scale_factor_m256), 0);
+      _mm_storeu_si128((__m128i*)(output + i), result);
+    }
+  }
+#endif
+  for (; i < num_elements; ++i) {
+    float in_float;
+    HalfBits2Float(input + i, &in_float);
+    float out_float = scale_factor * in_float;
+    Float2HalfBits(&out_float, output + i);
+  }
+}
+
+} // namespace common
+} // namespace horovod
@@ -0,0 +1,61 @@
+// Copyright 2021 Uber Technologies, Inc. All Rights Reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+// =============================================================================
+
+#ifndef HOROVOD_CPU_KERNELS_H
+#define HOROVOD_CPU_KERNELS_H
+
+#include <functional>
+#include <stdint.h>
+
+#include "message.h"
+
+namespace horovod {
+namespace common {
+
+// Buffers are only split across threads into chunks of at least this many
+// bytes, smaller buffers are processed by the calling thread.
+#define CPU_KERNEL_MIN_CHUNK_BYTES (256 * 1024)
+
+// Starts the threads that share the CPU kernels with the calling thread. With
+// a single thread, all kernels run in the calling thread.
+void InitializeCPUKernels(int num_threads);
+
+void FinalizeCPUKernels();
+
+// Number of chunks ParallelFor splits the given buffer into.
+int ParallelChunks(int64_t num_elements, int64_t element_size);
+
+// Calls fn(chunk, begin, end) for ParallelChunks() contiguous ranges covering
+// [0, num_elements) in parallel, and returns once all calls returned. Chunk
+// boundaries only depend on the arguments and the number of threads.
+void ParallelFor(int64_t num_elements, int64_t element_size,
+                 const std::function<void(int, int64_t, int64_t)>& fn);
+
+// inout[i] += input[i], vectorized and split across threads. Booleans are
+// combined with a logical or.
+void SumBufferCPU(DataType dtype, const void* input, void* inout,
+                  int64_t num_elements);
+
+// Single-threaded float16 kernels, vectorized with AVX-512 or F16C if the CPU
+// supports them.
+void Float16Sum(const uint16_t* input, uint16_t* inout, int64_t num_elements);
+
+void Float16Scale(const uint16_t* input, uint16_t* output,
+                  int64_t num_elements, float scale_factor);
+
+} // namespace common
+} // namespace horovod
+
+#endif // HOROVOD_CPU_KERNELS_H
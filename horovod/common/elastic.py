@@ -15,6 +15,7 @@
 
 import functools
 import queue
+import uuid
 
 from horovod.common.exceptions import HorovodInternalError, HostsUpdatedInterrupt
 from horovod.runner.elastic.worker import HostUpdateResult, WorkerNotificationManager
@@ -29,13 +30,20 @@ class State(object):
     Args:
         bcast_object: Function used to broadcast a variable from rank 0 to the other workers.
         get_rank: Function that returns the current rank of this worker.
+        allgather_object: Optional function used to allgather a variable from all workers. When given,
+                          workers that already hold the committed state of rank 0 are identified
+                          during a sync, so they can serve the state and skip receiving it.
     """
-    def __init__(self, bcast_object, get_rank):
+    def __init__(self, bcast_object, get_rank, allgather_object=None):
         self._bcast_object = bcast_object
+        self._allgather_object = allgather_object
         self._rank = get_rank
         self._host_messages = queue.Queue()
         self._last_updated_timestamp = 0
         self._reset_callbacks = []
+        # Identifies the state of this worker as (sync generation, commits since the sync),
+        # None until the worker has been synced
+        self._commit_token = None
 
     def register_reset_callbacks(self, callbacks):
         """Register callbacks that will be invoked following a reset event (worker added or removed).
@@ -68,6 +76,9 @@ class State(object):
         between per-batch execution time and lost training steps in the event of a worker failure.
         """
         self.save()
+        if self._commit_token is not None:
+            generation, commits = self._commit_token
+            self._commit_token = (generation, commits + 1)
         self.check_host_updates()
 
     def check_host_updates(self):
@@ -96,6 +107,27 @@ class State(object):
             raise HostsUpdatedInterrupt(all_update == HostUpdateResult.removed)
 
 
+    def sync_holders(self):
+        """Returns the ranks that hold the same state as rank 0 and can serve it during a sync.
+
+        Workers that went through the same syncs and commits hold identical state, as do
+        all of them after restoring the last commit. When every rank is returned, the
+        state is already consistent and does not need to be broadcast at all. Returns
+        `[0]` if workers cannot be compared, e.g. on the first sync.
+
+        Must be called by all workers at the beginning of `sync()`.
+        """
+        if self._allgather_object is None:
+            return [0]
+
+        # Rank 0 also proposes the generation of the state everyone holds after this sync
+        tokens = self._allgather_object((self._commit_token, uuid.uuid4().hex))
+        root_token, generation = tokens[0]
+        self._commit_token = (generation, 0)
+        if root_token is None:
+            return [0]
+        return [r for r, (token, _) in enumerate(tokens) if token == root_token]
+
     def save(self):
         """Saves state to host memory."""
         raise NotImplementedError()
@@ -121,13 +153,16 @@ class ObjectState(State):
     Args:
         bcast_object: Horovod broadcast object function used to sync state dictionary.
         get_rank: Horovod rank function used to identify is this process is the coordinator.
+        allgather_object: Optional Horovod allgather object function used to find the workers
+                          holding the state of the coordinator.
         kwargs: Properties to sync, will be exposed as attributes of the object.
     """
-    def __init__(self, bcast_object, get_rank, **kwargs):
+    def __init__(self, bcast_object, get_rank, allgather_object=None, **kwargs):
         self._bcast_object = bcast_object
         self._saved_state = kwargs
         self._set_attrs()
-        super(ObjectState, self).__init__(bcast_object=bcast_object, get_rank=get_rank)
+        super(ObjectState, self).__init__(bcast_object=bcast_object, get_rank=get_rank,
+                                          allgather_object=allgather_object)
 
     def save(self):
         new_state = {}
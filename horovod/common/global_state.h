@@ -23,6 +23,7 @@
 #include "fusion_buffer_manager.h"
 #include "group_table.h"
 #include "parameter_manager.h"
+#include "process_set.h"
 #include "response_cache.h"
 #include "tensor_queue.h"
 #include "timeline.h"
@@ -97,6 +98,10 @@ struct HorovodGlobalState {
   // Information on registered groups.
   GroupTable group_table;
 
+  // Process sets, besides the global one, that collectives can be performed
+  // on. Each of them has its own controller, tensor queue and response cache.
+  ProcessSetTable process_set_table;
+
   // A LibType indicating what framework we are using to perform CPU operations.
   LibType cpu_operation;
 
@@ -120,6 +125,15 @@ struct HorovodGlobalState {
   // Flag indicating whether to prohibit groups from fusing
   bool disable_group_fusion = false;
 
+  // Flag indicating whether to reduce-scatter within nodes before reducing
+  // across nodes.
+  bool hierarchical_reducescatter = false;
+
+  // Allreduced tensors larger than this many bytes are split into partitions
+  // of at most this size, which are negotiated and fused independently.
+  // Partitioning is disabled if zero.
+  int64_t tensor_partition_size = 0;
+
   ~HorovodGlobalState() {
     // Make sure that the destructor of the background thread is safe to
     // call. If a thread is still joinable (not detached or complete) its
@@ -15,6 +15,7 @@
 
 #include "gloo_context.h"
 
+#include <algorithm>
 #include <chrono>
 #include <memory>
 #include <sstream>
@@ -215,6 +216,41 @@ void GlooContext::Initialize(const std::string& gloo_iface) {
   LOG(DEBUG) << "Cross-node Gloo context initialized.";
 }
 
+void GlooContext::InitializeForProcessSet(const GlooContext& global_context,
+                                         int32_t process_set_id,
+                                         const std::vector<int>& global_ranks,
+                                         const std::string& gloo_iface) {
+  enabled_ = global_context.enabled_;
+  if (!enabled_) {
+    return;
+  }
+
+  attr device_attr;
+  device_attr.iface = gloo_iface;
+  device_attr.ai_family = AF_UNSPEC;
+  auto dev = CreateDevice(device_attr);
+  auto timeout = GetTimeoutFromEnv();
+
+  auto rendezvous_addr_env = std::getenv(HOROVOD_GLOO_RENDEZVOUS_ADDR);
+  auto rendezvous_port = GetIntEnvOrDefault(HOROVOD_GLOO_RENDEZVOUS_PORT, -1);
+
+  // Ranks in the process set follow the order of the global ranks
+  auto it = std::find(global_ranks.begin(), global_ranks.end(),
+                      global_context.ctx->rank);
+  if (it == global_ranks.end()) {
+    throw std::logic_error("Current process is not a member of process set " +
+                           std::to_string(process_set_id) + ".");
+  }
+  int rank = (int) (it - global_ranks.begin());
+  int size = (int) global_ranks.size();
+
+  ctx = Rendezvous(HOROVOD_GLOO_PROCESS_SET_PREFIX + std::to_string(process_set_id),
+                   rendezvous_addr_env, rendezvous_port,
+                   rank, size, dev, timeout);
+  LOG(DEBUG) << "Gloo context of process set " << process_set_id
+             << " initialized.";
+}
+
 void GlooContext::Finalize() {
   if (!enabled_) {
     return;
@@ -32,6 +32,7 @@
 #define HOROVOD_GLOO_GLOBAL_PREFIX "global"
 #define HOROVOD_GLOO_LOCAL_PREFIX "local_"
 #define HOROVOD_GLOO_CROSS_PREFIX "cross_"
+#define HOROVOD_GLOO_PROCESS_SET_PREFIX "process_set_"
 #define HOROVOD_GLOO_GET_RANK_AND_SIZE "rank_and_size"
 #define HOROVOD_HOSTNAME "HOROVOD_HOSTNAME"
 #define HOROVOD_RANK "HOROVOD_RANK"
@@ -53,6 +54,14 @@ struct GlooContext {
 
   void Initialize(const std::string& gloo_iface);
 
+  // Creates the global context of a process set by a rendezvous of its member
+  // processes. Process sets do not perform hierarchical operations, so there
+  // are no local and cross contexts. Must only be called by member processes.
+  void InitializeForProcessSet(const GlooContext& global_context,
+                               int32_t process_set_id,
+                               const std::vector<int>& global_ranks,
+                               const std::string& gloo_iface);
+
   void Finalize();
 
   std::shared_ptr<gloo::Context> GetGlooContext(Communicator communicator);
@@ -111,6 +111,9 @@ const std::string& Request::RequestType_Name(RequestType value) {
     case RequestType::ALLTOALL:
       static const std::string alltoall("ALLTOALL");
       return alltoall;
+    case RequestType::REDUCESCATTER:
+      static const std::string reducescatter("REDUCESCATTER");
+      return reducescatter;
     default:
       static const std::string unknown("<unknown>");
       return unknown;
@@ -153,6 +156,10 @@ void Request::set_prescale_factor(const double prescale_factor) { prescale_facto
 
 void Request::set_postscale_factor(const double postscale_factor) { postscale_factor_ = postscale_factor; };
 
+int32_t Request::priority() const { return priority_; }
+
+void Request::set_priority(int32_t value) { priority_ = value; }
+
 int32_t Request::group_id() const { return group_id_; }
 
 void Request::set_group_id(int32_t value) { group_id_ = value; }
@@ -183,6 +190,7 @@ void Request_ParseFromWire(Request& request,
                                                 obj->tensor_shape()->end()));
   request.set_prescale_factor(obj->prescale_factor());
   request.set_postscale_factor(obj->postscale_factor());
+  request.set_priority(obj->priority());
 }
 
 void Request_SerializeToWire(const Request& request,
@@ -203,6 +211,7 @@ void Request_SerializeToWire(const Request& request,
   request_builder.add_tensor_shape(tensor_shape_wire);
   request_builder.add_prescale_factor(request.prescale_factor());
   request_builder.add_postscale_factor(request.postscale_factor());
+  request_builder.add_priority(request.priority());
   obj = request_builder.Finish();
 }
 
@@ -300,6 +309,9 @@ const std::string& Response::ResponseType_Name(ResponseType value) {
     case ResponseType::ALLTOALL:
       static const std::string alltoall("ALLTOALL");
       return alltoall;
+    case ResponseType::REDUCESCATTER:
+      static const std::string reducescatter("REDUCESCATTER");
+      return reducescatter;
     case ResponseType::ERROR:
       static const std::string error("ERROR");
       return error;
@@ -395,6 +407,10 @@ void Response::set_prescale_factor(const double prescale_factor) { prescale_fact
 
 void Response::set_postscale_factor(const double postscale_factor) { postscale_factor_ = postscale_factor; };
 
+int32_t Response::priority() const { return priority_; }
+
+void Response::set_priority(int32_t value) { priority_ = value; }
+
 void Response_ParseFromWire(Response& response,
                             const wire::Response* obj) {
   response.set_response_type((Response::ResponseType) obj->response_type());
@@ -409,6 +425,7 @@ void Response_ParseFromWire(Response& response,
                                                  obj->tensor_sizes()->end()));
   response.set_prescale_factor(obj->prescale_factor());
   response.set_postscale_factor(obj->postscale_factor());
+  response.set_priority(obj->priority());
 }
 
 void Response::ParseFromBytes(Response& response, const uint8_t* input) {
@@ -437,6 +454,7 @@ void Response_SerializeToWire(const Response& response,
   response_builder.add_tensor_sizes(tensor_sizes_wire);
   response_builder.add_prescale_factor(response.prescale_factor());
   response_builder.add_postscale_factor(response.postscale_factor());
+  response_builder.add_priority(response.priority());
   obj = response_builder.Finish();
 }
 
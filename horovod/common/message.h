@@ -50,7 +50,8 @@ std::size_t DataType_Size(DataType value);
 class Request {
 public:
   enum RequestType {
-    ALLREDUCE = 0, ALLGATHER = 1, BROADCAST = 2, JOIN = 3, ADASUM = 4, ALLTOALL = 5
+    ALLREDUCE = 0, ALLGATHER = 1, BROADCAST = 2, JOIN = 3, ADASUM = 4, ALLTOALL = 5,
+    REDUCESCATTER = 6
   };
 
 
@@ -99,6 +100,10 @@ public:
 
   void set_postscale_factor(const double postscale_factor);
 
+  int32_t priority() const;
+
+  void set_priority(int32_t value);
+
   static void ParseFromBytes(Request& request, const uint8_t* input);
 
   static void SerializeToString(const Request& request, std::string& output);
@@ -117,6 +122,7 @@ private:
   std::vector<int64_t> tensor_shape_;
   double prescale_factor_ = 1.0;
   double postscale_factor_ = 1.0;
+  int32_t priority_ = 0;
 };
 
 class RequestList {
@@ -152,7 +158,8 @@ private:
 class Response {
 public:
   enum ResponseType {
-    ALLREDUCE = 0, ALLGATHER = 1, BROADCAST = 2, JOIN = 3, ADASUM = 4, ALLTOALL= 5, ERROR = 6
+    ALLREDUCE = 0, ALLGATHER = 1, BROADCAST = 2, JOIN = 3, ADASUM = 4, ALLTOALL= 5,
+    REDUCESCATTER = 6, ERROR = 7
   };
 
   static const std::string& ResponseType_Name(ResponseType value);
@@ -207,6 +214,12 @@ public:
 
   void set_postscale_factor(const double postscale_factor);
 
+  // Responses with higher priority are scheduled first. A fused response
+  // carries the highest priority of its tensors.
+  int32_t priority() const;
+
+  void set_priority(int32_t value);
+
   static void ParseFromBytes(Response& response, const uint8_t* input);
 
   static void SerializeToString(const Response& response,
@@ -221,6 +234,7 @@ private:
   std::vector<int64_t> tensor_sizes_;
   double prescale_factor_ = 1.0;
   double postscale_factor_ = 1.0;
+  int32_t priority_ = 0;
 };
 
 class ResponseList {
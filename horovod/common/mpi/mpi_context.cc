@@ -163,6 +163,44 @@ void MPIContext::Initialize(const std::vector<int>& ranks,
   MPI_Op_create(&float16_sum, 1, &mpi_float16_sum);
 }
 
+void MPIContext::InitializeProcessSet(const MPIContext& parent,
+                                      const std::vector<int>& ranks) {
+  enabled_ = parent.enabled_;
+  should_finalize = false;
+  mpi_comm = MPI_COMM_NULL;
+  local_comm = MPI_COMM_NULL;
+  cross_comm = MPI_COMM_NULL;
+  mpi_float16_t = MPI_DATATYPE_NULL;
+  mpi_float16_sum = MPI_OP_NULL;
+  if (!enabled_) {
+    return;
+  }
+
+  // MPI_Comm_create is collective over the parent communicator and returns
+  // MPI_COMM_NULL on ranks outside of the group.
+  MPI_Group parent_group;
+  MPI_Comm_group(parent.mpi_comm, &parent_group);
+  MPI_Group work_group;
+  MPI_Group_incl(parent_group, ranks.size(), ranks.data(), &work_group);
+  MPI_Comm_create(parent.mpi_comm, work_group, &mpi_comm);
+  MPI_Group_free(&parent_group);
+  MPI_Group_free(&work_group);
+  if (mpi_comm == MPI_COMM_NULL) {
+    return;
+  }
+
+  MPI_Comm_split_type(mpi_comm, MPI_COMM_TYPE_SHARED, 0, MPI_INFO_NULL,
+                      &local_comm);
+  int local_rank, rank;
+  MPI_Comm_rank(mpi_comm, &rank);
+  MPI_Comm_rank(local_comm, &local_rank);
+  MPI_Comm_split(mpi_comm, local_rank, rank, &cross_comm);
+
+  MPI_Type_contiguous(2, MPI_BYTE, &mpi_float16_t);
+  MPI_Type_commit(&mpi_float16_t);
+  MPI_Op_create(&float16_sum, 1, &mpi_float16_sum);
+}
+
 void MPIContext::Finalize(MPIContextManager& ctx_manager) {
   if (!enabled_) {
     return;
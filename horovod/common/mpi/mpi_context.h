@@ -53,6 +53,12 @@ struct MPIContext {
   void Initialize(const std::vector<int>& ranks,
                   MPIContextManager& ctx_manager);
 
+  // Create the communicators of a process set over the given ranks of the
+  // parent context's communicator. Must be called by all ranks of the parent,
+  // communicators are null on ranks that are not members of the process set.
+  void InitializeProcessSet(const MPIContext& parent,
+                            const std::vector<int>& ranks);
+
   // Take an argument of context manager pointer that will take care of
   // finalization of MPI environment.
   void Finalize(MPIContextManager& ctx_manager);
@@ -19,10 +19,12 @@
 
 #include "operations.h"
 
+#include <algorithm>
 #include <atomic>
 #include <cassert>
 #include <cstring>
 #include <map>
+#include <mutex>
 #include <queue>
 #include <set>
 #include <sstream>
@@ -31,12 +33,14 @@
 #include <unordered_set>
 
 #include "common.h"
+#include "cpu_kernels.h"
 #include "fusion_buffer_manager.h"
 #include "global_state.h"
 #include "hashes.h"
 #include "logging.h"
 #include "message.h"
 #include "ops/operation_manager.h"
+#include "ops/shm_operations.h"
 #include "parameter_manager.h"
 #include "timeline.h"
 #include "utils/env_parser.h"
@@ -137,8 +141,23 @@ DDLContext ddl_context;
 CCLContext ccl_context;
 #endif
 
+SharedMemoryContext shm_context;
+
 std::unique_ptr<OperationManager> op_manager;
 
+#if HAVE_MPI
+// Communicators of the process sets other than the global one.
+std::map<int32_t, MPIContext> process_set_mpi_contexts;
+#endif
+
+#if HAVE_GLOO
+// Gloo contexts of the process sets other than the global one.
+std::map<int32_t, GlooContext> process_set_gloo_contexts;
+#endif
+
+// Operation managers of the process sets other than the global one.
+std::map<int32_t, std::unique_ptr<OperationManager>> process_set_op_managers;
+
 OperationManager* CreateOperationManager(HorovodGlobalState& state) {
   // Order of these operations is very important. Operations will be checked
   // sequentially from the first to the last. The first 'Enabled' operation will
@@ -148,6 +167,7 @@ OperationManager* CreateOperationManager(HorovodGlobalState& state) {
   std::vector<std::shared_ptr<BroadcastOp>> broadcast_ops;
   std::vector<std::shared_ptr<AllreduceOp>> adasum_ops;
   std::vector<std::shared_ptr<AlltoallOp>> alltoall_ops;
+  std::vector<std::shared_ptr<ReducescatterOp>> reducescatter_ops;
 
 #if HAVE_MPI && HAVE_GPU
   if (mpi_context.IsEnabled()) {
@@ -203,6 +223,8 @@ OperationManager* CreateOperationManager(HorovodGlobalState& state) {
 
 #if HAVE_GLOO
   if (gloo_context.IsEnabled()) {
+    allreduce_ops.push_back(std::shared_ptr<AllreduceOp>(
+        new GlooShmAllreduce(&shm_context, &gloo_context, &state)));
     allreduce_ops.push_back(
         std::shared_ptr<AllreduceOp>(new GlooAllreduce(&gloo_context, &state)));
     allgather_ops.push_back(
@@ -211,6 +233,8 @@ OperationManager* CreateOperationManager(HorovodGlobalState& state) {
         std::shared_ptr<BroadcastOp>(new GlooBroadcast(&gloo_context, &state)));
     alltoall_ops.push_back(
         std::shared_ptr<AlltoallOp>(new GlooAlltoall(&gloo_context, &state)));
+    reducescatter_ops.push_back(std::shared_ptr<ReducescatterOp>(
+        new GlooReducescatter(&gloo_context, &state)));
   }
 #endif
 
@@ -231,6 +255,8 @@ OperationManager* CreateOperationManager(HorovodGlobalState& state) {
   if (mpi_context.IsEnabled()){
     adasum_ops.push_back(
         std::shared_ptr<AllreduceOp>(new AdasumMPIAllreduceOp(&mpi_context, &state)));
+    allreduce_ops.push_back(std::shared_ptr<AllreduceOp>(
+        new MPIShmAllreduce(&shm_context, &mpi_context, &state)));
     allreduce_ops.push_back(
         std::shared_ptr<AllreduceOp>(new MPIAllreduce(&mpi_context,&state)));
     allgather_ops.push_back(
@@ -239,6 +265,66 @@ OperationManager* CreateOperationManager(HorovodGlobalState& state) {
         std::shared_ptr<BroadcastOp>(new MPIBroadcast(&mpi_context, &state)));
     alltoall_ops.push_back(
         std::shared_ptr<AlltoallOp>(new MPIAlltoall(&mpi_context, &state)));
+    reducescatter_ops.push_back(std::shared_ptr<ReducescatterOp>(
+        new MPIHierarchicalReducescatter(&mpi_context, &state)));
+    reducescatter_ops.push_back(std::shared_ptr<ReducescatterOp>(
+        new MPIReducescatter(&mpi_context, &state)));
+  }
+#endif
+
+  std::shared_ptr<JoinOp> join_op(new JoinOp(&state));
+  std::shared_ptr<ErrorOp> error_op(new ErrorOp(&state));
+
+  return new OperationManager(&state.parameter_manager, allreduce_ops,
+                              allgather_ops, broadcast_ops, alltoall_ops,
+                              reducescatter_ops, join_op, adasum_ops, error_op);
+}
+
+// Collectives on process sets other than the global one are performed on CPU
+// over the communicators of the process set, with Gloo if it performs the CPU
+// operations and with MPI otherwise.
+OperationManager* CreateProcessSetOperationManager(HorovodGlobalState& state,
+                                                   int32_t id) {
+  std::vector<std::shared_ptr<AllreduceOp>> allreduce_ops;
+  std::vector<std::shared_ptr<AllgatherOp>> allgather_ops;
+  std::vector<std::shared_ptr<BroadcastOp>> broadcast_ops;
+  std::vector<std::shared_ptr<AllreduceOp>> adasum_ops;
+  std::vector<std::shared_ptr<AlltoallOp>> alltoall_ops;
+  std::vector<std::shared_ptr<ReducescatterOp>> reducescatter_ops;
+
+#if HAVE_GLOO
+  auto gloo_it = process_set_gloo_contexts.find(id);
+  if (gloo_it != process_set_gloo_contexts.end() &&
+      gloo_it->second.IsEnabled()) {
+    auto* ctx = &gloo_it->second;
+    allreduce_ops.push_back(
+        std::shared_ptr<AllreduceOp>(new GlooAllreduce(ctx, &state)));
+    allgather_ops.push_back(
+        std::shared_ptr<AllgatherOp>(new GlooAllgather(ctx, &state)));
+    broadcast_ops.push_back(
+        std::shared_ptr<BroadcastOp>(new GlooBroadcast(ctx, &state)));
+    alltoall_ops.push_back(
+        std::shared_ptr<AlltoallOp>(new GlooAlltoall(ctx, &state)));
+    reducescatter_ops.push_back(
+        std::shared_ptr<ReducescatterOp>(new GlooReducescatter(ctx, &state)));
+  }
+#endif
+
+#if HAVE_MPI
+  auto mpi_it = process_set_mpi_contexts.find(id);
+  if (mpi_it != process_set_mpi_contexts.end() &&
+      mpi_it->second.IsEnabled()) {
+    auto* ctx = &mpi_it->second;
+    allreduce_ops.push_back(
+        std::shared_ptr<AllreduceOp>(new MPIAllreduce(ctx, &state)));
+    allgather_ops.push_back(
+        std::shared_ptr<AllgatherOp>(new MPIAllgather(ctx, &state)));
+    broadcast_ops.push_back(
+        std::shared_ptr<BroadcastOp>(new MPIBroadcast(ctx, &state)));
+    alltoall_ops.push_back(
+        std::shared_ptr<AlltoallOp>(new MPIAlltoall(ctx, &state)));
+    reducescatter_ops.push_back(
+        std::shared_ptr<ReducescatterOp>(new MPIReducescatter(ctx, &state)));
   }
 #endif
 
@@ -247,17 +333,206 @@ OperationManager* CreateOperationManager(HorovodGlobalState& state) {
 
   return new OperationManager(&state.parameter_manager, allreduce_ops,
                               allgather_ops, broadcast_ops, alltoall_ops,
-                              join_op, adasum_ops, error_op);
+                              reducescatter_ops, join_op, adasum_ops, error_op);
+}
+
+// Create the communicators, controller and operation manager of a process set.
+// Collectives on it are negotiated and performed on its own thread, so with
+// the MPI controller MPI has to provide MPI_THREAD_MULTIPLE. With the Gloo
+// controller only the members of the process set take part in its rendezvous.
+Status InitializeProcessSet(HorovodGlobalState& state, int32_t id) {
+  auto& process_set = state.process_set_table.Get(id);
+  auto& ranks = process_set.registered_global_ranks;
+  int global_size = state.controller->GetSize();
+  if (ranks.empty() || ranks.front() < 0 || ranks.back() >= global_size) {
+    return Status::InvalidArgument("Process set " + std::to_string(id) +
+                                   " contains ranks outside of [0, " +
+                                   std::to_string(global_size) + ").");
+  }
+
+  try {
+#if HAVE_MPI
+    if (state.control_operation == LibType::MPI) {
+      int provided;
+      MPI_Query_thread(&provided);
+      if (provided < MPI_THREAD_MULTIPLE) {
+        return Status::PreconditionError(
+            "Process set " + std::to_string(id) +
+            " is not available, process sets require MPI multi-threading "
+            "support (MPI_THREAD_MULTIPLE).");
+      }
+
+      auto& ctx = process_set_mpi_contexts[id];
+      ctx.InitializeProcessSet(mpi_context, ranks);
+      if (!process_set.IsCurrentProcessIncluded()) {
+        return Status::OK();
+      }
+#if HAVE_GLOO
+      if (state.cpu_operation == LibType::GLOO) {
+        auto& gloo_ctx = process_set_gloo_contexts[id];
+        gloo_ctx.Enable();
+        gloo_ctx.InitializeFromMPI(ctx, ParseGlooIface());
+      }
+#endif
+      process_set.controller.reset(new MPIController(
+          process_set.response_cache, process_set.tensor_queue, state.timeline,
+          state.parameter_manager, process_set.group_table, ctx));
+    }
+#endif
+
+#if HAVE_GLOO
+    if (state.control_operation == LibType::GLOO) {
+      if (!process_set.IsCurrentProcessIncluded()) {
+        return Status::OK();
+      }
+      auto& gloo_ctx = process_set_gloo_contexts[id];
+      gloo_ctx.InitializeForProcessSet(gloo_context, id, ranks,
+                                       ParseGlooIface());
+      process_set.controller.reset(new GlooController(
+          process_set.response_cache, process_set.tensor_queue, state.timeline,
+          state.parameter_manager, process_set.group_table, gloo_ctx));
+    }
+#endif
+  } catch (const std::exception& ex) {
+    return Status::UnknownError("Process set " + std::to_string(id) +
+                                " is not available: " + ex.what());
+  }
+
+  if (process_set.controller == nullptr) {
+    return Status::PreconditionError(
+        "Process set " + std::to_string(id) +
+        " is not available, process sets require the MPI or Gloo "
+        "controller.");
+  }
+  process_set.controller->SetJoinEnabled(false);
+  process_set.controller->Initialize();
+  process_set.response_cache.set_capacity(state.response_cache.capacity());
+  process_set_op_managers[id].reset(
+      CreateProcessSetOperationManager(state, id));
+  return Status::OK();
+}
+
+void ProcessSetLoop(HorovodGlobalState& state, int32_t process_set_id);
+
+// Create the communicators, controllers, operation managers and background
+// threads of the registered process sets. Every rank has to register the same
+// process sets in the same order. A process set that cannot be created keeps
+// the error in its initialization status, which fails every collective
+// enqueued on it.
+void InitializeProcessSets(HorovodGlobalState& state) {
+  int global_rank = state.controller->GetRank();
+  for (auto id : state.process_set_table.Ids()) {
+    auto& process_set = state.process_set_table.Get(id);
+    process_set.global_rank = global_rank;
+    process_set.initialization_status = InitializeProcessSet(state, id);
+    if (!process_set.initialization_status.ok()) {
+      LOG(ERROR, global_rank)
+          << process_set.initialization_status.reason();
+    } else if (process_set.controller != nullptr) {
+      process_set.background_thread =
+          std::thread(ProcessSetLoop, std::ref(state), id);
+    }
+  }
+}
+
+// Stop the background threads of all process sets, release their resources
+// and notify their outstanding operations that Horovod has been shut down.
+// Requires state.shut_down to be set, so that the threads negotiate shutdown.
+void FinalizeProcessSets(HorovodGlobalState& state) {
+  for (auto id : state.process_set_table.Ids()) {
+    auto& process_set = state.process_set_table.Get(id);
+    if (process_set.background_thread.joinable()) {
+      process_set.background_thread.join();
+    }
+  }
+  for (auto id : state.process_set_table.Ids()) {
+    auto& process_set = state.process_set_table.Get(id);
+    std::vector<StatusCallback> callbacks;
+    process_set.tensor_queue.FinalizeTensorQueue(callbacks);
+    for (auto& cb : callbacks) {
+      cb(SHUT_DOWN_ERROR);
+    }
+    process_set.controller.reset();
+  }
+  process_set_op_managers.clear();
+
+#if HAVE_GLOO
+  for (auto& it : process_set_gloo_contexts) {
+    it.second.Finalize();
+  }
+  process_set_gloo_contexts.clear();
+#endif
+
+#if HAVE_MPI
+  auto mpi_ctx_manager = MPIContextManager();
+  for (auto& it : process_set_mpi_contexts) {
+    it.second.Finalize(mpi_ctx_manager);
+  }
+  process_set_mpi_contexts.clear();
+#endif
+}
+
+Controller& GetProcessSetController(int32_t process_set_id) {
+  if (process_set_id == GLOBAL_PROCESS_SET_ID) {
+    return *horovod_global.controller;
+  }
+  return *horovod_global.process_set_table.Get(process_set_id).controller;
+}
+
+TensorQueue& GetProcessSetTensorQueue(int32_t process_set_id) {
+  if (process_set_id == GLOBAL_PROCESS_SET_ID) {
+    return horovod_global.tensor_queue;
+  }
+  return horovod_global.process_set_table.Get(process_set_id).tensor_queue;
+}
+
+GroupTable& GetProcessSetGroupTable(int32_t process_set_id) {
+  if (process_set_id == GLOBAL_PROCESS_SET_ID) {
+    return horovod_global.group_table;
+  }
+  return horovod_global.process_set_table.Get(process_set_id).group_table;
+}
+
+// Check that the current process can enqueue the tensors of the given device
+// on the process set.
+Status CheckProcessSet(int32_t process_set_id, int device) {
+  if (process_set_id == GLOBAL_PROCESS_SET_ID) {
+    return Status::OK();
+  }
+  if (!horovod_global.process_set_table.Contains(process_set_id)) {
+    return Status::InvalidArgument("Process set " +
+                                   std::to_string(process_set_id) +
+                                   " has not been registered.");
+  }
+  auto& process_set = horovod_global.process_set_table.Get(process_set_id);
+  if (!process_set.initialization_status.ok()) {
+    return process_set.initialization_status;
+  }
+  if (!process_set.IsCurrentProcessIncluded()) {
+    return Status::InvalidArgument(
+        "Current process is not a member of process set " +
+        std::to_string(process_set_id) + ".");
+  }
+  if (device != CPU_DEVICE_ID) {
+    return Status::InvalidArgument(
+        "Only CPU tensors are supported on process sets other than the "
+        "global one, GPU tensors have to be copied to host memory.");
+  }
+  return Status::OK();
 }
 
 // Process a Response by doing a reduction, a gather, a broadcast, or
 // raising an error.
-void PerformOperation(Response response, HorovodGlobalState& state) {
+void PerformOperation(Response response, HorovodGlobalState& state,
+                      int32_t process_set_id = GLOBAL_PROCESS_SET_ID) {
   std::vector<TensorTableEntry> entries;
   auto& timeline = horovod_global.timeline;
   if (response.response_type() != Response::JOIN) {
-    horovod_global.tensor_queue.GetTensorEntriesFromResponse(response, entries,
-                                                             state.joined);
+    // Join only applies to the global process set.
+    GetProcessSetTensorQueue(process_set_id)
+        .GetTensorEntriesFromResponse(
+            response, entries,
+            process_set_id == GLOBAL_PROCESS_SET_ID && state.joined);
 
     for (auto& e : entries) {
       timeline.Start(e.tensor_name, response.response_type());
@@ -268,8 +543,13 @@ void PerformOperation(Response response, HorovodGlobalState& state) {
       // Note: it is OK for different entries to come from different frameworks
       // since buffer allocated here is guaranteed to survive at least till the
       // end of this operation.
-      Status status = horovod_global.fusion_buffer.InitializeBuffer(
-          horovod_global.controller->TensorFusionThresholdBytes(),
+      auto& fusion_buffer =
+          process_set_id == GLOBAL_PROCESS_SET_ID
+              ? horovod_global.fusion_buffer
+              : horovod_global.process_set_table.Get(process_set_id)
+                    .fusion_buffer;
+      Status status = fusion_buffer.InitializeBuffer(
+          GetProcessSetController(process_set_id).TensorFusionThresholdBytes(),
           first_entry.device, first_entry.context,
           horovod_global.current_nccl_stream,
           [&]() { timeline.ActivityStartAll(entries, INIT_FUSION_BUFFER); },
@@ -316,7 +596,10 @@ void PerformOperation(Response response, HorovodGlobalState& state) {
 
   Status status;
   try {
-    status = op_manager->ExecuteOperation(entries, response);
+    auto& manager = process_set_id == GLOBAL_PROCESS_SET_ID
+                        ? op_manager
+                        : process_set_op_managers.at(process_set_id);
+    status = manager->ExecuteOperation(entries, response);
   } catch (const std::exception& ex) {
     LOG(DEBUG, horovod_global.controller->GetRank()) << "ExecuteOperation Failed";
     status = Status::UnknownError(ex.what());
@@ -333,6 +616,44 @@ void PerformOperation(Response response, HorovodGlobalState& state) {
   }
 }
 
+// Negotiate and perform the collectives of a process set until shutdown. Every
+// process set runs this loop on its own thread, so it negotiates independently
+// of the global process set and of the other process sets.
+void ProcessSetLoop(HorovodGlobalState& state, int32_t process_set_id) {
+  auto& process_set = state.process_set_table.Get(process_set_id);
+  int rank = state.controller->GetRank();
+  auto last_cycle_start = std::chrono::steady_clock::now();
+  try {
+    while (true) {
+      auto sleep_duration = last_cycle_start +
+                            std::chrono::microseconds(long(
+                                state.parameter_manager.CycleTimeMs() * 1000.)) -
+                            std::chrono::steady_clock::now();
+      if (sleep_duration > std::chrono::steady_clock::duration::zero()) {
+        std::this_thread::sleep_for(sleep_duration);
+      }
+      last_cycle_start = std::chrono::steady_clock::now();
+
+      auto response_list =
+          process_set.controller->ComputeResponseList(state.shut_down, state);
+      for (auto& response : response_list.responses()) {
+        if (!process_set.group_table.empty()) {
+          process_set.group_table.DeregisterGroups(response.tensor_names());
+        }
+        LOG(TRACE, rank) << "Performing " << response.tensor_names_string()
+                         << " on process set " << process_set_id;
+        PerformOperation(response, state, process_set_id);
+      }
+      if (response_list.shutdown()) {
+        break;
+      }
+    }
+  } catch (const std::exception& ex) {
+    LOG(ERROR, rank) << "Horovod background loop of process set "
+                     << process_set_id << " uncaught exception: " << ex.what();
+  }
+}
+
 // The background thread loop coordinates all the controller processes and the
 // tensor reductions. The design of the communicator mechanism is limited by a
 // few considerations:
@@ -399,6 +720,14 @@ void BackgroundThreadLoop(HorovodGlobalState& state) {
   // Set background thread affinity
   parse_and_set_affinity(std::getenv(HOROVOD_THREAD_AFFINITY), local_size, local_rank);
 
+  // Set number of threads reducing and scaling CPU buffers. By default, share
+  // the cores of the host among the local ranks, with at most 4 threads each.
+  int cpu_reduction_threads =
+      std::max(1, std::min(4, (int)std::thread::hardware_concurrency() /
+                                  std::max(local_size, 1)));
+  SetIntFromEnv(HOROVOD_CPU_REDUCTION_THREADS, cpu_reduction_threads);
+  InitializeCPUKernels(cpu_reduction_threads);
+
 #if HAVE_GPU
   // Set number of GPU streams to use
   auto horovod_num_nccl_streams =
@@ -477,6 +806,15 @@ void BackgroundThreadLoop(HorovodGlobalState& state) {
                  (size != local_size);
     state.parameter_manager.SetHierarchicalAllgather(value, true);
   }
+  // Set flag for hierarchical reducescatter. Ignore if Horovod is running on
+  // a single node.
+  auto horovod_hierarchical_reducescatter =
+      std::getenv(HOROVOD_HIERARCHICAL_REDUCESCATTER);
+  if (horovod_hierarchical_reducescatter != nullptr) {
+    state.hierarchical_reducescatter =
+        std::strtol(horovod_hierarchical_reducescatter, nullptr, 10) > 0 &&
+        (size != local_size);
+  }
   // Set flag for hierarchical allreduce. Ignore if Horovod is running on a
   // single node.
   auto horovod_hierarchical_allreduce =
@@ -493,6 +831,32 @@ void BackgroundThreadLoop(HorovodGlobalState& state) {
   state.parameter_manager.SetHierarchicalAllreduce(false, true);
 #endif
 
+  // Set flag for allreducing CPU tensors within a node through shared memory.
+  // CPU tensors have no other hierarchical allreduce, so this follows
+  // HOROVOD_HIERARCHICAL_ALLREDUCE unless set explicitly. Ignore if there is
+  // only one rank per node.
+  bool shm_allreduce = false;
+  if (horovod_hierarchical_allreduce != nullptr) {
+    shm_allreduce = std::strtol(horovod_hierarchical_allreduce, nullptr, 10) > 0;
+  }
+  shm_allreduce = GetBoolEnvOrDefault(HOROVOD_SHM_ALLREDUCE, shm_allreduce);
+  if (shm_allreduce && local_size > 1 &&
+      state.cpu_operation != LibType::CCL) {
+    // Gloo ops take precedence over MPI ops, see CreateOperationManager.
+    bool use_gloo = false;
+#if HAVE_GLOO
+    use_gloo = gloo_context.IsEnabled();
+    if (use_gloo) {
+      shm_context.InitializeFromGloo(gloo_context, local_rank, local_size);
+    }
+#endif
+#if HAVE_MPI
+    if (!use_gloo && mpi_context.IsEnabled()) {
+      shm_context.InitializeFromMPI(mpi_context, local_rank, local_size);
+    }
+#endif
+  }
+
   // Issue warning if hierarchical allreduce is enabled in heterogeneous cluster
   if (is_coordinator &&
       (state.parameter_manager.HierarchicalAllreduce() ||
@@ -517,6 +881,13 @@ void BackgroundThreadLoop(HorovodGlobalState& state) {
   // Check if group fusion should be disabled
   SetBoolFromEnv(HOROVOD_DISABLE_GROUP_FUSION, state.disable_group_fusion, true);
 
+  // Set the size above which allreduced tensors are partitioned.
+  auto horovod_tensor_partition_size = std::getenv(HOROVOD_TENSOR_PARTITION_SIZE);
+  if (horovod_tensor_partition_size != nullptr) {
+    state.tensor_partition_size =
+        std::strtoll(horovod_tensor_partition_size, nullptr, 10);
+  }
+
   // Enable auto-tuning.
   auto horovod_autotune = std::getenv(HOROVOD_AUTOTUNE);
   if (horovod_autotune != nullptr &&
@@ -537,6 +908,8 @@ void BackgroundThreadLoop(HorovodGlobalState& state) {
 
   op_manager.reset(CreateOperationManager(state));
 
+  InitializeProcessSets(state);
+
   // Signal that initialization is completed.
   state.initialization_done = true;
   LOG(INFO, horovod_global.controller->GetRank()) << "Horovod Initialized";
@@ -548,20 +921,27 @@ void BackgroundThreadLoop(HorovodGlobalState& state) {
     LOG(ERROR) << "Horovod background loop uncaught exception: " << ex.what();
   }
 
+  // Signal that shutdown has been requested.
+  state.shut_down = true;
+
+  // Stop the process sets before the contexts their collectives use are
+  // finalized.
+  FinalizeProcessSets(state);
+
     // Finalize all contexts
 #if HAVE_NCCL
   nccl_context.ShutDown();
 #endif
 
+  shm_context.Finalize();
+  FinalizeCPUKernels();
+
 #if HAVE_GLOO
   gloo_context.Finalize();
 #endif
 
   LOG(DEBUG, horovod_global.controller->GetRank()) << "Shutting down background thread";
 
-  // Signal that shutdown has been requested.
-  state.shut_down = true;
-
   // Notify all outstanding operations that Horovod has been shut down
   // and finalize tensor queue.
   std::vector<StatusCallback> callbacks;
@@ -698,6 +1078,113 @@ void InitializeHorovodOnce(const int* ranks, int nranks) {
   LOG(DEBUG) << "Background thread init done";
 }
 
+// A contiguous range of elements of another tensor, sharing its memory.
+class TensorSlice : public Tensor {
+public:
+  TensorSlice(std::shared_ptr<Tensor> tensor, int64_t offset,
+              int64_t num_elements)
+      : tensor_(std::move(tensor)), offset_(offset) {
+    shape_.AddDim(num_elements);
+  }
+
+  const DataType dtype() const override { return tensor_->dtype(); }
+
+  const TensorShape shape() const override { return shape_; }
+
+  const void* data() const override {
+    return static_cast<const uint8_t*>(tensor_->data()) +
+           offset_ * DataType_Size(tensor_->dtype());
+  }
+
+  int64_t size() const override {
+    return shape_.num_elements() * DataType_Size(tensor_->dtype());
+  }
+
+private:
+  std::shared_ptr<Tensor> tensor_;
+  int64_t offset_;
+  TensorShape shape_;
+};
+
+// Split tensors larger than partition_size bytes into partitions that are
+// enqueued as separate allreduces, so that they can be negotiated and fused
+// independently instead of holding up other tensors behind a single large
+// collective. The callback of a partitioned tensor is called once all of its
+// partitions are done.
+void PartitionTensors(std::vector<std::shared_ptr<OpContext>>& contexts,
+                      std::vector<std::shared_ptr<Tensor>>& tensors,
+                      std::vector<std::shared_ptr<Tensor>>& outputs,
+                      std::vector<std::shared_ptr<ReadyEvent>>& ready_events,
+                      std::vector<std::string>& names,
+                      std::vector<StatusCallback>& callbacks,
+                      int64_t partition_size) {
+  std::vector<std::shared_ptr<OpContext>> new_contexts;
+  std::vector<std::shared_ptr<Tensor>> new_tensors;
+  std::vector<std::shared_ptr<Tensor>> new_outputs;
+  std::vector<std::shared_ptr<ReadyEvent>> new_ready_events;
+  std::vector<std::string> new_names;
+  std::vector<StatusCallback> new_callbacks;
+
+  for (size_t n = 0; n < tensors.size(); ++n) {
+    if (tensors[n]->size() <= partition_size) {
+      new_contexts.push_back(std::move(contexts[n]));
+      new_tensors.push_back(std::move(tensors[n]));
+      new_outputs.push_back(std::move(outputs[n]));
+      new_ready_events.push_back(std::move(ready_events[n]));
+      new_names.push_back(std::move(names[n]));
+      new_callbacks.push_back(std::move(callbacks[n]));
+      continue;
+    }
+
+    auto num_elements = tensors[n]->shape().num_elements();
+    auto partition_elements = std::max(
+        partition_size / (int64_t)DataType_Size(tensors[n]->dtype()), (int64_t)1);
+    auto num_partitions =
+        (num_elements + partition_elements - 1) / partition_elements;
+
+    auto callback_mutex = std::make_shared<std::mutex>();
+    auto callback_count = std::make_shared<int64_t>(0);
+    auto callback_status = std::make_shared<Status>();
+    auto callback = std::move(callbacks[n]);
+    for (int64_t i = 0; i < num_partitions; ++i) {
+      auto offset = i * partition_elements;
+      auto length = std::min(partition_elements, num_elements - offset);
+      auto tensor = std::make_shared<TensorSlice>(tensors[n], offset, length);
+      new_contexts.push_back(contexts[n]);
+      new_tensors.push_back(tensor);
+      if (tensors[n] == outputs[n]) {
+        new_outputs.push_back(tensor);
+      } else {
+        new_outputs.push_back(
+            std::make_shared<TensorSlice>(outputs[n], offset, length));
+      }
+      new_ready_events.push_back(ready_events[n]);
+      new_names.push_back(names[n] + "_part_" + std::to_string(i + 1) + "of" +
+                          std::to_string(num_partitions));
+      new_callbacks.push_back(
+          [callback, callback_mutex, callback_count, callback_status,
+           num_partitions](const Status& status) mutable {
+            std::lock_guard<std::mutex> guard(*callback_mutex);
+            if (!status.ok() && callback_status->ok()) {
+              *callback_status = status;
+            }
+            (*callback_count)++;
+            // Only call the original callback once the last partition is done.
+            if (*callback_count == num_partitions) {
+              callback(*callback_status);
+            }
+          });
+    }
+  }
+
+  contexts = std::move(new_contexts);
+  tensors = std::move(new_tensors);
+  outputs = std::move(new_outputs);
+  ready_events = std::move(new_ready_events);
+  names = std::move(new_names);
+  callbacks = std::move(new_callbacks);
+}
+
 } // namespace
 
 Status CheckInitialized() {
@@ -726,6 +1213,9 @@ void horovod_shutdown() {
     horovod_global.shut_down = true;
     horovod_global.background_thread.join();
 
+    // Process sets have to be registered again before restarting.
+    horovod_global.process_set_table.Clear();
+
     // Reset the initialization flag to allow restarting with horovod_init(...)
     horovod_global.initialize_flag.clear();
     horovod_global.shut_down = false;
@@ -733,6 +1223,48 @@ void horovod_shutdown() {
   }
 }
 
+int horovod_add_process_set(const int* ranks, int nranks) {
+  if (horovod_global.initialization_done) {
+    return -1;
+  }
+  return horovod_global.process_set_table.RegisterProcessSet(
+      std::vector<int>(ranks, ranks + nranks));
+}
+
+int horovod_process_set_rank(int process_set_id) {
+  if (!horovod_global.initialization_done) {
+    return -1;
+  }
+  if (process_set_id == GLOBAL_PROCESS_SET_ID) {
+    return horovod_global.controller->GetRank();
+  }
+  if (!horovod_global.process_set_table.Contains(process_set_id)) {
+    return -1;
+  }
+  auto& ranks = horovod_global.process_set_table.Get(process_set_id)
+                    .registered_global_ranks;
+  auto it = std::lower_bound(ranks.begin(), ranks.end(),
+                             horovod_global.controller->GetRank());
+  if (it == ranks.end() || *it != horovod_global.controller->GetRank()) {
+    return -1;
+  }
+  return (int)(it - ranks.begin());
+}
+
+int horovod_process_set_size(int process_set_id) {
+  if (!horovod_global.initialization_done) {
+    return -1;
+  }
+  if (process_set_id == GLOBAL_PROCESS_SET_ID) {
+    return horovod_global.controller->GetSize();
+  }
+  if (!horovod_global.process_set_table.Contains(process_set_id)) {
+    return -1;
+  }
+  return (int)horovod_global.process_set_table.Get(process_set_id)
+      .registered_global_ranks.size();
+}
+
 bool horovod_is_initialized() {
   return horovod_global.initialization_done;
 }
@@ -921,7 +1453,9 @@ Status EnqueueTensorAllreduce(std::shared_ptr<OpContext> context,
                               StatusCallback callback,
                               ReduceOp reduce_op,
                               double prescale_factor,
-                              double postscale_factor) {
+                              double postscale_factor,
+                              int32_t priority,
+                              int32_t process_set_id) {
   // Wrap inputs in std::vector and pass onto multi tensor implementation
   std::vector<std::shared_ptr<OpContext>> contexts;
   std::vector<std::shared_ptr<Tensor>> tensors;
@@ -939,7 +1473,8 @@ Status EnqueueTensorAllreduce(std::shared_ptr<OpContext> context,
 
   return EnqueueTensorAllreduces(contexts, tensors, outputs, ready_events,
                                  names, device, callbacks, reduce_op,
-                                 prescale_factor, postscale_factor);
+                                 prescale_factor, postscale_factor, priority,
+                                 process_set_id);
 }
 
 Status EnqueueTensorAllreduces(std::vector<std::shared_ptr<OpContext>>& contexts,
@@ -951,13 +1486,19 @@ Status EnqueueTensorAllreduces(std::vector<std::shared_ptr<OpContext>>& contexts
                                std::vector<StatusCallback>& callbacks,
                                ReduceOp reduce_op,
                                double prescale_factor,
-                               double postscale_factor) {
-  Status status;
+                               double postscale_factor,
+                               int32_t priority,
+                               int32_t process_set_id) {
+  Status status = CheckProcessSet(process_set_id, device);
+  if (!status.ok()) {
+    return status;
+  }
+  auto& controller = GetProcessSetController(process_set_id);
 
   if (reduce_op == ReduceOp::AVERAGE) {
 #if !HAVE_ROCM
     // Averaging happens via postscale_factor
-    postscale_factor /= horovod_global.controller->GetSize();
+    postscale_factor /= controller.GetSize();
 #else
     LOG(ERROR, horovod_global.controller->GetRank()) << "Enqueuing AVERAGE allreduce is not allowed.";
     return status.Aborted("AVERAGE not allowed.");
@@ -966,11 +1507,22 @@ Status EnqueueTensorAllreduces(std::vector<std::shared_ptr<OpContext>>& contexts
 #if HAVE_NCCL && !HAVE_ROCM
     if (device != CPU_DEVICE_ID) {
       // Averaging by local size happens via postscale_factor
-      postscale_factor /= horovod_global.controller->GetLocalSize();
+      postscale_factor /= controller.GetLocalSize();
     }
 #endif
   }
 
+  // Only create groups larger than 1 tensor, unless disable_group_fusion is requested.
+  // In that case, even single tensor groups are created to enforce disabling fusion.
+  bool register_group = tensors.size() > 1 || horovod_global.disable_group_fusion;
+
+  // Adasum reduces whole tensors, so they cannot be partitioned.
+  if (horovod_global.tensor_partition_size > 0 &&
+      reduce_op != ReduceOp::ADASUM) {
+    PartitionTensors(contexts, tensors, outputs, ready_events, names,
+                     callbacks, horovod_global.tensor_partition_size);
+  }
+
   std::vector<Request> messages;
   std::vector<TensorTableEntry> entries;
   messages.reserve(tensors.size());
@@ -978,12 +1530,13 @@ Status EnqueueTensorAllreduces(std::vector<std::shared_ptr<OpContext>>& contexts
 
   for (int n = 0; n < tensors.size(); ++n) {
     Request message;
-    message.set_request_rank(horovod_global.controller->GetRank());
+    message.set_request_rank(controller.GetRank());
     message.set_tensor_name(names[n]);
     message.set_tensor_type(tensors[n]->dtype());
     message.set_device(device);
     message.set_prescale_factor(prescale_factor);
     message.set_postscale_factor(postscale_factor);
+    message.set_priority(priority);
 
     if (reduce_op == ReduceOp::ADASUM) {
       message.set_request_type(Request::ADASUM);
@@ -1008,6 +1561,7 @@ Status EnqueueTensorAllreduces(std::vector<std::shared_ptr<OpContext>>& contexts
     e.ready_event = std::move(ready_events[n]);
     e.device = device;
     e.callback = std::move(callbacks[n]);
+    e.process_set_id = process_set_id;
 
     entries.push_back(std::move(e));
 
@@ -1019,10 +1573,9 @@ Status EnqueueTensorAllreduces(std::vector<std::shared_ptr<OpContext>>& contexts
   }
   LOG(TRACE, horovod_global.controller->GetRank()) << "Enqueued " << tensors_enqueued;
 
-  // Only create groups larger than 1 tensor, unless disable_group_fusion is requested.
-  // In that case, even single tensor groups are created to enforce disabling fusion.
-  if (tensors.size() > 1 || horovod_global.disable_group_fusion) {
-    auto group_id = horovod_global.group_table.RegisterGroup(std::move(names));
+  if (register_group) {
+    auto group_id =
+        GetProcessSetGroupTable(process_set_id).RegisterGroup(std::move(names));
     for (auto& message : messages) {
       message.set_group_id(group_id);
     }
@@ -1031,7 +1584,8 @@ Status EnqueueTensorAllreduces(std::vector<std::shared_ptr<OpContext>>& contexts
   if (horovod_global.shut_down) {
     return SHUT_DOWN_ERROR;
   }
-  status = horovod_global.tensor_queue.AddToTensorQueueMulti(entries, messages);
+  status = GetProcessSetTensorQueue(process_set_id)
+               .AddToTensorQueueMulti(entries, messages);
 
   return status;
 }
@@ -1042,9 +1596,15 @@ Status EnqueueTensorAllgather(std::shared_ptr<OpContext> context,
                               std::shared_ptr<Tensor> tensor,
                               std::shared_ptr<ReadyEvent> ready_event,
                               const std::string name, const int device,
-                              StatusCallback callback) {
+                              StatusCallback callback,
+                              int32_t process_set_id) {
+  Status status = CheckProcessSet(process_set_id, device);
+  if (!status.ok()) {
+    return status;
+  }
+
   Request message;
-  message.set_request_rank(horovod_global.controller->GetRank());
+  message.set_request_rank(GetProcessSetController(process_set_id).GetRank());
   message.set_tensor_name(name);
   message.set_tensor_type(tensor->dtype());
   message.set_device(device);
@@ -1060,11 +1620,12 @@ Status EnqueueTensorAllgather(std::shared_ptr<OpContext> context,
   e.ready_event = ready_event;
   e.device = device;
   e.callback = callback;
+  e.process_set_id = process_set_id;
 
   if (horovod_global.shut_down) {
     return SHUT_DOWN_ERROR;
   }
-  Status status = horovod_global.tensor_queue.AddToTensorQueue(e, message);
+  status = GetProcessSetTensorQueue(process_set_id).AddToTensorQueue(e, message);
   if (status.ok()) {
     LOG(TRACE, horovod_global.controller->GetRank()) << "Enqueued " << name;
   }
@@ -1078,36 +1639,102 @@ Status EnqueueTensorBroadcast(std::shared_ptr<OpContext> context,
                               std::shared_ptr<Tensor> output, int root_rank,
                               std::shared_ptr<ReadyEvent> ready_event,
                               const std::string name, const int device,
-                              StatusCallback callback) {
-  Request message;
-  message.set_request_rank(horovod_global.controller->GetRank());
-  message.set_tensor_name(name);
-  message.set_tensor_type(tensor->dtype());
-  message.set_root_rank(root_rank);
-  message.set_device(device);
-  message.set_request_type(Request::BROADCAST);
-  for (int i = 0; i < tensor->shape().dims(); ++i) {
-    message.add_tensor_shape((int64_t)tensor->shape().dim_size(i));
+                              StatusCallback callback,
+                              int32_t process_set_id) {
+  // Wrap inputs in std::vector and pass onto multi tensor implementation
+  std::vector<std::shared_ptr<OpContext>> contexts;
+  std::vector<std::shared_ptr<Tensor>> tensors;
+  std::vector<std::shared_ptr<Tensor>> outputs;
+  std::vector<std::shared_ptr<ReadyEvent>> ready_events;
+  std::vector<std::string> names;
+  std::vector<StatusCallback> callbacks;
+
+  contexts.emplace_back(std::move(context));
+  tensors.emplace_back(std::move(tensor));
+  outputs.emplace_back(std::move(output));
+  ready_events.emplace_back(std::move(ready_event));
+  names.emplace_back(std::move(name));
+  callbacks.emplace_back(std::move(callback));
+
+  return EnqueueTensorBroadcasts(contexts, tensors, outputs, root_rank,
+                                 ready_events, names, device, callbacks,
+                                 process_set_id);
+}
+
+Status EnqueueTensorBroadcasts(std::vector<std::shared_ptr<OpContext>>& contexts,
+                               std::vector<std::shared_ptr<Tensor>>& tensors,
+                               std::vector<std::shared_ptr<Tensor>>& outputs,
+                               int root_rank,
+                               std::vector<std::shared_ptr<ReadyEvent>>& ready_events,
+                               std::vector<std::string>& names,
+                               const int device,
+                               std::vector<StatusCallback>& callbacks,
+                               int32_t process_set_id) {
+  Status status = CheckProcessSet(process_set_id, device);
+  if (!status.ok()) {
+    return status;
   }
+  auto& controller = GetProcessSetController(process_set_id);
 
-  TensorTableEntry e;
-  e.tensor_name = name;
-  e.context = context;
-  e.tensor = tensor;
-  e.output = output;
-  e.root_rank = root_rank;
-  e.ready_event = ready_event;
-  e.device = device;
-  e.callback = callback;
+  // Only create groups larger than 1 tensor, unless disable_group_fusion is requested.
+  // In that case, even single tensor groups are created to enforce disabling fusion.
+  bool register_group = tensors.size() > 1 || horovod_global.disable_group_fusion;
+
+  std::vector<Request> messages;
+  std::vector<TensorTableEntry> entries;
+  messages.reserve(tensors.size());
+  entries.reserve(tensors.size());
+
+  for (int n = 0; n < tensors.size(); ++n) {
+    Request message;
+    message.set_request_rank(controller.GetRank());
+    message.set_tensor_name(names[n]);
+    message.set_tensor_type(tensors[n]->dtype());
+    message.set_root_rank(root_rank);
+    message.set_device(device);
+    message.set_request_type(Request::BROADCAST);
+    message.set_tensor_shape(tensors[n]->shape().to_vector());
+    messages.push_back(std::move(message));
+
+    TensorTableEntry e;
+    e.tensor_name = names[n];
+    e.context = std::move(contexts[n]);
+    // input and output can be the same, only move when safe
+    if (tensors[n] != outputs[n]) {
+      e.tensor = std::move(tensors[n]);
+      e.output = std::move(outputs[n]);
+    } else {
+      e.tensor = tensors[n];
+      e.output = outputs[n];
+    }
+    e.root_rank = root_rank;
+    e.ready_event = std::move(ready_events[n]);
+    e.device = device;
+    e.callback = std::move(callbacks[n]);
+    e.process_set_id = process_set_id;
+
+    entries.push_back(std::move(e));
+  }
+
+  std::string tensors_enqueued;
+  for (const auto& n : names) {
+    tensors_enqueued += n + "; ";
+  }
+  LOG(TRACE, horovod_global.controller->GetRank()) << "Enqueued " << tensors_enqueued;
+
+  if (register_group) {
+    auto group_id =
+        GetProcessSetGroupTable(process_set_id).RegisterGroup(std::move(names));
+    for (auto& message : messages) {
+      message.set_group_id(group_id);
+    }
+  }
 
   if (horovod_global.shut_down) {
     return SHUT_DOWN_ERROR;
   }
-  Status status = horovod_global.tensor_queue.AddToTensorQueue(e, message);
-  if (status.ok()) {
-    LOG(TRACE, horovod_global.controller->GetRank()) << "Enqueued " << name;
-  }
-  return status;
+  return GetProcessSetTensorQueue(process_set_id)
+      .AddToTensorQueueMulti(entries, messages);
 }
 
 // Contexts and controller must be initialized and the background thread
@@ -1117,7 +1744,14 @@ Status EnqueueTensorAlltoall(std::shared_ptr<OpContext> context,
                              std::shared_ptr<Tensor> splits,
                              std::shared_ptr<ReadyEvent> ready_event,
                              const std::string name, const int device,
-                             StatusCallback callback) {
+                             StatusCallback callback,
+                             int32_t process_set_id) {
+  Status status = CheckProcessSet(process_set_id, device);
+  if (!status.ok()) {
+    return status;
+  }
+  auto& controller = GetProcessSetController(process_set_id);
+
   // Check arguments
   if (splits->shape().dims() > 1) {
     return Status::InvalidArgument("alltoall expects a 1D splits tensor");
@@ -1127,7 +1761,7 @@ Status EnqueueTensorAlltoall(std::shared_ptr<OpContext> context,
   }
 
   Request message;
-  message.set_request_rank(horovod_global.controller->GetRank());
+  message.set_request_rank(controller.GetRank());
   message.set_tensor_name(name);
   message.set_tensor_type(tensor->dtype());
   message.set_device(device);
@@ -1143,10 +1777,11 @@ Status EnqueueTensorAlltoall(std::shared_ptr<OpContext> context,
   e.ready_event = ready_event;
   e.device = device;
   e.callback = callback;
+  e.process_set_id = process_set_id;
 
   int64_t splits_first_dim = splits->shape().dim_size(0);
   int64_t tensor_first_dim = tensor->shape().dim_size(0);
-  int world_size = horovod_global.controller->GetSize();
+  int world_size = controller.GetSize();
   if (splits_first_dim == world_size) {
     auto splits_data = static_cast<const int32_t*>(splits->data());
     auto sum = std::accumulate(splits_data, splits_data + splits_first_dim, 0);
@@ -1168,7 +1803,68 @@ Status EnqueueTensorAlltoall(std::shared_ptr<OpContext> context,
   if (horovod_global.shut_down) {
     return SHUT_DOWN_ERROR;
   }
-  Status status = horovod_global.tensor_queue.AddToTensorQueue(e, message);
+  status = GetProcessSetTensorQueue(process_set_id).AddToTensorQueue(e, message);
+  if (status.ok()) {
+    LOG(TRACE, horovod_global.controller->GetRank()) << "Enqueued " << name;
+  }
+  return status;
+}
+
+// Contexts and controller must be initialized and the background thread
+// must be running before this function is called.
+Status EnqueueTensorReducescatter(std::shared_ptr<OpContext> context,
+                                  std::shared_ptr<Tensor> tensor,
+                                  std::shared_ptr<ReadyEvent> ready_event,
+                                  const std::string name, const int device,
+                                  StatusCallback callback,
+                                  ReduceOp reduce_op,
+                                  double prescale_factor,
+                                  double postscale_factor,
+                                  int32_t process_set_id) {
+  Status status = CheckProcessSet(process_set_id, device);
+  if (!status.ok()) {
+    return status;
+  }
+  auto& controller = GetProcessSetController(process_set_id);
+
+  // Check arguments
+  if (device != CPU_DEVICE_ID) {
+    return Status::InvalidArgument(
+        "reducescatter is only supported for tensors on the CPU.");
+  }
+  if (reduce_op == ReduceOp::AVERAGE) {
+    // Averaging happens via postscale_factor
+    postscale_factor /= controller.GetSize();
+  } else if (reduce_op != ReduceOp::SUM) {
+    return Status::InvalidArgument(
+        "reducescatter only supports the Sum and Average reduce ops.");
+  }
+
+  Request message;
+  message.set_request_rank(controller.GetRank());
+  message.set_tensor_name(name);
+  message.set_tensor_type(tensor->dtype());
+  message.set_device(device);
+  message.set_prescale_factor(prescale_factor);
+  message.set_postscale_factor(postscale_factor);
+  message.set_request_type(Request::REDUCESCATTER);
+  for (int i = 0; i < tensor->shape().dims(); ++i) {
+    message.add_tensor_shape((int64_t)tensor->shape().dim_size(i));
+  }
+
+  TensorTableEntry e;
+  e.tensor_name = name;
+  e.context = context;
+  e.tensor = tensor;
+  e.ready_event = ready_event;
+  e.device = device;
+  e.callback = callback;
+  e.process_set_id = process_set_id;
+
+  if (horovod_global.shut_down) {
+    return SHUT_DOWN_ERROR;
+  }
+  status = GetProcessSetTensorQueue(process_set_id).AddToTensorQueue(e, message);
   if (status.ok()) {
     LOG(TRACE, horovod_global.controller->GetRank()) << "Enqueued " << name;
   }
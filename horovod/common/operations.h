@@ -52,6 +52,21 @@ void horovod_init_comm(MPI_Comm comm);
 // C interface to shut down Horovod.
 void horovod_shutdown();
 
+// C interface to register a process set over the given ranks of the global
+// communicator. Must be called with the same ranks in the same order on all
+// processes before Horovod is initialized. Returns the id of the process set,
+// or -1 if Horovod is already initialized.
+int horovod_add_process_set(const int* ranks, int nranks);
+
+// C interface to get index of current Horovod process in the process set.
+// Returns -1 if Horovod is not initialized or the current process is not a
+// member of the process set.
+int horovod_process_set_rank(int process_set_id);
+
+// C interface to return number of Horovod processes in the process set.
+// Returns -1 if Horovod is not initialized or the process set does not exist.
+int horovod_process_set_size(int process_set_id);
+
 // C interface to get index of current Horovod process.
 // Returns -1 if Horovod is not initialized.
 int horovod_rank();
@@ -119,7 +134,9 @@ Status EnqueueTensorAllreduce(std::shared_ptr<OpContext> context,
                               StatusCallback callback,
                               ReduceOp reduce_op = ReduceOp::SUM,
                               double prescale_factor = 1.0,
-                              double postscale_factor = 1.0);
+                              double postscale_factor = 1.0,
+                              int32_t priority = 0,
+                              int32_t process_set_id = 0);
 
 Status EnqueueTensorAllreduces(std::vector<std::shared_ptr<OpContext>>& contexts,
                                std::vector<std::shared_ptr<Tensor>>& tensors,
@@ -130,27 +147,52 @@ Status EnqueueTensorAllreduces(std::vector<std::shared_ptr<OpContext>>& contexts
                                std::vector<StatusCallback>& callbacks,
                                ReduceOp reduce_op = ReduceOp::SUM,
                                double prescale_factor = 1.0,
-                               double postscale_factor = 1.0);
+                               double postscale_factor = 1.0,
+                               int32_t priority = 0,
+                               int32_t process_set_id = 0);
 
 Status EnqueueTensorAllgather(std::shared_ptr<OpContext> context,
                               std::shared_ptr<Tensor> tensor,
                               std::shared_ptr<ReadyEvent> ready_event,
                               const std::string name, const int device,
-                              StatusCallback callback);
+                              StatusCallback callback,
+                              int32_t process_set_id = 0);
 
 Status EnqueueTensorBroadcast(std::shared_ptr<OpContext> context,
                               std::shared_ptr<Tensor> tensor,
                               std::shared_ptr<Tensor> output, int root_rank,
                               std::shared_ptr<ReadyEvent> ready_event,
                               const std::string name, const int device,
-                              StatusCallback callback);
+                              StatusCallback callback,
+                              int32_t process_set_id = 0);
+
+Status EnqueueTensorBroadcasts(std::vector<std::shared_ptr<OpContext>>& contexts,
+                               std::vector<std::shared_ptr<Tensor>>& tensors,
+                               std::vector<std::shared_ptr<Tensor>>& outputs,
+                               int root_rank,
+                               std::vector<std::shared_ptr<ReadyEvent>>& ready_events,
+                               std::vector<std::string>& names,
+                               const int device,
+                               std::vector<StatusCallback>& callbacks,
+                               int32_t process_set_id = 0);
 
 Status EnqueueTensorAlltoall(std::shared_ptr<OpContext> context,
                              std::shared_ptr<Tensor> tensor,
                              std::shared_ptr<Tensor> splits,
                              std::shared_ptr<ReadyEvent> ready_event,
                              const std::string name, const int device,
-                             StatusCallback callback);
+                             StatusCallback callback,
+                             int32_t process_set_id = 0);
+
+Status EnqueueTensorReducescatter(std::shared_ptr<OpContext> context,
+                                  std::shared_ptr<Tensor> tensor,
+                                  std::shared_ptr<ReadyEvent> ready_event,
+                                  const std::string name, const int device,
+                                  StatusCallback callback,
+                                  ReduceOp reduce_op = ReduceOp::SUM,
+                                  double prescale_factor = 1.0,
+                                  double postscale_factor = 1.0,
+                                  int32_t process_set_id = 0);
 
 Status EnqueueJoin(std::shared_ptr<OpContext> context,
                               std::shared_ptr<ReadyEvent> ready_event,
@@ -18,6 +18,7 @@
 
 #include <cstring>
 #include <float.h>
+#include <vector>
 
 #if __AVX__ && __F16C__ && __FMA__
 #include <emmintrin.h>
@@ -25,6 +26,7 @@
 #endif
 
 #include "../../common.h"
+#include "../../cpu_kernels.h"
 #include "../../global_state.h"
 
 namespace horovod {
@@ -98,12 +100,54 @@ protected:
     }
   }
 
+  // Splits the vectors across the CPU kernel threads. The partial sums of the
+  // chunks are added in order, so results only depend on the thread count.
   virtual void DispatchComputeDotAndNormSqrds(const void* __restrict__ a,
                                               const void* __restrict__ b,
                                               DataType horovod_datatype,
                                               int count, double& dotProduct,
                                               double& anormsq, double& bnormsq,
                                               int layerid) {
+    int64_t element_size = DataType_Size(horovod_datatype);
+    int chunks = ParallelChunks(count, element_size);
+    std::vector<double> partials(3 * chunks, 0.);
+    ParallelFor(count, element_size,
+                [&](int chunk, int64_t begin, int64_t end) {
+                  ComputeDotAndNormSqrdsRange(
+                      (const uint8_t*)a + begin * element_size,
+                      (const uint8_t*)b + begin * element_size,
+                      horovod_datatype, (int)(end - begin),
+                      partials[3 * chunk], partials[3 * chunk + 1],
+                      partials[3 * chunk + 2], layerid);
+                });
+    dotProduct = 0.;
+    anormsq = 0.;
+    bnormsq = 0.;
+    for (int chunk = 0; chunk < chunks; ++chunk) {
+      dotProduct += partials[3 * chunk];
+      anormsq += partials[3 * chunk + 1];
+      bnormsq += partials[3 * chunk + 2];
+    }
+  }
+
+  virtual void DispatchScaledAdd(DataType horovod_datatype, int count,
+                                 double acoeff, void* __restrict__ a,
+                                 double bcoeff, void* __restrict__ b,
+                                 int layerid) {
+    int64_t element_size = DataType_Size(horovod_datatype);
+    ParallelFor(count, element_size,
+                [&](int chunk, int64_t begin, int64_t end) {
+                  ScaledAddRange(horovod_datatype, (int)(end - begin), acoeff,
+                                 (uint8_t*)a + begin * element_size, bcoeff,
+                                 (uint8_t*)b + begin * element_size, layerid);
+                });
+  }
+
+  void ComputeDotAndNormSqrdsRange(const void* __restrict__ a,
+                                   const void* __restrict__ b,
+                                   DataType horovod_datatype, int count,
+                                   double& dotProduct, double& anormsq,
+                                   double& bnormsq, int layerid) {
 #if __AVX__ && __F16C__ && __FMA__
     if (horovod_datatype == DataType::HOROVOD_FLOAT16) {
       ComputeDotAndNormSqrdsfp16((uint16_t*)a, (uint16_t*)b, count, dotProduct,
@@ -121,10 +165,9 @@ protected:
     }
   }
 
-  virtual void DispatchScaledAdd(DataType horovod_datatype, int count,
-                                 double acoeff, void* __restrict__ a,
-                                 double bcoeff, void* __restrict__ b,
-                                 int layerid) {
+  void ScaledAddRange(DataType horovod_datatype, int count, double acoeff,
+                      void* __restrict__ a, double bcoeff,
+                      void* __restrict__ b, int layerid) {
 #if __AVX__ && __F16C__ && __FMA__
     if (horovod_datatype == DataType::HOROVOD_FLOAT16) {
       ScaledAddfp16(count, acoeff, (uint16_t*)a, bcoeff, (uint16_t*)b, layerid);
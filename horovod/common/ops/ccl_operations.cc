@@ -379,7 +379,7 @@ Status CCLAllgather::Execute(std::vector<TensorTableEntry>& entries,
   status = AllocateOutput(entries, response, entry_component_sizes, recvcounts);
   if (status.ok()) {
     timeline.ActivityEndAll(entries);
-    SetDisplacements(recvcounts, displcmnts);
+    SetDisplacements(entries, recvcounts, displcmnts);
     SetEntryComponentOffsets(entries, entry_component_sizes, recvcounts,
                              entry_component_offsets);
 
@@ -448,27 +448,35 @@ Status CCLAllgather::Execute(std::vector<TensorTableEntry>& entries,
 
 Status CCLBroadcast::Execute(std::vector<TensorTableEntry>& entries,
                              const Response& response) {
-  assert(entries.size() == 1);
   auto& e = entries[0];
   LOG(DEBUG) << "CCLBroadcast::Execute #entries: " << entries.size()
              << " device " << e.device;
   auto& c4h = this->ccl_context_->opctxt_->GetCCL4HVD(e, global_state_);
 
-  global_state_->timeline.ActivityStartAll(entries, CCL_BCAST);
-
   // shortcut for single rank
   if (global_state_->controller->GetSize() > 1) {
     // On root rank, CCL_Bcast sends data, on other ranks it receives data.
     const bool amroot = global_state_->controller->GetRank() == e.root_rank;
     size_t size = e.tensor->size();
     void* data_ptr = const_cast<void*>((amroot ? e.tensor : e.output)->data());
+    if (entries.size() > 1) {
+      global_state_->timeline.ActivityStartAll(entries, MEMCPY_IN_FUSION_BUFFER);
+      MemcpyInFusionBuffer(entries, amroot, data_ptr, size);
+      global_state_->timeline.ActivityEndAll(entries);
+    }
 
+    global_state_->timeline.ActivityStartAll(entries, CCL_BCAST);
     ccl::broadcast(data_ptr, size, ccl::datatype::int8, e.root_rank, c4h.comm_,
                    c4h.stream_)
         .wait();
-  }
+    global_state_->timeline.ActivityEndAll(entries);
 
-  global_state_->timeline.ActivityEndAll(entries);
+    if (entries.size() > 1 && !amroot) {
+      global_state_->timeline.ActivityStartAll(entries, MEMCPY_OUT_FUSION_BUFFER);
+      MemcpyOutFusionBuffer(data_ptr, entries);
+      global_state_->timeline.ActivityEndAll(entries);
+    }
+  }
   LOG(DEBUG) << "CCLBroadcast::Execute done";
 
   return Status::OK();
@@ -16,6 +16,9 @@
 // =============================================================================
 
 #include "collective_operations.h"
+
+#include <algorithm>
+
 #include "../message.h"
 
 namespace horovod {
@@ -32,6 +35,20 @@ int64_t HorovodOp::NumElements(std::vector<TensorTableEntry>& entries) {
   return num_elements;
 }
 
+Controller& HorovodOp::GetController(const TensorTableEntry& entry) {
+  if (entry.process_set_id == GLOBAL_PROCESS_SET_ID) {
+    return *global_state_->controller;
+  }
+  return *global_state_->process_set_table.Get(entry.process_set_id).controller;
+}
+
+FusionBufferManager& HorovodOp::GetFusionBuffer(const TensorTableEntry& entry) {
+  if (entry.process_set_id == GLOBAL_PROCESS_SET_ID) {
+    return global_state_->fusion_buffer;
+  }
+  return global_state_->process_set_table.Get(entry.process_set_id).fusion_buffer;
+}
+
 // Allreduce
 AllreduceOp::AllreduceOp(HorovodGlobalState* global_state)
     : HorovodOp(global_state) {}
@@ -41,7 +58,7 @@ void AllreduceOp::MemcpyInFusionBuffer(
     void*& buffer_data, size_t& buffer_len) {
   // Access the fusion buffer.
   auto& first_entry = entries[0];
-  auto buffer = global_state_->fusion_buffer.GetBuffer(
+  auto buffer = GetFusionBuffer(first_entry).GetBuffer(
       first_entry.device, first_entry.context->framework(), global_state_->current_nccl_stream);
   buffer_data = const_cast<void*>(buffer->AccessData(first_entry.context));
 
@@ -86,29 +103,47 @@ void AllreduceOp::ScaleBuffer(
     double scale_factor, const std::vector<TensorTableEntry>& entries,
     const void* fused_input_data, void* buffer_data,
     int64_t num_elements) {
+  ScaleBufferCPU(scale_factor, entries[0].tensor->dtype(), fused_input_data,
+                 buffer_data, num_elements);
+}
 
-  DataType dtype = entries[0].tensor->dtype();
+namespace {
+
+template <typename T, typename TS>
+void ParallelScaleBufferCPU(const T* input, T* output, int64_t num_elements,
+                            TS scale_factor) {
+  ParallelFor(num_elements, sizeof(T),
+              [&](int chunk, int64_t begin, int64_t end) {
+                ScaleBufferCPUImpl(input + begin, output + begin, end - begin,
+                                   scale_factor);
+              });
+}
+
+} // namespace
+
+void ScaleBufferCPU(double scale_factor, DataType dtype, const void* input,
+                    void* output, int64_t num_elements) {
   switch (dtype) {
     case HOROVOD_UINT8:
-      ScaleBufferCPUImpl((const uint8_t*) fused_input_data, (uint8_t*) buffer_data, num_elements, scale_factor);
+      ParallelScaleBufferCPU((const uint8_t*) input, (uint8_t*) output, num_elements, scale_factor);
       break;
     case HOROVOD_INT8:
-      ScaleBufferCPUImpl((const int8_t*) fused_input_data, (int8_t*) buffer_data, num_elements, scale_factor);
+      ParallelScaleBufferCPU((const int8_t*) input, (int8_t*) output, num_elements, scale_factor);
       break;
     case HOROVOD_INT32:
-      ScaleBufferCPUImpl((const int32_t*) fused_input_data, (int32_t*) buffer_data, num_elements, scale_factor);
+      ParallelScaleBufferCPU((const int32_t*) input, (int32_t*) output, num_elements, scale_factor);
       break;
     case HOROVOD_INT64:
-      ScaleBufferCPUImpl((const int64_t*) fused_input_data, (int64_t*) buffer_data, num_elements, scale_factor);
+      ParallelScaleBufferCPU((const int64_t*) input, (int64_t*) output, num_elements, scale_factor);
       break;
     case HOROVOD_FLOAT16:
-      ScaleBufferCPUImpl((const unsigned short*) fused_input_data, (unsigned short*) buffer_data, num_elements, (float) scale_factor);
+      ParallelScaleBufferCPU((const unsigned short*) input, (unsigned short*) output, num_elements, (float) scale_factor);
       break;
     case HOROVOD_FLOAT32:
-      ScaleBufferCPUImpl((const float*) fused_input_data, (float*) buffer_data, num_elements, (float) scale_factor);
+      ParallelScaleBufferCPU((const float*) input, (float*) output, num_elements, (float) scale_factor);
       break;
     case HOROVOD_FLOAT64:
-      ScaleBufferCPUImpl((const double*) fused_input_data, (double*) buffer_data, num_elements, scale_factor);
+      ParallelScaleBufferCPU((const double*) input, (double*) output, num_elements, scale_factor);
       break;
     default:
       throw std::logic_error("Type " + DataType_Name(dtype) +
@@ -124,7 +159,7 @@ Status AllgatherOp::AllocateOutput(std::vector<TensorTableEntry>& entries,
                                    const Response& response,
                                    int64_t**& entry_component_sizes,
                                    int*& recvcounts) {
-  int global_size = global_state_->controller->GetSize();
+  int global_size = GetController(entries[0]).GetSize();
   for (size_t ec = 0; ec < entries.size(); ++ec) {
     auto& e = entries[ec];
     // Every tensor participating in Allgather operation may have different
@@ -168,8 +203,9 @@ Status AllgatherOp::AllocateOutput(std::vector<TensorTableEntry>& entries,
   return Status::OK();
 }
 
-void AllgatherOp::SetDisplacements(const int* recvcounts, int*& displcmnts) {
-  int global_size = global_state_->controller->GetSize();
+void AllgatherOp::SetDisplacements(const std::vector<TensorTableEntry>& entries,
+                                   const int* recvcounts, int*& displcmnts) {
+  int global_size = GetController(entries[0]).GetSize();
   for (int rc = 0; rc < global_size; ++rc) {
     if (rc == 0) {
       displcmnts[rc] = 0;
@@ -184,7 +220,7 @@ void AllgatherOp::SetEntryComponentOffsets(
     const int64_t* const* entry_component_sizes, const int* recvcounts,
     int64_t**& entry_component_offsets) {
   unsigned int rank_displacement = 0;
-  int global_size = global_state_->controller->GetSize();
+  int global_size = GetController(entries[0]).GetSize();
   for (int rc = 0; rc < global_size; ++rc) {
     for (size_t ec = 0; ec < entries.size(); ++ec) {
       if (ec == 0) {
@@ -203,11 +239,11 @@ void AllgatherOp::MemcpyInFusionBuffer(
     int element_size, void*& buffer_data) {
   // Access the fusion buffer.
   auto& first_entry = entries[0];
-  auto buffer = global_state_->fusion_buffer.GetBuffer(
+  auto buffer = GetFusionBuffer(first_entry).GetBuffer(
       first_entry.device, first_entry.context->framework(), global_state_->current_nccl_stream);
   buffer_data = const_cast<void*>(buffer->AccessData(first_entry.context));
 
-  int64_t offset = displcmnts[global_state_->controller->GetRank()] * element_size;
+  int64_t offset = displcmnts[GetController(first_entry).GetRank()] * element_size;
   for (auto& e : entries) {
     void* buffer_data_at_offset = (uint8_t*)buffer_data + offset;
     MemcpyEntryInFusionBuffer(entries, e, buffer_data_at_offset);
@@ -220,7 +256,7 @@ void AllgatherOp::MemcpyOutFusionBuffer(
     const int64_t* const* entry_component_sizes, const void* buffer_data,
     int element_size, std::vector<TensorTableEntry>& entries) {
   // Copy memory out of the fusion buffer.
-  int global_size = global_state_->controller->GetSize();
+  int global_size = GetController(entries[0]).GetSize();
   for (size_t ec = 0; ec < entries.size(); ++ec) {
     auto& e = entries[ec];
     int64_t copy_offset = 0;
@@ -253,9 +289,142 @@ void AllgatherOp::MemcpyEntryOutFusionBuffer(
 BroadcastOp::BroadcastOp(HorovodGlobalState* global_state)
     : HorovodOp(global_state) {}
 
+void BroadcastOp::MemcpyInFusionBuffer(
+    const std::vector<TensorTableEntry>& entries, bool is_root,
+    void*& buffer_data, size_t& buffer_len) {
+  // Access the fusion buffer.
+  auto& first_entry = entries[0];
+  auto buffer = GetFusionBuffer(first_entry).GetBuffer(
+      first_entry.device, first_entry.context->framework(), global_state_->current_nccl_stream);
+  buffer_data = const_cast<void*>(buffer->AccessData(first_entry.context));
+
+  int64_t offset = 0;
+  for (auto& e : entries) {
+    // Only the root rank sends data, other ranks receive into the buffer.
+    if (is_root) {
+      std::memcpy((uint8_t*)buffer_data + offset, e.tensor->data(),
+                  (size_t)e.tensor->size());
+    }
+    offset += e.tensor->size();
+  }
+
+  buffer_len = (size_t)offset;
+}
+
+void BroadcastOp::MemcpyOutFusionBuffer(
+    const void* buffer_data, std::vector<TensorTableEntry>& entries) {
+  int64_t offset = 0;
+  for (auto& e : entries) {
+    std::memcpy((void*)e.output->data(), (const uint8_t*)buffer_data + offset,
+                (size_t)e.output->size());
+    offset += e.output->size();
+  }
+}
+
 AlltoallOp::AlltoallOp(HorovodGlobalState* global_state)
     : HorovodOp(global_state) {}
 
+// Reducescatter
+ReducescatterOp::ReducescatterOp(HorovodGlobalState* global_state)
+    : HorovodOp(global_state) {}
+
+int64_t ReducescatterOp::ShardFirstDim(int64_t dim0, int rank, int size) {
+  return dim0 / size + (rank < dim0 % size ? 1 : 0);
+}
+
+int64_t ReducescatterOp::ShardFirstDimOffset(int64_t dim0, int rank,
+                                             int size) {
+  return rank * (dim0 / size) + std::min<int64_t>(rank, dim0 % size);
+}
+
+Status ReducescatterOp::AllocateOutput(std::vector<TensorTableEntry>& entries,
+                                       int rank, int size) {
+  for (auto& e : entries) {
+    const auto& shape = e.tensor->shape();
+    TensorShape output_shape;
+    output_shape.AddDim(ShardFirstDim(shape.dim_size(0), rank, size));
+    for (int i = 1; i < shape.dims(); ++i) {
+      output_shape.AddDim(shape.dim_size(i));
+    }
+
+    Status status = e.context->AllocateOutput(output_shape, &e.output);
+    if (!status.ok()) {
+      return status;
+    }
+  }
+  return Status::OK();
+}
+
+std::vector<int>
+ReducescatterOp::ComputeRecvcounts(const std::vector<TensorTableEntry>& entries,
+                                   int size) {
+  std::vector<int> recvcounts(size, 0);
+  for (auto& e : entries) {
+    int64_t dim0 = e.tensor->shape().dim_size(0);
+    if (dim0 == 0) {
+      continue;
+    }
+    int64_t slice_num_elements = e.tensor->shape().num_elements() / dim0;
+    for (int rc = 0; rc < size; ++rc) {
+      recvcounts[rc] += (int)(ShardFirstDim(dim0, rc, size) * slice_num_elements);
+    }
+  }
+  return recvcounts;
+}
+
+void ReducescatterOp::MemcpyInFusionBuffer(
+    const std::vector<TensorTableEntry>& entries,
+    const std::vector<int>& rank_order, int size, void*& buffer_data,
+    size_t& buffer_len) {
+  // The fusion buffer is only initialized for fused responses, a single
+  // tensor is packed into a scratch buffer instead.
+  auto& first_entry = entries[0];
+  if (entries.size() > 1) {
+    auto buffer = GetFusionBuffer(first_entry).GetBuffer(
+        first_entry.device, first_entry.context->framework(), global_state_->current_nccl_stream);
+    buffer_data = const_cast<void*>(buffer->AccessData(first_entry.context));
+  } else {
+    scratch_buffer_.resize((size_t)first_entry.tensor->size());
+    buffer_data = scratch_buffer_.data();
+  }
+
+  int64_t offset = 0;
+  for (int rc : rank_order) {
+    for (auto& e : entries) {
+      int64_t dim0 = e.tensor->shape().dim_size(0);
+      if (dim0 == 0) {
+        continue;
+      }
+      int64_t slice_size = e.tensor->size() / dim0;
+      int64_t shard_size = ShardFirstDim(dim0, rc, size) * slice_size;
+      std::memcpy((uint8_t*)buffer_data + offset,
+                  (const uint8_t*)e.tensor->data() +
+                      ShardFirstDimOffset(dim0, rc, size) * slice_size,
+                  (size_t)shard_size);
+      offset += shard_size;
+    }
+  }
+
+  buffer_len = (size_t)offset;
+}
+
+void ReducescatterOp::MemcpyOutFusionBuffer(
+    const void* buffer_data, std::vector<TensorTableEntry>& entries) {
+  int64_t offset = 0;
+  for (auto& e : entries) {
+    std::memcpy((void*)e.output->data(), (const uint8_t*)buffer_data + offset,
+                (size_t)e.output->size());
+    offset += e.output->size();
+  }
+}
+
+void ReducescatterOp::ScaleBuffer(
+    double scale_factor, const std::vector<TensorTableEntry>& entries,
+    const void* fused_input_data, void* buffer_data, int64_t num_elements) {
+  ScaleBufferCPU(scale_factor, entries[0].tensor->dtype(), fused_input_data,
+                 buffer_data, num_elements);
+}
+
 // Join
 JoinOp::JoinOp(HorovodGlobalState* global_state) : HorovodOp(global_state) {}
 
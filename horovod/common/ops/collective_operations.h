@@ -22,16 +22,12 @@
 
 #include "../common.h"
 #include "../controller.h"
+#include "../cpu_kernels.h"
 #include "../global_state.h"
 #include "../half.h"
 #include "../operations.h"
 #include "../parameter_manager.h"
 
-#if __AVX__ && __F16C__
-#include <cpuid.h>
-#include <immintrin.h>
-#endif
-
 namespace horovod {
 namespace common {
 
@@ -45,6 +41,12 @@ public:
 protected:
   int64_t NumElements(std::vector<TensorTableEntry>& entries);
 
+  // Controller of the process set the entry was enqueued on.
+  Controller& GetController(const TensorTableEntry& entry);
+
+  // Fusion buffers of the process set the entry was enqueued on.
+  FusionBufferManager& GetFusionBuffer(const TensorTableEntry& entry);
+
   HorovodGlobalState* global_state_;
 };
 
@@ -96,34 +98,14 @@ void ScaleBufferCPUImpl(const T* input, T* output, int64_t num_elements, TS scal
 // Specialization for float16
 template <> inline
 void ScaleBufferCPUImpl(const unsigned short* input, unsigned short* output, int64_t num_elements, float scale_factor) {
-  int64_t i = 0;
-
-#if __AVX__ && __F16C__
-  if (is_avx_and_f16c()) {
-    __m256 scale_factor_m256 = _mm256_broadcast_ss(&scale_factor);
-    for (; i < (num_elements / 8) * 8; i += 8) {
-      // convert input to m256
-      __m256 input_m256 = _mm256_cvtph_ps(_mm_loadu_si128((__m128i*)(input + i)));
-
-      // scale and store result in output_m256
-      __m256 output_m256 = _mm256_mul_ps(input_m256, scale_factor_m256);
-
-      // convert back and store in output
-      __m128i output_m128i = _mm256_cvtps_ph(output_m256, 0);
-      _mm_storeu_si128((__m128i*)(output + i), output_m128i);
-    }
-  }
-#endif
-
-  for (; i < num_elements; ++i) {
-    float in_float;
-    HalfBits2Float(input + i, &in_float);
-    float out_float = scale_factor * in_float;
-    Float2HalfBits(&out_float, output + i);
-  }
-
+  Float16Scale(input, output, num_elements, scale_factor);
 }
 
+// Scales num_elements elements of the given type from input into output,
+// split across the CPU kernel threads.
+void ScaleBufferCPU(double scale_factor, DataType dtype, const void* input,
+                    void* output, int64_t num_elements);
+
 class AllgatherOp : public HorovodOp {
 public:
   AllgatherOp(HorovodGlobalState* global_state);
@@ -143,7 +125,8 @@ protected:
                                 int64_t**& entry_component_sizes,
                                 int*& recvcounts);
 
-  virtual void SetDisplacements(const int* recvcounts, int*& displcmnts);
+  virtual void SetDisplacements(const std::vector<TensorTableEntry>& entries,
+                                const int* recvcounts, int*& displcmnts);
 
   virtual void
   SetEntryComponentOffsets(const std::vector<TensorTableEntry>& entries,
@@ -187,6 +170,16 @@ public:
   virtual bool Enabled(const ParameterManager& param_manager,
                        const std::vector<TensorTableEntry>& entries,
                        const Response& response) const = 0;
+
+protected:
+  // Fused broadcasts are CPU only: the root rank packs its tensors into the
+  // fusion buffer, other ranks receive into it and unpack their outputs.
+  virtual void MemcpyInFusionBuffer(const std::vector<TensorTableEntry>& entries,
+                                    bool is_root, void*& buffer_data,
+                                    size_t& buffer_len);
+
+  virtual void MemcpyOutFusionBuffer(const void* buffer_data,
+                                     std::vector<TensorTableEntry>& entries);
 };
 
 class AlltoallOp : public HorovodOp {
@@ -209,12 +202,13 @@ protected:
                                 std::vector<T>& rdispls,
                                 std::vector<T>& sendcounts,
                                 std::vector<T>& recvcounts) {
-    auto world_size = global_state_->controller->GetSize();
+    auto& controller = GetController(e);
+    auto world_size = controller.GetSize();
 
     const auto& splits = e.splits;
     std::vector<int32_t> recvsplits;
     // Perform alltoall of splits to get expected receive splits
-    global_state_->controller->AlltoallGetRecvSplits(splits, recvsplits);
+    controller.AlltoallGetRecvSplits(splits, recvsplits);
 
     // Every tensor participating in Alltoall operation may have different
     // first dimension size, but the rest of dimensions are same for all
@@ -268,6 +262,52 @@ protected:
   }
 };
 
+class ReducescatterOp : public HorovodOp {
+public:
+  ReducescatterOp(HorovodGlobalState* global_state);
+
+  virtual ~ReducescatterOp() = default;
+
+  virtual Status Execute(std::vector<TensorTableEntry>& entries,
+                         const Response& response) = 0;
+
+  virtual bool Enabled(const ParameterManager& param_manager,
+                       const std::vector<TensorTableEntry>& entries,
+                       const Response& response) const = 0;
+
+protected:
+  // Tensors are split along the first dimension, the first
+  // (dim0 % size) ranks receive one more row than the others.
+  static int64_t ShardFirstDim(int64_t dim0, int rank, int size);
+
+  static int64_t ShardFirstDimOffset(int64_t dim0, int rank, int size);
+
+  virtual Status AllocateOutput(std::vector<TensorTableEntry>& entries,
+                                int rank, int size);
+
+  // Number of elements of all entries that each rank receives.
+  virtual std::vector<int>
+  ComputeRecvcounts(const std::vector<TensorTableEntry>& entries, int size);
+
+  // Packs the shards of all entries into the fusion buffer, ordered by the
+  // ranks in rank_order and then by entry, so that every rank's shards are
+  // contiguous.
+  virtual void MemcpyInFusionBuffer(const std::vector<TensorTableEntry>& entries,
+                                    const std::vector<int>& rank_order,
+                                    int size, void*& buffer_data,
+                                    size_t& buffer_len);
+
+  // Unpacks the shards of this rank from the start of the fusion buffer.
+  virtual void MemcpyOutFusionBuffer(const void* buffer_data,
+                                     std::vector<TensorTableEntry>& entries);
+
+  virtual void
+  ScaleBuffer(double scale_factor, const std::vector<TensorTableEntry>& entries,
+              const void* fused_input_data, void* buffer_data, int64_t num_elements);
+
+  std::vector<uint8_t> scratch_buffer_;
+};
+
 class JoinOp : public HorovodOp {
 public:
   JoinOp(HorovodGlobalState* global_state);
@@ -15,6 +15,9 @@
 
 #include "gloo_operations.h"
 
+#include <algorithm>
+#include <cstring>
+
 #include "gloo/allgather.h"
 #include "gloo/allgatherv.h"
 #include "gloo/allreduce.h"
@@ -24,6 +27,7 @@
 #include "gloo/types.h"
 
 #include "../common.h"
+#include "../cpu_kernels.h"
 #include "../global_state.h"
 
 namespace horovod {
@@ -58,16 +62,45 @@ IGlooAlgorithms* GetAlgorithmsForType(DataType dtype,
   }
 }
 
+namespace {
+
+template <typename T> DataType GlooDataType();
+template <> DataType GlooDataType<u_int8_t>() { return HOROVOD_UINT8; }
+template <> DataType GlooDataType<int8_t>() { return HOROVOD_INT8; }
+template <> DataType GlooDataType<u_int16_t>() { return HOROVOD_UINT16; }
+template <> DataType GlooDataType<int16_t>() { return HOROVOD_INT16; }
+template <> DataType GlooDataType<int32_t>() { return HOROVOD_INT32; }
+template <> DataType GlooDataType<int64_t>() { return HOROVOD_INT64; }
+template <> DataType GlooDataType<gloo::float16>() { return HOROVOD_FLOAT16; }
+template <> DataType GlooDataType<float>() { return HOROVOD_FLOAT32; }
+template <> DataType GlooDataType<double>() { return HOROVOD_FLOAT64; }
+template <> DataType GlooDataType<bool>() { return HOROVOD_BOOL; }
+
+// Reduction function of the Gloo allreduce, c = a + b, computed with the
+// vectorized and multithreaded CPU kernels.
+template <typename T>
+void GlooSum(void* c, const void* a, const void* b, size_t n) {
+  if (c == b) {
+    std::swap(a, b);
+  } else if (c != a) {
+    std::memcpy(c, a, n * sizeof(T));
+  }
+  SumBufferCPU(GlooDataType<T>(), b, c, (int64_t)n);
+}
+
+} // namespace
+
 template <typename T>
 GlooAlgorithms<T>::GlooAlgorithms(GlooContext* gloo_context)
     : gloo_context_(gloo_context) {}
 
 template <typename T>
-void GlooAlgorithms<T>::Allreduce(void* buffer_data, int num_elements) {
-  gloo::AllreduceOptions opts(gloo_context_->ctx);
+void GlooAlgorithms<T>::Allreduce(void* buffer_data, int num_elements,
+                                  Communicator communicator) {
+  gloo::AllreduceOptions opts(gloo_context_->GetGlooContext(communicator));
   opts.setOutput<T>(static_cast<T*>(buffer_data), (size_t) num_elements);
 
-  void (*func)(void*, const void*, const void*, size_t) = &::gloo::sum<T>;
+  void (*func)(void*, const void*, const void*, size_t) = &GlooSum<T>;
   opts.setReduceFunction(gloo::AllreduceOptions::Func(func));
 
   gloo::allreduce(opts);
@@ -108,6 +141,30 @@ void GlooAlgorithms<T>::Alltoall(void* buffer_data, void* buffer_out,
   gloo::alltoallv(opts);
 }
 
+template <typename T>
+void GlooAlgorithms<T>::Reducescatter(void* buffer_data, void* buffer_out,
+                                      std::vector<int64_t>& recvcounts) {
+  // Gloo has no reduce-scatter collective, so every rank receives its shard
+  // from all ranks with an alltoallv and reduces the shards locally.
+  int rank = gloo_context_->ctx->rank;
+  int size = gloo_context_->ctx->size;
+  int64_t num_elements = recvcounts[rank];
+  std::unique_ptr<T[]> shards(new T[num_elements * size]);
+
+  std::vector<int64_t> shard_counts(size, num_elements);
+  gloo::AlltoallvOptions opts(gloo_context_->ctx);
+  opts.setInput<T>(static_cast<T*>(buffer_data), recvcounts);
+  opts.setOutput<T>(shards.get(), shard_counts);
+  gloo::alltoallv(opts);
+
+  T* out = static_cast<T*>(buffer_out);
+  std::copy(shards.get(), shards.get() + num_elements, out);
+  for (int rc = 1; rc < size; ++rc) {
+    SumBufferCPU(GlooDataType<T>(), shards.get() + rc * num_elements, out,
+                 num_elements);
+  }
+}
+
 template <typename T> int GlooAlgorithms<T>::ElementSize() const {
   return sizeof(T);
 }
@@ -220,7 +277,7 @@ Status GlooAllgather::Execute(std::vector<TensorTableEntry>& entries,
   }
   timeline.ActivityEndAll(entries);
 
-  SetDisplacements(recvcounts, displcmnts);
+  SetDisplacements(entries, recvcounts, displcmnts);
   SetEntryComponentOffsets(entries, entry_component_sizes, recvcounts,
                            entry_component_offsets);
 
@@ -278,25 +335,36 @@ GlooBroadcast::GlooBroadcast(GlooContext* gloo_context,
 
 Status GlooBroadcast::Execute(std::vector<TensorTableEntry>& entries,
                               const Response& response) {
-  assert(entries.size() == 1);
+  auto& timeline = global_state_->timeline;
   auto e = entries[0];
+  bool is_root = global_state_->controller->GetRank() == e.root_rank;
 
   // On root rank, MPI_Bcast sends data, on other ranks it receives data.
   // for gloo broadcast, only output needs to be set if inplace
 
   void* data_ptr;
-  if (global_state_->controller->GetRank() == e.root_rank) {
+  if (entries.size() > 1) {
+    size_t buffer_len;
+    timeline.ActivityStartAll(entries, MEMCPY_IN_FUSION_BUFFER);
+    MemcpyInFusionBuffer(entries, is_root, data_ptr, buffer_len);
+    timeline.ActivityEndAll(entries);
+  } else if (is_root) {
     data_ptr = (void*)e.tensor->data();
   } else {
     data_ptr = (void*)e.output->data();
   }
 
-  global_state_->timeline.ActivityStartAll(entries, GLOO_BCAST);
+  timeline.ActivityStartAll(entries, GLOO_BCAST);
   std::unique_ptr<IGlooAlgorithms> gloo_algos(
       GetAlgorithmsForType(e.tensor->dtype(), gloo_context_));
-  gloo_algos->Broadcast(data_ptr, (int)e.tensor->shape().num_elements(),
-                        e.root_rank);
-  global_state_->timeline.ActivityEndAll(entries);
+  gloo_algos->Broadcast(data_ptr, (int)NumElements(entries), e.root_rank);
+  timeline.ActivityEndAll(entries);
+
+  if (entries.size() > 1 && !is_root) {
+    timeline.ActivityStartAll(entries, MEMCPY_OUT_FUSION_BUFFER);
+    MemcpyOutFusionBuffer(data_ptr, entries);
+    timeline.ActivityEndAll(entries);
+  }
 
   return Status::OK();
 }
@@ -340,5 +408,77 @@ bool GlooAlltoall::Enabled(const ParameterManager& param_manager,
   return true;
 }
 
+GlooReducescatter::GlooReducescatter(GlooContext* gloo_context,
+                                     HorovodGlobalState* global_state)
+    : ReducescatterOp(global_state), gloo_context_(gloo_context) {}
+
+Status GlooReducescatter::Execute(std::vector<TensorTableEntry>& entries,
+                                  const Response& response) {
+  auto& timeline = global_state_->timeline;
+  auto& first_entry = entries[0];
+  int rank = global_state_->controller->GetRank();
+  int size = global_state_->controller->GetSize();
+
+  timeline.ActivityStartAll(entries, ALLOCATE_OUTPUT);
+  Status status = AllocateOutput(entries, rank, size);
+  if (!status.ok()) {
+    return status;
+  }
+  timeline.ActivityEndAll(entries);
+
+  std::vector<int> counts = ComputeRecvcounts(entries, size);
+  std::vector<int64_t> recvcounts(counts.begin(), counts.end());
+
+  void* sendbuf;
+  void* buffer_data;
+  bool use_fusion_buffer = entries.size() > 1 || response.prescale_factor() != 1.0;
+  if (use_fusion_buffer) {
+    std::vector<int> rank_order(size);
+    for (int rc = 0; rc < size; ++rc) {
+      rank_order[rc] = rc;
+    }
+    size_t buffer_len;
+    timeline.ActivityStartAll(entries, MEMCPY_IN_FUSION_BUFFER);
+    MemcpyInFusionBuffer(entries, rank_order, size, buffer_data, buffer_len);
+    timeline.ActivityEndAll(entries);
+
+    if (response.prescale_factor() != 1.0) {
+      // Execute prescaling op
+      ScaleBuffer(response.prescale_factor(), entries, buffer_data, buffer_data,
+                  NumElements(entries));
+    }
+    sendbuf = buffer_data;
+  } else {
+    sendbuf = (void*)first_entry.tensor->data();
+    buffer_data = (void*)first_entry.output->data();
+  }
+
+  timeline.ActivityStartAll(entries, GLOO_REDUCESCATTER);
+  std::unique_ptr<IGlooAlgorithms> gloo_algos(
+      GetAlgorithmsForType(first_entry.tensor->dtype(), gloo_context_));
+  gloo_algos->Reducescatter(sendbuf, buffer_data, recvcounts);
+  timeline.ActivityEndAll(entries);
+
+  if (response.postscale_factor() != 1.0) {
+    // Execute postscaling op
+    ScaleBuffer(response.postscale_factor(), entries, buffer_data, buffer_data,
+                recvcounts[rank]);
+  }
+
+  if (use_fusion_buffer) {
+    timeline.ActivityStartAll(entries, MEMCPY_OUT_FUSION_BUFFER);
+    MemcpyOutFusionBuffer(buffer_data, entries);
+    timeline.ActivityEndAll(entries);
+  }
+
+  return Status::OK();
+}
+
+bool GlooReducescatter::Enabled(const ParameterManager& param_manager,
+                                const std::vector<TensorTableEntry>& entries,
+                                const Response& response) const {
+  return true;
+}
+
 } // namespace common
 } // namespace horovod
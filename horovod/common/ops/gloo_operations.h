@@ -27,7 +27,8 @@ namespace common {
 
 class IGlooAlgorithms {
 public:
-  virtual void Allreduce(void* buffer_data, int num_elements) = 0;
+  virtual void Allreduce(void* buffer_data, int num_elements,
+                         Communicator communicator = Communicator::GLOBAL) = 0;
 
   virtual void Allgather(void* buffer_data, void* buffer_out, int* recvcounts,
                          int* displcmnts) = 0;
@@ -39,6 +40,9 @@ public:
                         std::vector<int64_t>& sendcounts,
                         std::vector<int64_t>& recvcounts) = 0;
 
+  virtual void Reducescatter(void* buffer_data, void* buffer_out,
+                             std::vector<int64_t>& recvcounts) = 0;
+
   virtual int ElementSize() const = 0;
 };
 
@@ -48,7 +52,8 @@ public:
 
   ~GlooAlgorithms() = default;
 
-  void Allreduce(void* buffer_data, int num_elements) override;
+  void Allreduce(void* buffer_data, int num_elements,
+                 Communicator communicator = Communicator::GLOBAL) override;
 
   void Allgather(void* buffer_data, void* buffer_out, int* recvcounts,
                  int* displcmnts) override;
@@ -59,12 +64,18 @@ public:
                 std::vector<int64_t>& sendcounts,
                 std::vector<int64_t>& recvcounts);
 
+  void Reducescatter(void* buffer_data, void* buffer_out,
+                     std::vector<int64_t>& recvcounts) override;
+
   int ElementSize() const override;
 
 private:
   GlooContext* gloo_context_;
 };
 
+IGlooAlgorithms* GetAlgorithmsForType(DataType dtype,
+                                      GlooContext* gloo_context);
+
 class GlooAllreduce : public AllreduceOp {
 public:
   GlooAllreduce(GlooContext* gloo_context, HorovodGlobalState* global_state);
@@ -126,6 +137,21 @@ protected:
   GlooContext* gloo_context_;
 };
 
+class GlooReducescatter : public ReducescatterOp {
+public:
+  GlooReducescatter(GlooContext* gloo_context, HorovodGlobalState* global_state);
+
+  Status Execute(std::vector<TensorTableEntry>& entries,
+                 const Response& response) override;
+
+  bool Enabled(const ParameterManager& param_manager,
+               const std::vector<TensorTableEntry>& entries,
+               const Response& response) const override;
+
+protected:
+  GlooContext* gloo_context_;
+};
+
 } // namespace common
 } // namespace horovod
 
@@ -103,7 +103,7 @@ Status MPIAllgather::Execute(std::vector<TensorTableEntry>& entries, const Respo
   // allgatherv
   auto** entry_component_offsets = new int64_t* [entries.size()];
 
-  int global_size = global_state_->controller->GetSize();
+  int global_size = GetController(entries[0]).GetSize();
   auto* recvcounts = new int[global_size]();
   auto* displcmnts = new int[global_size]();
 
@@ -130,7 +130,7 @@ Status MPIAllgather::Execute(std::vector<TensorTableEntry>& entries, const Respo
   }
   timeline.ActivityEndAll(entries);
 
-  SetDisplacements(recvcounts, displcmnts);
+  SetDisplacements(entries, recvcounts, displcmnts);
   SetEntryComponentOffsets(entries, entry_component_sizes, recvcounts, entry_component_offsets);
 
   int element_size = mpi_context_->GetMPITypeSize(first_entry.tensor->dtype());
@@ -224,7 +224,7 @@ Status MPIHierarchicalAllgather::Execute(std::vector<TensorTableEntry>& entries,
   }
   timeline.ActivityEndAll(entries);
 
-  SetDisplacements(recvcounts, displcmnts);
+  SetDisplacements(entries, recvcounts, displcmnts);
   SetEntryComponentOffsets(entries, entry_component_sizes, recvcounts, entry_component_offsets);
 
   int element_size = mpi_context_->GetMPITypeSize(first_entry.tensor->dtype());
@@ -355,27 +355,39 @@ MPIBroadcast::MPIBroadcast(MPIContext* mpi_context, HorovodGlobalState* global_s
     : BroadcastOp(global_state), mpi_context_(mpi_context) {}
 
 Status MPIBroadcast::Execute(std::vector<TensorTableEntry>& entries, const Response& response) {
-  assert(entries.size() == 1);
+  auto& timeline = global_state_->timeline;
   auto e = entries[0];
+  bool is_root = GetController(e).GetRank() == e.root_rank;
 
   // On root rank, MPI_Bcast sends data, on other ranks it receives data.
   void* data_ptr;
-  if (global_state_->controller->GetRank() == e.root_rank) {
+  if (entries.size() > 1) {
+    size_t buffer_len;
+    timeline.ActivityStartAll(entries, MEMCPY_IN_FUSION_BUFFER);
+    MemcpyInFusionBuffer(entries, is_root, data_ptr, buffer_len);
+    timeline.ActivityEndAll(entries);
+  } else if (is_root) {
     data_ptr = (void*) e.tensor->data();
   } else {
     data_ptr = (void*) e.output->data();
   }
 
-  global_state_->timeline.ActivityStartAll(entries, MPI_BCAST);
+  timeline.ActivityStartAll(entries, MPI_BCAST);
   int op = MPI_Bcast(data_ptr,
-                     (int) e.tensor->shape().num_elements(),
+                     (int) NumElements(entries),
                      mpi_context_->GetMPIDataType(e.tensor->dtype()),
                      e.root_rank,
                      mpi_context_->GetMPICommunicator(Communicator::GLOBAL));
   if (op != MPI_SUCCESS) {
     throw std::runtime_error("MPI_Broadcast failed, see MPI output for details.");
   }
-  global_state_->timeline.ActivityEndAll(entries);
+  timeline.ActivityEndAll(entries);
+
+  if (entries.size() > 1 && !is_root) {
+    timeline.ActivityStartAll(entries, MEMCPY_OUT_FUSION_BUFFER);
+    MemcpyOutFusionBuffer(data_ptr, entries);
+    timeline.ActivityEndAll(entries);
+  }
 
   return Status::OK();
 }
@@ -423,5 +435,177 @@ bool MPIAlltoall::Enabled(const ParameterManager& param_manager,
   return true;
 }
 
+MPIReducescatter::MPIReducescatter(MPIContext* mpi_context, HorovodGlobalState* global_state)
+    : ReducescatterOp(global_state), mpi_context_(mpi_context) {}
+
+Status MPIReducescatter::Execute(std::vector<TensorTableEntry>& entries, const Response& response) {
+  auto& timeline = global_state_->timeline;
+  auto& first_entry = entries[0];
+  auto& controller = GetController(first_entry);
+  int rank = controller.GetRank();
+  int size = controller.GetSize();
+
+  timeline.ActivityStartAll(entries, ALLOCATE_OUTPUT);
+  Status status = AllocateOutput(entries, rank, size);
+  if (!status.ok()) {
+    return status;
+  }
+  timeline.ActivityEndAll(entries);
+
+  std::vector<int> recvcounts = ComputeRecvcounts(entries, size);
+
+  // A single tensor is already laid out by rank and is scattered straight
+  // into the output, fused or prescaled tensors go through the fusion buffer
+  // and are reduced in place.
+  const void* sendbuf;
+  void* buffer_data;
+  bool use_fusion_buffer = entries.size() > 1 || response.prescale_factor() != 1.0;
+  if (use_fusion_buffer) {
+    std::vector<int> rank_order(size);
+    for (int rc = 0; rc < size; ++rc) {
+      rank_order[rc] = rc;
+    }
+    size_t buffer_len;
+    timeline.ActivityStartAll(entries, MEMCPY_IN_FUSION_BUFFER);
+    MemcpyInFusionBuffer(entries, rank_order, size, buffer_data, buffer_len);
+    timeline.ActivityEndAll(entries);
+
+    if (response.prescale_factor() != 1.0) {
+      // Execute prescaling op
+      ScaleBuffer(response.prescale_factor(), entries, buffer_data, buffer_data,
+                  NumElements(entries));
+    }
+    sendbuf = MPI_IN_PLACE;
+  } else {
+    sendbuf = first_entry.tensor->data();
+    buffer_data = (void*) first_entry.output->data();
+  }
+
+  timeline.ActivityStartAll(entries, MPI_REDUCESCATTER);
+  int op = MPI_Reduce_scatter(sendbuf, buffer_data, recvcounts.data(),
+                              mpi_context_->GetMPIDataType(first_entry.tensor),
+                              mpi_context_->GetMPISumOp(first_entry.tensor->dtype()),
+                              mpi_context_->GetMPICommunicator(Communicator::GLOBAL));
+  if (op != MPI_SUCCESS) {
+    throw std::runtime_error("MPI_Reduce_scatter failed, see MPI output for details.");
+  }
+  timeline.ActivityEndAll(entries);
+
+  if (response.postscale_factor() != 1.0) {
+    // Execute postscaling op
+    ScaleBuffer(response.postscale_factor(), entries, buffer_data, buffer_data,
+                recvcounts[rank]);
+  }
+
+  if (use_fusion_buffer) {
+    timeline.ActivityStartAll(entries, MEMCPY_OUT_FUSION_BUFFER);
+    MemcpyOutFusionBuffer(buffer_data, entries);
+    timeline.ActivityEndAll(entries);
+  }
+
+  return Status::OK();
+}
+
+bool MPIReducescatter::Enabled(const ParameterManager& param_manager,
+                               const std::vector<TensorTableEntry>& entries,
+                               const Response& response) const {
+  return true;
+}
+
+MPIHierarchicalReducescatter::MPIHierarchicalReducescatter(MPIContext* mpi_context,
+                                                           HorovodGlobalState* global_state)
+    : MPIReducescatter(mpi_context, global_state) {}
+
+Status MPIHierarchicalReducescatter::Execute(std::vector<TensorTableEntry>& entries,
+                                             const Response& response) {
+  auto& timeline = global_state_->timeline;
+  auto& first_entry = entries[0];
+  auto& controller = *global_state_->controller;
+  int rank = controller.GetRank();
+  int size = controller.GetSize();
+  int local_size = controller.GetLocalSize();
+  int local_rank = controller.GetLocalRank();
+  int cross_size = controller.GetCrossSize();
+
+  timeline.ActivityStartAll(entries, ALLOCATE_OUTPUT);
+  Status status = AllocateOutput(entries, rank, size);
+  if (!status.ok()) {
+    return status;
+  }
+  timeline.ActivityEndAll(entries);
+
+  std::vector<int> recvcounts = ComputeRecvcounts(entries, size);
+
+  // Order the shards by local rank first, so that the local reduce-scatter
+  // leaves every local rank with the node's sum of the shards of all ranks
+  // sharing its local rank, ordered by cross rank.
+  std::vector<int> rank_order;
+  rank_order.reserve(size);
+  std::vector<int> local_recvcounts(local_size, 0);
+  for (int lr = 0; lr < local_size; ++lr) {
+    for (int cr = 0; cr < cross_size; ++cr) {
+      rank_order.push_back(cr * local_size + lr);
+      local_recvcounts[lr] += recvcounts[cr * local_size + lr];
+    }
+  }
+  std::vector<int> cross_recvcounts(cross_size);
+  for (int cr = 0; cr < cross_size; ++cr) {
+    cross_recvcounts[cr] = recvcounts[cr * local_size + local_rank];
+  }
+
+  void* buffer_data;
+  size_t buffer_len;
+  timeline.ActivityStartAll(entries, MEMCPY_IN_FUSION_BUFFER);
+  MemcpyInFusionBuffer(entries, rank_order, size, buffer_data, buffer_len);
+  timeline.ActivityEndAll(entries);
+
+  if (response.prescale_factor() != 1.0) {
+    // Execute prescaling op
+    ScaleBuffer(response.prescale_factor(), entries, buffer_data, buffer_data,
+                NumElements(entries));
+  }
+
+  auto dtype = mpi_context_->GetMPIDataType(first_entry.tensor);
+  auto sum_op = mpi_context_->GetMPISumOp(first_entry.tensor->dtype());
+
+  timeline.ActivityStartAll(entries, MPI_LOCAL_REDUCESCATTER);
+  int op = MPI_Reduce_scatter(MPI_IN_PLACE, buffer_data, local_recvcounts.data(),
+                              dtype, sum_op,
+                              mpi_context_->GetMPICommunicator(Communicator::LOCAL));
+  if (op != MPI_SUCCESS) {
+    throw std::runtime_error("MPI_Reduce_scatter failed, see MPI output for details.");
+  }
+  timeline.ActivityEndAll(entries);
+
+  timeline.ActivityStartAll(entries, MPI_CROSS_REDUCESCATTER);
+  op = MPI_Reduce_scatter(MPI_IN_PLACE, buffer_data, cross_recvcounts.data(),
+                          dtype, sum_op,
+                          mpi_context_->GetMPICommunicator(Communicator::CROSS));
+  if (op != MPI_SUCCESS) {
+    throw std::runtime_error("MPI_Reduce_scatter failed, see MPI output for details.");
+  }
+  timeline.ActivityEndAll(entries);
+
+  if (response.postscale_factor() != 1.0) {
+    // Execute postscaling op
+    ScaleBuffer(response.postscale_factor(), entries, buffer_data, buffer_data,
+                recvcounts[rank]);
+  }
+
+  timeline.ActivityStartAll(entries, MEMCPY_OUT_FUSION_BUFFER);
+  MemcpyOutFusionBuffer(buffer_data, entries);
+  timeline.ActivityEndAll(entries);
+
+  return Status::OK();
+}
+
+bool MPIHierarchicalReducescatter::Enabled(const ParameterManager& param_manager,
+                                           const std::vector<TensorTableEntry>& entries,
+                                           const Response& response) const {
+  return global_state_->hierarchical_reducescatter &&
+         global_state_->controller->IsHomogeneous() &&
+         entries[0].process_set_id == GLOBAL_PROCESS_SET_ID;
+}
+
 } // namespace common
 } // namespace horovod
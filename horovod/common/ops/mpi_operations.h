@@ -102,6 +102,34 @@ protected:
   MPIContext* mpi_context_;
 };
 
+class MPIReducescatter : public ReducescatterOp {
+public:
+  MPIReducescatter(MPIContext* mpi_context, HorovodGlobalState* global_state);
+
+  Status Execute(std::vector<TensorTableEntry>& entries, const Response& response) override;
+
+  bool Enabled(const ParameterManager& param_manager,
+               const std::vector<TensorTableEntry>& entries,
+               const Response& response) const override;
+
+protected:
+  MPIContext* mpi_context_;
+};
+
+// Reduce-scatters within each node first and then across nodes, so that only
+// 1 / local_size of the data crosses the network. Assumes a homogeneous
+// cluster with ranks laid out by node, like the hierarchical allgather.
+class MPIHierarchicalReducescatter : public MPIReducescatter {
+public:
+  MPIHierarchicalReducescatter(MPIContext* mpi_context, HorovodGlobalState* global_state);
+
+  Status Execute(std::vector<TensorTableEntry>& entries, const Response& response) override;
+
+  bool Enabled(const ParameterManager& param_manager,
+               const std::vector<TensorTableEntry>& entries,
+               const Response& response) const override;
+};
+
 } // namespace common
 } // namespace horovod
 
@@ -25,6 +25,7 @@ OperationManager::OperationManager(ParameterManager* param_manager,
                                    std::vector<std::shared_ptr<AllgatherOp>> allgather_ops,
                                    std::vector<std::shared_ptr<BroadcastOp>> broadcast_ops,
                                    std::vector<std::shared_ptr<AlltoallOp>> alltoall_ops,
+                                   std::vector<std::shared_ptr<ReducescatterOp>> reducescatter_ops,
                                    std::shared_ptr<JoinOp> join_op,
                                    std::vector<std::shared_ptr<AllreduceOp>> adasum_ops,
                                    std::shared_ptr<ErrorOp> error_op)
@@ -33,6 +34,7 @@ OperationManager::OperationManager(ParameterManager* param_manager,
       allgather_ops_(std::move(allgather_ops)),
       broadcast_ops_(std::move(broadcast_ops)),
       alltoall_ops_(std::move(alltoall_ops)),
+      reducescatter_ops_(std::move(reducescatter_ops)),
       join_op_(std::move(join_op)),
       adasum_ops_(std::move(adasum_ops)),
       error_op_(std::move(error_op)) {}
@@ -77,6 +79,16 @@ Status OperationManager::ExecuteAlltoall(std::vector<TensorTableEntry>& entries,
   throw std::logic_error("No Alltoall operation enabled");
 }
 
+Status OperationManager::ExecuteReducescatter(std::vector<TensorTableEntry>& entries,
+                                              const Response& response) const {
+  for (auto& op : reducescatter_ops_) {
+    if (op->Enabled(*param_manager_, entries, response)) {
+      return op->Execute(entries, response);
+    }
+  }
+  throw std::logic_error("No Reducescatter operation enabled");
+}
+
 Status OperationManager::ExecuteJoin(std::vector<TensorTableEntry>& entries,
                                           const Response& response) const {
   return join_op_->Execute(entries, response);
@@ -107,6 +119,8 @@ Status OperationManager::ExecuteOperation(std::vector<TensorTableEntry>& entries
     return ExecuteBroadcast(entries, response);
   } else if (response.response_type() == Response::ALLTOALL) {
     return ExecuteAlltoall(entries, response);
+  } else if (response.response_type() == Response::REDUCESCATTER) {
+    return ExecuteReducescatter(entries, response);
   } else if (response.response_type() == Response::JOIN) {
     return ExecuteJoin(entries, response);
   } else if (response.response_type() == Response::ADASUM) {
@@ -31,6 +31,7 @@ public:
                    std::vector<std::shared_ptr<AllgatherOp>> allgather_ops,
                    std::vector<std::shared_ptr<BroadcastOp>> broadcast_ops,
                    std::vector<std::shared_ptr<AlltoallOp>> alltoall_ops,
+                   std::vector<std::shared_ptr<ReducescatterOp>> reducescatter_ops,
                    std::shared_ptr<JoinOp> join_op,
                    std::vector<std::shared_ptr<AllreduceOp>> adasum_ops,
                    std::shared_ptr<ErrorOp> error_op);
@@ -45,6 +46,8 @@ public:
 
   Status ExecuteAlltoall(std::vector<TensorTableEntry>& entries, const Response& response) const;
 
+  Status ExecuteReducescatter(std::vector<TensorTableEntry>& entries, const Response& response) const;
+
   Status ExecuteError(std::vector<TensorTableEntry>& entries, const Response& response) const;
 
   Status ExecuteJoin(std::vector<TensorTableEntry>& entries, const Response& response) const;
@@ -60,6 +63,7 @@ private:
   std::vector<std::shared_ptr<AllgatherOp>> allgather_ops_;
   std::vector<std::shared_ptr<BroadcastOp>> broadcast_ops_;
   std::vector<std::shared_ptr<AlltoallOp>> alltoall_ops_;
+  std::vector<std::shared_ptr<ReducescatterOp>> reducescatter_ops_;
   std::shared_ptr<JoinOp> join_op_;
   std::vector<std::shared_ptr<AllreduceOp>> adasum_ops_;
   std::shared_ptr<ErrorOp> error_op_;
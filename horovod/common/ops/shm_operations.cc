@@ -0,0 +1,400 @@
+// Copyright 2021 Uber Technologies, Inc. All Rights Reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+// =============================================================================
+
+#include "shm_operations.h"
+
+#include <algorithm>
+#include <atomic>
+#include <cerrno>
+#include <chrono>
+#include <cstddef>
+#include <cstring>
+#include <fcntl.h>
+#include <new>
+#include <signal.h>
+#include <sys/mman.h>
+#include <thread>
+#include <unistd.h>
+
+#include "../cpu_kernels.h"
+#include "../global_state.h"
+#include "../logging.h"
+
+#if HAVE_GLOO
+#include "gloo/allreduce.h"
+#include "gloo/broadcast.h"
+#include "gloo/math.h"
+#include "gloo_operations.h"
+#endif
+
+namespace horovod {
+namespace common {
+
+namespace {
+
+#define SHM_NAME_MAX 64
+#define SHM_HEADER_ALIGNMENT 4096
+
+// Number of busy polls of the barrier before yielding the CPU, and of yields
+// between checks that the other local ranks are still alive.
+#define SHM_BARRIER_SPINS 1024
+#define SHM_BARRIER_LIVENESS_CHECK 65536
+
+struct ShmHeader {
+  alignas(64) std::atomic<int32_t> arrived;
+  alignas(64) std::atomic<uint32_t> generation;
+  // Followed by the pid of every local rank.
+  alignas(64) pid_t pids[1];
+};
+
+size_t HeaderSize(int local_size) {
+  size_t size = offsetof(ShmHeader, pids) + local_size * sizeof(pid_t);
+  return (size + SHM_HEADER_ALIGNMENT - 1) / SHM_HEADER_ALIGNMENT *
+         SHM_HEADER_ALIGNMENT;
+}
+
+} // namespace
+
+bool SharedMemoryContext::CreateSegment(std::string& name) {
+  name = "/horovod_shm_" + std::to_string(getpid()) + "_" +
+         std::to_string(
+             std::chrono::steady_clock::now().time_since_epoch().count());
+  int fd = shm_open(name.c_str(), O_CREAT | O_EXCL | O_RDWR, 0600);
+  if (fd < 0) {
+    LOG(WARNING) << "Failed to create shared memory segment " << name << ": "
+                 << std::strerror(errno);
+    return false;
+  }
+  segment_size_ = HeaderSize(local_size_) + local_size_ * slot_size_;
+  // Reserve the memory upfront, so that a full /dev/shm fails here rather
+  // than with a SIGBUS during the first allreduce.
+#if __linux__
+  int err = posix_fallocate(fd, 0, segment_size_);
+#else
+  int err = ftruncate(fd, segment_size_) == 0 ? 0 : errno;
+#endif
+  if (err != 0) {
+    LOG(WARNING) << "Failed to allocate " << segment_size_
+                 << " bytes of shared memory: " << std::strerror(err);
+    close(fd);
+    shm_unlink(name.c_str());
+    return false;
+  }
+  segment_ = mmap(nullptr, segment_size_, PROT_READ | PROT_WRITE, MAP_SHARED,
+                  fd, 0);
+  close(fd);
+  if (segment_ == MAP_FAILED) {
+    segment_ = nullptr;
+    shm_unlink(name.c_str());
+    return false;
+  }
+  auto* header = new (segment_) ShmHeader();
+  header->arrived.store(0);
+  header->generation.store(0);
+  header->pids[local_rank_] = getpid();
+  return true;
+}
+
+bool SharedMemoryContext::OpenSegment(const std::string& name) {
+  int fd = shm_open(name.c_str(), O_RDWR, 0600);
+  if (fd < 0) {
+    LOG(WARNING) << "Failed to open shared memory segment " << name << ": "
+                 << std::strerror(errno);
+    return false;
+  }
+  segment_size_ = HeaderSize(local_size_) + local_size_ * slot_size_;
+  segment_ = mmap(nullptr, segment_size_, PROT_READ | PROT_WRITE, MAP_SHARED,
+                  fd, 0);
+  close(fd);
+  if (segment_ == MAP_FAILED) {
+    segment_ = nullptr;
+    return false;
+  }
+  static_cast<ShmHeader*>(segment_)->pids[local_rank_] = getpid();
+  return true;
+}
+
+#if HAVE_MPI
+void SharedMemoryContext::InitializeFromMPI(MPIContext& mpi_context,
+                                            int local_rank, int local_size) {
+  local_rank_ = local_rank;
+  local_size_ = local_size;
+  generation_ = 1;
+
+  std::string name;
+  char name_buffer[SHM_NAME_MAX] = {0};
+  int ok = 1;
+  if (local_rank_ == 0) {
+    ok = CreateSegment(name);
+    if (ok) {
+      std::strncpy(name_buffer, name.c_str(), SHM_NAME_MAX - 1);
+    }
+  }
+  MPI_Bcast(name_buffer, SHM_NAME_MAX, MPI_CHAR, 0,
+            mpi_context.GetMPICommunicator(Communicator::LOCAL));
+  if (local_rank_ != 0) {
+    name = name_buffer;
+    ok = !name.empty() && OpenSegment(name);
+  }
+
+  // All ranks have to agree, as nodes without the segment would run a
+  // different allreduce. This also ensures that all local ranks mapped the
+  // segment before its name is unlinked.
+  MPI_Allreduce(MPI_IN_PLACE, &ok, 1, MPI_INT, MPI_MIN,
+                mpi_context.GetMPICommunicator(Communicator::GLOBAL));
+  if (local_rank_ == 0 && !name.empty()) {
+    shm_unlink(name.c_str());
+  }
+  if (!ok) {
+    Unmap();
+    LOG(WARNING) << "Shared memory allreduce disabled, falling back to "
+                    "the MPI allreduce.";
+    return;
+  }
+  enabled_ = true;
+  LOG(DEBUG) << "Shared memory context initialized.";
+}
+#endif
+
+#if HAVE_GLOO
+void SharedMemoryContext::InitializeFromGloo(GlooContext& gloo_context,
+                                             int local_rank, int local_size) {
+  local_rank_ = local_rank;
+  local_size_ = local_size;
+  generation_ = 1;
+
+  std::string name;
+  char name_buffer[SHM_NAME_MAX] = {0};
+  int ok = 1;
+  if (local_rank_ == 0) {
+    ok = CreateSegment(name);
+    if (ok) {
+      std::strncpy(name_buffer, name.c_str(), SHM_NAME_MAX - 1);
+    }
+  }
+  gloo::BroadcastOptions bcast_opts(gloo_context.local_ctx);
+  bcast_opts.setRoot(0);
+  bcast_opts.setOutput<char>(name_buffer, SHM_NAME_MAX);
+  gloo::broadcast(bcast_opts);
+  if (local_rank_ != 0) {
+    name = name_buffer;
+    ok = !name.empty() && OpenSegment(name);
+  }
+
+  // See InitializeFromMPI.
+  gloo::AllreduceOptions allreduce_opts(gloo_context.ctx);
+  allreduce_opts.setOutput<int>(&ok, 1);
+  void (*func)(void*, const void*, const void*, size_t) = &::gloo::min<int>;
+  allreduce_opts.setReduceFunction(gloo::AllreduceOptions::Func(func));
+  gloo::allreduce(allreduce_opts);
+  if (local_rank_ == 0 && !name.empty()) {
+    shm_unlink(name.c_str());
+  }
+  if (!ok) {
+    Unmap();
+    LOG(WARNING) << "Shared memory allreduce disabled, falling back to "
+                    "the Gloo allreduce.";
+    return;
+  }
+  enabled_ = true;
+  LOG(DEBUG) << "Shared memory context initialized.";
+}
+#endif
+
+void SharedMemoryContext::Unmap() {
+  if (segment_ != nullptr) {
+    munmap(segment_, segment_size_);
+    segment_ = nullptr;
+  }
+}
+
+void SharedMemoryContext::Finalize() {
+  enabled_ = false;
+  Unmap();
+}
+
+void SharedMemoryContext::Barrier() {
+  auto* header = static_cast<ShmHeader*>(segment_);
+  uint32_t generation = generation_++;
+  if (header->arrived.fetch_add(1, std::memory_order_acq_rel) ==
+      local_size_ - 1) {
+    header->arrived.store(0, std::memory_order_relaxed);
+    header->generation.store(generation, std::memory_order_release);
+    return;
+  }
+
+  int64_t polls = 0;
+  while (header->generation.load(std::memory_order_acquire) != generation) {
+    if (++polls < SHM_BARRIER_SPINS) {
+      continue;
+    }
+    std::this_thread::yield();
+    if (polls % SHM_BARRIER_LIVENESS_CHECK == 0) {
+      for (int lr = 0; lr < local_size_; ++lr) {
+        if (kill(header->pids[lr], 0) != 0 && errno == ESRCH) {
+          throw std::runtime_error(
+              "Local rank " + std::to_string(lr) +
+              " exited during a shared memory allreduce.");
+        }
+      }
+    }
+  }
+}
+
+uint8_t* SharedMemoryContext::Slot(int local_rank) const {
+  return static_cast<uint8_t*>(segment_) + HeaderSize(local_size_) +
+         local_rank * slot_size_;
+}
+
+ShmAllreduce::ShmAllreduce(SharedMemoryContext* shm_context,
+                           HorovodGlobalState* global_state)
+    : AllreduceOp(global_state), shm_context_(shm_context) {}
+
+void ShmAllreduce::AllreduceBuffer(const void* input, void* output,
+                                   int64_t num_elements, DataType dtype) {
+  auto& controller = *global_state_->controller;
+  int local_rank = controller.GetLocalRank();
+  int local_size = controller.GetLocalSize();
+  int cross_size = controller.GetCrossSize();
+
+  int64_t element_size = DataType_Size(dtype);
+  int64_t piece_elements = shm_context_->slot_size() / element_size;
+  auto* in = static_cast<const uint8_t*>(input);
+  auto* out = static_cast<uint8_t*>(output);
+  // Local rank 0 reduces into its own slot, which then holds the result.
+  uint8_t* result = shm_context_->Slot(0);
+
+  for (int64_t offset = 0; offset < num_elements; offset += piece_elements) {
+    int64_t count = std::min(piece_elements, num_elements - offset);
+    std::memcpy(shm_context_->Slot(local_rank), in + offset * element_size,
+                count * element_size);
+    shm_context_->Barrier();
+
+    // Every local rank owns a contiguous part of the piece.
+    int64_t part_begin = count * local_rank / local_size;
+    int64_t part_count = count * (local_rank + 1) / local_size - part_begin;
+    if (part_count > 0) {
+      uint8_t* part = result + part_begin * element_size;
+      for (int lr = 1; lr < local_size; ++lr) {
+        SumBufferCPU(dtype, shm_context_->Slot(lr) + part_begin * element_size,
+                     part, part_count);
+      }
+      if (cross_size > 1) {
+        CrossAllreduce(part, part_count, dtype);
+      }
+    }
+    shm_context_->Barrier();
+
+    std::memcpy(out + offset * element_size, result, count * element_size);
+    // The slots are reused by the next piece.
+    shm_context_->Barrier();
+  }
+}
+
+Status ShmAllreduce::Execute(std::vector<TensorTableEntry>& entries,
+                             const Response& response) {
+  auto& first_entry = entries[0];
+
+  const void* fused_input_data;
+  void* buffer_data;
+  size_t buffer_len;
+  int64_t num_elements = NumElements(entries);
+
+  // Copy memory into the fusion buffer.
+  auto& timeline = global_state_->timeline;
+  if (entries.size() > 1) {
+    timeline.ActivityStartAll(entries, MEMCPY_IN_FUSION_BUFFER);
+    MemcpyInFusionBuffer(entries, fused_input_data, buffer_data, buffer_len);
+    timeline.ActivityEndAll(entries);
+  } else {
+    fused_input_data = first_entry.tensor->data();
+    buffer_data = (void*) first_entry.output->data();
+    buffer_len = (size_t) first_entry.output->size();
+  }
+
+  if (response.prescale_factor() != 1.0) {
+    // Execute prescaling op
+    ScaleBuffer(response.prescale_factor(), entries, fused_input_data, buffer_data, num_elements);
+    fused_input_data = buffer_data; // for unfused, scale is done out of place
+  }
+
+  // Do allreduce.
+  timeline.ActivityStartAll(entries, SHM_ALLREDUCE);
+  AllreduceBuffer(fused_input_data, buffer_data, num_elements,
+                  first_entry.tensor->dtype());
+  timeline.ActivityEndAll(entries);
+
+  if (response.postscale_factor() != 1.0) {
+    // Execute postscaling op
+    ScaleBuffer(response.postscale_factor(), entries, buffer_data, buffer_data, num_elements);
+  }
+
+  // Copy memory out of the fusion buffer.
+  if (entries.size() > 1) {
+    timeline.ActivityStartAll(entries, MEMCPY_OUT_FUSION_BUFFER);
+    MemcpyOutFusionBuffer(buffer_data, entries);
+    timeline.ActivityEndAll(entries);
+  }
+
+  return Status::OK();
+}
+
+bool ShmAllreduce::Enabled(const ParameterManager& param_manager,
+                           const std::vector<TensorTableEntry>& entries,
+                           const Response& response) const {
+  auto& controller = *global_state_->controller;
+  // Parts are reduced across nodes among ranks of the same local rank, which
+  // requires the same number of ranks on every node.
+  return shm_context_->IsEnabled() &&
+         entries[0].device == CPU_DEVICE_ID &&
+         entries[0].process_set_id == GLOBAL_PROCESS_SET_ID &&
+         entries[0].tensor->dtype() != HOROVOD_BOOL &&
+         (controller.GetCrossSize() == 1 || controller.IsHomogeneous());
+}
+
+#if HAVE_MPI
+MPIShmAllreduce::MPIShmAllreduce(SharedMemoryContext* shm_context,
+                                 MPIContext* mpi_context,
+                                 HorovodGlobalState* global_state)
+    : ShmAllreduce(shm_context, global_state), mpi_context_(mpi_context) {}
+
+void MPIShmAllreduce::CrossAllreduce(void* buffer_data, int64_t num_elements,
+                                     DataType dtype) {
+  int op = MPI_Allreduce(MPI_IN_PLACE, buffer_data, (int) num_elements,
+                         mpi_context_->GetMPIDataType(dtype),
+                         mpi_context_->GetMPISumOp(dtype),
+                         mpi_context_->GetMPICommunicator(Communicator::CROSS));
+  if (op != MPI_SUCCESS) {
+    throw std::runtime_error("MPI_Allreduce failed, see MPI output for details.");
+  }
+}
+#endif
+
+#if HAVE_GLOO
+GlooShmAllreduce::GlooShmAllreduce(SharedMemoryContext* shm_context,
+                                   GlooContext* gloo_context,
+                                   HorovodGlobalState* global_state)
+    : ShmAllreduce(shm_context, global_state), gloo_context_(gloo_context) {}
+
+void GlooShmAllreduce::CrossAllreduce(void* buffer_data, int64_t num_elements,
+                                      DataType dtype) {
+  std::unique_ptr<IGlooAlgorithms> gloo_algos(
+      GetAlgorithmsForType(dtype, gloo_context_));
+  gloo_algos->Allreduce(buffer_data, (int) num_elements, Communicator::CROSS);
+}
+#endif
+
+} // namespace common
+} // namespace horovod
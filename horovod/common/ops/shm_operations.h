@@ -0,0 +1,139 @@
+// Copyright 2021 Uber Technologies, Inc. All Rights Reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+// =============================================================================
+
+#ifndef HOROVOD_SHM_OPERATIONS_H
+#define HOROVOD_SHM_OPERATIONS_H
+
+#include <string>
+#include <sys/types.h>
+
+#include "collective_operations.h"
+
+#if HAVE_MPI
+#include "../mpi/mpi_context.h"
+#endif
+
+#if HAVE_GLOO
+#include "../gloo/gloo_context.h"
+#endif
+
+namespace horovod {
+namespace common {
+
+// Bytes of shared memory each local rank stages its data in. Larger buffers
+// are reduced in pieces of this size.
+#define SHM_ALLREDUCE_SLOT_SIZE (4 * 1024 * 1024)
+
+// A POSIX shared memory segment mapped by all ranks of a node. The segment
+// holds a barrier followed by one slot per local rank.
+class SharedMemoryContext {
+public:
+#if HAVE_MPI
+  void InitializeFromMPI(MPIContext& mpi_context, int local_rank,
+                         int local_size);
+#endif
+
+#if HAVE_GLOO
+  void InitializeFromGloo(GlooContext& gloo_context, int local_rank,
+                          int local_size);
+#endif
+
+  void Finalize();
+
+  bool IsEnabled() const { return enabled_; }
+
+  // Blocks until all local ranks have reached the barrier. Throws if a local
+  // rank exited before reaching it.
+  void Barrier();
+
+  uint8_t* Slot(int local_rank) const;
+
+  int64_t slot_size() const { return slot_size_; }
+
+private:
+  // Creates (local rank 0) or opens the segment. Returns false on failure.
+  bool CreateSegment(std::string& name);
+  bool OpenSegment(const std::string& name);
+  void Unmap();
+
+  bool enabled_ = false;
+  int local_rank_ = 0;
+  int local_size_ = 1;
+  int64_t slot_size_ = SHM_ALLREDUCE_SLOT_SIZE;
+  void* segment_ = nullptr;
+  size_t segment_size_ = 0;
+  // Barrier generation this rank waits for next.
+  uint32_t generation_ = 1;
+};
+
+// Sums the allreduce of CPU tensors within a node through shared memory: each
+// local rank reduces 1 / local_size of the buffer from the slots of all local
+// ranks, allreduces that part with the ranks of the same local rank on the
+// other nodes, and all local ranks copy the result out of shared memory.
+class ShmAllreduce : public AllreduceOp {
+public:
+  ShmAllreduce(SharedMemoryContext* shm_context,
+               HorovodGlobalState* global_state);
+
+  Status Execute(std::vector<TensorTableEntry>& entries,
+                 const Response& response) override;
+
+  bool Enabled(const ParameterManager& param_manager,
+               const std::vector<TensorTableEntry>& entries,
+               const Response& response) const override;
+
+protected:
+  // Allreduces `num_elements` elements in place across nodes.
+  virtual void CrossAllreduce(void* buffer_data, int64_t num_elements,
+                              DataType dtype) = 0;
+
+  void AllreduceBuffer(const void* input, void* output, int64_t num_elements,
+                       DataType dtype);
+
+  SharedMemoryContext* shm_context_;
+};
+
+#if HAVE_MPI
+class MPIShmAllreduce : public ShmAllreduce {
+public:
+  MPIShmAllreduce(SharedMemoryContext* shm_context, MPIContext* mpi_context,
+                  HorovodGlobalState* global_state);
+
+protected:
+  void CrossAllreduce(void* buffer_data, int64_t num_elements,
+                      DataType dtype) override;
+
+  MPIContext* mpi_context_;
+};
+#endif
+
+#if HAVE_GLOO
+class GlooShmAllreduce : public ShmAllreduce {
+public:
+  GlooShmAllreduce(SharedMemoryContext* shm_context, GlooContext* gloo_context,
+                   HorovodGlobalState* global_state);
+
+protected:
+  void CrossAllreduce(void* buffer_data, int64_t num_elements,
+                      DataType dtype) override;
+
+  GlooContext* gloo_context_;
+};
+#endif
+
+} // namespace common
+} // namespace horovod
+
+#endif // HOROVOD_SHM_OPERATIONS_H
@@ -0,0 +1,73 @@
+// Copyright 2020 Uber Technologies, Inc. All Rights Reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+// =============================================================================
+
+#include "process_set.h"
+
+#include <algorithm>
+
+namespace horovod {
+namespace common {
+
+bool ProcessSet::IsCurrentProcessIncluded() const {
+  return std::binary_search(registered_global_ranks.begin(),
+                            registered_global_ranks.end(), global_rank);
+}
+
+int32_t ProcessSetTable::RegisterProcessSet(std::vector<int> global_ranks) {
+  std::lock_guard<std::mutex> guard(mutex_);
+
+  std::sort(global_ranks.begin(), global_ranks.end());
+  global_ranks.erase(std::unique(global_ranks.begin(), global_ranks.end()),
+                     global_ranks.end());
+
+  int32_t id = next_id_++;
+  id_to_process_set_.emplace(
+      id, std::unique_ptr<ProcessSet>(new ProcessSet(std::move(global_ranks))));
+  return id;
+}
+
+bool ProcessSetTable::Contains(int32_t id) const {
+  std::lock_guard<std::mutex> guard(mutex_);
+  return id_to_process_set_.find(id) != id_to_process_set_.end();
+}
+
+ProcessSet& ProcessSetTable::Get(int32_t id) {
+  std::lock_guard<std::mutex> guard(mutex_);
+  return *id_to_process_set_.at(id);
+}
+
+std::vector<int32_t> ProcessSetTable::Ids() const {
+  std::lock_guard<std::mutex> guard(mutex_);
+  std::vector<int32_t> ids;
+  ids.reserve(id_to_process_set_.size());
+  for (auto& it : id_to_process_set_) {
+    ids.push_back(it.first);
+  }
+  return ids;
+}
+
+bool ProcessSetTable::empty() const {
+  std::lock_guard<std::mutex> guard(mutex_);
+  return id_to_process_set_.empty();
+}
+
+void ProcessSetTable::Clear() {
+  std::lock_guard<std::mutex> guard(mutex_);
+  id_to_process_set_.clear();
+  next_id_ = GLOBAL_PROCESS_SET_ID + 1;
+}
+
+} // namespace common
+} // namespace horovod
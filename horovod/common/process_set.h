@@ -0,0 +1,115 @@
+// Copyright 2020 Uber Technologies, Inc. All Rights Reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+// =============================================================================
+
+#ifndef HOROVOD_PROCESS_SET_H
+#define HOROVOD_PROCESS_SET_H
+
+#include <map>
+#include <memory>
+#include <mutex>
+#include <thread>
+#include <vector>
+
+#include "common.h"
+#include "fusion_buffer_manager.h"
+#include "group_table.h"
+#include "response_cache.h"
+#include "tensor_queue.h"
+
+// Id of the process set spanning all Horovod processes.
+#define GLOBAL_PROCESS_SET_ID 0
+
+namespace horovod {
+namespace common {
+
+// Forward declaration
+class Controller;
+
+// A subset of the Horovod processes that collectives can be performed on.
+// Every process set negotiates its tensors independently: it has its own
+// controller, tensor queue, response cache, group table, fusion buffers and
+// background thread.
+struct ProcessSet {
+  explicit ProcessSet(std::vector<int> global_ranks)
+      : registered_global_ranks(std::move(global_ranks)) {}
+
+  ProcessSet(const ProcessSet&) = delete;
+
+  // Whether the current process is a member of this process set.
+  bool IsCurrentProcessIncluded() const;
+
+  // Ranks of the global communicator that are members of this process set,
+  // in ascending order.
+  std::vector<int> registered_global_ranks;
+
+  // Controller of the process set, only available to member processes after
+  // the background thread has been initialized.
+  std::shared_ptr<Controller> controller;
+
+  TensorQueue tensor_queue;
+
+  ResponseCache response_cache;
+
+  GroupTable group_table;
+
+  FusionBufferManager fusion_buffer;
+
+  // Thread negotiating and performing the collectives of this process set,
+  // only running on member processes.
+  std::thread background_thread;
+
+  // Error that made the process set unavailable during initialization, which
+  // is returned by every collective enqueued on it.
+  Status initialization_status;
+
+  // Rank of the current process in the global communicator.
+  int global_rank = -1;
+};
+
+// Process sets other than the global one. Process sets are registered before
+// Horovod is initialized and exist until it is shut down.
+class ProcessSetTable {
+public:
+  ProcessSetTable() = default;
+  ProcessSetTable(const ProcessSetTable&) = delete;
+
+  // Register a process set with the given global ranks and return its id.
+  int32_t RegisterProcessSet(std::vector<int> global_ranks);
+
+  bool Contains(int32_t id) const;
+
+  ProcessSet& Get(int32_t id);
+
+  // Ids of all registered process sets in ascending order.
+  std::vector<int32_t> Ids() const;
+
+  bool empty() const;
+
+  // Remove all process sets, their ids can be reused afterwards.
+  void Clear();
+
+private:
+  std::map<int32_t, std::unique_ptr<ProcessSet>> id_to_process_set_;
+
+  // Next available process set id, id 0 is the global process set.
+  int32_t next_id_ = GLOBAL_PROCESS_SET_ID + 1;
+
+  mutable std::mutex mutex_;
+};
+
+} // namespace common
+} // namespace horovod
+
+#endif // HOROVOD_PROCESS_SET_H
@@ -0,0 +1,103 @@
+# Copyright 2020 Uber Technologies, Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+GLOBAL_PROCESS_SET_ID = 0
+
+# Registered process sets keyed by id, so that gradient functions which only
+# see the id stored on an op can recover the process set.
+_registered_process_sets = {}
+
+
+class ProcessSet(object):
+    """A subset of the Horovod processes that collectives can be performed on.
+
+    Process sets are passed to `hvd.init(process_sets=[...])`, which has to be
+    called with the same process sets in the same order on all processes.
+    Every process set negotiates its tensors independently of the others, so
+    collectives on disjoint process sets do not wait for each other.
+
+    Collectives on process sets are performed with MPI or Gloo on CPU. PyTorch
+    stages GPU tensors through host memory, so they do not use NCCL and are
+    not faster than on CPU; TensorFlow and MXNet only accept CPU tensors.
+
+    Args:
+        ranks: Ranks of the global communicator that are members of the
+               process set.
+    """
+    def __init__(self, ranks):
+        self.ranks = sorted(set(int(rank) for rank in ranks))
+        self.process_set_id = None
+        self._basics = None
+
+    def _setup(self, basics, process_set_id):
+        self._basics = basics
+        self.process_set_id = process_set_id
+        _registered_process_sets[process_set_id] = self
+
+    def _check_registered(self):
+        if self.process_set_id is None:
+            raise ValueError('Process set has not been registered; pass it to '
+                             'hvd.init(process_sets=[...]).')
+
+    def size(self):
+        """Returns the number of Horovod processes in the process set."""
+        self._check_registered()
+        size = self._basics.MPI_LIB_CTYPES.horovod_process_set_size(
+            self.process_set_id)
+        if size == -1:
+            raise ValueError(
+                'Horovod has not been initialized; use hvd.init().')
+        return size
+
+    def rank(self):
+        """Returns the rank of the current process in the process set, or
+        -1 if it is not a member of the process set."""
+        self._check_registered()
+        if not self._basics.is_initialized():
+            raise ValueError(
+                'Horovod has not been initialized; use hvd.init().')
+        return self._basics.MPI_LIB_CTYPES.horovod_process_set_rank(
+            self.process_set_id)
+
+    def included(self):
+        """Returns True if the current process is a member of the process set."""
+        return self.rank() != -1
+
+    def __repr__(self):
+        if self.process_set_id == GLOBAL_PROCESS_SET_ID:
+            return 'ProcessSet(global)'
+        return 'ProcessSet(process_set_id={}, ranks={})'.format(
+            self.process_set_id, self.ranks)
+
+
+# Process set spanning all Horovod processes, collectives use it by default.
+global_process_set = ProcessSet([])
+global_process_set.process_set_id = GLOBAL_PROCESS_SET_ID
+_registered_process_sets[GLOBAL_PROCESS_SET_ID] = global_process_set
+
+
+def process_set_id(process_set):
+    """Returns the id to pass to the Horovod ops for the given process set."""
+    process_set._check_registered()
+    return process_set.process_set_id
+
+
+def process_set_by_id(process_set_id):
+    """Returns the registered process set with the given id."""
+    try:
+        return _registered_process_sets[process_set_id]
+    except KeyError:
+        raise ValueError('No process set with id {} has been registered.'
+                         .format(process_set_id))
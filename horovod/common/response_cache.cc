@@ -183,6 +183,7 @@ void ResponseCache::put(const Response& response, TensorQueue& tensor_queue, boo
       new_response.set_tensor_type(response.tensor_type());
       new_response.set_prescale_factor(response.prescale_factor());
       new_response.set_postscale_factor(response.postscale_factor());
+      new_response.set_priority(response.priority());
 
       // Populate tensor parameters from tensor_queue entry
       TensorParams params;
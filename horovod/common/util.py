@@ -15,20 +15,36 @@
 # limitations under the License.
 # =============================================================================
 
+import heapq
 import json
 import multiprocessing
 import os
+import pickle
+import struct
 import sys
 import sysconfig
 import warnings
 
 from contextlib import contextmanager
 
+import cloudpickle
+
 from horovod.common.exceptions import get_version_mismatch_message, HorovodVersionMismatchError
 
 
 EXTENSIONS = ['tensorflow', 'torch', 'mxnet']
 
+# Objects are allgathered in a first chunk of fixed size, which also carries the
+# size of the serialized object, followed by chunks of at most this many bytes.
+OBJECT_FIRST_CHUNK_SIZE = 64 * 1024
+OBJECT_CHUNK_SIZE = 64 * 1024 * 1024
+# Broadcast objects only pad their first chunk once rather than once per rank,
+# which is kept small so that small objects are not padded much.
+OBJECT_BROADCAST_FIRST_CHUNK_SIZE = 4 * 1024
+
+# Total size of the serialized object and number of out-of-band buffers.
+_OBJECT_HEADER = struct.Struct('<QQ')
+
 
 def get_ext_suffix():
     """Determine library extension for various versions of Python."""
@@ -248,6 +264,73 @@ def split_list(l, n):
     return [l[i * d + min(i, r):(i + 1) * d + min(i + 1, r)] for i in range(n)]
 
 
+def fusion_threshold_bytes():
+    """Returns the tensor fusion threshold the background thread uses, in bytes."""
+    return int(os.environ.get('HOROVOD_FUSION_THRESHOLD', 128 * 1024 * 1024))
+
+
+def sparse_density_threshold():
+    """Returns the density above which sparse gradients are reduced as dense tensors.
+
+    The density is the number of unique rows of all processes together, duplicates across
+    processes included, divided by the number of rows of the dense tensor.
+    """
+    return float(os.environ.get('HOROVOD_SPARSE_DENSITY_THRESHOLD', 1.0))
+
+
+def split_list_by_size(sizes, dtypes, max_bytes):
+    """Groups tensors for grouped allreduces by their size in bytes.
+
+    Tensors are visited in reverse order, the order in which the backward pass produces their
+    gradients. Every tensor joins the open group of its data type, unless the group would then
+    exceed `max_bytes`, in which case it starts a new group. Tensors of different types are
+    never grouped, and a tensor larger than `max_bytes` forms a group of its own.
+
+    Args:
+        sizes: Size in bytes of every tensor.
+        dtypes: Data type of every tensor.
+        max_bytes: Maximum size of a group in bytes, usually the tensor fusion threshold.
+
+    Returns:
+        Lists of tensor indices in ascending order, one per group. Groups are ordered by the
+        time their first tensor becomes ready in the backward pass.
+    """
+    groups = []
+    open_groups = {}
+    for i in reversed(range(len(sizes))):
+        group = open_groups.get(dtypes[i])
+        if group is None or group[1] + sizes[i] > max_bytes:
+            group = [[], 0]
+            groups.append(group)
+            open_groups[dtypes[i]] = group
+        group[0].append(i)
+        group[1] += sizes[i]
+    return [sorted(indices) for indices, _ in groups]
+
+
+def assign_roots(sizes, holders):
+    """Assigns every tensor to one of the `holders` ranks to broadcast it from.
+
+    Tensors are assigned from the largest to the smallest to the holder serving the fewest
+    bytes so far, so that the holders share the egress bandwidth of the broadcast evenly.
+    The assignment is deterministic, so all workers compute the same one.
+
+    Args:
+        sizes: Size in bytes of every tensor.
+        holders: Ranks holding identical values of the tensors.
+
+    Returns:
+        The root rank of every tensor.
+    """
+    loads = [(0, r) for r in sorted(holders)]
+    roots = [None] * len(sizes)
+    for i in sorted(range(len(sizes)), key=lambda i: (-sizes[i], i)):
+        load, root = heapq.heappop(loads)
+        roots[i] = root
+        heapq.heappush(loads, (load + sizes[i], root))
+    return roots
+
+
 def check_installed_version(name, version, exception=None):
     file_path = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)),\
         os.pardir, "metadata.json"))
@@ -258,3 +341,148 @@ def check_installed_version(name, version, exception=None):
                 warnings.warn(get_version_mismatch_message(name, version, installed_version))
             else:
                 raise HorovodVersionMismatchError(name, version, installed_version) from exception
+
+
+def serialize_object(obj, min_size=0):
+    """
+    Serializes an object into a single buffer holding its size, its pickle stream and,
+    with pickle protocol 5, its out-of-band buffers (e.g. the data of numpy arrays),
+    which are copied only once. The buffer is zero padded to at least `min_size` bytes.
+    """
+    buffers = []
+
+    def buffer_callback(buffer):
+        try:
+            buffers.append(buffer.raw())
+        except BufferError:
+            # Non-contiguous buffers are serialized in-band
+            return True
+        return False
+
+    if pickle.HIGHEST_PROTOCOL >= 5:
+        data = cloudpickle.dumps(obj, protocol=5, buffer_callback=buffer_callback)
+    else:
+        data = cloudpickle.dumps(obj)
+
+    offset = _OBJECT_HEADER.size + 8 * len(buffers)
+    total_size = offset + len(data) + sum(b.nbytes for b in buffers)
+    result = bytearray(max(total_size, min_size))
+    _OBJECT_HEADER.pack_into(result, 0, total_size, len(buffers))
+    struct.pack_into('<%dQ' % len(buffers), result, _OBJECT_HEADER.size, *[b.nbytes for b in buffers])
+    for part in [data] + buffers:
+        result[offset:offset + len(part)] = part
+        offset += len(part)
+    return result
+
+
+def serialized_object_size(buf):
+    """Returns the size of the object serialized with `serialize_object` at the start of `buf`."""
+    return _OBJECT_HEADER.unpack_from(buf)[0]
+
+
+def deserialize_object(buf):
+    """
+    Deserializes an object serialized with `serialize_object`. Out-of-band buffers
+    reference the memory of `buf` unless it is read-only.
+    """
+    view = memoryview(buf).cast('B')
+    total_size, num_buffers = _OBJECT_HEADER.unpack_from(view)
+    offset = _OBJECT_HEADER.size
+    sizes = struct.unpack_from('<%dQ' % num_buffers, view, offset)
+    offset += 8 * num_buffers
+
+    data_size = total_size - offset - sum(sizes)
+    data = view[offset:offset + data_size]
+    offset += data_size
+
+    buffers = []
+    for size in sizes:
+        buffer = view[offset:offset + size]
+        buffers.append(bytearray(buffer) if view.readonly else buffer)
+        offset += size
+    return pickle.loads(data, buffers=buffers) if buffers else pickle.loads(data)
+
+
+def broadcast_object_chunks(obj, is_root, broadcast_chunk,
+                            first_chunk_size=OBJECT_BROADCAST_FIRST_CHUNK_SIZE,
+                            chunk_size=OBJECT_CHUNK_SIZE):
+    """
+    Broadcasts an object serialized with `serialize_object`. The first chunk of fixed size
+    carries the size of the object together with the start of its bytes, so that small
+    objects take a single broadcast, while the rest of larger ones is streamed in chunks
+    of `chunk_size` bytes.
+
+    `broadcast_chunk(chunk, index)` broadcasts the bytes of the writable memoryview `chunk`
+    from the root rank and returns the received bytes, which may be `chunk` itself.
+    """
+    if is_root:
+        view = memoryview(serialize_object(obj, min_size=first_chunk_size))
+    else:
+        view = memoryview(bytearray(first_chunk_size))
+
+    first_chunk = view[:first_chunk_size]
+    received = broadcast_chunk(first_chunk, 0)
+    if received is not first_chunk:
+        first_chunk[:] = memoryview(received).cast('B')
+    total_size = serialized_object_size(first_chunk)
+    if not is_root and total_size > first_chunk_size:
+        buf = memoryview(bytearray(total_size))
+        buf[:first_chunk_size] = first_chunk
+        view = buf
+
+    for index, start in enumerate(range(first_chunk_size, total_size, chunk_size), 1):
+        chunk = view[start:min(start + chunk_size, total_size)]
+        received = broadcast_chunk(chunk, index)
+        if received is not chunk:
+            chunk[:] = memoryview(received).cast('B')
+    return obj if is_root else deserialize_object(view)
+
+
+def allgather_object_chunks(obj, allgather_chunk,
+                            first_chunk_size=OBJECT_FIRST_CHUNK_SIZE, chunk_size=OBJECT_CHUNK_SIZE):
+    """
+    Allgathers objects serialized with `serialize_object`. The first chunk of every rank
+    carries the size of its object, so that small objects take a single allgather, while
+    larger ones are streamed in chunks of `chunk_size` bytes per rank.
+
+    `allgather_chunk(chunk, index)` allgathers the memoryview `chunk`, whose size may differ
+    across ranks, and returns the concatenated bytes of all ranks.
+    """
+    def chunk_bounds(total_size, index):
+        start = min(first_chunk_size + (index - 1) * chunk_size, total_size)
+        end = min(start + chunk_size, total_size)
+        return start, end
+
+    view = memoryview(serialize_object(obj))
+    gathered = memoryview(allgather_chunk(view[:first_chunk_size], 0)).cast('B')
+
+    bufs, total_sizes = [], []
+    offset = 0
+    while offset < len(gathered):
+        total_size = serialized_object_size(gathered[offset:])
+        end = offset + min(total_size, first_chunk_size)
+        if total_size > first_chunk_size:
+            buf = memoryview(bytearray(total_size))
+            buf[:first_chunk_size] = gathered[offset:end]
+        else:
+            buf = gathered[offset:end]
+        bufs.append(buf)
+        total_sizes.append(total_size)
+        offset = end
+
+    num_chunks = (max(total_sizes) - first_chunk_size + chunk_size - 1) // chunk_size
+    for index in range(1, num_chunks + 1):
+        start, end = chunk_bounds(len(view), index)
+        # Ranks whose object has been fully sent keep sending a single padding
+        # byte, as not all collectives support empty tensors.
+        chunk = view[start:end] if end > start else memoryview(bytearray(1))
+        gathered = memoryview(allgather_chunk(chunk, index)).cast('B')
+
+        offset = 0
+        for buf, total_size in zip(bufs, total_sizes):
+            start, end = chunk_bounds(total_size, index)
+            if end > start:
+                buf[start:end] = gathered[offset:offset + end - start]
+            offset += max(end - start, 1)
+
+    return [deserialize_object(buf) for buf in bufs]
@@ -176,7 +176,8 @@ struct Request FLATBUFFERS_FINAL_CLASS : private flatbuffers::Table {
     VT_DEVICE = 14,
     VT_TENSOR_SHAPE = 16,
     VT_PRESCALE_FACTOR = 18,
-    VT_POSTSCALE_FACTOR = 20
+    VT_POSTSCALE_FACTOR = 20,
+    VT_PRIORITY = 22
   };
   int32_t request_rank() const {
     return GetField<int32_t>(VT_REQUEST_RANK, 0);
@@ -205,6 +206,9 @@ struct Request FLATBUFFERS_FINAL_CLASS : private flatbuffers::Table {
   double postscale_factor() const {
     return GetField<double>(VT_POSTSCALE_FACTOR, 0.0);
   }
+  int32_t priority() const {
+    return GetField<int32_t>(VT_PRIORITY, 0);
+  }
   bool Verify(flatbuffers::Verifier &verifier) const {
     return VerifyTableStart(verifier) &&
            VerifyField<int32_t>(verifier, VT_REQUEST_RANK) &&
@@ -218,6 +222,7 @@ struct Request FLATBUFFERS_FINAL_CLASS : private flatbuffers::Table {
            verifier.VerifyVector(tensor_shape()) &&
            VerifyField<double>(verifier, VT_PRESCALE_FACTOR) &&
            VerifyField<double>(verifier, VT_POSTSCALE_FACTOR) &&
+           VerifyField<int32_t>(verifier, VT_PRIORITY) &&
            verifier.EndTable();
   }
 };
@@ -252,6 +257,9 @@ struct RequestBuilder {
   void add_postscale_factor(double postscale_factor) {
     fbb_.AddElement<double>(Request::VT_POSTSCALE_FACTOR, postscale_factor, 0.0);
   }
+  void add_priority(int32_t priority) {
+    fbb_.AddElement<int32_t>(Request::VT_PRIORITY, priority, 0);
+  }
   explicit RequestBuilder(flatbuffers::FlatBufferBuilder &_fbb)
         : fbb_(_fbb) {
     start_ = fbb_.StartTable();
@@ -274,10 +282,12 @@ inline flatbuffers::Offset<Request> CreateRequest(
     int32_t device = 0,
     flatbuffers::Offset<flatbuffers::Vector<int64_t>> tensor_shape = 0,
     double prescale_factor = 0.0,
-    double postscale_factor = 0.0) {
+    double postscale_factor = 0.0,
+    int32_t priority = 0) {
   RequestBuilder builder_(_fbb);
   builder_.add_postscale_factor(postscale_factor);
   builder_.add_prescale_factor(prescale_factor);
+  builder_.add_priority(priority);
   builder_.add_tensor_shape(tensor_shape);
   builder_.add_device(device);
   builder_.add_root_rank(root_rank);
@@ -298,7 +308,8 @@ inline flatbuffers::Offset<Request> CreateRequestDirect(
     int32_t device = 0,
     const std::vector<int64_t> *tensor_shape = nullptr,
     double prescale_factor = 0.0,
-    double postscale_factor = 0.0) {
+    double postscale_factor = 0.0,
+    int32_t priority = 0) {
   auto tensor_name__ = tensor_name ? _fbb.CreateString(tensor_name) : 0;
   auto tensor_shape__ = tensor_shape ? _fbb.CreateVector<int64_t>(*tensor_shape) : 0;
   return horovod::common::wire::CreateRequest(
@@ -311,7 +322,8 @@ inline flatbuffers::Offset<Request> CreateRequestDirect(
       device,
       tensor_shape__,
       prescale_factor,
-      postscale_factor);
+      postscale_factor,
+      priority);
 }
 
 struct RequestList FLATBUFFERS_FINAL_CLASS : private flatbuffers::Table {
@@ -386,7 +398,8 @@ struct Response FLATBUFFERS_FINAL_CLASS : private flatbuffers::Table {
     VT_TENSOR_SIZES = 12,
     VT_TENSOR_TYPE = 14,
     VT_PRESCALE_FACTOR = 16,
-    VT_POSTSCALE_FACTOR = 18
+    VT_POSTSCALE_FACTOR = 18,
+    VT_PRIORITY = 20
   };
   horovod::common::wire::ResponseType response_type() const {
     return static_cast<horovod::common::wire::ResponseType>(GetField<int8_t>(VT_RESPONSE_TYPE, 0));
@@ -412,6 +425,9 @@ struct Response FLATBUFFERS_FINAL_CLASS : private flatbuffers::Table {
   double postscale_factor() const {
     return GetField<double>(VT_POSTSCALE_FACTOR, 0.0);
   }
+  int32_t priority() const {
+    return GetField<int32_t>(VT_PRIORITY, 0);
+  }
   bool Verify(flatbuffers::Verifier &verifier) const {
     return VerifyTableStart(verifier) &&
            VerifyField<int8_t>(verifier, VT_RESPONSE_TYPE) &&
@@ -427,6 +443,7 @@ struct Response FLATBUFFERS_FINAL_CLASS : private flatbuffers::Table {
            VerifyField<int8_t>(verifier, VT_TENSOR_TYPE) &&
            VerifyField<double>(verifier, VT_PRESCALE_FACTOR) &&
            VerifyField<double>(verifier, VT_POSTSCALE_FACTOR) &&
+           VerifyField<int32_t>(verifier, VT_PRIORITY) &&
            verifier.EndTable();
   }
 };
@@ -458,6 +475,9 @@ struct ResponseBuilder {
   void add_postscale_factor(double postscale_factor) {
     fbb_.AddElement<double>(Response::VT_POSTSCALE_FACTOR, postscale_factor, 0.0);
   }
+  void add_priority(int32_t priority) {
+    fbb_.AddElement<int32_t>(Response::VT_PRIORITY, priority, 0);
+  }
   explicit ResponseBuilder(flatbuffers::FlatBufferBuilder &_fbb)
         : fbb_(_fbb) {
     start_ = fbb_.StartTable();
@@ -479,10 +499,12 @@ inline flatbuffers::Offset<Response> CreateResponse(
     flatbuffers::Offset<flatbuffers::Vector<int64_t>> tensor_sizes = 0,
     horovod::common::wire::DataType tensor_type = horovod::common::wire::DataType_HOROVOD_UINT8,
     double prescale_factor = 0.0,
-    double postscale_factor = 0.0) {
+    double postscale_factor = 0.0,
+    int32_t priority = 0) {
   ResponseBuilder builder_(_fbb);
   builder_.add_postscale_factor(postscale_factor);
   builder_.add_prescale_factor(prescale_factor);
+  builder_.add_priority(priority);
   builder_.add_tensor_sizes(tensor_sizes);
   builder_.add_devices(devices);
   builder_.add_error_message(error_message);
@@ -501,7 +523,8 @@ inline flatbuffers::Offset<Response> CreateResponseDirect(
     const std::vector<int64_t> *tensor_sizes = nullptr,
     horovod::common::wire::DataType tensor_type = horovod::common::wire::DataType_HOROVOD_UINT8,
     double prescale_factor = 0.0,
-    double postscale_factor = 0.0) {
+    double postscale_factor = 0.0,
+    int32_t priority = 0) {
   auto tensor_names__ = tensor_names ? _fbb.CreateVector<flatbuffers::Offset<flatbuffers::String>>(*tensor_names) : 0;
   auto error_message__ = error_message ? _fbb.CreateString(error_message) : 0;
   auto devices__ = devices ? _fbb.CreateVector<int32_t>(*devices) : 0;
@@ -515,7 +538,8 @@ inline flatbuffers::Offset<Response> CreateResponseDirect(
       tensor_sizes__,
       tensor_type,
       prescale_factor,
-      postscale_factor);
+      postscale_factor,
+      priority);
 }
 
 struct ResponseList FLATBUFFERS_FINAL_CLASS : private flatbuffers::Table {
@@ -70,9 +70,12 @@ def DistributedOptimizer(optimizer, name=None,
         num_groups: Number of groups to assign gradient allreduce ops to for explicit
                     grouping. Defaults to no explicit groups.
         groups: The parameter to group the gradient allreduce ops. Accept values is a
-                non-negative integer or a list of list of tf.Variable.
+                non-negative integer, 'auto' or a list of list of tf.Variable.
                 If groups is a non-negative integer, it is the number of groups to assign
                 gradient allreduce ops to for explicit grouping.
+                If groups is 'auto', gradients are grouped by data type into groups of at most
+                the tensor fusion threshold (HOROVOD_FUSION_THRESHOLD) bytes, in the order
+                the backward pass produces them.
                 If groups is a list of list of tf.Variable. Variables in the same
                 inner list will be assigned to the same group, while parameter that does
                 not appear in any list will form a group itself.
@@ -91,8 +94,8 @@ def DistributedOptimizer(optimizer, name=None,
             groups = num_groups
 
     if groups is not None:
-        if not (isinstance(groups, list) or groups > 0):
-            raise ValueError('groups should be a non-negative integer or '
+        if not (isinstance(groups, list) or groups == 'auto' or groups > 0):
+            raise ValueError('groups should be a non-negative integer, \'auto\' or '
                             'a list of list of tf.Variable.')
 
     return _impl.create_distributed_optimizer(
@@ -13,7 +13,7 @@
 # limitations under the License.
 # ==============================================================================
 
-from horovod.common.util import check_extension, split_list
+from horovod.common.util import check_extension, fusion_threshold_bytes, split_list, split_list_by_size
 
 check_extension('horovod.mxnet', 'HOROVOD_WITH_MXNET',
                 __file__, 'mpi_lib')
@@ -22,20 +22,32 @@ from horovod.mxnet.functions import allgather_object, broadcast_object
 from horovod.mxnet.mpi_ops import allgather
 from horovod.mxnet.mpi_ops import allreduce, allreduce_, grouped_allreduce, grouped_allreduce_
 from horovod.mxnet.mpi_ops import alltoall
-from horovod.mxnet.mpi_ops import broadcast, broadcast_
+from horovod.mxnet.mpi_ops import reducescatter
+from horovod.mxnet.mpi_ops import broadcast, broadcast_, grouped_broadcast, grouped_broadcast_
 from horovod.mxnet.mpi_ops import init, shutdown
 from horovod.mxnet.mpi_ops import is_initialized, start_timeline, stop_timeline
 from horovod.mxnet.mpi_ops import size, local_size, cross_size, rank, local_rank, cross_rank
 from horovod.mxnet.mpi_ops import mpi_threads_supported, mpi_enabled, mpi_built
 from horovod.mxnet.mpi_ops import gloo_enabled, gloo_built
 from horovod.mxnet.mpi_ops import nccl_built, ddl_built, ccl_built, cuda_built, rocm_built
+from horovod.mxnet.mpi_ops import ProcessSet, global_process_set
 
 import mxnet as mx
+import numpy as np
 from collections import OrderedDict, defaultdict
 import types
 import warnings
 
 
+def _split_by_size(tensors):
+    """Groups the indices of `tensors` by data type up to the tensor fusion threshold."""
+    sizes = [t.size * np.dtype(t.dtype).itemsize for t in tensors]
+    dtypes = [np.dtype(t.dtype) for t in tensors]
+    # Gradients are reduced after the backward pass, so groups of the first
+    # parameters, which are needed first in the next step, go first.
+    return sorted(split_list_by_size(sizes, dtypes, fusion_threshold_bytes()))
+
+
 # This is where Horovod's DistributedOptimizer wrapper for MXNet goes
 class DistributedOptimizer(mx.optimizer.Optimizer):
     def __init__(self, optimizer, gradient_predivide_factor=1.0, num_groups=0):
@@ -59,9 +71,14 @@ class DistributedOptimizer(mx.optimizer.Optimizer):
         if size() == 1: return
 
         if isinstance(index, (tuple, list)):
-            if (self._num_groups > 0):
-                grad_split = split_list(grad, self._num_groups)
-                index_split = split_list(index, self._num_groups)
+            if self._num_groups == 'auto' or self._num_groups > 0:
+                if self._num_groups == 'auto':
+                    groups = _split_by_size(grad)
+                    grad_split = [[grad[i] for i in group] for group in groups]
+                    index_split = [[index[i] for i in group] for group in groups]
+                else:
+                    grad_split = split_list(grad, self._num_groups)
+                    index_split = split_list(index, self._num_groups)
 
                 for i, (grads, indices) in enumerate(zip(grad_split, index_split)):
                     grouped_allreduce_(tensors=grads, average=False, name="{}:{}".format(indices[0], indices[-1]), priority=-i,
@@ -113,6 +130,10 @@ class DistributedTrainer(mx.gluon.Trainer):
         prefix: the prefix of the parameters this trainer manages.
               If multiple trainers are used in the same program,
               they must be specified by different prefixes to avoid tensor name collision.
+        num_groups: Number of groups to assign gradient allreduce ops to for explicit
+              grouping, or 'auto' to group gradients by data type into groups of at most
+              the tensor fusion threshold (HOROVOD_FUSION_THRESHOLD) bytes.
+              Defaults to no explicit groups.
     """
     def __init__(self, params, optimizer, optimizer_params=None,
                  gradient_predivide_factor=1.0, prefix=None,
@@ -147,7 +168,7 @@ class DistributedTrainer(mx.gluon.Trainer):
     def _allreduce_grads(self):
         if size() == 1: return
 
-        if (self._num_groups > 0):
+        if self._num_groups == 'auto' or self._num_groups > 0:
             grads = []
             names = []
 
@@ -156,8 +177,13 @@ class DistributedTrainer(mx.gluon.Trainer):
                     grads.append(param.list_grad()[0])
                     names.append(self._prefix + str(i))
 
-            grads_split = split_list(grads, self._num_groups)
-            names_split = split_list(names, self._num_groups)
+            if self._num_groups == 'auto':
+                groups = _split_by_size(grads)
+                grads_split = [[grads[i] for i in group] for group in groups]
+                names_split = [[names[i] for i in group] for group in groups]
+            else:
+                grads_split = split_list(grads, self._num_groups)
+                names_split = split_list(names, self._num_groups)
 
             for i, (group_grads, group_names) in enumerate(zip(grads_split, names_split)):
                 # For better performance, enqueue groups in separate grouped_allreduce calls by dtype.
@@ -206,7 +232,6 @@ def broadcast_parameters(params, root_rank=0, prefix=None):
     if size() == 1: return
 
     tensors = []
-    names = []
     assert prefix is None or isinstance(prefix, str)
     prefix = prefix if prefix else ""
     try:
@@ -221,7 +246,6 @@ def broadcast_parameters(params, root_rank=0, prefix=None):
                     tensors.append(p.data())
                 else:
                     tensors.append(p)
-                names.append(prefix + str(name))
             except mx.gluon.parameter.DeferredInitializationError:
                 # Inject wrapper method with post-initialization broadcast to
                 # handle parameters with deferred initialization
@@ -232,6 +256,9 @@ def broadcast_parameters(params, root_rank=0, prefix=None):
     else:
         raise ValueError('invalid params of type: %s' % type(params))
 
-    # Run broadcasts.
-    for tensor, name in zip(tensors, names):
-        broadcast_(tensor, root_rank, name=name)
+    # Run broadcasts, grouped per device so that they are negotiated together.
+    groups = OrderedDict()
+    for tensor in tensors:
+        groups.setdefault(str(tensor.context), []).append(tensor)
+    for index, group in enumerate(groups.values()):
+        grouped_broadcast_(group, root_rank, name='%sbroadcast_parameters.%d' % (prefix, index))
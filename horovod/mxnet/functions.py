@@ -15,11 +15,10 @@
 # limitations under the License.
 # ==============================================================================
 
-import io
-
-import cloudpickle
 import mxnet as mx
+import numpy as np
 
+from horovod.common.util import allgather_object_chunks, broadcast_object_chunks
 from horovod.mxnet.mpi_ops import allgather, broadcast_
 from horovod.mxnet.mpi_ops import rank, size
 
@@ -28,6 +27,9 @@ def broadcast_object(obj, root_rank=0, name=None):
     """
     Serializes and broadcasts an object from root rank to all other processes.
 
+    Small objects are broadcast together with their size in a single operation,
+    large objects are streamed in chunks.
+
     Arguments:
         obj: An object capable of being serialized without losing any context.
         root_rank: The rank of the process from which parameters will be
@@ -40,31 +42,21 @@ def broadcast_object(obj, root_rank=0, name=None):
     if name is None:
         name = type(obj).__name__
 
-    if rank() == root_rank:
-        b = io.BytesIO()
-        cloudpickle.dump(obj, b)
-        t = mx.nd.array(bytearray(b.getvalue()), dtype='byte')
-        sz = mx.nd.array([t.size], dtype='int')
-
-        broadcast_(sz, root_rank, name + '.sz')
-    else:
-        sz = mx.nd.empty(shape=[1], dtype='int')
-        broadcast_(sz, root_rank, name + '.sz')
-        t = mx.nd.empty(shape=[sz.asscalar()], dtype='byte')
-
-    broadcast_(t, root_rank, name + '.t')
-
-    if rank() != root_rank:
-        buf = io.BytesIO(t.asnumpy().tobytes())
-        obj = cloudpickle.load(buf)
+    def broadcast_chunk(chunk, index):
+        t = mx.nd.array(np.frombuffer(chunk, dtype=np.uint8), dtype='uint8')
+        broadcast_(t, root_rank, '%s.%d' % (name, index))
+        return t.asnumpy()
 
-    return obj
+    return broadcast_object_chunks(obj, rank() == root_rank, broadcast_chunk)
 
 
 def allgather_object(obj, name=None):
     """
     Serializes and allgathers an object from all other processes.
 
+    Small objects are allgathered together with their sizes in a single operation,
+    large objects are streamed in chunks.
+
     Arguments:
         obj: An object capable of being serialized without losing any context.
         name: Optional name to use during allgather, will default to the class
@@ -76,22 +68,8 @@ def allgather_object(obj, name=None):
     if name is None:
         name = type(obj).__name__
 
-    def load(byte_array):
-        buf = io.BytesIO(byte_array.tobytes())
-        return cloudpickle.load(buf)
-
-    b = io.BytesIO()
-    cloudpickle.dump(obj, b)
-
-    t = mx.nd.array(bytearray(b.getvalue()), dtype='byte')
-    sz = mx.nd.array([t.size], dtype='int')
-
-    sizes = allgather(sz, name=name + '.sz').asnumpy()
-    gathered = allgather(t, name=name + '.t').asnumpy()
-
-    def select(i):
-        start = sum(sizes[:i])
-        end = start + sizes[i]
-        return gathered[start:end]
+    def allgather_chunk(chunk, index):
+        t = mx.nd.array(np.frombuffer(chunk, dtype=np.uint8), dtype='uint8')
+        return allgather(t, name='%s.%d' % (name, index)).asnumpy()
 
-    return [load(select(i)) for i in range(size())]
+    return allgather_object_chunks(obj, allgather_chunk)
@@ -43,6 +43,7 @@ static const char* ALLREDUCE_OP_TYPE_NAME = "horovod_allreduce";
 static const char* ALLGATHER_OP_TYPE_NAME = "horovod_allgather";
 static const char* BROADCAST_OP_TYPE_NAME = "horovod_broadcast";
 static const char* ALLTOALL_OP_TYPE_NAME = "horovod_alltoall";
+static const char* REDUCESCATTER_OP_TYPE_NAME = "horovod_reducescatter";
 
 inline void InvokeCompleteCallback(CallbackOnComplete on_complete, const Status& status) {
   if (status.ok()) {
@@ -63,6 +64,8 @@ inline const char* GetOpTypeName(OperationType op_type) {
       return BROADCAST_OP_TYPE_NAME;
     case OperationType::ALLTOALL:
       return ALLTOALL_OP_TYPE_NAME;
+    case OperationType::REDUCESCATTER:
+      return REDUCESCATTER_OP_TYPE_NAME;
     default:
       throw std::logic_error("Unsupported Horovod operation type.");
   }
@@ -131,33 +134,42 @@ void DoHorovodOperation(void*, void* on_complete_ptr, void* param) {
 
       enqueue_result = EnqueueTensorAllreduces(
           hvd_contexts, hvd_tensors, hvd_outputs, ready_events, ops_param->op_names, device,
-          callbacks, (average) ? ReduceOp::AVERAGE : ReduceOp::SUM, prescale_factor, postscale_factor);
+          callbacks, (average) ? ReduceOp::AVERAGE : ReduceOp::SUM, prescale_factor, postscale_factor,
+          0, ops_param->process_set_id);
       break;
     case OperationType::ALLGATHER:
       enqueue_result = EnqueueTensorAllgather(
           hvd_contexts[0], hvd_tensors[0], ready_events[0], ops_param->op_names[0], device,
-          callbacks[0]);
+          callbacks[0], ops_param->process_set_id);
       break;
     case OperationType::BROADCAST:
-      if (horovod_rank() != ops_param->root_rank) {
-        hvd_outputs.emplace_back(std::make_shared<MXTensor>(ops_param->output_tensors[0].get()));
-      } else {
-        hvd_outputs.emplace_back(nullptr);
+      for (int i = 0; i < num_tensors; ++i) {
+        if (horovod_process_set_rank(ops_param->process_set_id) != ops_param->root_rank) {
+          hvd_outputs.emplace_back(std::make_shared<MXTensor>(ops_param->output_tensors[i].get()));
+        } else {
+          hvd_outputs.emplace_back(nullptr);
+        }
       }
 
-      enqueue_result = EnqueueTensorBroadcast(
-          hvd_contexts[0], hvd_tensors[0], hvd_outputs[0], ops_param->root_rank,
-          ready_events[0], ops_param->op_names[0], device,
-          callbacks[0]);
+      enqueue_result = EnqueueTensorBroadcasts(
+          hvd_contexts, hvd_tensors, hvd_outputs, ops_param->root_rank,
+          ready_events, ops_param->op_names, device, callbacks,
+          ops_param->process_set_id);
       break;
     case OperationType::ALLTOALL:
     {
       auto hvd_splits = std::make_shared<MXTensor>(ops_param->splits_tensor.get());
       enqueue_result = EnqueueTensorAlltoall(
           hvd_contexts[0], hvd_tensors[0], hvd_splits, ready_events[0], ops_param->op_names[0],
-          device, callbacks[0]);
+          device, callbacks[0], ops_param->process_set_id);
       break;
     }
+    case OperationType::REDUCESCATTER:
+      enqueue_result = EnqueueTensorReducescatter(
+          hvd_contexts[0], hvd_tensors[0], ready_events[0], ops_param->op_names[0], device,
+          callbacks[0], (average) ? ReduceOp::AVERAGE : ReduceOp::SUM, prescale_factor,
+          postscale_factor, ops_param->process_set_id);
+      break;
     default:
       throw std::logic_error("Unsupported Horovod operation type.");
   }
@@ -172,7 +184,8 @@ inline void PushHorovodOperation(OperationType op_type, NDArray* const * inputs,
                                  NDArray* splits = nullptr,
                                  NDArray* output_received_splits = nullptr,
                                  double prescale_factor = 1.0,
-                                 double postscale_factor = 1.0) {
+                                 double postscale_factor = 1.0,
+                                 int process_set_id = 0) {
   auto op_type_name = GetOpTypeName(op_type);
 
   auto first_input_var = inputs[0]->var();
@@ -242,7 +255,8 @@ inline void PushHorovodOperation(OperationType op_type, NDArray* const * inputs,
 
   auto ops_param = CreateMpiOpsParam(std::move(input_copies), std::move(output_copies),
     std::move(outputs_vec), cpu_input_tensors, cpu_output_tensors, op_type, std::move(op_names), root_rank,
-    average, splits_tensor, received_splits_tensor, prescale_factor, postscale_factor);
+    average, splits_tensor, received_splits_tensor, prescale_factor, postscale_factor,
+    process_set_id);
 
   // Not in-place
   if (!inplace) {
@@ -318,27 +332,34 @@ void DoHorovodOperationCudaOnCPU(void*, void* on_complete_ptr, void* param) {
     case OperationType::ALLREDUCE:
       enqueue_result = EnqueueTensorAllreduces(
           hvd_contexts, hvd_cpu_buffers, hvd_cpu_buffers, ready_events, ops_param->op_names, device,
-          callbacks, (average) ? ReduceOp::AVERAGE : ReduceOp::SUM, prescale_factor, postscale_factor);
+          callbacks, (average) ? ReduceOp::AVERAGE : ReduceOp::SUM, prescale_factor, postscale_factor,
+          0, ops_param->process_set_id);
       break;
     case OperationType::ALLGATHER:
       enqueue_result = EnqueueTensorAllgather(
           hvd_contexts[0], hvd_cpu_buffers[0], ready_events[0], ops_param->op_names[0], device,
-          callbacks[0]);
+          callbacks[0], ops_param->process_set_id);
       break;
     case OperationType::BROADCAST:
-      enqueue_result = EnqueueTensorBroadcast(
-          hvd_contexts[0], hvd_cpu_buffers[0], hvd_cpu_buffers[0], ops_param->root_rank,
-          ready_events[0], ops_param->op_names[0], device,
-          callbacks[0]);
+      enqueue_result = EnqueueTensorBroadcasts(
+          hvd_contexts, hvd_cpu_buffers, hvd_cpu_buffers, ops_param->root_rank,
+          ready_events, ops_param->op_names, device, callbacks,
+          ops_param->process_set_id);
       break;
     case OperationType::ALLTOALL:
     {
       auto hvd_splits = std::make_shared<MXTensor>(ops_param->splits_tensor.get());
       enqueue_result = EnqueueTensorAlltoall(
           hvd_contexts[0], hvd_cpu_buffers[0], hvd_splits, ready_events[0], ops_param->op_names[0],
-          device, callbacks[0]);
+          device, callbacks[0], ops_param->process_set_id);
       break;
     }
+    case OperationType::REDUCESCATTER:
+      enqueue_result = EnqueueTensorReducescatter(
+          hvd_contexts[0], hvd_cpu_buffers[0], ready_events[0], ops_param->op_names[0], device,
+          callbacks[0], (average) ? ReduceOp::AVERAGE : ReduceOp::SUM, prescale_factor,
+          postscale_factor, ops_param->process_set_id);
+      break;
     default:
       throw std::logic_error("Unsupported Horovod operation type.");
   }
@@ -353,7 +374,8 @@ inline void PushHorovodOperationCudaOnCPU(OperationType op_type, NDArray* const
                                           NDArray* splits = nullptr,
                                           NDArray* output_received_splits = nullptr,
                                           double prescale_factor = 1.0,
-                                          double postscale_factor = 1.0) {
+                                          double postscale_factor = 1.0,
+                                          int process_set_id = 0) {
 
   auto op_type_name = GetOpTypeName(op_type);
 
@@ -406,7 +428,8 @@ inline void PushHorovodOperationCudaOnCPU(OperationType op_type, NDArray* const
 
   auto ops_param = CreateMpiOpsParam(std::move(input_copies), std::move(output_copies),
     std::move(outputs_vec), cpu_input_tensors, cpu_output_tensors, op_type, std::move(op_names), root_rank,
-    average, splits_tensor, received_splits_tensor, prescale_factor, postscale_factor);
+    average, splits_tensor, received_splits_tensor, prescale_factor, postscale_factor,
+    process_set_id);
 
   std::vector<void*> cpu_input_vars;
   std::vector<void*> cpu_output_vars;
@@ -418,7 +441,8 @@ inline void PushHorovodOperationCudaOnCPU(OperationType op_type, NDArray* const
   }
 
   if (op_type == OperationType::ALLGATHER ||
-      op_type == OperationType::ALLTOALL) {
+      op_type == OperationType::ALLTOALL ||
+      op_type == OperationType::REDUCESCATTER) {
     if (splits) {
       // Add splits tensor to input list to enforce dependency on possible async D2H copy
       cpu_input_vars.push_back(splits_tensor->var());
@@ -458,7 +482,7 @@ extern "C" int horovod_mxnet_allreduce_async(NDArray* const * inputs,
                                              int priority,
                                              double prescale_factor,
                                              double postscale_factor,
-                                             int num_tensors) {
+                                             int num_tensors, int process_set_id) {
   MX_API_BEGIN();
 
 #if HAVE_ROCM
@@ -471,21 +495,23 @@ extern "C" int horovod_mxnet_allreduce_async(NDArray* const * inputs,
 #if HAVE_CUDA && !HOROVOD_GPU_ALLREDUCE
   if (IsTensorOnCPU(inputs[0]) && IsTensorOnCPU(outputs[0])) {
     PushHorovodOperation(OperationType::ALLREDUCE, inputs, outputs,
-                         name, priority, num_tensors, -1, average, nullptr, nullptr, prescale_factor, postscale_factor);
+                         name, priority, num_tensors, -1, average, nullptr, nullptr, prescale_factor, postscale_factor,
+                         process_set_id);
   } else {
     PushHorovodOperationCudaOnCPU(OperationType::ALLREDUCE, inputs, outputs,
-                                  name, priority, num_tensors, -1, average, nullptr, nullptr, prescale_factor, postscale_factor);
+                                  name, priority, num_tensors, -1, average, nullptr, nullptr, prescale_factor, postscale_factor,
+                                  process_set_id);
   }
 #else
   PushHorovodOperation(OperationType::ALLREDUCE, inputs, outputs,
                        name, priority, num_tensors, -1, average, nullptr,
-                       nullptr, prescale_factor, postscale_factor);
+                       nullptr, prescale_factor, postscale_factor, process_set_id);
 #endif
 
 #if HAVE_ROCM
   if (average_in_framework) {
     for (int i = 0; i < num_tensors; ++i) {
-      *outputs[i] /= horovod_size();
+      *outputs[i] /= horovod_process_set_size(process_set_id);
     }
   }
 #endif
@@ -495,43 +521,51 @@ extern "C" int horovod_mxnet_allreduce_async(NDArray* const * inputs,
 
 extern "C" int horovod_mxnet_allgather_async(NDArray* input,
                                              NDArray* output,
-                                             const char* name, int priority) {
+                                             const char* name, int priority,
+                                             int process_set_id) {
   MX_API_BEGIN();
 
 #if HAVE_CUDA && !HOROVOD_GPU_ALLGATHER
   if (IsTensorOnCPU(input) && IsTensorOnCPU(output)) {
     PushHorovodOperation(OperationType::ALLGATHER, &input, &output,
-                         name, priority, 1);
+                         name, priority, 1, -1, true, nullptr, nullptr, 1.0, 1.0,
+                         process_set_id);
   } else {
     PushHorovodOperationCudaOnCPU(OperationType::ALLGATHER, &input, &output,
-                                  name, priority, 1);
+                                  name, priority, 1, -1, true, nullptr, nullptr, 1.0, 1.0,
+                                  process_set_id);
   }
 #else
   PushHorovodOperation(OperationType::ALLGATHER, &input, &output,
-                       name, priority, 1);
+                       name, priority, 1, -1, true, nullptr, nullptr, 1.0, 1.0,
+                       process_set_id);
 #endif
 
   MX_API_END();
 }
 
-extern "C" int horovod_mxnet_broadcast_async(NDArray* input,
-                                             NDArray* output,
+extern "C" int horovod_mxnet_broadcast_async(NDArray* const * inputs,
+                                             NDArray* const * outputs,
                                              const char* name, int root_rank,
-                                             int priority) {
+                                             int priority, int num_tensors,
+                                             int process_set_id) {
   MX_API_BEGIN();
 
 #if HAVE_CUDA && !HOROVOD_GPU_BROADCAST
-  if (IsTensorOnCPU(input) && IsTensorOnCPU(output)) {
-    PushHorovodOperation(OperationType::BROADCAST, &input, &output,
-                         name, priority, 1, root_rank);
+  if (IsTensorOnCPU(inputs[0]) && IsTensorOnCPU(outputs[0])) {
+    PushHorovodOperation(OperationType::BROADCAST, inputs, outputs,
+                         name, priority, num_tensors, root_rank, true, nullptr,
+                         nullptr, 1.0, 1.0, process_set_id);
 
   } else {
-    PushHorovodOperationCudaOnCPU(OperationType::BROADCAST, &input, &output,
-                                  name, priority, 1, root_rank);
+    PushHorovodOperationCudaOnCPU(OperationType::BROADCAST, inputs, outputs,
+                                  name, priority, num_tensors, root_rank, true,
+                                  nullptr, nullptr, 1.0, 1.0, process_set_id);
   }
 #else
-  PushHorovodOperation(OperationType::BROADCAST, &input, &output,
-                       name, priority, 1, root_rank);
+  PushHorovodOperation(OperationType::BROADCAST, inputs, outputs,
+                       name, priority, num_tensors, root_rank, true, nullptr,
+                       nullptr, 1.0, 1.0, process_set_id);
 #endif
 
   MX_API_END();
@@ -564,5 +598,34 @@ extern "C" int horovod_mxnet_alltoall_async(NDArray* input,
   MX_API_END();
 }
 
+extern "C" int horovod_mxnet_reducescatter_async(NDArray* input,
+                                                 NDArray* output,
+                                                 const char* name, bool average,
+                                                 int priority,
+                                                 double prescale_factor,
+                                                 double postscale_factor,
+                                                 int process_set_id) {
+  MX_API_BEGIN();
+
+  // Reducescatter is only implemented on the CPU.
+#if HAVE_CUDA
+  if (IsTensorOnCPU(input) && IsTensorOnCPU(output)) {
+    PushHorovodOperation(OperationType::REDUCESCATTER, &input, &output,
+                         name, priority, 1, -1, average, nullptr, nullptr,
+                         prescale_factor, postscale_factor, process_set_id);
+  } else {
+    PushHorovodOperationCudaOnCPU(OperationType::REDUCESCATTER, &input, &output,
+                                  name, priority, 1, -1, average, nullptr, nullptr,
+                                  prescale_factor, postscale_factor, process_set_id);
+  }
+#else
+  PushHorovodOperation(OperationType::REDUCESCATTER, &input, &output,
+                       name, priority, 1, -1, average, nullptr, nullptr,
+                       prescale_factor, postscale_factor, process_set_id);
+#endif
+
+  MX_API_END();
+}
+
 } // namespace mxnet
 } // namespace horovod
@@ -25,6 +25,8 @@ from mxnet.base import c_handle_array, c_str, c_str_array, check_call, string_ty
 
 from horovod.common.util import check_installed_version, get_ext_suffix
 from horovod.common.basics import HorovodBasics as _HorovodBasics
+from horovod.common.process_sets import ProcessSet, global_process_set, \
+    process_set_id as _process_set_id
 
 # Check possible symbol not found error from mxnet version mismatch
 try:
@@ -64,7 +66,7 @@ MPI_MXNET_LIB_CTYPES = ctypes.CDLL(dll_path, ctypes.RTLD_GLOBAL)
 
 
 def allreduce(tensor, average=True, name=None, priority=0, prescale_factor=1.0,
-              postscale_factor=1.0):
+              postscale_factor=1.0, process_set=global_process_set):
     """
     A function that performs averaging or summation of the input tensor over
     all the Horovod processes. The input tensor is not modified.
@@ -87,6 +89,8 @@ def allreduce(tensor, average=True, name=None, priority=0, prescale_factor=1.0,
                   are likely to be executed before other operations.
         prescale_factor: Multiplicative factor to scale tensor before allreduce
         postscale_factor: Multiplicative factor to scale tensor after allreduce
+        process_set: Process set object to limit this operation to a subset of
+                     Horovod processes. Default is the global process set.
 
     Returns:
         A tensor of the same shape and type as `tensor`, averaged or summed
@@ -103,13 +107,14 @@ def allreduce(tensor, average=True, name=None, priority=0, prescale_factor=1.0,
         ctypes.byref(c_in), ctypes.byref(c_out), c_name, ctypes.c_bool(average),
         ctypes.c_int(priority),
         ctypes.c_double(prescale_factor),
-        ctypes.c_double(postscale_factor), ctypes.c_int(1)))
+        ctypes.c_double(postscale_factor), ctypes.c_int(1),
+        ctypes.c_int(_process_set_id(process_set))))
 
     return output
 
 
 def allreduce_(tensor, average=True, name=None, priority=0, prescale_factor=1.0,
-              postscale_factor=1.0):
+              postscale_factor=1.0, process_set=global_process_set):
     """
     A function that performs in-place averaging or summation of the input
     tensor over all the Horovod processes.
@@ -128,6 +133,8 @@ def allreduce_(tensor, average=True, name=None, priority=0, prescale_factor=1.0,
                   are likely to be executed before other operations.
         prescale_factor: Multiplicative factor to scale tensor before allreduce
         postscale_factor: Multiplicative factor to scale tensor after allreduce
+        process_set: Process set object to limit this operation to a subset of
+                     Horovod processes. Default is the global process set.
 
     Returns:
         A tensor of the same shape and type as `tensor`, averaged or summed
@@ -143,12 +150,13 @@ def allreduce_(tensor, average=True, name=None, priority=0, prescale_factor=1.0,
         ctypes.c_int(priority),
         ctypes.c_double(prescale_factor),
         ctypes.c_double(postscale_factor),
-        ctypes.c_int(1)))
+        ctypes.c_int(1),
+        ctypes.c_int(_process_set_id(process_set))))
 
     return tensor
 
 def grouped_allreduce(tensors, average=True, name=None, priority=0, prescale_factor=1.0,
-              postscale_factor=1.0):
+              postscale_factor=1.0, process_set=global_process_set):
     """
     A function that performs averaging or summation of the input
     tensors over all the Horovod processes. The input tensors are not modified.
@@ -169,6 +177,8 @@ def grouped_allreduce(tensors, average=True, name=None, priority=0, prescale_fac
                   are likely to be executed before other operations.
         prescale_factor: Multiplicative factor to scale tensor before allreduce
         postscale_factor: Multiplicative factor to scale tensor after allreduce
+        process_set: Process set object to limit this operation to a subset of
+                     Horovod processes. Default is the global process set.
 
     Returns:
         A list containing tensors of the same shape and type as in `tensors`,
@@ -190,12 +200,13 @@ def grouped_allreduce(tensors, average=True, name=None, priority=0, prescale_fac
         ctypes.c_int(priority),
         ctypes.c_double(prescale_factor),
         ctypes.c_double(postscale_factor),
-        ctypes.c_int(len(tensors))))
+        ctypes.c_int(len(tensors)),
+        ctypes.c_int(_process_set_id(process_set))))
 
     return outputs
 
 def grouped_allreduce_(tensors, average=True, name=None, priority=0, prescale_factor=1.0,
-              postscale_factor=1.0):
+              postscale_factor=1.0, process_set=global_process_set):
     """
     A function that performs in-place averaging or summation of the input
     tensors over all the Horovod processes.
@@ -216,6 +227,8 @@ def grouped_allreduce_(tensors, average=True, name=None, priority=0, prescale_fa
                   are likely to be executed before other operations.
         prescale_factor: Multiplicative factor to scale tensor before allreduce
         postscale_factor: Multiplicative factor to scale tensor after allreduce
+        process_set: Process set object to limit this operation to a subset of
+                     Horovod processes. Default is the global process set.
 
     Returns:
         A list containing tensors of the same shape and type as in `tensors`,
@@ -234,12 +247,13 @@ def grouped_allreduce_(tensors, average=True, name=None, priority=0, prescale_fa
         ctypes.c_int(priority),
         ctypes.c_double(prescale_factor),
         ctypes.c_double(postscale_factor),
-        ctypes.c_int(len(tensors))))
+        ctypes.c_int(len(tensors)),
+        ctypes.c_int(_process_set_id(process_set))))
 
     return tensors
 
 
-def allgather(tensor, name=None, priority=0):
+def allgather(tensor, name=None, priority=0, process_set=global_process_set):
     """
     A function that concatenates the input tensor with the same input tensor on
     all other Horovod processes. The input tensor is not modified.
@@ -253,6 +267,8 @@ def allgather(tensor, name=None, priority=0):
         name: A name of the allgather operation.
         priority: The priority of this operation. Higher priority operations
                   are likely to be executed before other operations.
+        process_set: Process set object to limit this operation to a subset of
+                     Horovod processes. Default is the global process set.
 
     Returns:
         A tensor of the same type as `tensor`, concatenated on dimension zero
@@ -269,17 +285,20 @@ def allgather(tensor, name=None, priority=0):
     c_out = output.handle
     if isinstance(name, string_types):
         check_call(MPI_MXNET_LIB_CTYPES.horovod_mxnet_allgather_async(
-            c_in, c_out, c_str(name), ctypes.c_int(priority)))
+            c_in, c_out, c_str(name), ctypes.c_int(priority),
+            ctypes.c_int(_process_set_id(process_set))))
     else:
         check_call(MPI_MXNET_LIB_CTYPES.horovod_mxnet_allgather_async(
-            c_in, c_out, name, ctypes.c_int(priority)))
+            c_in, c_out, name, ctypes.c_int(priority),
+            ctypes.c_int(_process_set_id(process_set))))
 
     # Need to block here so changes to output tensor are visible
     output.wait_to_read()
     return output
 
 
-def broadcast(tensor, root_rank, name=None, priority=0):
+def broadcast(tensor, root_rank, name=None, priority=0,
+              process_set=global_process_set):
     """
     A function that broadcasts the input tensor on root rank to the same input
     tensor on all other Horovod processes. The input tensor is not modified.
@@ -295,34 +314,36 @@ def broadcast(tensor, root_rank, name=None, priority=0):
 
     Arguments:
         tensor: A tensor to broadcast.
-        root_rank: The rank to broadcast the value from.
+        root_rank: The rank to broadcast the value from, relative to
+                   `process_set`.
         name: A name of the broadcast operation.
         priority: The priority of this operation. Higher priority operations
                   are likely to be executed before other operations.
+        process_set: Process set object to limit this operation to a subset of
+                     Horovod processes. Default is the global process set.
 
     Returns:
         A tensor of the same shape and type as `tensor`, with the value
         broadcasted from root rank.
     """
-    if rank() == root_rank:
+    if process_set.rank() == root_rank:
         output = tensor.copy()
     else:
         output = mx.nd.zeros(shape=tensor.shape, ctx=tensor.context,
                              dtype=tensor.dtype)
-    c_in = tensor.handle
-    c_out = output.handle
-    if isinstance(name, string_types):
-        check_call(MPI_MXNET_LIB_CTYPES.horovod_mxnet_broadcast_async(
-            c_in, c_out, c_str(name), ctypes.c_int(root_rank),
-            ctypes.c_int(priority)))
-    else:
-        check_call(MPI_MXNET_LIB_CTYPES.horovod_mxnet_broadcast_async(
-            c_in, c_out, name, ctypes.c_int(root_rank),
-            ctypes.c_int(priority)))
+    c_in = c_handle_array([tensor])
+    c_out = c_handle_array([output])
+    c_name = c_str(name) if isinstance(name, string_types) else ctypes.c_char_p(None)
+
+    check_call(MPI_MXNET_LIB_CTYPES.horovod_mxnet_broadcast_async(
+        c_in, c_out, c_name, ctypes.c_int(root_rank),
+        ctypes.c_int(priority), ctypes.c_int(1),
+        ctypes.c_int(_process_set_id(process_set))))
     return output
 
 
-def broadcast_(tensor, root_rank, name=None, priority=0):
+def broadcast_(tensor, root_rank, name=None, priority=0,
+               process_set=global_process_set):
     """
     A function that broadcasts the input tensor on root rank to the same input
     tensor on all other Horovod processes. The operation is performed in-place.
@@ -334,27 +355,116 @@ def broadcast_(tensor, root_rank, name=None, priority=0):
 
     Arguments:
         tensor: A tensor to broadcast.
-        root_rank: The rank to broadcast the value from.
+        root_rank: The rank to broadcast the value from, relative to
+                   `process_set`.
         name: A name of the broadcast operation.
         priority: The priority of this operation. Higher priority operations
                   are likely to be executed before other operations.
+        process_set: Process set object to limit this operation to a subset of
+                     Horovod processes. Default is the global process set.
 
     Returns:
         A tensor of the same shape and type as `tensor`, with the value
         broadcasted from root rank.
     """
-    c_in = tensor.handle
-    c_out = tensor.handle
-    if isinstance(name, string_types):
-        check_call(MPI_MXNET_LIB_CTYPES.horovod_mxnet_broadcast_async(
-            c_in, c_out, c_str(name), ctypes.c_int(root_rank),
-            ctypes.c_int(priority)))
-    else:
-        check_call(MPI_MXNET_LIB_CTYPES.horovod_mxnet_broadcast_async(
-            c_in, c_out, name, ctypes.c_int(root_rank),
-            ctypes.c_int(priority)))
+    c_in = c_handle_array([tensor])
+    c_out = c_handle_array([tensor])
+    c_name = c_str(name) if isinstance(name, string_types) else ctypes.c_char_p(None)
+
+    check_call(MPI_MXNET_LIB_CTYPES.horovod_mxnet_broadcast_async(
+        c_in, c_out, c_name, ctypes.c_int(root_rank),
+        ctypes.c_int(priority), ctypes.c_int(1),
+        ctypes.c_int(_process_set_id(process_set))))
     return tensor
 
+
+def grouped_broadcast(tensors, root_rank, name=None, priority=0,
+                      process_set=global_process_set):
+    """
+    A function that broadcasts the input tensors on root rank to the same input
+    tensors on all other Horovod processes. The input tensors are not modified.
+
+    The broadcast operations are keyed by the base name. If a base name is not
+    provided, an incremented auto-generated base name is used. The tensor type
+    and shape must be the same on all Horovod processes for tensors sharing
+    positions in the input tensor list. The broadcast will not start until all
+    processes are ready to send and receive all the tensors.
+
+    Arguments:
+        tensors: A list of tensors to broadcast.
+        root_rank: The rank to broadcast the values from, relative to
+                   `process_set`.
+        name: A base name to use for the group broadcast operation.
+        priority: The priority of this operation. Higher priority operations
+                  are likely to be executed before other operations.
+        process_set: Process set object to limit this operation to a subset of
+                     Horovod processes. Default is the global process set.
+
+    Returns:
+        A list containing tensors of the same shape and type as in `tensors`,
+        with the values broadcasted from root rank.
+    """
+
+    if not tensors:
+      return tensors
+
+    if process_set.rank() == root_rank:
+        outputs = [tensor.copy() for tensor in tensors]
+    else:
+        outputs = [mx.nd.zeros(shape=tensor.shape, ctx=tensor.context,
+                               dtype=tensor.dtype) for tensor in tensors]
+
+    c_in = c_handle_array(tensors)
+    c_out = c_handle_array(outputs)
+    c_name = c_str(name) if isinstance(name, string_types) else ctypes.c_char_p(None)
+
+    check_call(MPI_MXNET_LIB_CTYPES.horovod_mxnet_broadcast_async(
+        c_in, c_out, c_name, ctypes.c_int(root_rank),
+        ctypes.c_int(priority), ctypes.c_int(len(tensors)),
+        ctypes.c_int(_process_set_id(process_set))))
+    return outputs
+
+
+def grouped_broadcast_(tensors, root_rank, name=None, priority=0,
+                       process_set=global_process_set):
+    """
+    A function that broadcasts the input tensors on root rank to the same input
+    tensors on all other Horovod processes. The operation is performed in-place.
+
+    The broadcast operations are keyed by the base name. If a base name is not
+    provided, an incremented auto-generated base name is used. The tensor type
+    and shape must be the same on all Horovod processes for tensors sharing
+    positions in the input tensor list. The broadcast will not start until all
+    processes are ready to send and receive all the tensors.
+
+    Arguments:
+        tensors: A list of tensors to broadcast.
+        root_rank: The rank to broadcast the values from, relative to
+                   `process_set`.
+        name: A base name to use for the group broadcast operation.
+        priority: The priority of this operation. Higher priority operations
+                  are likely to be executed before other operations.
+        process_set: Process set object to limit this operation to a subset of
+                     Horovod processes. Default is the global process set.
+
+    Returns:
+        A list containing tensors of the same shape and type as in `tensors`,
+        with the values broadcasted from root rank.
+    """
+
+    if not tensors:
+      return tensors
+
+    c_in = c_handle_array(tensors)
+    c_out = c_handle_array(tensors)
+    c_name = c_str(name) if isinstance(name, string_types) else ctypes.c_char_p(None)
+
+    check_call(MPI_MXNET_LIB_CTYPES.horovod_mxnet_broadcast_async(
+        c_in, c_out, c_name, ctypes.c_int(root_rank),
+        ctypes.c_int(priority), ctypes.c_int(len(tensors)),
+        ctypes.c_int(_process_set_id(process_set))))
+    return tensors
+
 def alltoall(tensor, splits=None, name=None, priority=0):
     """
     A function that scatters slices of the input tensor to all other Horovod processes
@@ -414,3 +524,50 @@ def alltoall(tensor, splits=None, name=None, priority=0):
         return output, output_received_splits
     else:
         return output
+
+
+def reducescatter(tensor, average=True, name=None, priority=0, prescale_factor=1.0,
+                  postscale_factor=1.0, process_set=global_process_set):
+    """
+    A function that reduces the input tensor over all the Horovod processes and
+    scatters the result, so that every process receives one slice of the reduced
+    tensor. The input tensor is not modified.
+
+    The slicing is done on the first dimension, the tensors must have the same
+    shape on all processes. If the first dimension is not divisible by the
+    number of processes, the processes with the lowest ranks receive one extra
+    row each. Reducescatter is performed on the CPU.
+
+    Arguments:
+        tensor: A tensor to reduce and scatter.
+        average: A flag indicating whether to compute average or summation,
+                 defaults to average.
+        name: A name of the reducescatter operation.
+        priority: The priority of this operation. Higher priority operations
+                  are likely to be executed before other operations.
+        prescale_factor: Multiplicative factor to scale tensor before reducescatter
+        postscale_factor: Multiplicative factor to scale tensor after reducescatter
+        process_set: Process set object to limit this operation to a subset of
+                     Horovod processes. Default is the global process set.
+
+    Returns:
+        A tensor of the same rank and type as `tensor`, holding this process'
+        slice of the reduced tensor along the first dimension.
+    """
+    assert(isinstance(tensor, mx.nd.NDArray))
+    # Size of output is only known once the shard of this rank is computed,
+    # create output array that will be resized during Horovod operation
+    output = mx.nd.empty(shape=[1], ctx=tensor.context,
+                         dtype=tensor.dtype)
+    c_in = tensor.handle
+    c_out = output.handle
+    c_name = c_str(name) if isinstance(name, string_types) else ctypes.c_char_p(None)
+
+    check_call(MPI_MXNET_LIB_CTYPES.horovod_mxnet_reducescatter_async(
+        c_in, c_out, c_name, ctypes.c_bool(average), ctypes.c_int(priority),
+        ctypes.c_double(prescale_factor), ctypes.c_double(postscale_factor),
+        ctypes.c_int(_process_set_id(process_set))))
+
+    # Need to block here so changes to output tensor are visible
+    output.wait_to_read()
+    return output
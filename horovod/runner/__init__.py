@@ -33,12 +33,16 @@ class _HorovodArgs(object):
 
         # tuneable parameter arguments
         self.fusion_threshold_mb = None
+        self.tensor_partition_mb = None
+        self.cpu_reduction_threads = None
         self.cycle_time_ms = None,
         self.cache_capacity = None,
 
         # hierarchy
         self.hierarchical_allreduce = None
         self.hierarchical_allgather = None
+        self.hierarchical_reducescatter = None
+        self.shm_allreduce = None
 
         # autotune arguments
         self.autotune = None
@@ -17,10 +17,14 @@ import logging
 
 # Parameter knobs
 HOROVOD_FUSION_THRESHOLD = 'HOROVOD_FUSION_THRESHOLD'
+HOROVOD_TENSOR_PARTITION_SIZE = 'HOROVOD_TENSOR_PARTITION_SIZE'
+HOROVOD_CPU_REDUCTION_THREADS = 'HOROVOD_CPU_REDUCTION_THREADS'
 HOROVOD_CYCLE_TIME = 'HOROVOD_CYCLE_TIME'
 HOROVOD_CACHE_CAPACITY = 'HOROVOD_CACHE_CAPACITY'
 HOROVOD_HIERARCHICAL_ALLREDUCE = 'HOROVOD_HIERARCHICAL_ALLREDUCE'
 HOROVOD_HIERARCHICAL_ALLGATHER = 'HOROVOD_HIERARCHICAL_ALLGATHER'
+HOROVOD_HIERARCHICAL_REDUCESCATTER = 'HOROVOD_HIERARCHICAL_REDUCESCATTER'
+HOROVOD_SHM_ALLREDUCE = 'HOROVOD_SHM_ALLREDUCE'
 
 # Autotune knobs
 HOROVOD_AUTOTUNE = 'HOROVOD_AUTOTUNE'
@@ -77,10 +81,14 @@ def set_args_from_config(args, config, override_args):
     params = config.get('params')
     if params:
         _set_arg_from_config(args, 'fusion_threshold_mb', override_args, params)
+        _set_arg_from_config(args, 'tensor_partition_mb', override_args, params)
+        _set_arg_from_config(args, 'cpu_reduction_threads', override_args, params)
         _set_arg_from_config(args, 'cycle_time_ms', override_args, params)
         _set_arg_from_config(args, 'cache_capacity', override_args, params)
         _set_arg_from_config(args, 'hierarchical_allreduce', override_args, params)
         _set_arg_from_config(args, 'hierarchical_allgather', override_args, params)
+        _set_arg_from_config(args, 'hierarchical_reducescatter', override_args, params)
+        _set_arg_from_config(args, 'shm_allreduce', override_args, params)
 
     # Autotune
     autotune = config.get('autotune')
@@ -129,6 +137,8 @@ def _validate_arg_nonnegative(args, arg_name):
 
 def validate_config_args(args):
     _validate_arg_nonnegative(args, 'fusion_threshold_mb')
+    _validate_arg_nonnegative(args, 'tensor_partition_mb')
+    _validate_arg_nonnegative(args, 'cpu_reduction_threads')
     _validate_arg_nonnegative(args, 'cycle_time_ms')
     _validate_arg_nonnegative(args, 'cache_capacity')
     _validate_arg_nonnegative(args, 'autotune_warmup_samples')
@@ -164,10 +174,14 @@ def set_env_from_args(env, args):
 
     # Params
     _add_arg_to_env(env, HOROVOD_FUSION_THRESHOLD, args.fusion_threshold_mb, lambda v: v * 1024 * 1024)
+    _add_arg_to_env(env, HOROVOD_TENSOR_PARTITION_SIZE, args.tensor_partition_mb, lambda v: v * 1024 * 1024)
+    _add_arg_to_env(env, HOROVOD_CPU_REDUCTION_THREADS, args.cpu_reduction_threads)
     _add_arg_to_env(env, HOROVOD_CYCLE_TIME, args.cycle_time_ms)
     _add_arg_to_env(env, HOROVOD_CACHE_CAPACITY, args.cache_capacity)
     _add_arg_to_env(env, HOROVOD_HIERARCHICAL_ALLREDUCE, args.hierarchical_allreduce, identity)
     _add_arg_to_env(env, HOROVOD_HIERARCHICAL_ALLGATHER, args.hierarchical_allgather, identity)
+    _add_arg_to_env(env, HOROVOD_HIERARCHICAL_REDUCESCATTER, args.hierarchical_reducescatter, identity)
+    _add_arg_to_env(env, HOROVOD_SHM_ALLREDUCE, args.shm_allreduce, identity)
 
     # Autotune
     if args.autotune:
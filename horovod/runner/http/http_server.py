@@ -124,9 +124,14 @@ class RendezvousHandler(KVStoreHandler):
 
         with self.server.finished_list_lock:
             self.server.finished_list[scope].append(key)
-            if self.server.scope_size[scope] == len(self.server.finished_list[scope]):
-                with self.server.cache_lock:
+            with self.server.cache_lock:
+                # Process set scopes are not part of the allocation plan, every
+                # member has put its address before the first one finishes
+                scope_size = self.server.scope_size.get(scope,
+                                                        len(self.server.cache.get(scope, {})))
+                if scope_size == len(self.server.finished_list[scope]):
                     self.server.cache.get(scope, {}).clear()
+                    del self.server.finished_list[scope]
 
         self.send_status_code(OK)
 
@@ -307,6 +307,15 @@ def parse_args():
                                    'tensor data that can be fused together into a single batch '
                                    'during allreduce / allgather. Setting 0 disables tensor fusion. '
                                    '(default: 128)')
+    group_params.add_argument('--tensor-partition-mb', action=make_override_action(override_args), type=int,
+                              help='Tensor partition size in MB. Allreduced tensors larger than this '
+                                   'are split into partitions that are negotiated and fused '
+                                   'independently, so that smaller tensors are not held up behind '
+                                   'them. Setting 0 disables tensor partitioning. (default: 0)')
+    group_params.add_argument('--cpu-reduction-threads', action=make_override_action(override_args), type=int,
+                              help='Number of threads each worker uses to reduce and scale CPU buffers, '
+                                   'including the calling thread. (default: the number of cores of the '
+                                   'host divided by the number of workers on it, at most 4)')
     group_params.add_argument('--cycle-time-ms', action=make_override_action(override_args), type=float,
                               help='Cycle time in ms. This is the delay between each tensor fusion '
                                    'cycle. The larger the cycle time, the more batching, but the '
@@ -340,6 +349,30 @@ def parse_args():
                                               help='Explicitly disable hierarchical allgather to prevent autotuning '
                                                    'from adjusting it.')
 
+    group_hierarchical_reducescatter = group_params.add_mutually_exclusive_group()
+    group_hierarchical_reducescatter.add_argument('--hierarchical-reducescatter',
+                                                  action=make_override_true_action(override_args),
+                                                  help='Perform hierarchical reducescatter between workers: a local '
+                                                       'reducescatter within a host followed by a cross '
+                                                       'reducescatter between equal local ranks across workers, so '
+                                                       'that only a fraction of the data crosses the network. '
+                                                       'Requires a homogeneous cluster.')
+    group_hierarchical_reducescatter.add_argument('--no-hierarchical-reducescatter',
+                                                  dest='hierarchical_reducescatter',
+                                                  action=make_override_false_action(override_args),
+                                                  help='Explicitly disable hierarchical reducescatter.')
+
+    group_shm_allreduce = group_params.add_mutually_exclusive_group()
+    group_shm_allreduce.add_argument('--shm-allreduce',
+                                     action=make_override_true_action(override_args),
+                                     help='Allreduce CPU tensors between workers on the same host through '
+                                          'shared memory, and only the shares of the reduced data across '
+                                          'hosts. Defaults to the setting of --hierarchical-allreduce.')
+    group_shm_allreduce.add_argument('--no-shm-allreduce',
+                                     dest='shm_allreduce',
+                                     action=make_override_false_action(override_args),
+                                     help='Explicitly disable shared memory allreduce.')
+
     group_autotune = parser.add_argument_group('autotune arguments')
     group_autotune_enabled = group_autotune.add_mutually_exclusive_group()
     group_autotune_enabled.add_argument('--autotune', action=make_override_true_action(override_args),
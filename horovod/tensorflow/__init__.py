@@ -19,14 +19,16 @@
 import os
 import warnings
 
-from horovod.common.util import check_extension, gpu_available, split_list
+from horovod.common.util import check_extension, fusion_threshold_bytes, gpu_available, sparse_density_threshold, \
+    split_list, split_list_by_size
 
 check_extension('horovod.tensorflow', 'HOROVOD_WITH_TENSORFLOW', __file__, 'mpi_lib')
 
 from horovod.tensorflow import elastic
-from horovod.tensorflow.compression import Compression
+from horovod.tensorflow.compression import Compression, PowerSGDCompressor, QuantizingCompressor, SparseCompressor
 from horovod.tensorflow.functions import allgather_object, broadcast_object, broadcast_object_fn, broadcast_variables
-from horovod.tensorflow.mpi_ops import allgather, broadcast, _allreduce, _grouped_allreduce, alltoall
+from horovod.tensorflow.mpi_ops import allgather, broadcast, grouped_broadcast, _allreduce, _grouped_allreduce, alltoall
+from horovod.tensorflow.mpi_ops import reducescatter
 from horovod.tensorflow.mpi_ops import init, shutdown
 from horovod.tensorflow.mpi_ops import is_initialized, start_timeline, stop_timeline
 from horovod.tensorflow.mpi_ops import size, local_size, cross_size, rank, local_rank, cross_rank, is_homogeneous
@@ -38,6 +40,7 @@ from horovod.tensorflow.mpi_ops import Average, Sum, Adasum
 from horovod.tensorflow.mpi_ops import handle_average_backwards_compatibility, check_num_rank_power_of_2
 from horovod.tensorflow.util import _executing_eagerly, _make_subgraph, _cache, vars_to_refs, refs_to_vars
 from horovod.tensorflow.mpi_ops import join
+from horovod.tensorflow.mpi_ops import ProcessSet, global_process_set
 from horovod.tensorflow.sync_batch_norm import SyncBatchNormalization
 from horovod.tensorflow.gradient_aggregation import LocalGradientAggregationHelper
 
@@ -54,13 +57,15 @@ if tf.__version__.startswith('2.2.'):
 def allreduce(tensor, average=None, device_dense='', device_sparse='',
               compression=Compression.none, op=None,
               prescale_factor=1.0, postscale_factor=1.0,
-              name=None):
+              name=None, priority=0, process_set=global_process_set):
     """Perform an allreduce on a tf.Tensor or tf.IndexedSlices.
 
     This function performs a bandwidth-optimal ring allreduce on the input
-    tensor. If the input is an tf.IndexedSlices, the function instead does an
-    allgather on the values and the indices, effectively doing an allreduce on
-    the represented tensor.
+    tensor. If the input is an tf.IndexedSlices, every process first sums its
+    duplicate rows, and the unique rows are then allgathered, or allreduced as
+    a dense tensor once the rows of all processes together reach
+    HOROVOD_SPARSE_DENSITY_THRESHOLD (default 1.0) times the rows of the dense
+    tensor.
 
     Arguments:
         tensor: tf.Tensor, tf.Variable, or tf.IndexedSlices to reduce.
@@ -76,12 +81,19 @@ def allreduce(tensor, average=None, device_dense='', device_sparse='',
                        if Horovod was built with HOROVOD_GPU_OPERATIONS.
         compression: Compression algorithm used to reduce the amount of data
                      sent and received by each worker node.  Defaults to not
-                     using compression.
+                     using compression. Sparse compressors such as
+                     `Compression.topk(ratio)` turn the tensor into a
+                     tf.IndexedSlices that is exchanged with allgathers, and
+                     use `name` to key their error feedback residual.
         op: The reduction operation to combine tensors across different ranks.
             Defaults to Average if None is given.
         prescale_factor: Multiplicative factor to scale tensor before allreduce.
         postscale_factor: Multiplicative factor to scale tensor after allreduce.
         name: A name of the allreduce operation
+        priority: The priority of this operation. Higher priority operations
+                  are likely to be executed before other operations.
+        process_set: Process set object to limit this operation to a subset of
+                     Horovod processes. Default is the global process set.
 
     Returns:
         A tensor of the same shape and type as `tensor`, summed across all
@@ -89,23 +101,40 @@ def allreduce(tensor, average=None, device_dense='', device_sparse='',
     """
     op = handle_average_backwards_compatibility(op, average)
 
+    if process_set is not global_process_set and \
+            isinstance(compression, (SparseCompressor, QuantizingCompressor)):
+        raise NotImplementedError('Sparse and quantizing compressors are only supported '
+                                  'on the global process set.')
+
+    if isinstance(compression, SparseCompressor) and not isinstance(tensor, tf.IndexedSlices):
+        with tf.device(device_sparse):
+            tensor_compressed, ctx = compression.compress(tensor, name=name)
+        if isinstance(tensor_compressed, tf.IndexedSlices):
+            reduced = allreduce(tensor_compressed, device_dense=device_dense,
+                                device_sparse=device_sparse, op=op, name=name)
+            with tf.device(device_sparse):
+                return compression.decompress(reduced, ctx)
+        # Tensors that cannot be sparsified are reduced as they are
+        compression = Compression.none
+
+    if isinstance(compression, QuantizingCompressor) and not isinstance(tensor, tf.IndexedSlices):
+        if op == Adasum:
+            raise NotImplementedError('The Adasum reduction does not support quantizing compressors.')
+        with tf.device(device_dense):
+            horovod_size = size_op() if int(os.environ.get("HOROVOD_ELASTIC", 0)) else size()
+            tensor_compressed, ctx = compression.compress(tensor, name=name, num_shards=horovod_size)
+            if ctx is not None:
+                return _quantized_allreduce(tensor_compressed, ctx, compression, op, horovod_size, name)
+        # Tensors that cannot be quantized are reduced as they are
+        compression = Compression.none
+
     if isinstance(tensor, tf.IndexedSlices):
         # TODO: Need to fix this to actuall call Adasum
         if op == Adasum:
             raise NotImplementedError('The Adasum reduction does not currently support sparse tensors. As a '
                                       'workaround please pass sparse_as_dense=True to DistributedOptimizer')
         with tf.device(device_sparse):
-            # For IndexedSlices, do two allgathers instead of an allreduce.
-            horovod_size = tf.cast(size_op() if int(os.environ.get("HOROVOD_ELASTIC", 0)) else size(),
-                                   dtype=tensor.values.dtype)
-            values = allgather(tensor.values)
-            indices = allgather(tensor.indices)
-
-            # To make this operation into an average, divide allgathered values by
-            # the Horovod size.
-            new_values = (values / horovod_size) if op == Average else values
-        return tf.IndexedSlices(new_values, indices,
-                                dense_shape=tensor.dense_shape)
+            return _sparse_allreduce(tensor, op, process_set)
     else:
         average_in_framework = False
         if rocm_built():
@@ -114,13 +143,13 @@ def allreduce(tensor, average=None, device_dense='', device_sparse='',
             op = Sum if op == Average else op
 
         with tf.device(device_dense):
-            horovod_size = tf.cast(size_op() if int(os.environ.get("HOROVOD_ELASTIC", 0)) else size(),
-                                   dtype=tensor.dtype)
+            horovod_size = tf.cast(_process_set_size(process_set), dtype=tensor.dtype)
             tensor_compressed, ctx = compression.compress(tensor)
             summed_tensor_compressed = _allreduce(tensor_compressed, op=op,
                                                   prescale_factor=prescale_factor,
                                                   postscale_factor=postscale_factor,
-                                                  name=name)
+                                                  name=name, priority=priority,
+                                                  process_set=process_set)
             summed_tensor = compression.decompress(summed_tensor_compressed, ctx)
             if op == Adasum:
                 if 'CPU' not in tensor.device and gpu_available('tensorflow'):
@@ -153,9 +182,77 @@ def allreduce(tensor, average=None, device_dense='', device_sparse='',
                     new_tensor = summed_tensor
         return new_tensor
 
+
+def _process_set_size(process_set):
+    if process_set is global_process_set:
+        return size_op() if int(os.environ.get("HOROVOD_ELASTIC", 0)) else size()
+    return process_set.size()
+
+
+def _quantized_allreduce(tensor_compressed, ctx, compression, op, horovod_size, name):
+    # Every rank receives the codes of its shard from all ranks, and reduces them
+    # after dequantization so that quantized values are never summed.
+    def _name(suffix):
+        return '%s_%s' % (name, suffix) if name is not None else None
+
+    codes, scales = tensor_compressed
+    shard_codes = alltoall(codes, name=_name('codes'))
+    shard_scales = alltoall(scales, name=_name('scales')) if scales is not None else None
+
+    shard = compression.dequantize(shard_codes, shard_scales)
+    shard = tf.reduce_sum(tf.reshape(shard, [horovod_size, -1, compression.chunk_size]), axis=0)
+    if op == Average:
+        shard = shard / tf.cast(horovod_size, shard.dtype)
+
+    shard_codes, shard_scales = compression.quantize(shard)
+    gathered_codes = allgather(shard_codes, name=_name('gathered_codes'))
+    gathered_scales = allgather(shard_scales, name=_name('gathered_scales')) \
+        if shard_scales is not None else None
+    return compression.decompress((gathered_codes, gathered_scales), ctx)
+
+
+def _sum_duplicate_rows(indices, values):
+    unique_indices, positions = tf.unique(indices)
+    return unique_indices, tf.math.unsorted_segment_sum(values, positions, tf.shape(unique_indices)[0])
+
+
+def _sparse_allreduce(tensor, op, process_set):
+    # Every rank sums its duplicate rows first. If the unique rows of all ranks
+    # together reach the density threshold, a dense allreduce moves less data
+    # than allgathering them, otherwise the unique rows are allgathered.
+    horovod_size = tf.cast(_process_set_size(process_set), dtype=tensor.values.dtype)
+    indices, values = _sum_duplicate_rows(tensor.indices, tensor.values)
+
+    def gathered():
+        return _sum_duplicate_rows(allgather(indices, process_set=process_set),
+                                   allgather(values, process_set=process_set))
+
+    if tensor.dense_shape is None:
+        new_indices, new_values = gathered()
+    else:
+        dense_rows = tensor.dense_shape[0]
+
+        def dense():
+            summed = _allreduce(tf.math.unsorted_segment_sum(values, indices, dense_rows),
+                                op=Sum, process_set=process_set)
+            return tf.range(tf.cast(dense_rows, indices.dtype)), summed
+
+        # All ranks must take the same branch, so they agree on the total number of rows.
+        num_rows = _allreduce(tf.shape(indices, out_type=tf.int64)[:1], op=Sum, process_set=process_set)
+        is_dense = tf.cast(num_rows[0], tf.float64) >= \
+            sparse_density_threshold() * tf.cast(dense_rows, tf.float64)
+        new_indices, new_values = tf.cond(is_dense, dense, gathered)
+
+    # To make this operation into an average, divide the summed values by
+    # the Horovod size.
+    new_values = (new_values / horovod_size) if op == Average else new_values
+    return tf.IndexedSlices(new_values, new_indices, dense_shape=tensor.dense_shape)
+
+
 def grouped_allreduce(tensors, average=None, device_dense='', device_sparse='',
                       compression=Compression.none, op=None,
-                      prescale_factor=1.0, postscale_factor=1.0):
+                      prescale_factor=1.0, postscale_factor=1.0, priority=0,
+                      process_set=global_process_set):
     if not tensors:
         return tensors
 
@@ -173,25 +270,15 @@ def grouped_allreduce(tensors, average=None, device_dense='', device_sparse='',
             raise NotImplementedError('The Adasum reduction does not currently support sparse tensors. As a '
                                       'workaround please pass sparse_as_dense=True to DistributedOptimizer')
         with tf.device(device_sparse):
-            new_values = []
-            for tensor in tensors:
-                # For IndexedSlices, do two allgathers instead of an allreduce.
-                horovod_size = tf.cast(size_op() if int(os.environ.get("HOROVOD_ELASTIC", 0)) else size(),
-                                       dtype=tensor.values.dtype)
-                values = allgather(tensor.values)
-                indices = allgather(tensor.indices)
-
-                # To make this operation into an average, divide allgathered values by
-                # the Horovod size.
-                new_values += (values / horovod_size) if op == Average else values
-        return [tf.IndexedSlices(x, indices,
-                                 dense_shape=t.dense_shape) for x,t in zip(new_values, tensors)]
+            return [_sparse_allreduce(tensor, op, process_set) for tensor in tensors]
     else:
         with tf.device(device_dense):
             tensors_compressed, ctxs = zip(*[compression.compress(tensor) for tensor in tensors])
             summed_tensors_compressed = _grouped_allreduce(tensors_compressed, op=op,
                                                            prescale_factor=prescale_factor,
-                                                           postscale_factor=postscale_factor)
+                                                           postscale_factor=postscale_factor,
+                                                           priority=priority,
+                                                           process_set=process_set)
             summed_tensors = [compression.decompress(t, ctx) for t, ctx in zip(summed_tensors_compressed, ctxs)]
             if op == Adasum:
                 if 'CPU' not in tensor.device and gpu_available('tensorflow'):
@@ -223,8 +310,7 @@ def grouped_allreduce(tensors, average=None, device_dense='', device_sparse='',
                 if rocm_built():
                     new_tensors = []
                     for tensor in summed_tensors:
-                        horovod_size = tf.cast(size_op() if int(os.environ.get("HOROVOD_ELASTIC", 0)) else size(),
-                                               dtype=tensor.dtype)
+                        horovod_size = tf.cast(_process_set_size(process_set), dtype=tensor.dtype)
                         new_tensors += (tensor / horovod_size) if average_in_framework else tensor
                 else:
                     new_tensors = summed_tensors
@@ -251,6 +337,27 @@ def _grouped_allreduce_cond(tensors, *args, **kwargs):
                    allreduce_fn, id_fn)
 
 
+def _low_rank_allreduce_cond(grads, name, compression, op):
+    # PowerSGD reduces all gradients together, keyed by their position
+    indices = [i for i, grad in enumerate(grads) if grad is not None]
+    tensors = [tf.convert_to_tensor(grads[i]) for i in indices]
+    if not tensors:
+        return list(grads)
+
+    def allreduce_fn():
+        return compression.reduce(tensors, ['%s_%d' % (name, i) for i in indices], op=op)
+
+    def id_fn():
+        return tensors
+
+    reduced = tf.cond((size_op() > 1) if int(os.environ.get("HOROVOD_ELASTIC", 0)) else tf.convert_to_tensor(size() > 1),
+                      allreduce_fn, id_fn)
+    outputs = list(grads)
+    for i, tensor in zip(indices, reduced):
+        outputs[i] = tensor
+    return outputs
+
+
 try:
     _global_variables = tf.compat.v1.global_variables
 except AttributeError:
@@ -330,11 +437,24 @@ if _SessionRunHook is not None and _get_default_graph is not None:
             session.run(self.bcast_op)
 
 
+def _grad_size_bytes(grad, var):
+    """Size of the dense gradient in bytes, taken from the variable if the gradient shape is unknown."""
+    shape = grad.shape if not isinstance(grad, tf.IndexedSlices) else var.shape
+    if not shape.is_fully_defined():
+        shape = var.shape
+    num_elements = shape.num_elements() if shape.is_fully_defined() else 0
+    return num_elements * grad.dtype.size
+
+
 @_cache
 def _make_cached_allreduce_grads_fn(name, device_dense, device_sparse,
                                     compression, sparse_as_dense, op,
                                     gradient_predivide_factor, groups):
     groups = refs_to_vars(groups) if isinstance(groups, tuple) else groups
+    if gradient_predivide_factor != 1.0 and \
+            isinstance(compression, (SparseCompressor, QuantizingCompressor, PowerSGDCompressor)):
+        raise ValueError('gradient_predivide_factor not supported with sparse, quantizing '
+                         'or PowerSGD compression')
     if op == Average:
         # Split average operation across pre/postscale factors
         # C++ backend will apply additional 1 / size() factor to postscale_factor for op == Average.
@@ -369,6 +489,12 @@ def _make_cached_allreduce_grads_fn(name, device_dense, device_sparse,
                         grads_split.append(grad_group)
                     for _, grad in var_name2grad.items():
                         grads_split.append([grad])
+                elif groups == 'auto':
+                    grads_clean = [(i, grad) for i, grad in enumerate(grads) if grad is not None]
+                    sizes = [_grad_size_bytes(grad, vars[i]) for i, grad in grads_clean]
+                    dtypes = [(grad.dtype, isinstance(grad, tf.IndexedSlices)) for _, grad in grads_clean]
+                    grads_split = [[grads_clean[j] for j in group]
+                                   for group in split_list_by_size(sizes, dtypes, fusion_threshold_bytes())]
                 elif groups > 0:
                     grads_clean = [(i, grad) for i, grad in enumerate(grads) if grad is not None]
                     grads_split = split_list(grads_clean, groups)
@@ -382,20 +508,38 @@ def _make_cached_allreduce_grads_fn(name, device_dense, device_sparse,
                                                                compression=compression,
                                                                op=op,
                                                                prescale_factor=prescale_factor,
-                                                               postscale_factor=postscale_factor)
+                                                               postscale_factor=postscale_factor,
+                                                               priority=-min(index_group))
                     for i in range(len(index_group)):
                         reduce_ops[index_group[i]] = reduce_ops_group[i]
                 return reduce_ops
 
+            if isinstance(compression, PowerSGDCompressor):
+                return _low_rank_allreduce_cond(grads, name, compression, op)
+
+            if isinstance(compression, (SparseCompressor, QuantizingCompressor)):
+                # Sparse and quantizing compressors key their error feedback residuals by name
+                return [_allreduce_cond(grad,
+                                        device_dense=device_dense,
+                                        device_sparse=device_sparse,
+                                        compression=compression,
+                                        op=op,
+                                        name='%s_%d' % (name, i))
+                        if grad is not None else grad
+                        for i, grad in enumerate(grads)]
+
+            # Gradients of the first variables are computed last but needed first
+            # in the next step, so they are reduced with the highest priority.
             return [_allreduce_cond(grad,
                                     device_dense=device_dense,
                                     device_sparse=device_sparse,
                                     compression=compression,
                                     op=op,
                                     prescale_factor=prescale_factor,
-                                    postscale_factor=postscale_factor)
+                                    postscale_factor=postscale_factor,
+                                    priority=-i)
                     if grad is not None else grad
-                    for grad in grads]
+                    for i, grad in enumerate(grads)]
 
     if _executing_eagerly():
         return _make_subgraph(allreduce_grads)
@@ -406,6 +550,12 @@ def _make_cached_allreduce_grads_fn(name, device_dense, device_sparse,
 def _make_allreduce_grads_fn(name, device_dense, device_sparse,
                              compression, sparse_as_dense, op,
                              gradient_predivide_factor, groups):
+    if isinstance(compression, (SparseCompressor, PowerSGDCompressor, QuantizingCompressor)):
+        if groups is not None:
+            raise ValueError('Sparse, PowerSGD and quantizing compression cannot be used together with groups.')
+        if op == Adasum:
+            raise NotImplementedError('The Adasum reduction does not support sparse, PowerSGD or '
+                                      'quantizing compression.')
     groups = vars_to_refs(groups) if isinstance(groups, list) else groups
     return _make_cached_allreduce_grads_fn(name, device_dense, device_sparse,
                                            compression, sparse_as_dense, op,
@@ -652,9 +802,12 @@ def DistributedOptimizer(optimizer, name=None, use_locking=False, device_dense='
         grouping. Defaults to no explicit groups.
       groups:
         The parameter to group the gradient allreduce ops. Accept values is a
-        non-negative integer or a list of list of tf.Variable.
+        non-negative integer, 'auto' or a list of list of tf.Variable.
         If groups is a non-negative integer, it is the number of groups to assign
         gradient allreduce ops to for explicit grouping.
+        If groups is 'auto', gradients are grouped by data type into groups of at most
+        the tensor fusion threshold (HOROVOD_FUSION_THRESHOLD) bytes, in the order
+        the backward pass produces them.
         If groups is a list of list of tf.Variable. Variables in the same
         inner list will be assigned to the same group, while parameter that does
         not appear in any list will form a group itself.
@@ -676,8 +829,8 @@ def DistributedOptimizer(optimizer, name=None, use_locking=False, device_dense='
             groups = num_groups
 
     if groups is not None:
-        if not (isinstance(groups, list) or groups > 0):
-            raise ValueError('groups should be a non-negative integer or '
+        if not (isinstance(groups, list) or groups == 'auto' or groups > 0):
+            raise ValueError('groups should be a non-negative integer, \'auto\' or '
                             'a list of list of tf.Variable.')
 
     if isinstance(optimizer, _LegacyOptimizer):
@@ -777,9 +930,12 @@ if hasattr(tf, 'GradientTape'):
             grouping. Defaults to no explicit groups.
           groups:
             The parameter to group the gradient allreduce ops. Accept values is a
-            non-negative integer or a list of list of tf.Variable.
+            non-negative integer, 'auto' or a list of list of tf.Variable.
             If groups is a non-negative integer, it is the number of groups to assign
             gradient allreduce ops to for explicit grouping.
+            If groups is 'auto', gradients are grouped by data type into groups of at most
+            the tensor fusion threshold (HOROVOD_FUSION_THRESHOLD) bytes, in the order
+            the backward pass produces them.
             If groups is a list of list of tf.Variable. Variables in the same
             inner list will be assigned to the same group, while parameter that does
             not appear in any list will form a group itself.
@@ -798,8 +954,8 @@ if hasattr(tf, 'GradientTape'):
                 groups = num_groups
 
         if groups is not None:
-            if not (isinstance(groups, list) or groups > 0):
-                raise ValueError('groups should be a non-negative integer or '
+            if not (isinstance(groups, list) or groups == 'auto' or groups > 0):
+                raise ValueError('groups should be a non-negative integer, \'auto\' or '
                                 'a list of list of tf.Variable.')
 
         cls = type(gradtape.__class__.__name__, (gradtape.__class__,),
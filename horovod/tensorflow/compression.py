@@ -64,6 +64,365 @@ class FP16Compressor(Compressor):
         return tensor_decompressed
 
 
+class SparseCompressor(Compressor):
+    """
+    Interface for stateful compressors that sparsify a tensor before it is exchanged.
+
+    Compressed tensors are returned as flat `tf.IndexedSlices` and are combined across
+    ranks by allgathering their indices and values instead of by an allreduce.
+    Elements that are not selected are kept in a per-tensor residual variable and
+    added back to the tensor the next time a tensor with the same name is compressed
+    (error feedback), so no gradient information is lost, only delayed.
+
+    Unlike stateless compressors, sparse compressors must be instantiated, e.g.
+    ``hvd.Compression.topk(ratio=0.01)``, and an instance must not be shared between
+    optimizers.
+    """
+    def __init__(self):
+        self._residuals = {}
+
+    def select(self, tensor):
+        """Returns the indices of the elements of the flat `tensor` to exchange."""
+        raise NotImplementedError()
+
+    def _residual(self, name, tensor):
+        if name not in self._residuals:
+            with tf.init_scope():
+                self._residuals[name] = tf.Variable(
+                    tf.zeros(tensor.shape, dtype=tensor.dtype), trainable=False,
+                    name='residual_' + name.replace(':', '_'))
+        return self._residuals[name]
+
+    def compress(self, tensor, name=None):
+        """
+        Sparsifies the floating point tensor and returns it with its original shape as the
+        context. Error feedback is only applied when a name is given.
+        """
+        if not tensor.dtype.is_floating:
+            return tensor, None
+
+        flat = tf.reshape(tensor, [-1])
+        residual = self._residual(name, flat) if name is not None else None
+        if residual is not None:
+            flat = flat + residual
+
+        indices = self.select(flat)
+        values = tf.gather(flat, indices)
+        if residual is not None:
+            remainder = tf.tensor_scatter_nd_update(flat, tf.expand_dims(indices, 1),
+                                                    tf.zeros_like(values))
+            with tf.control_dependencies([residual.assign(remainder)]):
+                values = tf.identity(values)
+
+        tensor_compressed = tf.IndexedSlices(values, indices,
+                                             dense_shape=tf.shape(flat, out_type=indices.dtype))
+        return tensor_compressed, tf.shape(tensor)
+
+    def decompress(self, tensor, ctx):
+        """Densifies the tensor, summing duplicate indices, and restores its shape."""
+        if ctx is None:
+            return tensor
+        if isinstance(tensor, tf.IndexedSlices):
+            tensor = tf.math.unsorted_segment_sum(tensor.values, tensor.indices,
+                                                  num_segments=tensor.dense_shape[0])
+        return tf.reshape(tensor, ctx)
+
+
+class TopKCompressor(SparseCompressor):
+    """Exchange only the largest `ratio` fraction of elements by magnitude."""
+    def __init__(self, ratio=0.01):
+        super(TopKCompressor, self).__init__()
+        if not 0 < ratio <= 1:
+            raise ValueError('ratio should be in (0, 1], got %s.' % ratio)
+        self.ratio = ratio
+
+    def select(self, tensor):
+        k = max(1, int(tensor.shape.num_elements() * self.ratio))
+        _, indices = tf.math.top_k(tf.abs(tensor), k=k, sorted=False)
+        return tf.cast(indices, tf.int64)
+
+
+class RandomKCompressor(SparseCompressor):
+    """Exchange a random `ratio` fraction of elements."""
+    def __init__(self, ratio=0.01):
+        super(RandomKCompressor, self).__init__()
+        if not 0 < ratio <= 1:
+            raise ValueError('ratio should be in (0, 1], got %s.' % ratio)
+        self.ratio = ratio
+
+    def select(self, tensor):
+        num_elements = tensor.shape.num_elements()
+        k = max(1, int(num_elements * self.ratio))
+        return tf.random.shuffle(tf.range(num_elements, dtype=tf.int64))[:k]
+
+
+class ThresholdCompressor(SparseCompressor):
+    """Exchange only the elements whose magnitude is at least `threshold`."""
+    def __init__(self, threshold):
+        super(ThresholdCompressor, self).__init__()
+        if threshold < 0:
+            raise ValueError('threshold should be non-negative, got %s.' % threshold)
+        self.threshold = threshold
+
+    def select(self, tensor):
+        return tf.reshape(tf.where(tf.abs(tensor) >= self.threshold), [-1])
+
+
+class QuantizingCompressor(Compressor):
+    """
+    Interface for compressors that quantize a tensor into low-precision codes with
+    per-chunk scaling metadata.
+
+    Quantized codes cannot be summed by the allreduce backend without overflowing, so
+    tensors are reduced in two phases: an alltoall sends every rank the codes of its shard
+    of the tensor, which it dequantizes and sums, and an allgather of the requantized sums
+    distributes the result. Both phases send quantized data, so the traffic is that of a
+    ring allreduce on the codes.
+
+    With `error_feedback`, the local quantization error is added back to the tensor the
+    next time a tensor with the same name is compressed. Quantizing compressors must be
+    instantiated, e.g. ``hvd.Compression.int8()``.
+    """
+    def __init__(self, chunk_size=1024, error_feedback=False):
+        self.chunk_size = chunk_size
+        self.error_feedback = error_feedback
+        self._residuals = {}
+
+    def quantize(self, chunks):
+        """Quantizes float32 `chunks` of shape [num_chunks, chunk_size] into (codes, scales)."""
+        raise NotImplementedError()
+
+    def dequantize(self, codes, scales):
+        """Returns the float32 chunks of shape [num_chunks, chunk_size] for (codes, scales)."""
+        raise NotImplementedError()
+
+    def _residual(self, name, tensor):
+        if name not in self._residuals:
+            with tf.init_scope():
+                self._residuals[name] = tf.Variable(
+                    tf.zeros(tensor.shape, dtype=tensor.dtype), trainable=False,
+                    name='residual_' + name.replace(':', '_'))
+        return self._residuals[name]
+
+    def compress(self, tensor, name=None, num_shards=1):
+        """
+        Quantizes the floating point tensor and returns (codes, scales) with the context
+        needed to decompress them. The number of chunks is padded to a multiple of
+        `num_shards`, which may be a scalar tensor. Error feedback is only applied when a
+        name is given.
+        """
+        if not tensor.dtype.is_floating:
+            return tensor, None
+
+        flat = tf.cast(tf.reshape(tensor, [-1]), tf.float32)
+        residual = None
+        if self.error_feedback and name is not None:
+            residual = self._residual(name, flat)
+            flat = flat + residual
+
+        numel = tf.size(flat)
+        num_chunks = (numel + self.chunk_size - 1) // self.chunk_size
+        num_chunks = (num_chunks + num_shards - 1) // num_shards * num_shards
+        chunks = tf.reshape(tf.pad(flat, [[0, num_chunks * self.chunk_size - numel]]),
+                            [-1, self.chunk_size])
+
+        codes, scales = self.quantize(chunks)
+        if residual is not None:
+            error = tf.reshape(chunks - self.dequantize(codes, scales), [-1])[:numel]
+            with tf.control_dependencies([residual.assign(error)]):
+                codes = tf.identity(codes)
+        return (codes, scales), (tf.shape(tensor), tensor.dtype)
+
+    def decompress(self, tensor, ctx):
+        """Dequantizes (codes, scales) back into a tensor of the original shape and type."""
+        if ctx is None:
+            return tensor
+        codes, scales = tensor
+        shape, dtype = ctx
+        flat = tf.reshape(self.dequantize(codes, scales), [-1])[:tf.reduce_prod(shape)]
+        return tf.cast(tf.reshape(flat, shape), dtype)
+
+
+class Int8Compressor(QuantizingCompressor):
+    """Quantize to 8-bit integers with one float32 scale per chunk."""
+    def __init__(self, chunk_size=1024, error_feedback=False):
+        super(Int8Compressor, self).__init__(chunk_size, error_feedback)
+
+    def quantize(self, chunks):
+        scales = tf.reduce_max(tf.abs(chunks), axis=1) / 127
+        scales = tf.where(scales > 0, scales, tf.ones_like(scales))
+        codes = tf.cast(tf.clip_by_value(tf.round(chunks / tf.expand_dims(scales, 1)), -127, 127),
+                        tf.int8)
+        return codes, scales
+
+    def dequantize(self, codes, scales):
+        return tf.cast(codes, tf.float32) * tf.expand_dims(scales, 1)
+
+
+class OneBitCompressor(QuantizingCompressor):
+    """
+    Quantize to the sign of every element, packed eight to a byte, scaled by the mean
+    magnitude of the chunk. The quantization error is always fed back.
+    """
+    _BIT_WEIGHTS = [128, 64, 32, 16, 8, 4, 2, 1]
+
+    def __init__(self, chunk_size=1024):
+        if chunk_size % 8 != 0:
+            raise ValueError('chunk_size should be a multiple of 8, got %s.' % chunk_size)
+        super(OneBitCompressor, self).__init__(chunk_size, error_feedback=True)
+
+    def quantize(self, chunks):
+        scales = tf.reduce_mean(tf.abs(chunks), axis=1)
+        signs = tf.reshape(tf.cast(chunks >= 0, tf.int32), [tf.shape(chunks)[0], -1, 8])
+        codes = tf.cast(tf.reduce_sum(signs * self._BIT_WEIGHTS, axis=2), tf.uint8)
+        return codes, scales
+
+    def dequantize(self, codes, scales):
+        weights = tf.constant(self._BIT_WEIGHTS, dtype=tf.uint8)
+        bits = tf.not_equal(tf.bitwise.bitwise_and(tf.expand_dims(codes, -1), weights), 0)
+        signs = tf.cast(tf.reshape(bits, [tf.shape(codes)[0], -1]), tf.float32) * 2 - 1
+        return signs * tf.expand_dims(scales, 1)
+
+
+class BF16Compressor(QuantizingCompressor):
+    """
+    Truncate floating point tensors to bfloat16, which keeps the float32 exponent range.
+    Requires no scaling metadata.
+    """
+    def __init__(self, chunk_size=1024, error_feedback=False):
+        super(BF16Compressor, self).__init__(chunk_size, error_feedback)
+
+    def quantize(self, chunks):
+        # The backend has no bfloat16 type, the codes are exchanged as raw 16-bit integers
+        return tf.bitcast(tf.cast(chunks, tf.bfloat16), tf.int16), None
+
+    def dequantize(self, codes, scales):
+        return tf.cast(tf.bitcast(codes, tf.bfloat16), tf.float32)
+
+
+class PowerSGDCompressor(object):
+    """
+    Low-rank gradient compression as described in "PowerSGD: Practical Low-Rank Gradient
+    Compression for Distributed Optimization" (Vogels et al., 2019).
+
+    Every gradient with at least two dimensions is viewed as an n x m matrix M and
+    approximated by P Q^T with P of shape n x r and Q of shape m x r. P = M Q and
+    Q = M^T P are reduced across ranks in two grouped allreduces, P being orthogonalized
+    in between, so that only r * (n + m) instead of n * m elements are sent. Q is kept
+    in a variable as the starting point of the next power iteration (warm start), and
+    the approximation error is fed back into the gradient of the next step.
+
+    Gradients for which the compression rate would be below `min_compression_rate`,
+    such as biases, are reduced uncompressed alongside P.
+
+    PowerSGD reduces all gradients together, so it cannot be expressed as a per-tensor
+    `Compressor`. It must be instantiated, e.g. ``hvd.Compression.powersgd(rank=4)``,
+    and an instance must not be shared between optimizers.
+    """
+    def __init__(self, rank=1, min_compression_rate=2.0, warm_start=True, seed=0):
+        if rank < 1:
+            raise ValueError('rank should be a positive integer, got %s.' % rank)
+        self.rank = rank
+        self.min_compression_rate = min_compression_rate
+        self.warm_start = warm_start
+        self.seed = seed
+        self._qs = {}
+        self._errors = {}
+
+    def _is_compressible(self, tensor):
+        if tensor.shape.ndims is None or tensor.shape.ndims < 2 or not tensor.dtype.is_floating:
+            return False
+        n = tensor.shape[0]
+        m = tensor.shape.num_elements() // n
+        r = min(self.rank, n, m)
+        return n * m >= self.min_compression_rate * r * (n + m)
+
+    def _state(self, name, matrix):
+        if name not in self._qs:
+            n, m = matrix.shape.as_list()
+            r = min(self.rank, n, m)
+            var_name = name.replace(':', '_')
+            with tf.init_scope():
+                # All ranks must start from the same Q, so it is drawn from a fixed seed
+                self._qs[name] = tf.Variable(
+                    tf.random.stateless_normal([m, r], seed=[self.seed, len(self._qs)],
+                                               dtype=matrix.dtype),
+                    trainable=False, name='powersgd_q_' + var_name)
+                self._errors[name] = tf.Variable(
+                    tf.zeros([n, m], dtype=matrix.dtype), trainable=False,
+                    name='powersgd_error_' + var_name)
+        return self._qs[name], self._errors[name]
+
+    @staticmethod
+    def _grouped_allreduce(tensors, op):
+        from horovod.tensorflow import grouped_allreduce
+
+        # Grouped allreduce requires all tensors of a group to share the same type
+        indices_by_dtype = {}
+        for i, tensor in enumerate(tensors):
+            indices_by_dtype.setdefault(tensor.dtype, []).append(i)
+
+        outputs = [None] * len(tensors)
+        for indices in indices_by_dtype.values():
+            reduced = grouped_allreduce([tensors[i] for i in indices], op=op)
+            for i, tensor in zip(indices, reduced):
+                outputs[i] = tensor
+        return outputs
+
+    def reduce(self, tensors, names, op=None):
+        """
+        Reduces the tensors across all Horovod processes using the low-rank approximation.
+
+        Arguments:
+            tensors: A list of tensors to reduce, in the same order on every rank.
+            names: A list of unique names of the tensors, used to key the warm-start
+                   and error feedback variables.
+            op: The reduction operation, Average (the default) or Sum.
+
+        Returns:
+            A list of tensors of the same shapes and types as `tensors`.
+        """
+        from horovod.tensorflow.mpi_ops import Adasum
+
+        if op == Adasum:
+            raise NotImplementedError('The Adasum reduction does not support PowerSGD compression.')
+
+        outputs = [None] * len(tensors)
+        compressed = []
+        uncompressed = []
+        ps = []
+        for i, (tensor, name) in enumerate(zip(tensors, names)):
+            if not self._is_compressible(tensor):
+                uncompressed.append(i)
+                continue
+
+            matrix = tf.reshape(tensor, [tensor.shape[0], -1])
+            q, error = self._state(name, matrix)
+            matrix = matrix + error
+            compressed.append((i, matrix, q, error))
+            ps.append(tf.matmul(matrix, q))
+
+        reduced = self._grouped_allreduce(ps + [tensors[i] for i in uncompressed], op)
+        ps, reduced = reduced[:len(ps)], reduced[len(ps):]
+        for i, tensor in zip(uncompressed, reduced):
+            outputs[i] = tensor
+        if not compressed:
+            return outputs
+
+        ps = [tf.linalg.qr(p)[0] for p in ps]
+        qs = self._grouped_allreduce([tf.matmul(matrix, p, transpose_a=True)
+                                      for p, (_, matrix, _, _) in zip(ps, compressed)], op)
+
+        for p, q, (i, matrix, q_var, error) in zip(ps, qs, compressed):
+            approx = tf.matmul(p, q, transpose_b=True)
+            updates = [error.assign(matrix - approx)]
+            if self.warm_start:
+                updates.append(q_var.assign(q))
+            with tf.control_dependencies(updates):
+                outputs[i] = tf.reshape(approx, tf.shape(tensors[i]))
+        return outputs
+
+
 class Compression(object):
     """Optional gradient compression algorithm used during allreduce."""
 
@@ -72,3 +431,24 @@ class Compression(object):
 
     """Compress all floating point gradients to 16-bit."""
     fp16 = FP16Compressor
+
+    """Exchange the top-k elements of every gradient, with error feedback."""
+    topk = TopKCompressor
+
+    """Exchange k random elements of every gradient, with error feedback."""
+    randomk = RandomKCompressor
+
+    """Exchange the elements of every gradient above a threshold, with error feedback."""
+    threshold = ThresholdCompressor
+
+    """Reduce low-rank approximations of the gradients, with error feedback."""
+    powersgd = PowerSGDCompressor
+
+    """Quantize floating point gradients to 8-bit integers with per-chunk scales."""
+    int8 = Int8Compressor
+
+    """Quantize floating point gradients to their signs with per-chunk scales and error feedback."""
+    onebit = OneBitCompressor
+
+    """Truncate floating point gradients to bfloat16."""
+    bf16 = BF16Compressor
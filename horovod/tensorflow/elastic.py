@@ -21,8 +21,9 @@ from tensorflow.python.framework import ops
 
 from horovod.common.elastic import run_fn, ObjectState
 from horovod.common.exceptions import HorovodInternalError
-from horovod.tensorflow.functions import broadcast_object, broadcast_object_fn, broadcast_variables
-from horovod.tensorflow.mpi_ops import _executing_eagerly, init, rank, shutdown
+from horovod.tensorflow.functions import allgather_object, broadcast_object, broadcast_object_fn, \
+    broadcast_variables
+from horovod.tensorflow.mpi_ops import _executing_eagerly, init, rank, shutdown, size
 
 
 _IS_TF2 = LooseVersion(tf.__version__) >= LooseVersion('2.0.0')
@@ -69,8 +70,7 @@ def _reset():
 def _broadcast_model(model, optimizer, backend):
     if _executing_eagerly():
         # TensorFlow 2.0 or TensorFlow eager
-        broadcast_variables(model.variables, root_rank=0)
-        broadcast_variables(optimizer.variables(), root_rank=0)
+        broadcast_variables(list(model.variables) + list(optimizer.variables()), root_rank=0)
     else:
         bcast_op = broadcast_variables(_global_variables(), root_rank=0)
         backend.get_session().run(bcast_op)
@@ -111,14 +111,17 @@ class TensorFlowKerasState(ObjectState):
         if not backend or _executing_eagerly():
             self._bcast_model = lambda: _broadcast_model(self.model, self.optimizer, backend=self.backend)
             bcast_object = broadcast_object
+            gather_object = allgather_object
         else:
             # For TensorFlow v1, we need to reuse the broadcast op to prevent incrementing the uids
             bcast_op = broadcast_variables(_global_variables(), root_rank=0)
             self._bcast_model = lambda: self.backend.get_session().run(bcast_op)
             bcast_object = broadcast_object_fn(session=self.backend.get_session())
+            gather_object = None
 
         super(TensorFlowKerasState, self).__init__(bcast_object=bcast_object,
                                                    get_rank=rank,
+                                                   allgather_object=gather_object,
                                                    **kwargs)
 
     def save(self):
@@ -130,7 +133,9 @@ class TensorFlowKerasState(ObjectState):
         super(TensorFlowKerasState, self).restore()
 
     def sync(self):
-        self._bcast_model()
+        # Workers that all hold the state of rank 0 do not need to receive it again
+        if len(self.sync_holders()) < size():
+            self._bcast_model()
         self._save_model()
         super(TensorFlowKerasState, self).sync()
 
@@ -13,33 +13,54 @@
 # limitations under the License.
 # ==============================================================================
 
-import io
-
-import cloudpickle
 import numpy as np
 import tensorflow as tf
 
 from tensorflow.python.framework import ops
 
-from horovod.tensorflow.mpi_ops import allgather, broadcast
+from horovod.common.util import allgather_object_chunks, broadcast_object_chunks
+from horovod.tensorflow.mpi_ops import allgather, broadcast, grouped_broadcast
 from horovod.tensorflow.mpi_ops import rank, size
-from horovod.tensorflow.util import _cache, _executing_eagerly, _make_subgraph
+from horovod.tensorflow.util import _cache, _executing_eagerly, _make_subgraph, _pack_by_dtype_and_device
 
 
 @_cache
 def _make_broadcast_group_fn():
+    # All variables are broadcast by a single grouped op over one concatenated
+    # tensor per dtype and device, so that they are negotiated together and the
+    # backend only sees a few large tensors
+    def concat(pack, variables):
+        with tf.device(variables[pack[0]].device):
+            return tf.concat([tf.reshape(variables[i], [-1]) for i in pack], axis=0)
+
+    def broadcast_values(variables, root_rank):
+        if not variables:
+            return []
+        packs = _pack_by_dtype_and_device(variables)
+        tensors = [concat(pack, variables) if len(pack) > 1 else variables[pack[0]]
+                   for pack in packs]
+        values = [None] * len(variables)
+        for pack, tensor in zip(packs, grouped_broadcast(tensors, root_rank)):
+            if len(pack) == 1:
+                values[pack[0]] = tensor
+                continue
+            splits = tf.split(tensor, [variables[i].shape.num_elements() for i in pack])
+            for i, split in zip(pack, splits):
+                values[i] = tf.reshape(split, variables[i].shape)
+        return values
+
     if _executing_eagerly():
         # Eager mode will parallelize independent control flow
         def broadcast_group(variables, root_rank):
-            for var in variables:
-                var.assign(broadcast(var, root_rank))
+            for var, value in zip(variables, broadcast_values(variables, root_rank)):
+                var.assign(value)
 
         return _make_subgraph(broadcast_group)
     else:
         # Graph mode requires an Op
         def broadcast_group(variables, root_rank):
-            return tf.group(*[var.assign(broadcast(var, root_rank))
-                              for var in variables])
+            return tf.group(*[var.assign(value)
+                              for var, value in zip(variables, broadcast_values(variables, root_rank))])
 
         return broadcast_group
 
@@ -47,6 +68,9 @@ def _make_broadcast_group_fn():
 def broadcast_variables(variables, root_rank):
     """Broadcasts variables from root rank to all other processes.
 
+    Variables are concatenated into one tensor per dtype and device and broadcast by
+    a single operation, which is compiled together with the assignments in eager mode.
+
     Arguments:
         variables: variables for broadcast
         root_rank: rank of the process from which global variables will be broadcasted
@@ -60,6 +84,9 @@ def broadcast_object(obj, root_rank=0, session=None, name=None):
     """
     Serializes and broadcasts an object from root rank to all other processes.
 
+    Small objects are broadcast together with their size in a single operation,
+    large objects are streamed in chunks.
+
     Arguments:
         obj: An object capable of being serialized without losing any context.
         root_rank: The rank of the process from which parameters will be
@@ -80,56 +107,27 @@ def broadcast_object(obj, root_rank=0, session=None, name=None):
         else:
             return v.numpy()
 
-    if rank() == root_rank:
-        b = io.BytesIO()
-        cloudpickle.dump(obj, b)
-        t = tf.convert_to_tensor(bytearray(b.getvalue()), dtype=tf.uint8)
-        sz = tf.convert_to_tensor([t.shape[0]], dtype=tf.int32)
-        to_numpy(broadcast(sz, root_rank, name + '.sz'))
-    else:
-        sz = tf.convert_to_tensor([0], dtype=tf.int32)
-        sz = to_numpy(broadcast(sz, root_rank, name + '.sz'))
-        t = tf.zeros(sz.tolist()[0], dtype=tf.uint8)
-
-    t = to_numpy(broadcast(t, root_rank, name + '.t'))
+    def broadcast_chunk(chunk, index):
+        t = tf.convert_to_tensor(np.frombuffer(chunk, dtype=np.uint8))
+        return to_numpy(broadcast(t, root_rank, '%s.%d' % (name, index)))
 
-    if rank() != root_rank:
-        buf = io.BytesIO(t.tobytes())
-        obj = cloudpickle.load(buf)
-
-    return obj
+    return broadcast_object_chunks(obj, rank() == root_rank, broadcast_chunk)
 
 
 def broadcast_object_fn(root_rank=0, session=None, name=None):
     name = name or 'broadcast_object_fn'
 
-    sz = tf.placeholder(tf.int32, [1], name='bcast_object_size')
-    bcast_size = broadcast(sz, root_rank, name + '.sz')
-
     t = tf.placeholder(tf.uint8, [None], name='bcast_object_data')
     bcast_data = broadcast(t, root_rank, name + '.t')
 
     session = session or ops.get_default_session()
 
     def _bcast(obj):
-        if rank() == root_rank:
-            b = io.BytesIO()
-            cloudpickle.dump(obj, b)
-            t_ = bytearray(b.getvalue())
-            sz_ = [len(t_)]
-            session.run(bcast_size, feed_dict={sz: sz_})
-        else:
-            sz_ = [0]
-            sz_ = session.run(bcast_size, feed_dict={sz: sz_})
-            t_ = np.zeros(sz_, dtype=np.uint8)
-
-        t_ = session.run(bcast_data, feed_dict={t: t_})
+        # Chunks are broadcast one after the other by the same op
+        def broadcast_chunk(chunk, index):
+            return session.run(bcast_data, feed_dict={t: np.frombuffer(chunk, dtype=np.uint8)})
 
-        if rank() != root_rank:
-            buf = io.BytesIO(t_.tobytes())
-            obj = cloudpickle.load(buf)
-
-        return obj
+        return broadcast_object_chunks(obj, rank() == root_rank, broadcast_chunk)
     return _bcast
 
 
@@ -137,6 +135,9 @@ def allgather_object(obj, session=None, name=None):
     """
     Serializes and allgathers an object from all other processes.
 
+    Small objects are allgathered together with their sizes in a single operation,
+    large objects are streamed in chunks.
+
     Arguments:
         obj: An object capable of being serialized without losing any context.
         session: Session for TensorFlow v1 compatibility.
@@ -149,10 +150,6 @@ def allgather_object(obj, session=None, name=None):
     if name is None:
         name = type(obj).__name__
 
-    def load(byte_array):
-        buf = io.BytesIO(byte_array.tobytes())
-        return cloudpickle.load(buf)
-
     def to_numpy(v):
         if not _executing_eagerly():
             sess = session or ops.get_default_session()
@@ -160,18 +157,8 @@ def allgather_object(obj, session=None, name=None):
         else:
             return v.numpy()
 
-    b = io.BytesIO()
-    cloudpickle.dump(obj, b)
-
-    t = tf.convert_to_tensor(bytearray(b.getvalue()), dtype=tf.uint8)
-    sz = tf.convert_to_tensor([t.shape[0]], dtype=tf.int32)
-
-    sizes = to_numpy(allgather(sz, name=name + '.sz'))
-    gathered = to_numpy(allgather(t, name=name + '.t'))
-
-    def select(i):
-        start = sum(sizes[:i])
-        end = start + sizes[i]
-        return gathered[start:end]
+    def allgather_chunk(chunk, index):
+        t = tf.convert_to_tensor(np.frombuffer(chunk, dtype=np.uint8))
+        return to_numpy(allgather(t, name='%s.%d' % (name, index)))
 
-    return [load(select(i)) for i in range(size())]
+    return allgather_object_chunks(obj, allgather_chunk)
@@ -1,5 +1,7 @@
 import tensorflow as tf
 
+from horovod.tensorflow.util import _pack_by_dtype_and_device
+
 
 def apply_op_to_not_none_tensors(tensor_op, tensors, *args):
     return [
@@ -13,6 +15,71 @@ def get_not_none_from_list(tensor_list):
     return [x for x in tensor_list if x is not None]
 
 
+class FlatGradientAccumulator:
+    """
+    FlatGradientAccumulator sums gradients into one flat variable per dtype and
+    device, so that adding, reading and clearing the aggregated gradients take
+    one op per variable rather than one per gradient. Gradients of unknown shape
+    are summed into a variable of their own.
+    """
+
+    def __init__(self, grads, create_variable):
+        """
+        Arguments:
+            grads: The dense gradients to accumulate, None gradients excluded.
+            create_variable: A function (name, initial_value) -> tf.Variable.
+        """
+        self._shapes = [grad.shape for grad in grads]
+        self._packs = _pack_by_dtype_and_device(grads)
+        self.variables = []
+        for pack in self._packs:
+            grad = grads[pack[0]]
+            if len(pack) == 1:
+                name = str(pack[0])
+                initial_value = tf.zeros(shape=grad.shape, dtype=grad.dtype) \
+                    if grad.shape.is_fully_defined() else tf.zeros_like(grad)
+            else:
+                # Packs of the same dtype on different devices are told apart
+                # by the index of their first gradient.
+                name = "flat_%s_%d" % (grad.dtype.name, pack[0])
+                num_elements = sum(self._shapes[i].num_elements() for i in pack)
+                initial_value = tf.zeros(shape=[num_elements], dtype=grad.dtype)
+            with tf.device(grad.device):
+                self.variables.append(create_variable(name, initial_value))
+
+    def add(self, grads):
+        """Adds the gradients to the aggregated gradients, returns the update ops."""
+        updates = []
+        for pack, variable in zip(self._packs, self.variables):
+            if len(pack) == 1:
+                updates.append(variable.assign_add(grads[pack[0]]))
+            else:
+                # The concatenated temporary is only as large as the gradients of the pack
+                flat = tf.concat([tf.reshape(grads[i], [-1]) for i in pack], axis=0)
+                updates.append(variable.assign_add(flat))
+        return updates
+
+    def read(self):
+        """Returns the aggregated gradients in the order they were given."""
+        values = [None] * len(self._shapes)
+        for pack, variable in zip(self._packs, self.variables):
+            value = variable.read_value()
+            if len(pack) == 1:
+                values[pack[0]] = value
+                continue
+            splits = tf.split(value, [self._shapes[i].num_elements() for i in pack])
+            for i, split in zip(pack, splits):
+                values[i] = tf.reshape(split, self._shapes[i])
+        return values
+
+    def clear(self):
+        """Sets the aggregated gradients to zero, returns the assign ops."""
+        return [variable.assign(tf.zeros_like(variable)) for variable in self.variables]
+
+    def __len__(self):
+        return len(self._shapes)
+
+
 class LocalGradientAggregationHelper:
     """
     LocalGradientAggregationHelper aggregates gradient updates locally,
@@ -43,9 +110,9 @@ class LocalGradientAggregationHelper:
         # aggregated, should be divided by `backward_passes_per_step`.
         self.average_aggregated_gradients = average_aggregated_gradients
 
-        # This is going to be [N] data structure holding the aggregated gradient updates
-        # N is the number of parameters.
-        self.locally_aggregated_grads = []
+        # FlatGradientAccumulator holding the aggregated gradient updates of the
+        # N parameters with a gradient.
+        self.locally_aggregated_grads = None
 
         # Used to know when to allreduce and apply gradients. We allreduce when `self.counter`
         # is equal to `self.backward_passes_per_step`. We apply gradients when `self.counter` is
@@ -75,6 +142,7 @@ class LocalGradientAggregationHelper:
                 trainable=False, initializer=tf.compat.v1.zeros_initializer(),
                 collections=[tf.compat.v1.GraphKeys.LOCAL_VARIABLES],
             )
+            dense_grads = []
             for idx, grad in enumerate(grads):
                 # Handle IndexedSlices.
                 if self.sparse_as_dense and isinstance(grad, tf.IndexedSlices):
@@ -90,20 +158,21 @@ class LocalGradientAggregationHelper:
                 if grad is None:
                     self.num_none_grad_updates += 1
                     continue
-                self.not_none_indexes[idx] = len(self.locally_aggregated_grads)
+                self.not_none_indexes[idx] = len(dense_grads)
+                dense_grads.append(grad)
 
-                # Create shadow variable.
-                grad_aggregation_variable_name = str(idx)
-                zero_grad = tf.zeros(shape=grad.get_shape().as_list(), dtype=grad.dtype)
-                grad_aggregation_variable = tf.compat.v1.get_variable(
-                    grad_aggregation_variable_name,
+            # Create shadow variables, one per dtype.
+            def create_variable(name, initial_value):
+                return tf.compat.v1.get_variable(
+                    name,
                     trainable=False,
-                    initializer=zero_grad,
+                    initializer=initial_value,
                     collections=[
                         tf.compat.v1.GraphKeys.LOCAL_VARIABLES,
                         "aggregating_collection"],
                 )
-                self.locally_aggregated_grads.append(grad_aggregation_variable)
+
+            self.locally_aggregated_grads = FlatGradientAccumulator(dense_grads, create_variable)
             assert len(self.locally_aggregated_grads) + \
                 self.num_none_grad_updates == len(grads)
 
@@ -113,42 +182,27 @@ class LocalGradientAggregationHelper:
         if self.optimizer_type == self._OPTIMIZER_TYPE_KERAS:
             session = tf.compat.v1.keras.backend.get_session(op_input_list=())
             vars_init_op = tf.compat.v1.variables_initializer(
-                [self.counter, *get_not_none_from_list(self.locally_aggregated_grads)]
+                [self.counter, *self.locally_aggregated_grads.variables]
             )
             session.run(vars_init_op)
 
     def _clear_grads(self):
-        clear_ops_list = []
-        for idx, grad_aggregator in enumerate(self.locally_aggregated_grads):
-            clear_op = grad_aggregator.assign(grad_aggregator.initial_value)
-            clear_ops_list.append(clear_op)
-        return tf.group(*clear_ops_list)
+        return tf.group(*self.locally_aggregated_grads.clear())
 
     def _aggregate_grads(self, grads):
-        aggregation_ops_list = []
         grads = get_not_none_from_list(grads)
         assert len(grads) == len(self.locally_aggregated_grads)
 
         # Apply new gradient updates to the local copy.
-        for idx, grad in enumerate(grads):
-            if self.sparse_as_dense and isinstance(grad, tf.IndexedSlices):
-                grad = tf.convert_to_tensor(grad)
-
-            updated_grad_aggregator = self.locally_aggregated_grads[idx].assign_add(
-                grad)
-            aggregation_ops_list.append(updated_grad_aggregator)
-
-        return aggregation_ops_list
+        grads = [tf.convert_to_tensor(grad)
+                 if self.sparse_as_dense and isinstance(grad, tf.IndexedSlices) else grad
+                 for grad in grads]
+        return self.locally_aggregated_grads.add(grads)
 
     def _allreduce_grads_helper(self, grads, vars):
         # Read in latest variables values.
-        aggregated_grads = []
-        aggregation_read_ops_list = []
-        for idx, locally_aggregated_grad in enumerate(
-                self.locally_aggregated_grads):
-            aggregated_grads.append(locally_aggregated_grad.read_value())
-            aggregation_read_ops_list.append(aggregated_grads[idx])
-        aggregation_read_ops = tf.group(*aggregation_read_ops_list)
+        aggregated_grads = self.locally_aggregated_grads.read()
+        aggregation_read_ops = tf.group(*aggregated_grads)
 
         with tf.control_dependencies([aggregation_read_ops]):
             averaged_gradients = self._allreduce_grads(aggregated_grads, vars)
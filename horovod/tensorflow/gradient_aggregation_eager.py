@@ -2,6 +2,8 @@ from distutils.version import LooseVersion
 
 import tensorflow as tf
 
+from horovod.tensorflow.gradient_aggregation import FlatGradientAccumulator
+
 _POST_TF_2_4_0 = LooseVersion(tf.__version__) >= LooseVersion('2.4.0')
 
 
@@ -32,9 +34,9 @@ class LocalGradientAggregationHelperEager:
         # aggregated, should be divided by `backward_passes_per_step`.
         self.average_aggregated_gradients = average_aggregated_gradients
 
-        # This is going to be N data structure holding the aggregated gradient updates
-        # for parameter updates. N is the number of parameters.
-        self.locally_aggregated_grads = {}
+        # FlatGradientAccumulator holding the aggregated gradient updates of the
+        # parameters with a gradient, created on the first call.
+        self.locally_aggregated_grads = None
 
         # Used to know when to allreduce and apply gradients. We allreduce when `self.counter`
         # is equal to `self.backward_passes_per_step`. We apply gradients when `self.counter`
@@ -46,9 +48,8 @@ class LocalGradientAggregationHelperEager:
         # On steps where allreduce happens, resulting_grads returns the allreduced
         # gradients, on other steps it returns the locally aggregated
         # gradients.
-        resulting_grads = []
-
-        for idx, grad in enumerate(grads):
+        dense_grads = []
+        for grad in grads:
             # Handle IndexedSlices.
             if self.sparse_as_dense and isinstance(grad, tf.IndexedSlices):
                 grad = tf.convert_to_tensor(grad)
@@ -58,24 +59,21 @@ class LocalGradientAggregationHelperEager:
                     "`backward_passes_per_step` > 1 and "
                     "`sparse_as_dense` is False."
                 )
-
-            # Create variables to store to aggregate gradients if they don't
-            # already exist. Skip variables that are None.
-            if idx not in self.locally_aggregated_grads.keys():
-                if grad is not None:
-                    self.locally_aggregated_grads[idx] = tf.Variable(
-                        initial_value=tf.zeros_like(grad),
-                        trainable=False,
-                        dtype=grad.dtype,
-                    )
-
-            if grad is None:
-                resulting_grads.append(None)
-            else:
-                self.locally_aggregated_grads[idx].assign_add(grad)
-                resulting_grads.append(
-                    self.locally_aggregated_grads[idx].read_value())
-        assert len(self.locally_aggregated_grads) == len(grads)
+            if grad is not None:
+                dense_grads.append(grad)
+
+        # Create the variables that aggregate the gradients if they don't
+        # already exist. Skip gradients that are None.
+        if self.locally_aggregated_grads is None:
+            self.locally_aggregated_grads = FlatGradientAccumulator(
+                dense_grads,
+                lambda name, initial_value: tf.Variable(
+                    initial_value=initial_value, trainable=False, name=name))
+        assert len(self.locally_aggregated_grads) == len(dense_grads)
+
+        self.locally_aggregated_grads.add(dense_grads)
+        aggregated_grads = iter(self.locally_aggregated_grads.read())
+        resulting_grads = [None if grad is None else next(aggregated_grads) for grad in grads]
 
         # Increment counter.
         self.counter.assign_add(1)
@@ -119,9 +117,7 @@ class LocalGradientAggregationHelperEager:
 
     def _clear_vars(self):
         self.counter.assign(0)
-        for idx in self.locally_aggregated_grads.keys():
-            self.locally_aggregated_grads[idx].assign_add(
-                -1 * self.locally_aggregated_grads[idx])
+        self.locally_aggregated_grads.clear()
 
     def apply_gradients(self, apply_grads_closure, optimizer, *args, **kwargs):
         def increment_optimizer_iteration():
@@ -387,7 +387,9 @@ public:
     OP_REQUIRES_OK(context, context->GetAttr("reduce_op", &reduce_op_));
     OP_REQUIRES_OK(context, context->GetAttr("prescale_factor", &prescale_factor_));
     OP_REQUIRES_OK(context, context->GetAttr("postscale_factor", &postscale_factor_));
+    OP_REQUIRES_OK(context, context->GetAttr("priority", &priority_));
     OP_REQUIRES_OK(context, context->GetAttr("ignore_name_scope", &ignore_name_scope_));
+    OP_REQUIRES_OK(context, context->GetAttr("process_set_id", &process_set_id_));
   }
 
   void ComputeAsync(OpKernelContext* context, DoneCallback done) override {
@@ -417,7 +419,8 @@ public:
         [context, done](const common::Status& status) {
           context->SetStatus(ConvertStatus(status));
           done();
-        }, reduce_op, (double) prescale_factor_, (double) postscale_factor_);
+        }, reduce_op, (double) prescale_factor_, (double) postscale_factor_,
+        priority_, process_set_id_);
     OP_REQUIRES_OK_ASYNC(context, ConvertStatus(enqueue_result), done);
   }
 
@@ -426,7 +429,9 @@ private:
   // Using float since TF does not support double OP attributes
   float prescale_factor_;
   float postscale_factor_;
+  int priority_;
   bool ignore_name_scope_;
+  int process_set_id_;
 };
 
 REGISTER_KERNEL_BUILDER(Name("HorovodAllreduce").Device(DEVICE_CPU),
@@ -441,7 +446,9 @@ REGISTER_OP("HorovodAllreduce")
     .Attr("reduce_op: int")
     .Attr("prescale_factor: float")
     .Attr("postscale_factor: float")
+    .Attr("priority: int = 0")
     .Attr("ignore_name_scope: bool = False")
+    .Attr("process_set_id: int = 0")
     .Input("tensor: T")
     .Output("sum: T")
     .SetShapeFn([](shape_inference::InferenceContext* c) {
@@ -468,8 +475,10 @@ public:
     OP_REQUIRES_OK(context, context->GetAttr("reduce_op", &reduce_op_));
     OP_REQUIRES_OK(context, context->GetAttr("prescale_factor", &prescale_factor_));
     OP_REQUIRES_OK(context, context->GetAttr("postscale_factor", &postscale_factor_));
+    OP_REQUIRES_OK(context, context->GetAttr("priority", &priority_));
     OP_REQUIRES_OK(context, context->GetAttr("ignore_name_scope", &ignore_name_scope_));
     OP_REQUIRES_OK(context, context->GetAttr("num_tensors", &num_tensors_));
+    OP_REQUIRES_OK(context, context->GetAttr("process_set_id", &process_set_id_));
   }
 
   void ComputeAsync(OpKernelContext* context, DoneCallback done) override {
@@ -528,7 +537,8 @@ public:
 
     auto enqueue_result = EnqueueTensorAllreduces(
         hvd_contexts, hvd_tensors, hvd_outputs, ready_events, names, device,
-        callbacks, reduce_op, (double) prescale_factor_, (double) postscale_factor_);
+        callbacks, reduce_op, (double) prescale_factor_, (double) postscale_factor_,
+        priority_, process_set_id_);
     OP_REQUIRES_OK_ASYNC(context, ConvertStatus(enqueue_result), done);
   }
 
@@ -537,8 +547,10 @@ private:
   // Using float since TF does not support double OP attributes
   float prescale_factor_;
   float postscale_factor_;
+  int priority_;
   bool ignore_name_scope_;
   int num_tensors_;
+  int process_set_id_;
 };
 
 REGISTER_KERNEL_BUILDER(Name("HorovodGroupedAllreduce").Device(DEVICE_CPU),
@@ -553,8 +565,10 @@ REGISTER_OP("HorovodGroupedAllreduce")
     .Attr("reduce_op: int")
     .Attr("prescale_factor: float")
     .Attr("postscale_factor: float")
+    .Attr("priority: int = 0")
     .Attr("ignore_name_scope: bool = False")
     .Attr("num_tensors: int")
+    .Attr("process_set_id: int = 0")
     .Input("tensors: num_tensors*T")
     .Output("sum: num_tensors*T")
     .SetShapeFn([](shape_inference::InferenceContext* c) {
@@ -582,6 +596,7 @@ public:
   explicit HorovodAllgatherOp(OpKernelConstruction* context)
       : AsyncOpKernel(context) {
     OP_REQUIRES_OK(context, context->GetAttr("ignore_name_scope", &ignore_name_scope_));
+    OP_REQUIRES_OK(context, context->GetAttr("process_set_id", &process_set_id_));
   }
 
   void ComputeAsync(OpKernelContext* context, DoneCallback done) override {
@@ -608,12 +623,13 @@ public:
         [context, done](const common::Status& status) {
           context->SetStatus(ConvertStatus(status));
           done();
-        });
+        }, process_set_id_);
     OP_REQUIRES_OK_ASYNC(context, ConvertStatus(enqueue_result), done);
   }
 
 private:
   bool ignore_name_scope_;
+  int process_set_id_;
 };
 
 REGISTER_KERNEL_BUILDER(Name("HorovodAllgather").Device(DEVICE_CPU),
@@ -627,6 +643,7 @@ REGISTER_OP("HorovodAllgather")
     .Attr(
         "T: {uint8, int8, uint16, int16, int32, int64, float16, float32, float64, bool}")
     .Attr("ignore_name_scope: bool = False")
+    .Attr("process_set_id: int = 0")
     .Input("tensor: T")
     .Output("output: T")
     .SetShapeFn([](shape_inference::InferenceContext* c) {
@@ -654,6 +671,7 @@ public:
       : AsyncOpKernel(context) {
     OP_REQUIRES_OK(context, context->GetAttr("root_rank", &root_rank_));
     OP_REQUIRES_OK(context, context->GetAttr("ignore_name_scope", &ignore_name_scope_));
+    OP_REQUIRES_OK(context, context->GetAttr("process_set_id", &process_set_id_));
   }
 
   void ComputeAsync(OpKernelContext* context, DoneCallback done) override {
@@ -670,7 +688,7 @@ public:
     auto device = GetDeviceID(context);
     auto tensor = context->input(0);
     Tensor* output = nullptr;
-    if (common::horovod_rank() == root_rank_) {
+    if (common::horovod_process_set_rank(process_set_id_) == root_rank_) {
       context->set_output(0, tensor);
     } else {
       OP_REQUIRES_OK_ASYNC(
@@ -689,13 +707,14 @@ public:
         device, [context, done](const common::Status& status) {
           context->SetStatus(ConvertStatus(status));
           done();
-        });
+        }, process_set_id_);
     OP_REQUIRES_OK_ASYNC(context, ConvertStatus(enqueue_result), done);
   }
 
 private:
   int root_rank_;
   bool ignore_name_scope_;
+  int process_set_id_;
 };
 
 REGISTER_KERNEL_BUILDER(Name("HorovodBroadcast").Device(DEVICE_CPU),
@@ -710,6 +729,7 @@ REGISTER_OP("HorovodBroadcast")
         "T: {uint8, int8, uint16, int16, int32, int64, float16, float32, float64, bool}")
     .Attr("root_rank: int")
     .Attr("ignore_name_scope: bool = False")
+    .Attr("process_set_id: int = 0")
     .Input("tensor: T")
     .Output("output: T")
     .SetShapeFn([](shape_inference::InferenceContext* c) {
@@ -729,6 +749,123 @@ Output
                `tensor` on root rank.
 )doc");
 
+class HorovodGroupedBroadcastOp : public AsyncOpKernel {
+public:
+  explicit HorovodGroupedBroadcastOp(OpKernelConstruction* context)
+      : AsyncOpKernel(context) {
+    OP_REQUIRES_OK(context, context->GetAttr("root_rank", &root_rank_));
+    OP_REQUIRES_OK(context, context->GetAttr("ignore_name_scope", &ignore_name_scope_));
+    OP_REQUIRES_OK(context, context->GetAttr("process_set_id", &process_set_id_));
+  }
+
+  void ComputeAsync(OpKernelContext* context, DoneCallback done) override {
+    OP_REQUIRES_OK_ASYNC(context, ConvertStatus(common::CheckInitialized()),
+                         done);
+
+    auto node_name = name();
+    if (ignore_name_scope_) {
+      auto pos = node_name.find_last_of('/');
+      if (pos != std::string::npos) {
+        node_name = node_name.substr(pos + 1);
+      }
+    }
+    auto device = GetDeviceID(context);
+    int num_tensors = context->num_inputs();
+
+    std::vector<std::shared_ptr<common::ReadyEvent>> ready_events;
+    std::vector<std::shared_ptr<common::OpContext>> hvd_contexts;
+    std::vector<std::shared_ptr<common::Tensor>> hvd_tensors;
+    std::vector<std::shared_ptr<common::Tensor>> hvd_outputs;
+    std::vector<common::StatusCallback> callbacks;
+    std::vector<std::string> names;
+    ready_events.reserve(num_tensors);
+    hvd_contexts.reserve(num_tensors);
+    hvd_tensors.reserve(num_tensors);
+    hvd_outputs.reserve(num_tensors);
+    callbacks.reserve(num_tensors);
+    names.reserve(num_tensors);
+    auto callback_mutex = std::make_shared<std::mutex>();
+    auto callback_count = std::make_shared<int>(0);
+
+    for (int i = 0; i < num_tensors; ++i) {
+        auto tensor = context->input(i);
+        Tensor* output = nullptr;
+        if (common::horovod_process_set_rank(process_set_id_) == root_rank_) {
+          context->set_output(i, tensor);
+        } else {
+          OP_REQUIRES_OK_ASYNC(
+              context, context->allocate_output(i, tensor.shape(), &output), done);
+        }
+        // ReadyEvent makes sure input tensor is ready, and output is allocated.
+        ready_events.emplace_back(std::shared_ptr<common::ReadyEvent>(RecordReadyEvent(context)));
+        hvd_contexts.emplace_back(std::make_shared<TFOpContext>(context));
+        hvd_tensors.emplace_back(std::make_shared<TFTensor>(tensor));
+        names.emplace_back(node_name + "_" + std::to_string(i+1) + "of" + std::to_string(num_tensors));
+        if (output != nullptr) {
+          hvd_outputs.emplace_back(std::make_shared<TFTensor>(*output));
+        } else {
+          hvd_outputs.emplace_back(nullptr);
+        }
+        callbacks.emplace_back(
+            [context, done, callback_mutex, callback_count, num_tensors](const common::Status& status) mutable {
+                // Must only invoke callback on last tensor.
+                std::lock_guard<std::mutex> guard(*callback_mutex);
+                (*callback_count)++;
+                if (*callback_count == num_tensors) {
+                    context->SetStatus(ConvertStatus(status));
+                    done();
+                }
+            }
+        );
+    }
+
+    auto enqueue_result = EnqueueTensorBroadcasts(
+        hvd_contexts, hvd_tensors, hvd_outputs, root_rank_, ready_events, names,
+        device, callbacks, process_set_id_);
+    OP_REQUIRES_OK_ASYNC(context, ConvertStatus(enqueue_result), done);
+  }
+
+private:
+  int root_rank_;
+  bool ignore_name_scope_;
+  int process_set_id_;
+};
+
+REGISTER_KERNEL_BUILDER(Name("HorovodGroupedBroadcast").Device(DEVICE_CPU),
+                        HorovodGroupedBroadcastOp);
+#if HOROVOD_GPU_BROADCAST
+REGISTER_KERNEL_BUILDER(Name("HorovodGroupedBroadcast").Device(DEVICE_GPU),
+                        HorovodGroupedBroadcastOp);
+#endif
+
+REGISTER_OP("HorovodGroupedBroadcast")
+    .Attr(
+        "T: list({uint8, int8, uint16, int16, int32, int64, float16, float32, float64, bool})")
+    .Attr("root_rank: int")
+    .Attr("ignore_name_scope: bool = False")
+    .Attr("process_set_id: int = 0")
+    .Input("tensors: T")
+    .Output("outputs: T")
+    .SetShapeFn([](shape_inference::InferenceContext* c) {
+      for (int i = 0; i < c->num_inputs(); ++i) {
+          c->set_output(i, c->input(i));
+      }
+      return Status::OK();
+    })
+    .Doc(R"doc(
+Perform an MPI Broadcast on a list of tensors, which may have different types.
+All other processes that do a broadcast on a tensor with the same name must have
+the same dimension for that tensor. The tensors of the list are negotiated together.
+
+Arguments
+    tensors:    A list of tensors to broadcast.
+    root_rank:  Rank that will send data, other ranks will receive data.
+
+Output
+    outputs:   A list of tensors with the same shapes as `tensors` and same values
+               as `tensors` on root rank.
+)doc");
+
 class HorovodJoinOp : public AsyncOpKernel {
 public:
   explicit HorovodJoinOp(OpKernelConstruction* context)
@@ -956,5 +1093,87 @@ Output
                       elements in `output` have been received from each worker.
 )doc");
 
+class HorovodReducescatterOp : public AsyncOpKernel {
+public:
+  explicit HorovodReducescatterOp(OpKernelConstruction* context)
+      : AsyncOpKernel(context) {
+    OP_REQUIRES_OK(context, context->GetAttr("reduce_op", &reduce_op_));
+    OP_REQUIRES_OK(context, context->GetAttr("prescale_factor", &prescale_factor_));
+    OP_REQUIRES_OK(context, context->GetAttr("postscale_factor", &postscale_factor_));
+    OP_REQUIRES_OK(context, context->GetAttr("ignore_name_scope", &ignore_name_scope_));
+    OP_REQUIRES_OK(context, context->GetAttr("process_set_id", &process_set_id_));
+  }
+
+  void ComputeAsync(OpKernelContext* context, DoneCallback done) override {
+    OP_REQUIRES_OK_ASYNC(context, ConvertStatus(common::CheckInitialized()),
+                         done);
+
+    auto node_name = name();
+    if (ignore_name_scope_) {
+      auto pos = node_name.find_last_of('/');
+      if (pos != std::string::npos) {
+        node_name = node_name.substr(pos + 1);
+      }
+    }
+    auto device = GetDeviceID(context);
+    auto tensor = context->input(0);
+    horovod::common::ReduceOp reduce_op = static_cast<horovod::common::ReduceOp>(reduce_op_);
+    // ReadyEvent makes sure input tensor is ready. The output is allocated
+    // once the shard of this rank is known.
+    auto ready_event = std::shared_ptr<common::ReadyEvent>(RecordReadyEvent(context));
+    auto hvd_context = std::make_shared<TFOpContext>(context);
+    auto hvd_tensor = std::make_shared<TFTensor>(tensor);
+    auto enqueue_result = EnqueueTensorReducescatter(
+        hvd_context, hvd_tensor, ready_event, node_name, device,
+        [context, done](const common::Status& status) {
+          context->SetStatus(ConvertStatus(status));
+          done();
+        }, reduce_op, (double) prescale_factor_, (double) postscale_factor_,
+        process_set_id_);
+    OP_REQUIRES_OK_ASYNC(context, ConvertStatus(enqueue_result), done);
+  }
+
+private:
+  int reduce_op_;
+  // Using float since TF does not support double OP attributes
+  float prescale_factor_;
+  float postscale_factor_;
+  bool ignore_name_scope_;
+  int process_set_id_;
+};
+
+// Reducescatter is only implemented on the CPU.
+REGISTER_KERNEL_BUILDER(Name("HorovodReducescatter").Device(DEVICE_CPU),
+                        HorovodReducescatterOp);
+
+REGISTER_OP("HorovodReducescatter")
+    .Attr("T: {int32, int64, float16, float32, float64}")
+    .Attr("reduce_op: int")
+    .Attr("prescale_factor: float")
+    .Attr("postscale_factor: float")
+    .Attr("ignore_name_scope: bool = False")
+    .Attr("process_set_id: int = 0")
+    .Input("tensor: T")
+    .Output("output: T")
+    .SetShapeFn([](shape_inference::InferenceContext* c) {
+      shape_inference::ShapeHandle output;
+      TF_RETURN_IF_ERROR(
+          c->ReplaceDim(c->input(0), 0, c->UnknownDim(), &output));
+      c->set_output(0, output);
+      return Status::OK();
+    })
+    .Doc(R"doc(
+Perform an MPI Reducescatter on a tensor. All other processes that do a
+reduction on a tensor with the same name must have the same shape for that
+tensor. The reduced tensor is split along the first dimension and every
+process receives one part.
+
+Arguments
+    tensor:     A tensor to reduce and scatter.
+
+Output
+    output:     The slice of the reduced tensor that belongs to this process.
+)doc");
+
 } // namespace tensorflow
 } // namespace horovod
@@ -26,6 +26,8 @@ from tensorflow.python.platform import resource_loader
 from horovod.common.util import check_installed_version, get_ext_suffix, \
     get_average_backwards_compatibility_fun, gpu_available, num_rank_is_power_2
 from horovod.common.basics import HorovodBasics as _HorovodBasics
+from horovod.common.process_sets import ProcessSet, global_process_set, \
+    process_set_by_id as _process_set_by_id, process_set_id as _process_set_id
 from horovod.tensorflow.util import _executing_eagerly
 
 
@@ -101,13 +103,18 @@ def _normalize_name(name):
 
 
 def _allreduce(tensor, name=None, op=Sum, prescale_factor=1.0, postscale_factor=1.0,
-               ignore_name_scope=False):
+               ignore_name_scope=False, priority=0, process_set=global_process_set):
     """An op which reduces an input tensor over all the Horovod processes. The
     default reduction is a sum.
 
     The reduction operation is keyed by the name of the op. The tensor type and
     shape must be the same on all Horovod processes for a given name. The reduction
     will not start until all processes are ready to send and receive the tensor.
+    Operations with higher `priority` are likely to be executed before others.
+
+    Arguments:
+      process_set: Process set object to limit this operation to a subset of
+                   Horovod processes. Default is the global process set.
 
     Returns:
       A tensor of the same shape and type as `tensor`, summed across all
@@ -118,7 +125,9 @@ def _allreduce(tensor, name=None, op=Sum, prescale_factor=1.0, postscale_factor=
     return MPI_LIB.horovod_allreduce(tensor, name=name, reduce_op=op,
                                      prescale_factor=prescale_factor,
                                      postscale_factor=postscale_factor,
-                                     ignore_name_scope=ignore_name_scope)
+                                     priority=priority,
+                                     ignore_name_scope=ignore_name_scope,
+                                     process_set_id=_process_set_id(process_set))
 
 
 @ops.RegisterGradient('HorovodAllreduce')
@@ -136,13 +145,15 @@ def _allreduce_grad(op, grad):
     prescale_factor = op.get_attr('prescale_factor')
     postscale_factor = op.get_attr('postscale_factor')
     ignore_name_scope = op.get_attr('ignore_name_scope')
+    process_set = _process_set_by_id(op.get_attr('process_set_id'))
     return _allreduce(grad, op=reduce_op, prescale_factor=prescale_factor,
                       postscale_factor=postscale_factor,
-                      ignore_name_scope=ignore_name_scope)
+                      ignore_name_scope=ignore_name_scope,
+                      process_set=process_set)
 
 
 def _grouped_allreduce(tensors, name=None, op=Sum, prescale_factor=1.0, postscale_factor=1.0,
-                       ignore_name_scope=False):
+                       ignore_name_scope=False, priority=0, process_set=global_process_set):
     """An op which reduces input tensors over all the Horovod processes. The
     default reduction is a sum.
 
@@ -154,7 +165,12 @@ def _grouped_allreduce(tensors, name=None, op=Sum, prescale_factor=1.0, postscal
     performed across tensors in the same list position. The tensor type and
     shape must be the same on all Horovod processes for tensors sharing
     positions in the input tensor list. The reduction will not start until all
-    processes are ready to send and receive the tensors.
+    processes are ready to send and receive the tensors. Operations with higher
+    `priority` are likely to be executed before others.
+
+    Arguments:
+      process_set: Process set object to limit this operation to a subset of
+                   Horovod processes. Default is the global process set.
 
     Returns:
       A list of tensors of the same shape and type as those in `tensors`,
@@ -165,7 +181,9 @@ def _grouped_allreduce(tensors, name=None, op=Sum, prescale_factor=1.0, postscal
     return MPI_LIB.horovod_grouped_allreduce(tensors, name=name, reduce_op=op,
                                              prescale_factor=prescale_factor,
                                              postscale_factor=postscale_factor,
-                                             ignore_name_scope=ignore_name_scope)
+                                             priority=priority,
+                                             ignore_name_scope=ignore_name_scope,
+                                             process_set_id=_process_set_id(process_set))
 
 
 @ops.RegisterGradient('HorovodGroupedAllreduce')
@@ -183,13 +201,15 @@ def _grouped_allreduce_grad(op, *grads):
     prescale_factor = op.get_attr('prescale_factor')
     postscale_factor = op.get_attr('postscale_factor')
     ignore_name_scope = op.get_attr('ignore_name_scope')
+    process_set = _process_set_by_id(op.get_attr('process_set_id'))
     # TODO(joshr): should this be done as separate allreduce ops?
     return _grouped_allreduce(list(grads), op=reduce_op, prescale_factor=prescale_factor,
                       postscale_factor=postscale_factor,
-                      ignore_name_scope=ignore_name_scope)
+                      ignore_name_scope=ignore_name_scope,
+                      process_set=process_set)
 
 
-def allgather(tensor, name=None, ignore_name_scope=False):
+def allgather(tensor, name=None, ignore_name_scope=False, process_set=global_process_set):
     """An op which concatenates the input tensor with the same input tensor on
     all other Horovod processes.
 
@@ -197,6 +217,10 @@ def allgather(tensor, name=None, ignore_name_scope=False):
     different processes must have the same rank and shape, except for the first
     dimension, which is allowed to be different.
 
+    Arguments:
+      process_set: Process set object to limit this operation to a subset of
+                   Horovod processes. Default is the global process set.
+
     Returns:
       A tensor of the same type as `tensor`, concatenated on dimension zero
       across all processes. The shape is identical to the input shape, except for
@@ -206,7 +230,8 @@ def allgather(tensor, name=None, ignore_name_scope=False):
     if name is None and not _executing_eagerly():
         name = 'HorovodAllgather_%s' % _normalize_name(tensor.name)
     return MPI_LIB.horovod_allgather(tensor, name=name,
-                                     ignore_name_scope=ignore_name_scope)
+                                     ignore_name_scope=ignore_name_scope,
+                                     process_set_id=_process_set_id(process_set))
 
 
 @ops.RegisterGradient('HorovodAllgather')
@@ -221,7 +246,9 @@ def _allgather_grad(op, grad):
       The gradient with respect to the input of the op.
     """
     ignore_name_scope = op.get_attr('ignore_name_scope')
-    grad = _allreduce(grad, op=Average, ignore_name_scope=ignore_name_scope)
+    process_set = _process_set_by_id(op.get_attr('process_set_id'))
+    grad = _allreduce(grad, op=Average, ignore_name_scope=ignore_name_scope,
+                      process_set=process_set)
 
     with tf.device('/cpu:0'):
         # Keep the tensor of split sizes on CPU.
@@ -229,14 +256,16 @@ def _allgather_grad(op, grad):
         d = tf.shape(x)
         d = tf.reshape(d[0], [1])
 
-        s = size()
-        d = tf.reshape(allgather(d, ignore_name_scope=ignore_name_scope), [s])
+        s = process_set.size()
+        d = tf.reshape(allgather(d, ignore_name_scope=ignore_name_scope,
+                                 process_set=process_set), [s])
 
     splits = tf.split(grad, num_or_size_splits=d, axis=0)
-    return splits[rank()]
+    return splits[process_set.rank()]
 
 
-def broadcast(tensor, root_rank, name=None, ignore_name_scope=False):
+def broadcast(tensor, root_rank, name=None, ignore_name_scope=False,
+              process_set=global_process_set):
     """An op which broadcasts the input tensor on root rank to the same input tensor
     on all other Horovod processes.
 
@@ -244,6 +273,12 @@ def broadcast(tensor, root_rank, name=None, ignore_name_scope=False):
     shape must be the same on all Horovod processes for a given name. The broadcast
     will not start until all processes are ready to send and receive the tensor.
 
+    Arguments:
+      root_rank: Rank of the process the tensor is broadcast from, relative to
+                 `process_set`.
+      process_set: Process set object to limit this operation to a subset of
+                   Horovod processes. Default is the global process set.
+
     Returns:
       A tensor of the same shape and type as `tensor`, with the value broadcasted
       from root rank.
@@ -251,7 +286,8 @@ def broadcast(tensor, root_rank, name=None, ignore_name_scope=False):
     if name is None and not _executing_eagerly():
         name = 'HorovodBroadcast_%s' % _normalize_name(tensor.name)
     return MPI_LIB.horovod_broadcast(tensor, name=name, root_rank=root_rank,
-                                     ignore_name_scope=ignore_name_scope)
+                                     ignore_name_scope=ignore_name_scope,
+                                     process_set_id=_process_set_id(process_set))
 
 
 @ops.RegisterGradient('HorovodBroadcast')
@@ -267,13 +303,66 @@ def _broadcast_grad(op, grad):
     """
     root_rank = op.get_attr('root_rank')
     ignore_name_scope = op.get_attr('ignore_name_scope')
+    process_set = _process_set_by_id(op.get_attr('process_set_id'))
     grad_reduced = _allreduce(grad, op=Average,
-                              ignore_name_scope=ignore_name_scope)
-    if rank() != root_rank:
+                              ignore_name_scope=ignore_name_scope,
+                              process_set=process_set)
+    if process_set.rank() != root_rank:
         return grad_reduced * 0
     return grad_reduced
 
 
+def grouped_broadcast(tensors, root_rank, name=None, ignore_name_scope=False,
+                      process_set=global_process_set):
+    """An op which broadcasts the input tensors on root rank to the same input tensors
+    on all other Horovod processes.
+
+    The broadcast operations are keyed by the name of the op. Broadcasts are
+    performed across tensors in the same list position, which may have different
+    types. The tensor type and shape must be the same on all Horovod processes for
+    tensors sharing positions in the input tensor list. The broadcast will not start
+    until all processes are ready to send and receive all the tensors.
+
+    Arguments:
+      root_rank: Rank of the process the tensors are broadcast from, relative to
+                 `process_set`.
+      process_set: Process set object to limit this operation to a subset of
+                   Horovod processes. Default is the global process set.
+
+    Returns:
+      A list of tensors of the same shape and type as those in `tensors`, with the
+      values broadcasted from root rank.
+    """
+    if name is None and not _executing_eagerly():
+        name = _normalize_name('HorovodGroupedBroadcast_%s_%s' % (tensors[0].name, tensors[-1].name))
+    return MPI_LIB.horovod_grouped_broadcast(tensors, name=name, root_rank=root_rank,
+                                             ignore_name_scope=ignore_name_scope,
+                                             process_set_id=_process_set_id(process_set))
+
+
+@ops.RegisterGradient('HorovodGroupedBroadcast')
+def _grouped_broadcast_grad(op, *grads):
+    """Gradient for the grouped broadcast op.
+
+    Args:
+      op: An operation.
+      grads: List of `Tensor` gradients with respect to the outputs of the op.
+
+    Returns:
+      The gradients with respect to the inputs of the op.
+    """
+    root_rank = op.get_attr('root_rank')
+    ignore_name_scope = op.get_attr('ignore_name_scope')
+    process_set = _process_set_by_id(op.get_attr('process_set_id'))
+    # Gradients may have different types, so they cannot share a grouped allreduce
+    grads_reduced = [_allreduce(grad, op=Average, ignore_name_scope=ignore_name_scope,
+                                process_set=process_set)
+                     if grad is not None else None for grad in grads]
+    if process_set.rank() != root_rank:
+        return [grad * 0 if grad is not None else None for grad in grads_reduced]
+    return grads_reduced
+
+
 def alltoall(tensor, splits=None, name=None, ignore_name_scope=False):
     """An op that scatters slices of the input tensor to all other Horovod processes
     and returns a tensor of gathered slices from all other Horovod processes.
@@ -331,6 +420,67 @@ def _alltoall_grad(op, grad_wrt_output, grad_wrt_received_splits):
 
     return [grad_wrt_tensor, grad_wrt_splits]
 
+
+def reducescatter(tensor, name=None, op=Average, prescale_factor=1.0, postscale_factor=1.0,
+                  ignore_name_scope=False, process_set=global_process_set):
+    """An op which reduces an input tensor over all the Horovod processes and
+    scatters the result, so that every process receives one slice of the reduced
+    tensor.
+
+    The slicing is done on the first dimension, the tensors must have the same
+    shape on all processes. If the first dimension is not divisible by the number
+    of processes, the processes with the lowest ranks receive one extra row each.
+    Reducescatter is performed on the CPU.
+
+    Arguments:
+        tensor: A tensor to reduce and scatter.
+        name: A name of the reducescatter operation.
+        op: The reduction operation to combine tensors across different ranks,
+            either Average or Sum. Defaults to Average.
+        prescale_factor: Multiplicative factor to scale tensor before reducescatter.
+        postscale_factor: Multiplicative factor to scale tensor after reducescatter.
+        ignore_name_scope: If True, ignores any outer name scope applied by
+                           TensorFlow in the name used by the Horovod operation.
+        process_set: Process set object to limit this operation to a subset of
+                     Horovod processes. Default is the global process set.
+
+    Returns:
+      A tensor of the same rank and type as `tensor`, holding this process' slice
+      of the reduced tensor along the first dimension.
+    """
+    if op not in (Average, Sum):
+        raise NotImplementedError('reducescatter only supports the Average and Sum ops.')
+    if name is None and not _executing_eagerly():
+        name = 'HorovodReducescatter_%s' % _normalize_name(tensor.name)
+    return MPI_LIB.horovod_reducescatter(tensor, name=name, reduce_op=op,
+                                         prescale_factor=prescale_factor,
+                                         postscale_factor=postscale_factor,
+                                         ignore_name_scope=ignore_name_scope,
+                                         process_set_id=_process_set_id(process_set))
+
+
+@ops.RegisterGradient('HorovodReducescatter')
+def _reducescatter_grad(op, grad):
+    """Gradient for reducescatter op.
+
+    Args:
+      op: An operation.
+      grad: `Tensor` gradient with respect to the output of the op.
+
+    Returns:
+      The gradient with respect to the input of the op.
+    """
+    ignore_name_scope = op.get_attr('ignore_name_scope')
+    process_set = _process_set_by_id(op.get_attr('process_set_id'))
+    grad = allgather(grad, ignore_name_scope=ignore_name_scope,
+                     process_set=process_set)
+
+    scale = op.get_attr('prescale_factor') * op.get_attr('postscale_factor')
+    if op.get_attr('reduce_op') == Average:
+        scale /= process_set.size()
+    return grad * scale if scale != 1.0 else grad
+
+
 def join():
     return MPI_LIB.horovod_join()
 
@@ -54,3 +54,18 @@ def refs_to_vars(refs):
     if isinstance(refs, tuple):
         return [refs_to_vars(r) for r in refs]
     return refs.deref()
+
+
+def _pack_by_dtype_and_device(tensors):
+    """Groups the indices of tensors of the same dtype and device with a known shape.
+
+    Such tensors can be flattened and concatenated into one tensor on their device,
+    tensors of unknown shape form a group of their own.
+    """
+    packs = {}
+    for i, tensor in enumerate(tensors):
+        if tensor.shape.is_fully_defined():
+            packs.setdefault(('dtype', tensor.dtype.base_dtype, tensor.device), []).append(i)
+        else:
+            packs[('tensor', i)] = [i]
+    return list(packs.values())
@@ -0,0 +1,380 @@
+// Copyright 2021 Uber Technologies, Inc. All Rights Reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+// =============================================================================
+
+// XLA kernels of HorovodAllreduce and HorovodGroupedAllreduce, so that a
+// jit_compile'd tf.function containing them compiles into a single cluster.
+// The kernels emit a custom call to a host function that enqueues the tensors
+// with Horovod and blocks until they are reduced. The kernels are registered
+// for the CPU JIT device only if HOROVOD_ENABLE_XLA_OPS is set when the
+// library is loaded.
+
+#include <condition_variable>
+#include <cstring>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <vector>
+
+#include "tensorflow/compiler/tf2xla/shape_util.h"
+#include "tensorflow/compiler/tf2xla/xla_op_kernel.h"
+#include "tensorflow/compiler/tf2xla/xla_op_registry.h"
+#include "tensorflow/compiler/xla/client/xla_builder.h"
+#include "tensorflow/compiler/xla/service/custom_call_status.h"
+#include "tensorflow/compiler/xla/service/custom_call_target_registry.h"
+
+#define OMPI_SKIP_MPICXX
+#include "../common/operations.h"
+#include "../common/utils/env_parser.h"
+
+using namespace tensorflow;
+using namespace horovod;
+
+namespace horovod {
+namespace tensorflow {
+
+namespace {
+
+Status GetHorovodDataType(::tensorflow::DataType dtype,
+                          common::DataType* hvd_dtype) {
+  switch (dtype) {
+  case DT_INT32:
+    *hvd_dtype = common::HOROVOD_INT32;
+    return Status::OK();
+  case DT_INT64:
+    *hvd_dtype = common::HOROVOD_INT64;
+    return Status::OK();
+  case DT_HALF:
+    *hvd_dtype = common::HOROVOD_FLOAT16;
+    return Status::OK();
+  case DT_FLOAT:
+    *hvd_dtype = common::HOROVOD_FLOAT32;
+    return Status::OK();
+  case DT_DOUBLE:
+    *hvd_dtype = common::HOROVOD_FLOAT64;
+    return Status::OK();
+  default:
+    return errors::Unimplemented("XLA Horovod ops do not support tensors of type ",
+                                 DataTypeString(dtype), ".");
+  }
+}
+
+// Parameters of an allreduce, passed to the custom call as a constant byte
+// array operand, since host custom calls do not receive an opaque string on
+// all TensorFlow versions.
+struct XlaAllreduceParams {
+  std::string name;
+  int32_t reduce_op = 0;
+  double prescale_factor = 1.0;
+  double postscale_factor = 1.0;
+  int32_t priority = 0;
+  int32_t process_set_id = 0;
+  std::vector<common::DataType> dtypes;
+  std::vector<common::TensorShape> shapes;
+
+  std::vector<uint8_t> Serialize() const {
+    std::vector<uint8_t> bytes;
+    auto write = [&bytes](const void* data, size_t size) {
+      auto begin = (const uint8_t*)data;
+      bytes.insert(bytes.end(), begin, begin + size);
+    };
+    auto write_int = [&write](int64_t value) { write(&value, sizeof(value)); };
+
+    write_int(name.size());
+    write(name.data(), name.size());
+    write_int(reduce_op);
+    write(&prescale_factor, sizeof(prescale_factor));
+    write(&postscale_factor, sizeof(postscale_factor));
+    write_int(priority);
+    write_int(process_set_id);
+    write_int(dtypes.size());
+    for (size_t i = 0; i < dtypes.size(); ++i) {
+      write_int(dtypes[i]);
+      write_int(shapes[i].dims());
+      for (int d = 0; d < shapes[i].dims(); ++d) {
+        write_int(shapes[i].dim_size(d));
+      }
+    }
+    return bytes;
+  }
+
+  static XlaAllreduceParams Parse(const uint8_t* bytes) {
+    auto read = [&bytes](void* data, size_t size) {
+      std::memcpy(data, bytes, size);
+      bytes += size;
+    };
+    auto read_int = [&read]() {
+      int64_t value;
+      read(&value, sizeof(value));
+      return value;
+    };
+
+    XlaAllreduceParams params;
+    params.name.resize(read_int());
+    read(&params.name[0], params.name.size());
+    params.reduce_op = (int32_t)read_int();
+    read(&params.prescale_factor, sizeof(params.prescale_factor));
+    read(&params.postscale_factor, sizeof(params.postscale_factor));
+    params.priority = (int32_t)read_int();
+    params.process_set_id = (int32_t)read_int();
+    auto num_tensors = read_int();
+    for (int64_t i = 0; i < num_tensors; ++i) {
+      params.dtypes.push_back((common::DataType)read_int());
+      common::TensorShape shape;
+      auto dims = read_int();
+      for (int64_t d = 0; d < dims; ++d) {
+        shape.AddDim(read_int());
+      }
+      params.shapes.push_back(shape);
+    }
+    return params;
+  }
+};
+
+class XlaTensor : public common::Tensor {
+public:
+  XlaTensor(void* data, common::DataType dtype, common::TensorShape shape,
+            std::shared_ptr<int8_t> owned = nullptr)
+      : data_(data), dtype_(dtype), shape_(std::move(shape)),
+        owned_(std::move(owned)) {}
+  const common::DataType dtype() const override { return dtype_; }
+  const common::TensorShape shape() const override { return shape_; }
+  const void* data() const override { return data_; }
+  int64_t size() const override {
+    return shape_.num_elements() * common::DataType_Size(dtype_);
+  }
+
+private:
+  void* data_;
+  common::DataType dtype_;
+  common::TensorShape shape_;
+  // Buffers allocated by XlaOpContext are owned by their tensor.
+  std::shared_ptr<int8_t> owned_;
+};
+
+class XlaPersistentBuffer : public common::PersistentBuffer {
+public:
+  explicit XlaPersistentBuffer(int64_t size) : buffer_(new int8_t[size]) {}
+  const void*
+  AccessData(std::shared_ptr<common::OpContext> context) const override {
+    return buffer_.get();
+  }
+
+private:
+  std::unique_ptr<int8_t[]> buffer_;
+};
+
+// Host memory allocations for the background thread. XLA preallocates the
+// outputs of the custom call, so only persistent buffers and zeros are needed.
+class XlaOpContext : public common::OpContext {
+public:
+  common::Status AllocatePersistent(
+      int64_t size, std::shared_ptr<common::PersistentBuffer>* tensor) override {
+    *tensor = std::make_shared<XlaPersistentBuffer>(size);
+    return common::Status::OK();
+  }
+
+  common::Status
+  AllocateOutput(common::TensorShape shape,
+                 std::shared_ptr<common::Tensor>* tensor) override {
+    return common::Status::PreconditionError(
+        "Outputs of XLA Horovod ops are allocated by XLA.");
+  }
+
+  common::Status
+  AllocateZeros(int64_t num_elements, common::DataType dtype,
+                std::shared_ptr<common::Tensor>* tensor) override {
+    auto size = num_elements * common::DataType_Size(dtype);
+    std::shared_ptr<int8_t> buffer(new int8_t[size](),
+                                   std::default_delete<int8_t[]>());
+    common::TensorShape shape;
+    shape.AddDim(num_elements);
+    *tensor = std::make_shared<XlaTensor>(buffer.get(), dtype, shape, buffer);
+    return common::Status::OK();
+  }
+
+  common::Framework framework() const override {
+    return common::Framework::XLA;
+  }
+};
+
+// Custom call target. in[0] holds the serialized parameters and in[1..n] the
+// tensors; out is the output buffer, or the table of output buffers if the
+// output is a tuple.
+void HorovodAllreduceXla(void* out, const void** in,
+                         XlaCustomCallStatus* status) {
+  auto params = XlaAllreduceParams::Parse((const uint8_t*)in[0]);
+  int num_tensors = (int)params.dtypes.size();
+  void** outputs = num_tensors == 1 ? &out : (void**)out;
+
+  std::mutex mutex;
+  std::condition_variable cond;
+  int pending = num_tensors;
+  common::Status result = common::Status::OK();
+
+  std::vector<std::shared_ptr<common::OpContext>> hvd_contexts;
+  std::vector<std::shared_ptr<common::Tensor>> hvd_tensors;
+  std::vector<std::shared_ptr<common::Tensor>> hvd_outputs;
+  std::vector<std::shared_ptr<common::ReadyEvent>> ready_events;
+  std::vector<std::string> names;
+  std::vector<common::StatusCallback> callbacks;
+  auto hvd_context = std::make_shared<XlaOpContext>();
+  for (int i = 0; i < num_tensors; ++i) {
+    hvd_contexts.push_back(hvd_context);
+    hvd_tensors.push_back(std::make_shared<XlaTensor>(
+        const_cast<void*>(in[i + 1]), params.dtypes[i], params.shapes[i]));
+    hvd_outputs.push_back(std::make_shared<XlaTensor>(
+        outputs[i], params.dtypes[i], params.shapes[i]));
+    // The data of host tensors is ready when the custom call runs.
+    ready_events.push_back(nullptr);
+    names.push_back(num_tensors == 1
+                        ? params.name
+                        : params.name + "_" + std::to_string(i + 1) + "of" +
+                              std::to_string(num_tensors));
+    callbacks.push_back([&](const common::Status& status) {
+      // Notify under the lock, the waiting thread returns and destroys the
+      // condition variable as soon as it observes pending == 0.
+      std::lock_guard<std::mutex> guard(mutex);
+      if (!status.ok() && result.ok()) {
+        result = status;
+      }
+      --pending;
+      cond.notify_one();
+    });
+  }
+
+  auto enqueue_result = common::EnqueueTensorAllreduces(
+      hvd_contexts, hvd_tensors, hvd_outputs, ready_events, names,
+      CPU_DEVICE_ID, callbacks,
+      static_cast<common::ReduceOp>(params.reduce_op), params.prescale_factor,
+      params.postscale_factor, params.priority, params.process_set_id);
+  if (enqueue_result.ok()) {
+    std::unique_lock<std::mutex> lock(mutex);
+    cond.wait(lock, [&] { return pending == 0; });
+  } else {
+    result = enqueue_result;
+  }
+
+  if (!result.ok()) {
+    const auto& reason = result.reason();
+    XlaCustomCallStatusSetFailure(status, reason.c_str(), reason.size());
+  }
+}
+
+XLA_REGISTER_CUSTOM_CALL_TARGET_WITH_SYM("HorovodAllreduceXla",
+                                         HorovodAllreduceXla, "Host");
+
+// Compiles HorovodAllreduce and HorovodGroupedAllreduce, which only differ in
+// the number of tensors.
+class HorovodAllreduceXlaOp : public XlaOpKernel {
+public:
+  explicit HorovodAllreduceXlaOp(OpKernelConstruction* context)
+      : XlaOpKernel(context) {
+    OP_REQUIRES_OK(context, context->GetAttr("reduce_op", &reduce_op_));
+    OP_REQUIRES_OK(context, context->GetAttr("prescale_factor", &prescale_factor_));
+    OP_REQUIRES_OK(context, context->GetAttr("postscale_factor", &postscale_factor_));
+    OP_REQUIRES_OK(context, context->GetAttr("priority", &priority_));
+    OP_REQUIRES_OK(context, context->GetAttr("ignore_name_scope", &ignore_name_scope_));
+    OP_REQUIRES_OK(context, context->GetAttr("process_set_id", &process_set_id_));
+  }
+
+  void Compile(XlaOpKernelContext* ctx) override {
+    XlaAllreduceParams params;
+    params.name = name();
+    if (ignore_name_scope_) {
+      auto pos = params.name.find_last_of('/');
+      if (pos != std::string::npos) {
+        params.name = params.name.substr(pos + 1);
+      }
+    }
+    params.reduce_op = reduce_op_;
+    params.prescale_factor = (double)prescale_factor_;
+    params.postscale_factor = (double)postscale_factor_;
+    params.priority = priority_;
+    params.process_set_id = process_set_id_;
+
+    std::vector<xla::XlaOp> operands;
+    std::vector<xla::Shape> output_shapes;
+    operands.push_back(xla::XlaOp());
+    for (int i = 0; i < ctx->num_inputs(); ++i) {
+      auto shape = ctx->InputShape(i);
+      common::TensorShape hvd_shape;
+      for (auto dim : shape) {
+        hvd_shape.AddDim(dim.size);
+      }
+      common::DataType hvd_dtype;
+      OP_REQUIRES_OK(ctx, GetHorovodDataType(ctx->input_type(i), &hvd_dtype));
+      params.dtypes.push_back(hvd_dtype);
+      params.shapes.push_back(hvd_shape);
+
+      xla::Shape xla_shape;
+      OP_REQUIRES_OK(ctx, TensorShapeToXLAShape(ctx->input_type(i), shape,
+                                                &xla_shape));
+      output_shapes.push_back(xla_shape);
+      operands.push_back(ctx->Input(i));
+    }
+    auto bytes = params.Serialize();
+    operands[0] = xla::ConstantR1<uint8_t>(ctx->builder(), bytes);
+
+    bool is_tuple = output_shapes.size() > 1;
+    auto output_shape = is_tuple ? xla::ShapeUtil::MakeTupleShape(output_shapes)
+                                 : output_shapes[0];
+    // The custom call has side effects, so that XLA neither removes nor
+    // duplicates the collective.
+    auto result = xla::CustomCall(
+        ctx->builder(), "HorovodAllreduceXla", operands, output_shape,
+        /*opaque=*/"", /*has_side_effect=*/true,
+        /*output_operand_aliasing=*/{}, /*literal=*/nullptr,
+        xla::CustomCallSchedule::SCHEDULE_NONE,
+        xla::CustomCallApiVersion::API_VERSION_STATUS_RETURNING);
+    for (int i = 0; i < ctx->num_outputs(); ++i) {
+      ctx->SetOutput(i, is_tuple ? xla::GetTupleElement(result, i) : result);
+    }
+  }
+
+private:
+  int reduce_op_;
+  // Using float since TF does not support double OP attributes
+  float prescale_factor_;
+  float postscale_factor_;
+  int priority_;
+  bool ignore_name_scope_;
+  int process_set_id_;
+};
+
+OpKernel* CreateHorovodAllreduceXlaOp(OpKernelConstruction* context) {
+  return new HorovodAllreduceXlaOp(context);
+}
+
+bool RegisterXlaOps() {
+  if (!common::GetBoolEnvOrDefault(HOROVOD_ENABLE_XLA_OPS, false)) {
+    return false;
+  }
+  static XlaOpRegistrar allreduce_registrar(
+      XlaOpRegistrationBuilder::Name("HorovodAllreduce")
+          .Device(DEVICE_CPU_XLA_JIT)
+          .Build(CreateHorovodAllreduceXlaOp));
+  static XlaOpRegistrar grouped_allreduce_registrar(
+      XlaOpRegistrationBuilder::Name("HorovodGroupedAllreduce")
+          .Device(DEVICE_CPU_XLA_JIT)
+          .Build(CreateHorovodAllreduceXlaOp));
+  return true;
+}
+
+bool xla_ops_registered = RegisterXlaOps();
+
+} // namespace
+
+} // namespace tensorflow
+} // namespace horovod
@@ -28,20 +28,24 @@ from horovod.torch.compression import Compression
 from horovod.torch.functions import allgather_object, broadcast_object, broadcast_optimizer_state, broadcast_parameters
 from horovod.torch.mpi_ops import allreduce, allreduce_async, allreduce_, allreduce_async_
 from horovod.torch.mpi_ops import grouped_allreduce, grouped_allreduce_async, grouped_allreduce_, grouped_allreduce_async_
-from horovod.torch.mpi_ops import sparse_allreduce_async
+from horovod.torch.mpi_ops import sparse_allreduce_async, quantized_allreduce_async
 from horovod.torch.mpi_ops import allgather, allgather_async
 from horovod.torch.mpi_ops import broadcast, broadcast_async, broadcast_, broadcast_async_
+from horovod.torch.mpi_ops import grouped_broadcast, grouped_broadcast_async, grouped_broadcast_, grouped_broadcast_async_
 from horovod.torch.mpi_ops import alltoall, alltoall_async
+from horovod.torch.mpi_ops import reducescatter, reducescatter_async
 from horovod.torch.mpi_ops import join
 from horovod.torch.mpi_ops import poll, synchronize
+from horovod.torch.mpi_ops import add_done_callback, as_completed, wait_any
 from horovod.torch.mpi_ops import init, shutdown
+from horovod.torch.mpi_ops import ProcessSet, global_process_set
 from horovod.torch.mpi_ops import is_initialized, start_timeline, stop_timeline
 from horovod.torch.mpi_ops import size, local_size, cross_size, rank, local_rank, cross_rank
 from horovod.torch.mpi_ops import mpi_threads_supported, mpi_enabled, mpi_built
 from horovod.torch.mpi_ops import gloo_enabled, gloo_built
 from horovod.torch.mpi_ops import nccl_built, ddl_built, ccl_built, cuda_built, rocm_built
 from horovod.torch.mpi_ops import Average, Sum, Adasum
-from horovod.torch.optimizer import DistributedOptimizer
+from horovod.torch.optimizer import DistributedOptimizer, ShardedDistributedOptimizer
 from horovod.torch.sync_batch_norm import SyncBatchNorm
 
 
@@ -64,6 +64,356 @@ class FP16Compressor(Compressor):
         return tensor_decompressed
 
 
+class SparseCompressor(Compressor):
+    """
+    Interface for stateful compressors that sparsify a tensor before it is exchanged.
+
+    Compressed tensors are returned as flat `torch.sparse_coo_tensor` objects and are
+    combined across ranks by allgathering their indices and values instead of by an
+    allreduce. Elements that are not selected are kept in a per-tensor residual and
+    added back to the tensor the next time a tensor with the same name is compressed
+    (error feedback), so no gradient information is lost, only delayed.
+
+    Unlike stateless compressors, sparse compressors must be instantiated, e.g.
+    ``hvd.Compression.topk(ratio=0.01)``, and an instance must not be shared between
+    optimizers.
+    """
+    def __init__(self):
+        self._residuals = {}
+
+    def select(self, tensor):
+        """Returns the indices of the elements of the flat `tensor` to exchange."""
+        raise NotImplementedError()
+
+    def compress(self, tensor, name=None):
+        """
+        Sparsifies the floating point tensor and returns it with its original shape as the
+        context. Error feedback is only applied when a name is given.
+        """
+        if not tensor.dtype.is_floating_point:
+            return tensor, None
+
+        flat = tensor.reshape(-1)
+        residual = self._residuals.get(name) if name is not None else None
+        if residual is not None:
+            flat = flat + residual
+
+        indices = self.select(flat)
+        values = flat.index_select(0, indices)
+        if name is not None:
+            residual = flat.clone() if residual is None else flat
+            residual.index_fill_(0, indices, 0)
+            self._residuals[name] = residual
+
+        tensor_compressed = torch.sparse_coo_tensor(indices.unsqueeze(0), values, flat.shape)
+        return tensor_compressed, tensor.shape
+
+    def decompress(self, tensor, ctx):
+        """Densifies the tensor, summing duplicate indices, and restores its shape."""
+        if ctx is None:
+            return tensor
+        if tensor.is_sparse:
+            tensor = tensor.to_dense()
+        return tensor.view(ctx)
+
+    def reset(self):
+        """Drops the accumulated residuals, e.g. after the model was restored."""
+        self._residuals.clear()
+
+
+class TopKCompressor(SparseCompressor):
+    """Exchange only the largest `ratio` fraction of elements by magnitude."""
+    def __init__(self, ratio=0.01):
+        super(TopKCompressor, self).__init__()
+        if not 0 < ratio <= 1:
+            raise ValueError('ratio should be in (0, 1], got %s.' % ratio)
+        self.ratio = ratio
+
+    def select(self, tensor):
+        k = max(1, int(tensor.numel() * self.ratio))
+        _, indices = tensor.abs().topk(k, sorted=False)
+        return indices
+
+
+class RandomKCompressor(SparseCompressor):
+    """Exchange a random `ratio` fraction of elements."""
+    def __init__(self, ratio=0.01):
+        super(RandomKCompressor, self).__init__()
+        if not 0 < ratio <= 1:
+            raise ValueError('ratio should be in (0, 1], got %s.' % ratio)
+        self.ratio = ratio
+
+    def select(self, tensor):
+        k = max(1, int(tensor.numel() * self.ratio))
+        return torch.randperm(tensor.numel(), device=tensor.device)[:k]
+
+
+class ThresholdCompressor(SparseCompressor):
+    """Exchange only the elements whose magnitude is at least `threshold`."""
+    def __init__(self, threshold):
+        super(ThresholdCompressor, self).__init__()
+        if threshold < 0:
+            raise ValueError('threshold should be non-negative, got %s.' % threshold)
+        self.threshold = threshold
+
+    def select(self, tensor):
+        return (tensor.abs() >= self.threshold).nonzero(as_tuple=False).view(-1)
+
+
+class QuantizingCompressor(Compressor):
+    """
+    Interface for compressors that quantize a tensor into low-precision codes with
+    per-chunk scaling metadata.
+
+    Quantized codes cannot be summed by the allreduce backend without overflowing, so
+    tensors are reduced in two phases: an alltoall sends every rank the codes of its shard
+    of the tensor, which it dequantizes and sums, and an allgather of the requantized sums
+    distributes the result. Both phases send quantized data, so the traffic is that of a
+    ring allreduce on the codes.
+
+    With `error_feedback`, the local quantization error is added back to the tensor the
+    next time a tensor with the same name is compressed. Quantizing compressors must be
+    instantiated, e.g. ``hvd.Compression.int8()``.
+    """
+    def __init__(self, chunk_size=1024, error_feedback=False):
+        self.chunk_size = chunk_size
+        self.error_feedback = error_feedback
+        self._residuals = {}
+
+    def quantize(self, chunks):
+        """Quantizes float32 `chunks` of shape [num_chunks, chunk_size] into (codes, scales)."""
+        raise NotImplementedError()
+
+    def dequantize(self, codes, scales):
+        """Returns the float32 chunks of shape [num_chunks, chunk_size] for (codes, scales)."""
+        raise NotImplementedError()
+
+    def compress(self, tensor, name=None, num_shards=1):
+        """
+        Quantizes the floating point tensor and returns (codes, scales) with the context
+        needed to decompress them. The number of chunks is padded to a multiple of
+        `num_shards`. Error feedback is only applied when a name is given.
+        """
+        if not tensor.dtype.is_floating_point:
+            return tensor, None
+
+        flat = tensor.reshape(-1).float()
+        numel = flat.numel()
+        residual = self._residuals.get(name) if self.error_feedback and name is not None else None
+        if residual is not None:
+            flat = flat + residual
+
+        num_chunks = (numel + self.chunk_size - 1) // self.chunk_size
+        num_chunks = (num_chunks + num_shards - 1) // num_shards * num_shards
+        padded = flat.new_zeros(num_chunks * self.chunk_size)
+        padded[:numel] = flat
+        chunks = padded.view(num_chunks, self.chunk_size)
+
+        codes, scales = self.quantize(chunks)
+        if self.error_feedback and name is not None:
+            self._residuals[name] = (chunks - self.dequantize(codes, scales)).view(-1)[:numel]
+        return (codes, scales), (tensor.shape, tensor.dtype)
+
+    def decompress(self, tensor, ctx):
+        """Dequantizes (codes, scales) back into a tensor of the original shape and type."""
+        if ctx is None:
+            return tensor
+        codes, scales = tensor
+        shape, dtype = ctx
+        numel = 1
+        for dim in shape:
+            numel *= dim
+        return self.dequantize(codes, scales).view(-1)[:numel].view(shape).to(dtype)
+
+    def reset(self):
+        """Drops the accumulated residuals, e.g. after the model was restored."""
+        self._residuals.clear()
+
+
+class Int8Compressor(QuantizingCompressor):
+    """Quantize to 8-bit integers with one float32 scale per chunk."""
+    def __init__(self, chunk_size=1024, error_feedback=False):
+        super(Int8Compressor, self).__init__(chunk_size, error_feedback)
+
+    def quantize(self, chunks):
+        scales = chunks.abs().max(dim=1)[0] / 127
+        scales = torch.where(scales > 0, scales, torch.ones_like(scales))
+        codes = (chunks / scales.unsqueeze(1)).round_().clamp_(-127, 127).to(torch.int8)
+        return codes, scales
+
+    def dequantize(self, codes, scales):
+        return codes.float() * scales.unsqueeze(1)
+
+
+class OneBitCompressor(QuantizingCompressor):
+    """
+    Quantize to the sign of every element, packed eight to a byte, scaled by the mean
+    magnitude of the chunk. The quantization error is always fed back.
+    """
+    def __init__(self, chunk_size=1024):
+        if chunk_size % 8 != 0:
+            raise ValueError('chunk_size should be a multiple of 8, got %s.' % chunk_size)
+        super(OneBitCompressor, self).__init__(chunk_size, error_feedback=True)
+
+    @staticmethod
+    def _bit_weights(device):
+        return torch.tensor([128, 64, 32, 16, 8, 4, 2, 1], dtype=torch.uint8, device=device)
+
+    def quantize(self, chunks):
+        scales = chunks.abs().mean(dim=1)
+        signs = (chunks >= 0).to(torch.uint8).view(chunks.shape[0], -1, 8)
+        codes = (signs * self._bit_weights(chunks.device)).sum(dim=2).to(torch.uint8)
+        return codes, scales
+
+    def dequantize(self, codes, scales):
+        bits = (codes.unsqueeze(-1) & self._bit_weights(codes.device)) != 0
+        signs = bits.view(codes.shape[0], -1).float() * 2 - 1
+        return signs * scales.unsqueeze(1)
+
+
+class BF16Compressor(QuantizingCompressor):
+    """
+    Truncate floating point tensors to bfloat16, which keeps the float32 exponent range.
+    Requires no scaling metadata.
+    """
+    def __init__(self, chunk_size=1024, error_feedback=False):
+        super(BF16Compressor, self).__init__(chunk_size, error_feedback)
+
+    def quantize(self, chunks):
+        # The backend has no bfloat16 type, the codes are exchanged as raw 16-bit integers
+        return chunks.to(torch.bfloat16).view(torch.int16), None
+
+    def dequantize(self, codes, scales):
+        return codes.view(torch.bfloat16).float()
+
+
+class PowerSGDCompressor(object):
+    """
+    Low-rank gradient compression as described in "PowerSGD: Practical Low-Rank Gradient
+    Compression for Distributed Optimization" (Vogels et al., 2019).
+
+    Every gradient with at least two dimensions is viewed as an n x m matrix M and
+    approximated by P Q^T with P of shape n x r and Q of shape m x r. P = M Q and
+    Q = M^T P are reduced across ranks in two grouped allreduces, P being orthogonalized
+    in between, so that only r * (n + m) instead of n * m elements are sent. Q is kept
+    between steps as the starting point of the next power iteration (warm start), and
+    the approximation error is fed back into the gradient of the next step.
+
+    Gradients for which the compression rate would be below `min_compression_rate`,
+    such as biases, are reduced uncompressed alongside P.
+
+    PowerSGD reduces all gradients together, so it cannot be expressed as a per-tensor
+    `Compressor`. It must be instantiated, e.g. ``hvd.Compression.powersgd(rank=4)``,
+    and an instance must not be shared between optimizers.
+    """
+    def __init__(self, rank=1, min_compression_rate=2.0, warm_start=True, seed=0):
+        if rank < 1:
+            raise ValueError('rank should be a positive integer, got %s.' % rank)
+        self.rank = rank
+        self.min_compression_rate = min_compression_rate
+        self.warm_start = warm_start
+        # All ranks must start from the same Q, so it is drawn from a fixed seed
+        self._generator = torch.Generator().manual_seed(seed)
+        self._qs = {}
+        self._errors = {}
+
+    def _is_compressible(self, tensor):
+        if tensor.dim() < 2 or not tensor.dtype.is_floating_point:
+            return False
+        n = tensor.shape[0]
+        m = tensor.numel() // n
+        r = min(self.rank, n, m)
+        return n * m >= self.min_compression_rate * r * (n + m)
+
+    def _initial_q(self, name, m, r, like):
+        q = self._qs.get(name) if self.warm_start else None
+        if q is None:
+            q = torch.randn(m, r, generator=self._generator).to(device=like.device, dtype=like.dtype)
+        return q
+
+    @staticmethod
+    def _orthogonalize(matrix, eps=1e-8):
+        # Gram-Schmidt on the (few) columns of the matrix, in place
+        for i in range(matrix.shape[1]):
+            col = matrix[:, i:i + 1]
+            col.div_(col.norm() + eps)
+            if i + 1 < matrix.shape[1]:
+                rest = matrix[:, i + 1:]
+                rest.sub_(col * (col.t() @ rest))
+        return matrix
+
+    @staticmethod
+    def _grouped_allreduce_(tensors, name, op):
+        from horovod.torch.mpi_ops import grouped_allreduce_
+
+        # Grouped allreduce requires all tensors of a group to share the same type and device
+        groups = {}
+        for tensor in tensors:
+            groups.setdefault((tensor.dtype, tensor.device), []).append(tensor)
+        for i, group in enumerate(groups.values()):
+            grouped_allreduce_(group, name='%s.%d' % (name, i), op=op)
+
+    def reduce(self, tensors, names, name='powersgd', op=None):
+        """
+        Reduces the tensors across all Horovod processes using the low-rank approximation.
+
+        Arguments:
+            tensors: A list of tensors to reduce, in the same order on every rank.
+            names: A list of unique names of the tensors, used to key the warm-start
+                   and error feedback state.
+            name: A base name for the grouped allreduce operations.
+            op: The reduction operation, Average (the default) or Sum.
+
+        Returns:
+            A list of tensors of the same shapes and types as `tensors`.
+        """
+        from horovod.torch.mpi_ops import Adasum
+
+        if op == Adasum:
+            raise NotImplementedError('The Adasum reduction does not support PowerSGD compression.')
+
+        outputs = [None] * len(tensors)
+        compressed = []
+        uncompressed = []
+        ps = []
+        for i, (tensor, tensor_name) in enumerate(zip(tensors, names)):
+            if not self._is_compressible(tensor):
+                uncompressed.append(i)
+                outputs[i] = tensor.clone()
+                continue
+
+            matrix = tensor.reshape(tensor.shape[0], -1)
+            error = self._errors.get(tensor_name)
+            matrix = matrix + error if error is not None else matrix.clone()
+            r = min(self.rank, *matrix.shape)
+            q = self._initial_q(tensor_name, matrix.shape[1], r, matrix)
+            compressed.append((i, tensor_name, matrix, q))
+            ps.append(matrix @ q)
+
+        self._grouped_allreduce_(ps + [outputs[i] for i in uncompressed], '%s.P' % name, op)
+        if not compressed:
+            return outputs
+
+        qs = []
+        for p, (i, tensor_name, matrix, _) in zip(ps, compressed):
+            self._orthogonalize(p)
+            qs.append(matrix.t() @ p)
+        self._grouped_allreduce_(qs, '%s.Q' % name, op)
+
+        for p, q, (i, tensor_name, matrix, _) in zip(ps, qs, compressed):
+            approx = p @ q.t()
+            self._errors[tensor_name] = matrix.sub_(approx)
+            if self.warm_start:
+                self._qs[tensor_name] = q
+            outputs[i] = approx.view_as(tensors[i])
+        return outputs
+
+    def reset(self):
+        """Drops the warm-start and error feedback state, e.g. after the model was restored."""
+        self._qs.clear()
+        self._errors.clear()
+
+
 class Compression(object):
     """Optional gradient compression algorithm used during allreduce."""
 
@@ -72,3 +422,24 @@ class Compression(object):
 
     """Compress all floating point gradients to 16-bit."""
     fp16 = FP16Compressor
+
+    """Exchange the top-k elements of every gradient, with error feedback."""
+    topk = TopKCompressor
+
+    """Exchange k random elements of every gradient, with error feedback."""
+    randomk = RandomKCompressor
+
+    """Exchange the elements of every gradient above a threshold, with error feedback."""
+    threshold = ThresholdCompressor
+
+    """Reduce low-rank approximations of the gradients, with error feedback."""
+    powersgd = PowerSGDCompressor
+
+    """Quantize floating point gradients to 8-bit integers with per-chunk scales."""
+    int8 = Int8Compressor
+
+    """Quantize floating point gradients to their signs with per-chunk scales and error feedback."""
+    onebit = OneBitCompressor
+
+    """Truncate floating point gradients to bfloat16."""
+    bf16 = BF16Compressor
@@ -14,8 +14,8 @@
 # ==============================================================================
 
 import math
-import random
 
+import numpy as np
 import torch.utils.data.distributed
 
 from horovod.torch.mpi_ops import rank, size
@@ -29,6 +29,10 @@ class ElasticSampler(torch.utils.data.Sampler):
     object, the sampler will automatically repartition the unprocessed indices among the
     new set of workers.
 
+    Processed indices are recorded in a bitmap with one bit per sample, and the unprocessed
+    indices are shuffled and partitioned with vectorized NumPy operations, so that large
+    datasets can be repartitioned quickly.
+
     In order to use this object successfully it is recommended that the user:
 
     1. Include this object in the `TorchState`.
@@ -47,16 +51,30 @@ class ElasticSampler(torch.utils.data.Sampler):
         self.seed = seed
 
         self.epoch = 0
-        self.processed_indices = set()
+        self.processed_bitmap = self._empty_bitmap()
 
         self.num_replicas = 0
         self.rank = 0
-        self.remaining_indices = []
+        self.remaining_indices = np.empty(0, dtype=self._index_dtype())
+        self.indices = np.empty(0, dtype=self._index_dtype())
         self.num_samples = 0
         self.total_size = 0
 
         self.reset()
 
+    @property
+    def processed_indices(self):
+        """The set of processed indices.
+
+        Builds a Python set from the bitmap, prefer `processed_bitmap` for large datasets.
+        """
+        return set(np.flatnonzero(self._processed_mask()).tolist())
+
+    @processed_indices.setter
+    def processed_indices(self, indices):
+        self.processed_bitmap = self._empty_bitmap()
+        self.record_indices(indices)
+
     def set_epoch(self, epoch):
         """Sets the epoch for this sampler.
 
@@ -71,33 +89,42 @@ class ElasticSampler(torch.utils.data.Sampler):
             epoch: Epoch number.
         """
         self.epoch = epoch
-        self.processed_indices = set()
+        self.processed_bitmap = self._empty_bitmap()
         self.reset()
 
     def record_batch(self, batch_idx, batch_size):
         """Record indices at batch `batch_idx` with length `batch_size` as processed."""
-        indices = set(self.get_indices(batch_idx, batch_size))
-        self.record_indices(indices)
+        start_idx = batch_idx * batch_size
+        end_idx = min(start_idx + batch_size, len(self.indices))
+        self.record_indices(self.indices[start_idx:end_idx])
 
     def record_indices(self, indices):
         """Record set `indices` as processed."""
-        self.processed_indices.update(indices)
+        if isinstance(indices, (set, frozenset)):
+            indices = list(indices)
+        indices = np.asarray(indices, dtype=np.int64)
+        np.bitwise_or.at(self.processed_bitmap, indices >> 3,
+                         np.left_shift(1, indices & 7).astype(np.uint8))
 
     def get_indices(self, batch_idx, batch_size):
         """Return list of indices at batch `batch_idx` with length `batch_size`."""
         start_idx = batch_idx * batch_size
         end_idx = min(start_idx + batch_size, len(self.indices))
-        return self.indices[start_idx:end_idx]
+        return self.indices[start_idx:end_idx].tolist()
 
     def load_state_dict(self, state_dict):
         self.epoch = state_dict['epoch']
-        self.processed_indices = state_dict['processed_indices']
+        if 'processed_bitmap' in state_dict:
+            # Recording updates the bitmap in place, so keep the loaded one intact
+            self.processed_bitmap = np.array(state_dict['processed_bitmap'], dtype=np.uint8)
+        else:
+            self.processed_indices = state_dict['processed_indices']
         self.reset()
 
     def state_dict(self):
         return dict(
             epoch=self.epoch,
-            processed_indices=self.processed_indices
+            processed_bitmap=self.processed_bitmap
         )
 
     def reset(self):
@@ -105,28 +132,44 @@ class ElasticSampler(torch.utils.data.Sampler):
         self.rank = rank()
 
         # Exclude any samples we have already processed this epoch
-        self.remaining_indices = [idx for idx in range(len(self.dataset))
-                                  if idx not in self.processed_indices]
+        self.remaining_indices = np.arange(len(self.dataset),
+                                           dtype=self._index_dtype())[~self._processed_mask()]
 
         self.num_samples = int(math.ceil(len(self.remaining_indices) * 1.0 / self.num_replicas))
         self.total_size = self.num_samples * self.num_replicas
 
+    def _empty_bitmap(self):
+        return np.zeros((len(self.dataset) + 7) // 8, dtype=np.uint8)
+
+    def _index_dtype(self):
+        # Halves the memory of the index arrays for all but the largest datasets
+        return np.int32 if len(self.dataset) < 2 ** 31 else np.int64
+
+    def _processed_mask(self):
+        return np.unpackbits(self.processed_bitmap, count=len(self.dataset),
+                             bitorder='little').astype(bool)
+
     def __iter__(self):
-        self.indices = self.remaining_indices[:]
+        num_remaining = len(self.remaining_indices)
+        indices = np.empty(self.total_size, dtype=self.remaining_indices.dtype)
+        indices[:num_remaining] = self.remaining_indices
         if self.shuffle:
-            # Shuffle indices across workers deterministically in place
+            # Shuffle indices across workers deterministically
             seed = self.seed + self.epoch
-            random.Random(seed).shuffle(self.indices)
+            np.random.RandomState(seed).shuffle(indices[:num_remaining])
 
         # add extra samples to make it evenly divisible
-        self.indices += self.indices[:(self.total_size - len(self.indices))]
-        assert len(self.indices) == self.total_size
+        filled = num_remaining
+        while filled < self.total_size:
+            count = min(filled, self.total_size - filled)
+            indices[filled:filled + count] = indices[:count]
+            filled += count
 
         # subsample
-        self.indices = self.indices[self.rank:self.total_size:self.num_replicas]
+        self.indices = indices[self.rank:self.total_size:self.num_replicas]
         assert len(self.indices) == self.num_samples
 
-        return iter(self.indices)
+        return iter(self.indices.tolist())
 
     def __len__(self):
         return self.num_samples
@@ -13,15 +13,22 @@
 # limitations under the License.
 # ==============================================================================
 
+import collections
 import copy
+import warnings
 
+import numpy as np
 import torch
 
 from horovod.common.elastic import ObjectState
 from horovod.torch.elastic.sampler import ElasticSampler
-from horovod.torch.functions import allgather_object, \
-    broadcast_object, broadcast_optimizer_state, broadcast_parameters
-from horovod.torch.mpi_ops import rank
+from horovod.torch.functions import allgather_object, broadcast_object, \
+    broadcast_optimizer_state, broadcast_parameters, _broadcast_flattened, _broadcast_optimizer_state
+from horovod.torch.mpi_ops import allgather, alltoall, rank, size
+from horovod.torch.optimizer import _ShardedOptimizer, _shard_sizes
+
+# Upper bound of the bitmap bytes exchanged at once when combining processed sample bitmaps
+_BITMAP_SYNC_CHUNK_BYTES = 64 * 1024 * 1024
 
 
 class TorchState(ObjectState):
@@ -34,17 +41,26 @@ class TorchState(ObjectState):
     Args:
         model: Optional PyTorch model.
         optimizer: Optional PyTorch optimizer.
+        inplace_snapshot: If `True`, commits copy the model and optimizer state tensors into
+                          buffers preallocated by the first commit instead of deep copying
+                          the state dicts, so frequent commits do not allocate memory.
+        track_changes: If `True` together with `inplace_snapshot`, commits only copy tensors
+                       that were modified or replaced since the previous commit, based on
+                       their version counters. Tensors modified through `.data` do not
+                       update their version counter and are missed.
         kwargs: Attributes sync, will be exposed as attributes of the object. If a handler exists
                 for the attribute type, it will be used to sync the object, otherwise it will be
                 handled an ordinary Python object.
     """
-    def __init__(self, model=None, optimizer=None, **kwargs):
+    def __init__(self, model=None, optimizer=None, inplace_snapshot=False, track_changes=False,
+                 **kwargs):
         kwargs.update(dict(model=model, optimizer=optimizer))
-        self._handlers, kwargs = _get_handlers(kwargs)
+        self._handlers, kwargs = _get_handlers(kwargs, inplace_snapshot, track_changes)
         for name, handler in self._handlers.items():
             setattr(self, name, handler.value)
         super(TorchState, self).__init__(bcast_object=broadcast_object,
                                          get_rank=rank,
+                                         allgather_object=allgather_object,
                                          **kwargs)
 
     def save(self):
@@ -58,8 +74,9 @@ class TorchState(ObjectState):
         super(TorchState, self).restore()
 
     def sync(self):
+        holders = self.sync_holders()
         for handler in self._handlers.values():
-            handler.sync()
+            handler.sync_from(holders)
         super(TorchState, self).sync()
 
     def __setattr__(self, name, value):
@@ -81,18 +98,26 @@ class StateHandler(object):
     def sync(self):
         raise NotImplementedError()
 
+    def sync_from(self, holders):
+        """Syncs the value given the ranks that hold the same state as rank 0."""
+        self.sync()
+
     def set_value(self, value):
         self.value = value
         self.save()
 
 
 class ModelStateHandler(StateHandler):
-    def __init__(self, model):
+    def __init__(self, model, snapshot=None):
         super().__init__(model)
-        self._saved_model_state = copy.deepcopy(self.value.state_dict())
+        self._snapshot = snapshot
+        self.save()
 
     def save(self):
-        self._saved_model_state = copy.deepcopy(self.value.state_dict())
+        if self._snapshot is not None:
+            self._saved_model_state = self._snapshot.save(self.value.state_dict())
+        else:
+            self._saved_model_state = copy.deepcopy(self.value.state_dict())
 
     def restore(self):
         self.value.load_state_dict(self._saved_model_state)
@@ -100,21 +125,153 @@ class ModelStateHandler(StateHandler):
     def sync(self):
         broadcast_parameters(self.value.state_dict(), root_rank=0)
 
+    def sync_from(self, holders):
+        if len(holders) == size():
+            return
+        # Every worker holding the state serves a share of the tensors
+        _broadcast_flattened(sorted(self.value.state_dict().items()), 0, 'broadcast_parameters',
+                             holders)
+
 
 class OptimizerStateHandler(StateHandler):
-    def __init__(self, optimizer):
+    def __init__(self, optimizer, snapshot=None):
         super().__init__(optimizer)
-        self._saved_optimizer_state = copy.deepcopy(self.value.state_dict())
+        self._snapshot = snapshot
+        self.save()
 
     def save(self):
-        self._saved_optimizer_state = copy.deepcopy(self.value.state_dict())
+        if self._snapshot is not None:
+            self._saved_optimizer_state = self._snapshot.save(self.value.state_dict())
+        else:
+            self._saved_optimizer_state = copy.deepcopy(self.value.state_dict())
 
     def restore(self):
-        self.value.load_state_dict(self._saved_optimizer_state)
+        state_dict = self._saved_optimizer_state
+        if self._snapshot is not None:
+            # The optimizer may keep the loaded tensors as its state, which must not
+            # alias the buffers that are overwritten by the next commit
+            state_dict = copy.deepcopy(state_dict)
+        self.value.load_state_dict(state_dict)
 
     def sync(self):
         broadcast_optimizer_state(self.value, root_rank=0)
 
+    def sync_from(self, holders):
+        if len(holders) == size():
+            return
+        _broadcast_optimizer_state(self.value, root_rank=0, holders=holders)
+
+
+class ShardedOptimizerStateHandler(OptimizerStateHandler):
+    def __init__(self, optimizer, snapshot=None):
+        self._synced = False
+        super().__init__(optimizer, snapshot)
+
+    def save(self):
+        # Every rank only keeps a copy of the state of its own shards
+        self._saved_shard_state = self.value._shard_state_dict()
+
+    def restore(self):
+        shard_state = self._saved_shard_state
+        if (shard_state['rank'], shard_state['size']) == (rank(), size()):
+            self.value._load_shard_state_dict(shard_state)
+        # Otherwise the committed shards are re-partitioned by the next sync
+
+    def sync(self):
+        # Without a comparison of the workers, all of them are assumed to hold committed shards
+        self.sync_from(list(range(size())))
+
+    def sync_from(self, holders):
+        saved = self._saved_shard_state
+        partitions = allgather_object((saved['rank'], saved['size'], self._synced))
+        self._synced = True
+        if not any(synced for _, _, synced in partitions):
+            # On the first sync every worker starts from the shards it was created with
+            return
+        if len(holders) == size() and \
+                all((old_rank, old_size) == (r, size())
+                    for r, (old_rank, old_size, _) in enumerate(partitions)):
+            # Every worker holds its own committed shards
+            return
+        _repartition_shards(self.value, saved, [partition[:2] for partition in partitions],
+                            holders)
+
+
+def _repartition_shards(optimizer, saved, partitions, holders):
+    # Only the workers holding the committed state of rank 0 serve their shards
+    old_size = partitions[holders[0]][1]
+    owners = {}
+    for r in holders:
+        owners.setdefault(partitions[r][0], r)
+
+    optimizer._repartition()
+    if sorted(owners) != list(range(old_size)):
+        warnings.warn('The optimizer state of the shards of removed workers was lost, '
+                      'the state of the sharded optimizer is reset.')
+        param_groups = broadcast_object(saved['param_groups'], root_rank=holders[0],
+                                        name='sharded_state.param_groups')
+        for group, options in zip(optimizer.param_groups, param_groups):
+            group.update(options)
+        return
+
+    # The old shards are broadcast one after the other, so that every worker holds
+    # at most one of them besides its new shards
+    for old_rank in range(old_size):
+        root = owners[old_rank]
+        old_shards = {bucket.index: (sum(_shard_sizes(bucket.numel, old_size)[:old_rank]),
+                                     _shard_sizes(bucket.numel, old_size)[old_rank])
+                      for bucket in optimizer._buckets}
+
+        # The layout replaces the shard tensors by their dtype, the tensors themselves
+        # follow in a single fused broadcast
+        layout = None
+        if rank() == root:
+            layout = {
+                'param_groups': saved['param_groups'],
+                'state': {index: {key: value.dtype
+                                  if torch.is_tensor(value) and
+                                  value.shape == (old_shards[index][1],) else value
+                                  for key, value in state.items()}
+                          for index, state in saved['state'].items()},
+            }
+        layout = broadcast_object(layout, root_rank=root,
+                                  name='sharded_state.layout.%d' % old_rank)
+        if old_rank == 0:
+            for group, options in zip(optimizer.param_groups, layout['param_groups']):
+                group.update(copy.deepcopy(options))
+
+        tensors = []
+        for bucket in optimizer._buckets:
+            for key, value in sorted(layout['state'].get(bucket.index, {}).items()):
+                if isinstance(value, torch.dtype):
+                    if rank() == root:
+                        tensor = saved['state'][bucket.index][key]
+                    else:
+                        tensor = bucket.shard.new_empty(old_shards[bucket.index][1], dtype=value)
+                    tensors.append(('%d.%s' % (bucket.index, key), tensor))
+        _broadcast_flattened(tensors, root, 'sharded_state.%d' % old_rank)
+        tensors = dict(tensors)
+
+        # Copy the overlap of the old shard with the new local shard of every bucket
+        for bucket in optimizer._buckets:
+            if bucket.index not in layout['state']:
+                continue
+            old_offset, old_numel = old_shards[bucket.index]
+            start = max(old_offset, bucket.shard_offset)
+            end = min(old_offset + old_numel, bucket.shard_offset + bucket.shard.numel())
+            state = optimizer.state[bucket.shard]
+            for key, value in layout['state'][bucket.index].items():
+                if not isinstance(value, torch.dtype):
+                    # State that is not sharded, such as step counts, is the same in every shard
+                    state.setdefault(key, copy.deepcopy(value))
+                    continue
+                if key not in state:
+                    state[key] = bucket.shard.new_zeros(bucket.shard.shape, dtype=value)
+                if start < end:
+                    state[key].narrow(0, start - bucket.shard_offset, end - start).copy_(
+                        tensors['%d.%s' % (bucket.index, key)].narrow(
+                            0, start - old_offset, end - start))
+
 
 class SamplerStateHandler(StateHandler):
     def __init__(self, sampler):
@@ -128,24 +285,86 @@ class SamplerStateHandler(StateHandler):
         self.value.load_state_dict(self._saved_sampler_state)
 
     def sync(self):
-        # Get the set of processed indices from all workers
-        world_processed_indices = _union(allgather_object(self.value.processed_indices))
-
-        # Replace local processed indices with global indices
-        state_dict = self.value.state_dict()
-        state_dict['processed_indices'] = world_processed_indices
-
-        # Broadcast and load the state to make sure we're all in sync
-        self.value.load_state_dict(broadcast_object(state_dict))
-
-
-def _union(sets):
-    # Union a list of sets into a single set
-    return set().union(*sets)
+        # Combine the processed indices of all workers
+        processed_bitmap = _bitwise_or_allreduce(self.value.processed_bitmap)
+
+        # The combined bitmap is identical everywhere, only the epoch is broadcast
+        epoch = broadcast_object(self.value.epoch)
+        self.value.load_state_dict(dict(epoch=epoch, processed_bitmap=processed_bitmap))
+
+
+class _InplaceSnapshot(object):
+    """Copy of a nested state dict whose tensors are reused and updated in place."""
+    def __init__(self, track_changes=False):
+        self._track_changes = track_changes
+        self._state = None
+        # Schema: path in the state dict -> (data_ptr, version) of the last copied tensor
+        self._versions = {}
+
+    def save(self, state):
+        with torch.no_grad():
+            self._state = self._copy(state, self._state, ())
+        return self._state
+
+    def _copy(self, src, dst, path):
+        if torch.is_tensor(src):
+            version = (src.data_ptr(), src._version)
+            if torch.is_tensor(dst) and dst.shape == src.shape and \
+                    dst.dtype == src.dtype and dst.device == src.device:
+                if not self._track_changes or self._versions.get(path) != version:
+                    dst.copy_(src)
+            else:
+                dst = src.detach().clone()
+            if self._track_changes:
+                self._versions[path] = version
+            return dst
+        if isinstance(src, dict):
+            if type(dst) is not type(src):
+                dst = collections.OrderedDict() if isinstance(src, collections.OrderedDict) else {}
+            for k in [k for k in dst if k not in src]:
+                del dst[k]
+            for k, v in src.items():
+                dst[k] = self._copy(v, dst.get(k), path + (k,))
+            if hasattr(src, '_metadata'):
+                # Module state dicts carry their version metadata as an attribute
+                dst._metadata = copy.deepcopy(src._metadata)
+            return dst
+        if isinstance(src, list):
+            if not isinstance(dst, list):
+                dst = []
+            del dst[len(src):]
+            dst.extend([None] * (len(src) - len(dst)))
+            for i, v in enumerate(src):
+                dst[i] = self._copy(v, dst[i], path + (i,))
+            return dst
+        if isinstance(src, tuple):
+            dst = dst if isinstance(dst, tuple) and len(dst) == len(src) else (None,) * len(src)
+            return type(src)(self._copy(v, d, path + (i,)) for i, (v, d) in enumerate(zip(src, dst)))
+        return copy.deepcopy(src)
+
+
+def _bitwise_or_allreduce(bitmap):
+    # There is no bitwise reduction, so every worker receives its segment of the packed
+    # bitmaps of all workers with an alltoall and combines it with NumPy, and the combined
+    # segments are allgathered. Each worker sends and receives about twice the bitmap.
+    n = size()
+    result = np.empty_like(bitmap)
+    for start in range(0, len(bitmap), _BITMAP_SYNC_CHUNK_BYTES):
+        chunk = bitmap[start:start + _BITMAP_SYNC_CHUNK_BYTES]
+        splits = [len(chunk) // n + (1 if r < len(chunk) % n else 0) for r in range(n)]
+        received, _ = alltoall(torch.from_numpy(chunk),
+                               splits=torch.tensor(splits, dtype=torch.int32),
+                               name='processed_bitmap.alltoall.%d' % start)
+        segment = np.bitwise_or.reduce(received.numpy().reshape(n, splits[rank()]), axis=0)
+        combined = allgather(torch.from_numpy(segment),
+                             name='processed_bitmap.allgather.%d' % start)
+        result[start:start + len(chunk)] = combined.numpy()
+    return result
 
 
 _handler_registry = [
     (torch.nn.Module, ModelStateHandler),
+    (_ShardedOptimizer, ShardedOptimizerStateHandler),
     (torch.optim.Optimizer, OptimizerStateHandler),
     (ElasticSampler, SamplerStateHandler),
 ]
@@ -160,18 +379,20 @@ def set_handler_registry(registry):
     _handler_registry = registry
 
 
-def _get_handler(v):
+def _get_handler(v, inplace_snapshot=False, track_changes=False):
     for handler_type, handler_cls in _handler_registry:
         if isinstance(v, handler_type):
+            if inplace_snapshot and issubclass(handler_cls, (ModelStateHandler, OptimizerStateHandler)):
+                return handler_cls(v, snapshot=_InplaceSnapshot(track_changes))
             return handler_cls(v)
     return None
 
 
-def _get_handlers(kwargs):
+def _get_handlers(kwargs, inplace_snapshot=False, track_changes=False):
     handlers = {}
     remainder = {}
     for k, v in kwargs.items():
-        handler = _get_handler(v)
+        handler = _get_handler(v, inplace_snapshot, track_changes)
         if handler:
             handlers[k] = handler
         else:
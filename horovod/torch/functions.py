@@ -14,14 +14,14 @@
 # ==============================================================================
 
 import collections
-import io
 
 from collections.abc import Iterable
 
-import cloudpickle
+import numpy as np
 import torch
 
-from horovod.torch.mpi_ops import allgather, broadcast_, broadcast_async_
+from horovod.common.util import allgather_object_chunks, assign_roots, broadcast_object_chunks
+from horovod.torch.mpi_ops import allgather, broadcast_, broadcast_async_, grouped_broadcast_async_
 from horovod.torch.mpi_ops import synchronize
 from horovod.torch.mpi_ops import rank, size
 
@@ -48,16 +48,72 @@ def broadcast_parameters(params, root_rank):
         raise ValueError('invalid params of type: %s' % type(params))
 
     # Run asynchronous broadcasts.
-    handles = []
-    for name, p in params:
-        handle = broadcast_async_(p, root_rank, name)
-        handles.append(handle)
+    handles = _grouped_broadcast_async_([p for _, p in params], root_rank, 'broadcast_parameters')
 
     # Wait for completion.
     for handle in handles:
         synchronize(handle)
 
 
+def _grouped_broadcast_async_(tensors, root_rank, name):
+    """
+    Broadcasts the tensors in place with one grouped broadcast per device, so that
+    they are negotiated together and fused by the backend.
+    """
+    groups = collections.OrderedDict()
+    for t in tensors:
+        groups.setdefault(t.device, []).append(t)
+    return [grouped_broadcast_async_(group, root_rank, '%s.%d' % (name, index))
+            for index, group in enumerate(groups.values())]
+
+
+def _broadcast_flattened(params, root_rank, name, holders=None):
+    """
+    Broadcasts a list of named tensors in place, packing the dense ones into a
+    single flat buffer per dtype and device. The buffers are broadcast as a group.
+
+    If `holders` is given, it lists ranks that all hold the same tensors, and every
+    tensor is broadcast from one of them instead of `root_rank`.
+    """
+    if holders is not None:
+        roots = assign_roots([p.numel() * p.element_size() for _, p in params], holders)
+    else:
+        roots = [root_rank] * len(params)
+
+    buffers = collections.OrderedDict()
+    sparse = []
+    for (key, p), root in zip(params, roots):
+        if p.is_sparse:
+            sparse.append((key, p, root))
+        else:
+            buffers.setdefault((root, p.dtype, p.device), []).append(p)
+
+    flats = [torch.cat([t.detach().reshape(-1) for t in tensors]) for tensors in buffers.values()]
+    root_flats = collections.OrderedDict()
+    for (root, _, _), flat in zip(buffers.keys(), flats):
+        root_flats.setdefault(root, []).append(flat)
+    # Broadcasts from different roots run concurrently
+    handles = [handle
+               for root, group in root_flats.items()
+               for handle in _grouped_broadcast_async_(group, root, '%s.flat.%d' % (name, root))]
+    sparse_handles = [broadcast_async_(p, root, key) for key, p, root in sparse]
+
+    for handle in handles:
+        synchronize(handle)
+
+    with torch.no_grad():
+        for (root, _, _), flat, tensors in zip(buffers.keys(), flats, buffers.values()):
+            if rank() == root:
+                continue
+            offset = 0
+            for t in tensors:
+                t.copy_(flat.narrow(0, offset, t.numel()).view_as(t))
+                offset += t.numel()
+
+    for handle in sparse_handles:
+        synchronize(handle)
+
+
 def broadcast_optimizer_state(optimizer, root_rank):
     """
     Broadcasts an optimizer state from root rank to all other processes.
@@ -67,7 +123,35 @@ def broadcast_optimizer_state(optimizer, root_rank):
         root_rank: The rank of the process from which the optimizer will be
                    broadcasted to all other processes.
     """
-    from horovod.torch.optimizer import DistributedOptimizer
+    _broadcast_optimizer_state(optimizer, root_rank)
+
+
+def _broadcast_optimizer_state(optimizer, root_rank, holders=None):
+    # The state tensors are broadcast from `holders` if given, see _broadcast_flattened()
+    from horovod.torch.optimizer import DistributedOptimizer, _ShardedOptimizer
+    if isinstance(optimizer, _ShardedOptimizer):
+        # Every rank holds a different shard of the state, so the full state is gathered
+        # from the shards of all ranks first. Its sharded tensors are then identical on
+        # all ranks, while the rest of the state, such as step counts, and the
+        # hyperparameters of the param groups are taken from the root rank. Every rank
+        # keeps its shard of the result.
+        state_dict = optimizer.state_dict()
+        params = [p for group in optimizer._group_params for p in group]
+        unsharded = {
+            'param_groups': [{k: v for k, v in group.items() if k != 'params'}
+                             for group in state_dict['param_groups']],
+            'state': {i: {k: v for k, v in s.items()
+                          if not (torch.is_tensor(v) and v.shape == params[i].shape)}
+                      for i, s in state_dict['state'].items()},
+        }
+        unsharded = broadcast_object(unsharded, root_rank, name='optimizer_state.unsharded')
+        for group, options in zip(state_dict['param_groups'], unsharded['param_groups']):
+            group.update(options)
+        for i, s in unsharded['state'].items():
+            state_dict['state'].setdefault(i, {}).update(s)
+        optimizer.load_state_dict(state_dict)
+        return
+
     if isinstance(optimizer, torch.optim.LBFGS):
         # TODO(travis): L-BFGS cannot be easily supported without serializing
         #  the entire state_dict, as its structure is deeply nested and contains
@@ -178,8 +262,9 @@ def broadcast_optimizer_state(optimizer, root_rank):
                     scalars[key] = p
                     callbacks[key] = _create_state_callback(pid, name)
 
-    # Synchronized broadcast of all tensor parameters
-    broadcast_parameters(params, root_rank)
+    # Synchronized broadcast of all tensor parameters, packed into a few flat
+    # buffers so that thousands of states do not need to be negotiated one by one
+    _broadcast_flattened(params, root_rank, 'optimizer_state', holders)
 
     # Broadcast and cleanup for non-tensor parameters
     scalars = broadcast_object(scalars, root_rank)
@@ -198,6 +283,9 @@ def broadcast_object(obj, root_rank=0, name=None):
         if hvd.rank() > 0:
             optimizer.load_state_dict(state_dict)
 
+    Small objects are broadcast together with their size in a single operation,
+    large objects are streamed in chunks.
+
     Arguments:
         obj: An object capable of being serialized without losing any context.
         root_rank: The rank of the process from which parameters will be
@@ -210,30 +298,21 @@ def broadcast_object(obj, root_rank=0, name=None):
     if name is None:
         name = type(obj).__name__
 
-    if rank() == root_rank:
-        b = io.BytesIO()
-        cloudpickle.dump(obj, b)
-        t = torch.ByteTensor(bytearray(b.getvalue()))
-        sz = torch.IntTensor([t.shape[0]])
-        broadcast_(sz, root_rank, name + '.sz')
-    else:
-        sz = torch.IntTensor([0])
-        broadcast_(sz, root_rank, name + '.sz')
-        t = torch.ByteTensor(sz.tolist()[0])
-
-    broadcast_(t, root_rank, name + '.t')
-
-    if rank() != root_rank:
-        buf = io.BytesIO(t.numpy().tobytes())
-        obj = cloudpickle.load(buf)
+    def broadcast_chunk(chunk, index):
+        # The tensor shares the memory of the chunk, which is broadcast in place
+        broadcast_(_byte_tensor(chunk), root_rank, '%s.%d' % (name, index))
+        return chunk
 
-    return obj
+    return broadcast_object_chunks(obj, rank() == root_rank, broadcast_chunk)
 
 
 def allgather_object(obj, name=None):
     """
     Serializes and allgathers an object from all other processes.
 
+    Small objects are allgathered together with their sizes in a single operation,
+    large objects are streamed in chunks.
+
     Arguments:
         obj: An object capable of being serialized without losing any context.
         name: Optional name to use during allgather, will default to the class
@@ -245,22 +324,11 @@ def allgather_object(obj, name=None):
     if name is None:
         name = type(obj).__name__
 
-    def load(byte_array):
-        buf = io.BytesIO(byte_array.tobytes())
-        return cloudpickle.load(buf)
-
-    b = io.BytesIO()
-    cloudpickle.dump(obj, b)
-
-    t = torch.ByteTensor(bytearray(b.getvalue()))
-    sz = torch.IntTensor([t.shape[0]])
+    def allgather_chunk(chunk, index):
+        return allgather(_byte_tensor(chunk), name='%s.%d' % (name, index)).numpy()
 
-    sizes = allgather(sz, name=name + '.sz').numpy()
-    gathered = allgather(t, name=name + '.t').numpy()
+    return allgather_object_chunks(obj, allgather_chunk)
 
-    def select(i):
-        start = sum(sizes[:i])
-        end = start + sizes[i]
-        return gathered[start:end]
 
-    return [load(select(i)) for i in range(size())]
+def _byte_tensor(buf):
+    return torch.from_numpy(np.frombuffer(buf, dtype=np.uint8))
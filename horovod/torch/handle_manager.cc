@@ -15,6 +15,8 @@
 
 #include "handle_manager.h"
 
+#include <chrono>
+
 namespace horovod {
 namespace torch {
 
@@ -26,8 +28,11 @@ int HandleManager::AllocateHandle() {
 }
 
 void HandleManager::MarkDone(int handle, const Status& status) {
-  std::lock_guard<std::mutex> guard(mutex_);
-  results_[handle] = std::make_shared<Status>(status);
+  {
+    std::lock_guard<std::mutex> guard(mutex_);
+    results_[handle] = std::make_shared<Status>(status);
+  }
+  cv_.notify_all();
 }
 
 bool HandleManager::PollHandle(int handle) {
@@ -39,6 +44,36 @@ bool HandleManager::PollHandle(int handle) {
   return results_[handle] != nullptr;
 }
 
+int HandleManager::WaitAny(const std::vector<int>& handles, double timeout) {
+  auto deadline = std::chrono::steady_clock::now() +
+                  std::chrono::duration_cast<std::chrono::steady_clock::duration>(
+                      std::chrono::duration<double>(timeout));
+  std::unique_lock<std::mutex> lock(mutex_);
+  while (true) {
+    for (auto handle : handles) {
+      auto it = results_.find(handle);
+      if (it == results_.end()) {
+        throw std::invalid_argument("Handle " + std::to_string(handle) +
+                                    " was not created or has been cleared.");
+      }
+      if (it->second != nullptr) {
+        return handle;
+      }
+    }
+    if (timeout < 0) {
+      cv_.wait(lock);
+    } else if (cv_.wait_until(lock, deadline) == std::cv_status::timeout) {
+      // Handles completed right before the deadline are still reported
+      for (auto handle : handles) {
+        if (results_[handle] != nullptr) {
+          return handle;
+        }
+      }
+      return -1;
+    }
+  }
+}
+
 std::shared_ptr<Status> HandleManager::ReleaseHandle(int handle) {
   std::lock_guard<std::mutex> guard(mutex_);
   if (results_.find(handle) == results_.end()) {
@@ -17,9 +17,11 @@
 #define HOROVOD_TORCH_HANDLE_MANAGER_H
 
 #include <atomic>
+#include <condition_variable>
 #include <memory>
 #include <mutex>
 #include <unordered_map>
+#include <vector>
 
 #include "../common/common.h"
 
@@ -33,6 +35,9 @@ public:
   int AllocateHandle();
   void MarkDone(int handle, const Status& status);
   bool PollHandle(int handle);
+  // Blocks until one of the handles is done and returns it, or returns -1 if
+  // none is done within timeout seconds. A negative timeout waits forever.
+  int WaitAny(const std::vector<int>& handles, double timeout);
   std::shared_ptr<Status> ReleaseHandle(int handle);
   void Reset();
 
@@ -40,6 +45,7 @@ private:
   std::atomic_int last_handle_;
   std::unordered_map<int, std::shared_ptr<Status>> results_;
   std::mutex mutex_;
+  std::condition_variable cv_;
 };
 
 } // namespace torch
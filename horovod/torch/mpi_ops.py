@@ -18,11 +18,14 @@
 # Load all the necessary PyTorch C types.
 import torch
 
+import time
 import warnings
 
 from horovod.common.basics import HorovodBasics as _HorovodBasics
 from horovod.common.exceptions import HorovodInternalError
-from horovod.common.util import check_installed_version, get_average_backwards_compatibility_fun, gpu_available, num_rank_is_power_2
+from horovod.common.process_sets import ProcessSet, global_process_set, process_set_id as _process_set_id
+from horovod.common.util import check_installed_version, get_average_backwards_compatibility_fun, gpu_available, num_rank_is_power_2, \
+    sparse_density_threshold
 
 from horovod.torch.compression import Compression
 
@@ -78,6 +81,9 @@ handle_average_backwards_compatibility = get_average_backwards_compatibility_fun
 # before the operation is finished.
 _handle_map = {}
 
+# Schema: handle -> functions called with the output once the operation is synchronized
+_done_callbacks = {}
+
 
 def _check_function(function_factory, tensor):
     function = function_factory(tensor)
@@ -92,12 +98,13 @@ def _allreduce_function_factory(tensor):
     return 'horovod_torch_allreduce_async_' + tensor.type().replace('.', '_')
 
 
-def _allreduce_async(tensor, output, name, op, prescale_factor, postscale_factor):
+def _allreduce_async(tensor, output, name, op, prescale_factor, postscale_factor, priority=0,
+                     process_set=global_process_set):
     # Set the divisor for reduced gradients to average when necessary
     if op == Average:
         if rocm_built():
             # For ROCm, perform averaging at framework level
-            divisor = size()
+            divisor = process_set.size()
             op = Sum
         else:
             divisor = 1
@@ -130,7 +137,8 @@ def _allreduce_async(tensor, output, name, op, prescale_factor, postscale_factor
     try:
         handle = getattr(mpi_lib, function)(tensor, output, divisor,
                                             name.encode() if name is not None else _NULL, op,
-                                            prescale_factor, postscale_factor)
+                                            prescale_factor, postscale_factor, priority,
+                                            _process_set_id(process_set))
     except RuntimeError as e:
         raise HorovodInternalError(e)
     _handle_map[handle] = (tensor, output)
@@ -138,7 +146,8 @@ def _allreduce_async(tensor, output, name, op, prescale_factor, postscale_factor
 
 
 def allreduce_async(tensor, average=None, name=None, op=None,
-                    prescale_factor=1.0, postscale_factor=1.0):
+                    prescale_factor=1.0, postscale_factor=1.0, priority=0,
+                    process_set=global_process_set):
     """
     A function that performs asynchronous averaging or summation of the input tensor
     over all the Horovod processes. The input tensor is not modified.
@@ -160,6 +169,10 @@ def allreduce_async(tensor, average=None, name=None, op=None,
                    ranks. Defaults to Average if None is given.
         prescale_factor: Multiplicative factor to scale tensor before allreduce.
         postscale_factor: Multiplicative factor to scale tensor after allreduce.
+        priority: The priority of this operation. Higher priority operations
+                  are likely to be executed before other operations.
+        process_set: Process set object to limit this operation to a subset of
+                     Horovod processes. Default is the global process set.
 
     Returns:
         A handle to the allreduce operation that can be used with `poll()` or
@@ -167,30 +180,34 @@ def allreduce_async(tensor, average=None, name=None, op=None,
     """
     op = handle_average_backwards_compatibility(op, average)
     output = tensor.new(tensor.shape)
-    return _allreduce_async(tensor, output, name, op, prescale_factor, postscale_factor)
+    return _allreduce_async(tensor, output, name, op, prescale_factor, postscale_factor, priority,
+                            process_set)
 
 
 class HorovodAllreduce(torch.autograd.Function):
     """An autograd function that performs allreduce on a tensor."""
 
     @staticmethod
-    def forward(ctx, tensor, average, name, op, prescale_factor, postscale_factor):
+    def forward(ctx, tensor, average, name, op, prescale_factor, postscale_factor, process_set):
         ctx.average = average
         ctx.op = op
         ctx.prescale_factor = prescale_factor
         ctx.postscale_factor = postscale_factor
-        handle = allreduce_async(tensor, average, name, op, prescale_factor, postscale_factor)
+        ctx.process_set = process_set
+        handle = allreduce_async(tensor, average, name, op, prescale_factor, postscale_factor,
+                                 process_set=process_set)
         return synchronize(handle)
 
     @staticmethod
     def backward(ctx, grad_output):
         return allreduce(grad_output, average=ctx.average, op=ctx.op,
                          prescale_factor=ctx.prescale_factor,
-                         postscale_factor=ctx.postscale_factor), None, None, None, None, None
+                         postscale_factor=ctx.postscale_factor,
+                         process_set=ctx.process_set), None, None, None, None, None, None
 
 
 def allreduce(tensor, average=None, name=None, compression=Compression.none, op=None,
-              prescale_factor=1.0, postscale_factor=1.0):
+              prescale_factor=1.0, postscale_factor=1.0, process_set=global_process_set):
     """
     A function that performs averaging or summation of the input tensor over all the
     Horovod processes. The input tensor is not modified.
@@ -219,6 +236,8 @@ def allreduce(tensor, average=None, name=None, compression=Compression.none, op=
             to Average if None is given.
         prescale_factor: Multiplicative factor to scale tensor before allreduce.
         postscale_factor: Multiplicative factor to scale tensor after allreduce.
+        process_set: Process set object to limit this operation to a subset of
+                     Horovod processes. Default is the global process set.
 
     Returns:
         A tensor of the same shape and type as `tensor`, averaged or summed across all
@@ -226,12 +245,14 @@ def allreduce(tensor, average=None, name=None, compression=Compression.none, op=
     """
     tensor_compressed, ctx = compression.compress(tensor)
     summed_tensor_compressed = HorovodAllreduce.apply(tensor_compressed, average, name, op,
-                                                      prescale_factor, postscale_factor)
+                                                      prescale_factor, postscale_factor,
+                                                      process_set)
     return compression.decompress(summed_tensor_compressed, ctx)
 
 
 def allreduce_async_(tensor, average=None, name=None, op=None,
-                     prescale_factor=1.0, postscale_factor=1.0):
+                     prescale_factor=1.0, postscale_factor=1.0, priority=0,
+                     process_set=global_process_set):
     """
     A function that performs asynchronous in-place averaging or summation of the input
     tensor over all the Horovod processes.
@@ -253,17 +274,22 @@ def allreduce_async_(tensor, average=None, name=None, op=None,
             Average if None is given.
         prescale_factor: Multiplicative factor to scale tensor before allreduce.
         postscale_factor: Multiplicative factor to scale tensor after allreduce.
+        priority: The priority of this operation. Higher priority operations
+                  are likely to be executed before other operations.
+        process_set: Process set object to limit this operation to a subset of
+                     Horovod processes. Default is the global process set.
 
     Returns:
         A handle to the allreduce operation that can be used with `poll()` or
         `synchronize()`.
     """
     op = handle_average_backwards_compatibility(op, average)
-    return _allreduce_async(tensor, tensor, name, op, prescale_factor, postscale_factor)
+    return _allreduce_async(tensor, tensor, name, op, prescale_factor, postscale_factor, priority,
+                            process_set)
 
 
 def allreduce_(tensor, average=None, name=None, op=None,
-               prescale_factor=1.0, postscale_factor=1.0):
+               prescale_factor=1.0, postscale_factor=1.0, process_set=global_process_set):
     """
     A function that performs in-place averaging or summation of the input tensor over
     all the Horovod processes.
@@ -285,12 +311,15 @@ def allreduce_(tensor, average=None, name=None, op=None,
             Average if None is given.
         prescale_factor: Multiplicative factor to scale tensor before allreduce.
         postscale_factor: Multiplicative factor to scale tensor after allreduce.
+        process_set: Process set object to limit this operation to a subset of
+                     Horovod processes. Default is the global process set.
 
     Returns:
         A tensor of the same shape and type as `tensor`, averaged or summed across all
         processes.
     """
-    handle = allreduce_async_(tensor, average, name, op, prescale_factor, postscale_factor)
+    handle = allreduce_async_(tensor, average, name, op, prescale_factor, postscale_factor,
+                              process_set=process_set)
     return synchronize(handle)
 
 
@@ -298,12 +327,13 @@ def _grouped_allreduce_function_factory(tensor):
     return 'horovod_torch_grouped_allreduce_async_' + tensor.type().replace('.', '_')
 
 
-def _grouped_allreduce_async(tensors, outputs, name, op, prescale_factor, postscale_factor):
+def _grouped_allreduce_async(tensors, outputs, name, op, prescale_factor, postscale_factor,
+                             priority=0, process_set=global_process_set):
     # Set the divisor for reduced gradients to average when necessary
     if op == Average:
         if rocm_built():
             # For ROCm, perform averaging at framework level
-            divisor = size()
+            divisor = process_set.size()
             op = Sum
         else:
             divisor = 1
@@ -335,7 +365,8 @@ def _grouped_allreduce_async(tensors, outputs, name, op, prescale_factor, postsc
     try:
         handle = getattr(mpi_lib, function)(tensors, outputs, divisor,
                                             name.encode() if name is not None else _NULL, op,
-                                            prescale_factor, postscale_factor)
+                                            prescale_factor, postscale_factor, priority,
+                                            _process_set_id(process_set))
     except RuntimeError as e:
         raise HorovodInternalError(e)
     _handle_map[handle] = (tuple(tensors), tuple(outputs))
@@ -343,7 +374,8 @@ def _grouped_allreduce_async(tensors, outputs, name, op, prescale_factor, postsc
 
 
 def grouped_allreduce_async(tensors, average=None, name=None, op=None,
-                            prescale_factor=1.0, postscale_factor=1.0):
+                            prescale_factor=1.0, postscale_factor=1.0, priority=0,
+                            process_set=global_process_set):
     """
     A function that performs asynchronous averaging or summation of the input tensor
     list over all the Horovod processes. The input tensors are not modified.
@@ -367,6 +399,10 @@ def grouped_allreduce_async(tensors, average=None, name=None, op=None,
                    ranks. Defaults to Average if None is given.
         prescale_factor: Multiplicative factor to scale tensor before allreduce.
         postscale_factor: Multiplicative factor to scale tensor after allreduce.
+        priority: The priority of this operation. Higher priority operations
+                  are likely to be executed before other operations.
+        process_set: Process set object to limit this operation to a subset of
+                     Horovod processes. Default is the global process set.
 
     Returns:
         A handle to the group allreduce operation that can be used with `poll()` or
@@ -374,31 +410,35 @@ def grouped_allreduce_async(tensors, average=None, name=None, op=None,
     """
     op = handle_average_backwards_compatibility(op, average)
     outputs = [t.new(t.shape) for t in tensors]
-    return _grouped_allreduce_async(tensors, outputs, name, op, prescale_factor, postscale_factor)
+    return _grouped_allreduce_async(tensors, outputs, name, op, prescale_factor, postscale_factor,
+                                    priority, process_set)
 
 
 class HorovodGroupedAllreduce(torch.autograd.Function):
     """An autograd function that performs allreduce on a list of tensors."""
 
     @staticmethod
-    def forward(ctx, average, name, op, prescale_factor, postscale_factor, *tensors):
+    def forward(ctx, average, name, op, prescale_factor, postscale_factor, process_set, *tensors):
         ctx.average = average
         ctx.op = op
         ctx.prescale_factor = prescale_factor
         ctx.postscale_factor = postscale_factor
-        handle = grouped_allreduce_async(list(tensors), average, name, op, prescale_factor, postscale_factor)
+        ctx.process_set = process_set
+        handle = grouped_allreduce_async(list(tensors), average, name, op, prescale_factor, postscale_factor,
+                                         process_set=process_set)
         return synchronize(handle)
 
     @staticmethod
     def backward(ctx, *grad_output):
         grad_reduced = grouped_allreduce(list(grad_output), average=ctx.average, op=ctx.op,
                                          prescale_factor=ctx.prescale_factor,
-                                         postscale_factor=ctx.postscale_factor)
-        return (None, None, None, None, None, *grad_reduced)
+                                         postscale_factor=ctx.postscale_factor,
+                                         process_set=ctx.process_set)
+        return (None, None, None, None, None, None, *grad_reduced)
 
 
 def grouped_allreduce(tensors, average=None, name=None, compression=Compression.none, op=None,
-                      prescale_factor=1.0, postscale_factor=1.0):
+                      prescale_factor=1.0, postscale_factor=1.0, process_set=global_process_set):
     """
     A function that performs averaging or summation of the input tensor
     list over all the Horovod processes. The input tensors are not modified.
@@ -429,6 +469,8 @@ def grouped_allreduce(tensors, average=None, name=None, compression=Compression.
             to Average if None is given.
         prescale_factor: Multiplicative factor to scale tensor before allreduce.
         postscale_factor: Multiplicative factor to scale tensor after allreduce.
+        process_set: Process set object to limit this operation to a subset of
+                     Horovod processes. Default is the global process set.
 
     Returns:
         A list containing tensors of the same shape and type as in `tensors`,
@@ -437,12 +479,13 @@ def grouped_allreduce(tensors, average=None, name=None, compression=Compression.
     tensors_compressed, ctxs = zip(*[compression.compress(t) for t in tensors])
     summed_tensors_compressed = HorovodGroupedAllreduce.apply(average, name, op,
                                                               prescale_factor, postscale_factor,
-                                                              *tensors_compressed)
+                                                              process_set, *tensors_compressed)
     return [compression.decompress(t, ctx) for t, ctx in zip(summed_tensors_compressed, ctxs)]
 
 
 def grouped_allreduce_async_(tensors, average=None, name=None, op=None,
-                             prescale_factor=1.0, postscale_factor=1.0):
+                             prescale_factor=1.0, postscale_factor=1.0, priority=0,
+                             process_set=global_process_set):
     """
     A function that performs asynchronous in-place averaging or summation of the input
     tensors over all the Horovod processes.
@@ -466,17 +509,22 @@ def grouped_allreduce_async_(tensors, average=None, name=None, op=None,
             Average if None is given.
         prescale_factor: Multiplicative factor to scale tensor before allreduce.
         postscale_factor: Multiplicative factor to scale tensor after allreduce.
+        priority: The priority of this operation. Higher priority operations
+                  are likely to be executed before other operations.
+        process_set: Process set object to limit this operation to a subset of
+                     Horovod processes. Default is the global process set.
 
     Returns:
         A handle to the group allreduce operation that can be used with `poll()` or
         `synchronize()`.
     """
     op = handle_average_backwards_compatibility(op, average)
-    return _grouped_allreduce_async(tensors, tensors, name, op, prescale_factor, postscale_factor)
+    return _grouped_allreduce_async(tensors, tensors, name, op, prescale_factor, postscale_factor,
+                                    priority, process_set)
 
 
 def grouped_allreduce_(tensors, average=None, name=None, op=None,
-                       prescale_factor=1.0, postscale_factor=1.0):
+                       prescale_factor=1.0, postscale_factor=1.0, process_set=global_process_set):
     """
     A function that performs in-place averaging or summation of the input tensors over
     all the Horovod processes.
@@ -500,31 +548,123 @@ def grouped_allreduce_(tensors, average=None, name=None, op=None,
             Average if None is given.
         prescale_factor: Multiplicative factor to scale tensor before allreduce.
         postscale_factor: Multiplicative factor to scale tensor after allreduce.
+        process_set: Process set object to limit this operation to a subset of
+                     Horovod processes. Default is the global process set.
 
     Returns:
         A list containing tensors of the same shape and type as in `tensors`,
         averaged or summed across all processes.
     """
-    handle = grouped_allreduce_async_(tensors, average, name, op, prescale_factor, postscale_factor)
+    handle = grouped_allreduce_async_(tensors, average, name, op, prescale_factor, postscale_factor,
+                                      process_set=process_set)
     return synchronize(handle)
 
 
-def sparse_allreduce_async(tensor, name, op):
-    # Allgather aggregates along the first dimension, so we need to transpose the
-    # indices to enforce correct concatenation behavior, then transpose back prior to
-    # constructing the new aggregated sparse gradient
-    t = tensor
-    indices_handle = allgather_async(t._indices().transpose(0, 1).contiguous(), name=f'{name}.indices')
-    values_handle = allgather_async(t._values(), name=f'{name}.values')
+def sparse_allreduce_async(tensor, name, op, prescale_factor=1.0, postscale_factor=1.0):
+    """
+    A function that performs asynchronous averaging or summation of a sparse tensor
+    over all the Horovod processes. The input tensor is not modified.
+
+    Every process first sums its duplicate entries. If the entries of all processes
+    together reach `HOROVOD_SPARSE_DENSITY_THRESHOLD` (default 1.0) times the number of
+    rows of the dense tensor, the tensor is reduced with a dense allreduce, otherwise the
+    unique entries are exchanged with allgathers and summed again.
+
+    Arguments:
+        tensor: A sparse tensor to reduce.
+        name: A name of the reduction operation.
+        op: The reduction operation, Average or Sum.
+        prescale_factor: Multiplicative factor to scale tensor before allreduce.
+        postscale_factor: Multiplicative factor to scale tensor after allreduce.
+
+    Returns:
+        A callable that blocks until the reduction is finished and returns the
+        reduced sparse tensor, which has no duplicate entries.
+    """
+    t = tensor.coalesce()
+    sparse_dim = t.sparse_dim()
+    dense_rows = 1
+    for dim in t.size()[:sparse_dim]:
+        dense_rows *= dim
+
+    # All processes must take the same path, so they agree on the total number of entries.
+    # The path is chosen once the count is needed, so that submitting does not block.
+    nnz_handle = allreduce_async(torch.tensor([t._nnz()], dtype=torch.int64), name=f'{name}.nnz', op=Sum)
 
     def handle():
+        nnz = synchronize(nnz_handle)
+        if nnz.item() >= sparse_density_threshold() * dense_rows:
+            dense = synchronize(allreduce_async_(t.to_dense(), name=name, op=op,
+                                                 prescale_factor=prescale_factor,
+                                                 postscale_factor=postscale_factor))
+            return dense.to_sparse(sparse_dim)
+
+        # Allgather aggregates along the first dimension, so we need to transpose the
+        # indices to enforce correct concatenation behavior, then transpose back prior to
+        # constructing the new aggregated sparse gradient
+        values = t._values() * prescale_factor if prescale_factor != 1.0 else t._values()
+        indices_handle = allgather_async(t._indices().transpose(0, 1).contiguous(), name=f'{name}.indices')
+        values_handle = allgather_async(values, name=f'{name}.values')
         indices = synchronize(indices_handle)
         values = synchronize(values_handle)
-        values = (values / size()) if op == Average else values
+        scale = postscale_factor / size() if op == Average else postscale_factor
+        values = (values * scale) if scale != 1.0 else values
 
         if indices.dim() == 0 or values.dim() == 0:
             return t.new().resize_as_(t)
-        return t.new(indices.transpose(0, 1), values, t.size())
+        return t.new(indices.transpose(0, 1), values, t.size()).coalesce()
+
+    return handle
+
+
+def quantized_allreduce_async(tensor, compression, name, op, prescale_factor=1.0, postscale_factor=1.0):
+    """
+    A function that performs asynchronous averaging or summation of the input tensor
+    over all the Horovod processes using a quantizing compressor, such as
+    `Compression.int8()`. The input tensor is not modified.
+
+    The quantized codes of each shard of the tensor are sent to the rank owning the
+    shard with an alltoall, dequantized and reduced there, and the requantized result
+    is allgathered, so that the reduction never happens on quantized values.
+
+    Arguments:
+        tensor: A floating point tensor to reduce.
+        compression: A `QuantizingCompressor` instance.
+        name: A name of the reduction operation, also used to key the error feedback.
+        op: The reduction operation, Average or Sum.
+        prescale_factor: Multiplicative factor to scale tensor before allreduce.
+        postscale_factor: Multiplicative factor to scale tensor after allreduce.
+
+    Returns:
+        A callable that blocks until the reduction is finished and returns the
+        reduced tensor.
+    """
+    if op == Adasum:
+        raise NotImplementedError('The Adasum reduction does not support quantizing compressors.')
+
+    num_shards = size()
+    if prescale_factor != 1.0:
+        tensor = tensor * prescale_factor
+    (codes, scales), ctx = compression.compress(tensor, name=name, num_shards=num_shards)
+    codes_handle = alltoall_async(codes, name=f'{name}.codes')
+    scales_handle = alltoall_async(scales, name=f'{name}.scales') if scales is not None else None
+
+    def handle():
+        shard_codes, _ = synchronize(codes_handle)
+        shard_scales = synchronize(scales_handle)[0] if scales_handle is not None else None
+
+        # Every rank sent its codes for this shard, reduce them after dequantization
+        shard = compression.dequantize(shard_codes, shard_scales)
+        shard = shard.view(num_shards, -1, shard.shape[1]).sum(dim=0)
+        scale = postscale_factor / num_shards if op == Average else postscale_factor
+        if scale != 1.0:
+            shard *= scale
+
+        shard_codes, shard_scales = compression.quantize(shard)
+        gathered_codes = synchronize(allgather_async(shard_codes, name=f'{name}.gathered_codes'))
+        gathered_scales = synchronize(allgather_async(shard_scales, name=f'{name}.gathered_scales')) \
+            if shard_scales is not None else None
+        return compression.decompress((gathered_codes, gathered_scales), ctx)
 
     return handle
 
@@ -533,18 +673,19 @@ def _allgather_function_factory(tensor):
     return 'horovod_torch_allgather_async_' + tensor.type().replace('.', '_')
 
 
-def _allgather_async(tensor, output, name):
+def _allgather_async(tensor, output, name, process_set=global_process_set):
     function = _check_function(_allgather_function_factory, tensor)
     try:
         handle = getattr(mpi_lib, function)(
-            tensor, output, name.encode() if name is not None else _NULL)
+            tensor, output, name.encode() if name is not None else _NULL,
+            _process_set_id(process_set))
     except RuntimeError as e:
         raise HorovodInternalError(e)
     _handle_map[handle] = (tensor, output)
     return handle
 
 
-def allgather_async(tensor, name=None):
+def allgather_async(tensor, name=None, process_set=global_process_set):
     """
     A function that asynchronously concatenates the input tensor with the same input
     tensor on all other Horovod processes. The input tensor is not modified.
@@ -556,37 +697,40 @@ def allgather_async(tensor, name=None):
     Arguments:
         tensor: A tensor to allgather.
         name: A name of the allgather operation.
+        process_set: Process set object to limit this operation to a subset of
+                     Horovod processes. Default is the global process set.
 
     Returns:
         A handle to the allgather operation that can be used with `poll()` or
         `synchronize()`.
     """
     output = tensor.new()
-    return _allgather_async(tensor, output, name)
+    return _allgather_async(tensor, output, name, process_set)
 
 
 class HorovodAllgather(torch.autograd.Function):
     """An autograd function that performs allgather on a tensor."""
 
     @staticmethod
-    def forward(ctx, tensor, name):
+    def forward(ctx, tensor, name, process_set):
         ctx.dim = tensor.shape[0]
-        handle = allgather_async(tensor, name)
+        ctx.process_set = process_set
+        handle = allgather_async(tensor, name, process_set)
         return synchronize(handle)
 
     @staticmethod
     def backward(ctx, grad_output):
-        grad_reduced = allreduce(grad_output, average=True)
+        grad_reduced = allreduce(grad_output, average=True, process_set=ctx.process_set)
 
         dim_t = torch.IntTensor([ctx.dim])
-        dim = allgather(dim_t).view(size())
+        dim = allgather(dim_t, process_set=ctx.process_set).view(ctx.process_set.size())
 
-        r = rank()
+        r = ctx.process_set.rank()
         offset = torch.sum(dim.narrow(0, 0, r)).item() if r != 0 else 0
-        return grad_reduced.narrow(0, offset, ctx.dim), None
+        return grad_reduced.narrow(0, offset, ctx.dim), None, None
 
 
-def allgather(tensor, name=None):
+def allgather(tensor, name=None, process_set=global_process_set):
     """
     A function that concatenates the input tensor with the same input tensor on
     all other Horovod processes. The input tensor is not modified.
@@ -602,6 +746,8 @@ def allgather(tensor, name=None):
     Arguments:
         tensor: A tensor to allgather.
         name: A name of the allgather operation.
+        process_set: Process set object to limit this operation to a subset of
+                     Horovod processes. Default is the global process set.
 
     Returns:
         A tensor of the same type as `tensor`, concatenated on dimension zero
@@ -609,25 +755,26 @@ def allgather(tensor, name=None):
         the first dimension, which may be greater and is the sum of all first
         dimensions of the tensors in different Horovod processes.
     """
-    return HorovodAllgather.apply(tensor, name)
+    return HorovodAllgather.apply(tensor, name, process_set)
 
 
 def _broadcast_function_factory(tensor):
     return 'horovod_torch_broadcast_async_' + tensor.type().replace('.', '_')
 
 
-def _broadcast_async(tensor, output, root_rank, name):
+def _broadcast_async(tensor, output, root_rank, name, process_set=global_process_set):
     function = _check_function(_broadcast_function_factory, tensor)
     try:
         handle = getattr(mpi_lib, function)(
-            tensor, output, root_rank, name.encode() if name is not None else _NULL)
+            tensor, output, root_rank, name.encode() if name is not None else _NULL,
+            _process_set_id(process_set))
     except RuntimeError as e:
         raise HorovodInternalError(e)
     _handle_map[handle] = (tensor, output)
     return handle
 
 
-def broadcast_async(tensor, root_rank, name=None):
+def broadcast_async(tensor, root_rank, name=None, process_set=global_process_set):
     """
     A function that asynchronously broadcasts the input tensor on root rank to the same
     input tensor on all other Horovod processes. The input tensor is not modified.
@@ -641,33 +788,36 @@ def broadcast_async(tensor, root_rank, name=None):
         tensor: A tensor to broadcast.
         root_rank: The rank to broadcast the value from.
         name: A name of the broadcast operation.
+        process_set: Process set object to limit this operation to a subset of
+                     Horovod processes. Default is the global process set.
 
     Returns:
         A handle to the broadcast operation that can be used with `poll()` or
         `synchronize()`.
     """
     output = tensor.new(tensor.shape)
-    return _broadcast_async(tensor, output, root_rank, name)
+    return _broadcast_async(tensor, output, root_rank, name, process_set)
 
 
 class HorovodBroadcast(torch.autograd.Function):
     """An autograd function that broadcasts a tensor."""
 
     @staticmethod
-    def forward(ctx, tensor, root_rank, name):
+    def forward(ctx, tensor, root_rank, name, process_set):
         ctx.root_rank = root_rank
-        handle = broadcast_async(tensor, root_rank, name)
+        ctx.process_set = process_set
+        handle = broadcast_async(tensor, root_rank, name, process_set)
         return synchronize(handle)
 
     @staticmethod
     def backward(ctx, grad_output):
-        grad_reduced = allreduce(grad_output, average=True)
-        if rank() != ctx.root_rank:
+        grad_reduced = allreduce(grad_output, average=True, process_set=ctx.process_set)
+        if ctx.process_set.rank() != ctx.root_rank:
             grad_reduced *= 0
-        return grad_reduced, None, None
+        return grad_reduced, None, None, None
 
 
-def broadcast(tensor, root_rank, name=None):
+def broadcast(tensor, root_rank, name=None, process_set=global_process_set):
     """
     A function that broadcasts the input tensor on root rank to the same input tensor
     on all other Horovod processes. The input tensor is not modified.
@@ -685,15 +835,17 @@ def broadcast(tensor, root_rank, name=None):
         tensor: A tensor to broadcast.
         root_rank: The rank to broadcast the value from.
         name: A name of the broadcast operation.
+        process_set: Process set object to limit this operation to a subset of
+                     Horovod processes. Default is the global process set.
 
     Returns:
         A tensor of the same shape and type as `tensor`, with the value broadcasted
         from root rank.
     """
-    return HorovodBroadcast.apply(tensor, root_rank, name)
+    return HorovodBroadcast.apply(tensor, root_rank, name, process_set)
 
 
-def broadcast_async_(tensor, root_rank, name=None):
+def broadcast_async_(tensor, root_rank, name=None, process_set=global_process_set):
     """
     A function that asynchronously broadcasts the input tensor on root rank to the same
     input tensor on all other Horovod processes. The operation is performed in-place.
@@ -707,15 +859,17 @@ def broadcast_async_(tensor, root_rank, name=None):
         tensor: A tensor to broadcast.
         root_rank: The rank to broadcast the value from.
         name: A name of the broadcast operation.
+        process_set: Process set object to limit this operation to a subset of
+                     Horovod processes. Default is the global process set.
 
     Returns:
         A handle to the broadcast operation that can be used with `poll()` or
         `synchronize()`.
     """
-    return _broadcast_async(tensor, tensor, root_rank, name)
+    return _broadcast_async(tensor, tensor, root_rank, name, process_set)
 
 
-def broadcast_(tensor, root_rank, name=None):
+def broadcast_(tensor, root_rank, name=None, process_set=global_process_set):
     """
     A function that broadcasts the input tensor on root rank to the same input tensor
     on all other Horovod processes. The operation is performed in-place.
@@ -729,14 +883,157 @@ def broadcast_(tensor, root_rank, name=None):
         tensor: A tensor to broadcast.
         root_rank: The rank to broadcast the value from.
         name: A name of the broadcast operation.
+        process_set: Process set object to limit this operation to a subset of
+                     Horovod processes. Default is the global process set.
 
     Returns:
         A tensor of the same shape and type as `tensor`, with the value broadcasted
         from root rank.
     """
-    handle = broadcast_async_(tensor, root_rank, name)
+    handle = broadcast_async_(tensor, root_rank, name, process_set)
+    return synchronize(handle)
+
+
+def _grouped_broadcast_function_factory(tensor):
+    return 'horovod_torch_grouped_broadcast_async_' + tensor.type().replace('.', '_')
+
+
+def _grouped_broadcast_async(tensors, outputs, root_rank, name, process_set=global_process_set):
+    function = _check_function(_grouped_broadcast_function_factory, tensors[0])
+    try:
+        handle = getattr(mpi_lib, function)(
+            tensors, outputs, root_rank, name.encode() if name is not None else _NULL,
+            _process_set_id(process_set))
+    except RuntimeError as e:
+        raise HorovodInternalError(e)
+    _handle_map[handle] = (tuple(tensors), tuple(outputs))
+    return handle
+
+
+def grouped_broadcast_async(tensors, root_rank, name=None, process_set=global_process_set):
+    """
+    A function that asynchronously broadcasts the input tensors on root rank to the same
+    input tensors on all other Horovod processes. The input tensors are not modified.
+
+    The broadcast operations are keyed by the base name. If a base name is not
+    provided, an incremented auto-generated base name is used. The tensor type and
+    shape must be the same on all Horovod processes for tensors sharing positions
+    in the input tensor list. The broadcast will not start until all processes are
+    ready to send and receive all the tensors of the group.
+
+    Arguments:
+        tensors: A list of tensors to broadcast.
+        root_rank: The rank to broadcast the values from.
+        name: A base name to use for the group broadcast operation.
+        process_set: Process set object to limit this operation to a subset of
+                     Horovod processes. Default is the global process set.
+
+    Returns:
+        A handle to the group broadcast operation that can be used with `poll()` or
+        `synchronize()`.
+    """
+    outputs = [t.new(t.shape) for t in tensors]
+    return _grouped_broadcast_async(tensors, outputs, root_rank, name, process_set)
+
+
+class HorovodGroupedBroadcast(torch.autograd.Function):
+    """An autograd function that broadcasts a list of tensors."""
+
+    @staticmethod
+    def forward(ctx, root_rank, name, process_set, *tensors):
+        ctx.root_rank = root_rank
+        ctx.process_set = process_set
+        handle = grouped_broadcast_async(list(tensors), root_rank, name, process_set)
+        return synchronize(handle)
+
+    @staticmethod
+    def backward(ctx, *grad_output):
+        grad_reduced = grouped_allreduce(list(grad_output), average=True, process_set=ctx.process_set)
+        if ctx.process_set.rank() != ctx.root_rank:
+            grad_reduced = [g * 0 for g in grad_reduced]
+        return (None, None, None, *grad_reduced)
+
+
+def grouped_broadcast(tensors, root_rank, name=None, process_set=global_process_set):
+    """
+    A function that broadcasts the input tensors on root rank to the same input tensors
+    on all other Horovod processes. The input tensors are not modified.
+
+    The broadcast operations are keyed by the base name. If a base name is not
+    provided, an incremented auto-generated base name is used. The tensor type and
+    shape must be the same on all Horovod processes for tensors sharing positions
+    in the input tensor list. The broadcast will not start until all processes are
+    ready to send and receive all the tensors of the group.
+
+    This acts as a thin wrapper around an autograd function.  If your input
+    tensors require gradients, then calling this function will allow gradients
+    to be computed and backpropagated.
+
+    Arguments:
+        tensors: A list of tensors to broadcast.
+        root_rank: The rank to broadcast the values from.
+        name: A base name to use for the group broadcast operation.
+        process_set: Process set object to limit this operation to a subset of
+                     Horovod processes. Default is the global process set.
+
+    Returns:
+        A list containing tensors of the same shape and type as in `tensors`, with
+        the values broadcasted from root rank.
+    """
+    return list(HorovodGroupedBroadcast.apply(root_rank, name, process_set, *tensors))
+
+
+def grouped_broadcast_async_(tensors, root_rank, name=None, process_set=global_process_set):
+    """
+    A function that asynchronously broadcasts the input tensors on root rank to the same
+    input tensors on all other Horovod processes. The operation is performed in-place.
+
+    The broadcast operations are keyed by the base name. If a base name is not
+    provided, an incremented auto-generated base name is used. The tensor type and
+    shape must be the same on all Horovod processes for tensors sharing positions
+    in the input tensor list. The broadcast will not start until all processes are
+    ready to send and receive all the tensors of the group.
+
+    Arguments:
+        tensors: A list of tensors to broadcast.
+        root_rank: The rank to broadcast the values from.
+        name: A base name to use for the group broadcast operation.
+        process_set: Process set object to limit this operation to a subset of
+                     Horovod processes. Default is the global process set.
+
+    Returns:
+        A handle to the group broadcast operation that can be used with `poll()` or
+        `synchronize()`.
+    """
+    return _grouped_broadcast_async(tensors, tensors, root_rank, name, process_set)
+
+
+def grouped_broadcast_(tensors, root_rank, name=None, process_set=global_process_set):
+    """
+    A function that broadcasts the input tensors on root rank to the same input tensors
+    on all other Horovod processes. The operation is performed in-place.
+
+    The broadcast operations are keyed by the base name. If a base name is not
+    provided, an incremented auto-generated base name is used. The tensor type and
+    shape must be the same on all Horovod processes for tensors sharing positions
+    in the input tensor list. The broadcast will not start until all processes are
+    ready to send and receive all the tensors of the group.
+
+    Arguments:
+        tensors: A list of tensors to broadcast.
+        root_rank: The rank to broadcast the values from.
+        name: A base name to use for the group broadcast operation.
+        process_set: Process set object to limit this operation to a subset of
+                     Horovod processes. Default is the global process set.
+
+    Returns:
+        A list containing tensors of the same shape and type as in `tensors`, with
+        the values broadcasted from root rank.
+    """
+    handle = grouped_broadcast_async_(tensors, root_rank, name, process_set)
     return synchronize(handle)
 
+
 def _alltoall_function_factory(tensor):
     return 'horovod_torch_alltoall_async_' + tensor.type().replace('.', '_')
 
@@ -840,6 +1137,119 @@ def alltoall(tensor, splits=None, name=None):
     return HorovodAlltoall.apply(tensor, splits, name)
 
 
+def _reducescatter_function_factory(tensor):
+    return 'horovod_torch_reducescatter_async_' + tensor.type().replace('.', '_')
+
+
+def _reducescatter_async(tensor, output, name, op, prescale_factor, postscale_factor,
+                         process_set=global_process_set):
+    if op not in (Average, Sum):
+        raise NotImplementedError('reducescatter only supports the Average and Sum ops.')
+    function = _check_function(_reducescatter_function_factory, tensor)
+    try:
+        handle = getattr(mpi_lib, function)(
+            tensor, output, name.encode() if name is not None else _NULL, op,
+            prescale_factor, postscale_factor, _process_set_id(process_set))
+    except RuntimeError as e:
+        raise HorovodInternalError(e)
+    _handle_map[handle] = (tensor, output)
+    return handle
+
+
+def reducescatter_async(tensor, name=None, op=Average, prescale_factor=1.0,
+                        postscale_factor=1.0, process_set=global_process_set):
+    """
+    A function that asynchronously reduces the input tensor over all the Horovod
+    processes and scatters the result, so that every process receives one slice of
+    the reduced tensor. The input tensor is not modified.
+
+    The slicing is done on the first dimension, the tensors must have the same shape
+    on all processes. If the first dimension is not divisible by the number of
+    processes, the processes with the lowest ranks receive one extra row each.
+
+    Reducescatter is performed on the CPU, tensors on the GPU are copied to host
+    memory and back. For GPU tensors it is therefore not faster than an allreduce
+    with NCCL, even though it moves less data.
+
+    Arguments:
+        tensor: A tensor to reduce and scatter.
+        name: A name of the reducescatter operation.
+        op: The reduction operation to combine tensors across different ranks,
+            either Average or Sum. Defaults to Average.
+        prescale_factor: Multiplicative factor to scale tensor before reducescatter.
+        postscale_factor: Multiplicative factor to scale tensor after reducescatter.
+        process_set: Process set object to limit this operation to a subset of
+                     Horovod processes. Default is the global process set.
+
+    Returns:
+        A handle to the reducescatter operation that can be used with `poll()` or
+        `synchronize()`.
+    """
+    output = tensor.new()
+    return _reducescatter_async(tensor, output, name, op, prescale_factor, postscale_factor,
+                                process_set)
+
+
+class HorovodReducescatter(torch.autograd.Function):
+    """An autograd function that performs reducescatter on a tensor."""
+
+    @staticmethod
+    def forward(ctx, tensor, name, op, prescale_factor, postscale_factor, process_set):
+        ctx.op = op
+        ctx.scale = prescale_factor * postscale_factor
+        ctx.process_set = process_set
+        handle = reducescatter_async(tensor, name, op, prescale_factor, postscale_factor,
+                                     process_set)
+        return synchronize(handle)
+
+    @staticmethod
+    def backward(ctx, grad_output):
+        grad = allgather(grad_output, process_set=ctx.process_set)
+        scale = ctx.scale
+        if ctx.op == Average:
+            scale /= ctx.process_set.size()
+        if scale != 1.0:
+            grad = grad * scale
+        return grad, None, None, None, None, None
+
+
+def reducescatter(tensor, name=None, op=Average, prescale_factor=1.0,
+                  postscale_factor=1.0, process_set=global_process_set):
+    """
+    A function that reduces the input tensor over all the Horovod processes and
+    scatters the result, so that every process receives one slice of the reduced
+    tensor. The input tensor is not modified.
+
+    The slicing is done on the first dimension, the tensors must have the same shape
+    on all processes. If the first dimension is not divisible by the number of
+    processes, the processes with the lowest ranks receive one extra row each.
+
+    Reducescatter is performed on the CPU, tensors on the GPU are copied to host
+    memory and back. For GPU tensors it is therefore not faster than an allreduce
+    with NCCL, even though it moves less data.
+
+    This acts as a thin wrapper around an autograd function.  If your input
+    tensor requires gradients, then callings this function will allow gradients
+    to be computed and backpropagated.
+
+    Arguments:
+        tensor: A tensor to reduce and scatter.
+        name: A name of the reducescatter operation.
+        op: The reduction operation to combine tensors across different ranks,
+            either Average or Sum. Defaults to Average.
+        prescale_factor: Multiplicative factor to scale tensor before reducescatter.
+        postscale_factor: Multiplicative factor to scale tensor after reducescatter.
+        process_set: Process set object to limit this operation to a subset of
+                     Horovod processes. Default is the global process set.
+
+    Returns:
+        A tensor of the same rank and type as `tensor`, holding this process' slice
+        of the reduced tensor along the first dimension.
+    """
+    return HorovodReducescatter.apply(tensor, name, op, prescale_factor, postscale_factor,
+                                      process_set)
+
+
 def poll(handle):
     """
     Polls an allreduce, allgather or broadcast handle to determine whether underlying
@@ -859,7 +1269,8 @@ def poll(handle):
 def synchronize(handle):
     """
     Synchronizes an asynchronous allreduce, allgather, alltoall or broadcast operation until
-    it's completed. Returns the result of the operation.
+    it's completed. Returns the result of the operation. Callbacks attached to the handle
+    with `add_done_callback()` are invoked with the result before it is returned.
 
     Arguments:
         handle: A handle returned by an allreduce, allgather, alltoall or broadcast asynchronous
@@ -874,9 +1285,85 @@ def synchronize(handle):
     try:
         mpi_lib.horovod_torch_wait_and_clear(handle)
         output = _handle_map.pop(handle)[-1]
-        return output
+    except RuntimeError as e:
+        _done_callbacks.pop(handle, None)
+        raise HorovodInternalError(e)
+    for fn in _done_callbacks.pop(handle, []):
+        fn(output)
+    return output
+
+
+def add_done_callback(handle, fn):
+    """
+    Attaches a function to an asynchronous operation that is called with the result of
+    the operation when it is synchronized, either by `synchronize()` or while iterating
+    over `as_completed()`. Callbacks run in the synchronizing thread in the order they
+    were added, so they can safely update tensors used by the training loop.
+
+    Arguments:
+        handle: A handle returned by an allreduce, allgather, alltoall or broadcast asynchronous
+                operation.
+        fn: A callable taking the output of the operation.
+    """
+    if handle not in _handle_map:
+        raise ValueError('Handle %s was not created or has been cleared.' % handle)
+    _done_callbacks.setdefault(handle, []).append(fn)
+
+
+def wait_any(handles, timeout=None):
+    """
+    Blocks until at least one of the asynchronous operations has completed, without
+    synchronizing it. The Python GIL is released while waiting.
+
+    Arguments:
+        handles: Handles returned by allreduce, allgather, alltoall or broadcast
+                 asynchronous operations.
+        timeout: Maximum number of seconds to wait, waits until an operation completes
+                 if None.
+
+    Returns:
+        A completed handle out of `handles`, or None if no operation completed before
+        the timeout.
+    """
+    handles = list(handles)
+    if not handles:
+        raise ValueError('wait_any() requires at least one handle.')
+    try:
+        handle = mpi_lib.horovod_torch_wait_any(handles, -1.0 if timeout is None else float(timeout))
     except RuntimeError as e:
         raise HorovodInternalError(e)
+    return handle if handle >= 0 else None
+
+
+def as_completed(handles, timeout=None):
+    """
+    Synchronizes asynchronous operations in the order in which they complete, rather than
+    the order of `handles`, so that results can be processed while slower operations are
+    still in flight.
+
+    Arguments:
+        handles: Handles returned by allreduce, allgather, alltoall or broadcast
+                 asynchronous operations.
+        timeout: Maximum total number of seconds to wait for all operations, waits
+                 until all of them complete if None.
+
+    Returns:
+        An iterator of (handle, output) pairs, where output is the result returned by
+        `synchronize()`.
+
+    Raises:
+        TimeoutError: If some operations did not complete before the timeout.
+    """
+    pending = list(handles)
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    while pending:
+        remaining = max(0.0, deadline - time.monotonic()) if deadline is not None else None
+        handle = wait_any(pending, remaining)
+        if handle is None:
+            raise TimeoutError('%d operations did not complete within %s seconds.'
+                               % (len(pending), timeout))
+        pending.remove(handle)
+        yield handle, synchronize(handle)
 
 
 def join(device=-1):
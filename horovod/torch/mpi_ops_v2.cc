@@ -49,6 +49,12 @@ int GetDeviceID(const ::torch::Tensor& tensor) {
   return CPU_DEVICE_ID;
 }
 
+// Collectives on process sets other than the global one are performed on CPU,
+// so GPU tensors enqueued on them are staged through host memory.
+bool StageOnCPU(const ::torch::Tensor& tensor, int process_set_id) {
+  return process_set_id != 0 && tensor.device().is_cuda();
+}
+
 } // namespace
 
 void DivideInPlace(::torch::Tensor& tensor, int divisor) {
@@ -61,11 +67,40 @@ void DivideInPlace(::torch::Tensor& tensor, int divisor) {
   tensor.div_(divisor);
 }
 
+int DoAllreduceCudaOnCPU(::torch::Tensor tensor, ::torch::Tensor output, int divisor,
+                         const std::string& name, int reduce_op_int,
+                         double prescale_factor, double postscale_factor,
+                         int priority, int process_set_id);
+int DoGroupedAllreduceCudaOnCPU(const std::vector<::torch::Tensor>& tensors,
+                       const std::vector<::torch::Tensor>& outputs, int divisor,
+                       const std::string& name, int reduce_op_int,
+                       double prescale_factor, double postscale_factor,
+                       int priority, int process_set_id);
+int DoAllgatherCudaOnCPU(::torch::Tensor tensor, ::torch::Tensor output,
+                         const std::string& name, int process_set_id);
+int DoBroadcastCudaOnCPU(::torch::Tensor tensor, ::torch::Tensor output, int root_rank,
+                         const std::string& name, int process_set_id);
+int DoGroupedBroadcastCudaOnCPU(const std::vector<::torch::Tensor>& tensors,
+                                const std::vector<::torch::Tensor>& outputs,
+                                int root_rank, const std::string& name,
+                                int process_set_id);
+int DoReducescatterCudaOnCPU(::torch::Tensor tensor, ::torch::Tensor output,
+                             const std::string& name, int reduce_op_int,
+                             double prescale_factor, double postscale_factor,
+                             int process_set_id);
+
 int DoAllreduce(::torch::Tensor tensor, ::torch::Tensor output, int divisor,
                 const std::string& name, int reduce_op_int,
-                double prescale_factor, double postscale_factor) {
+                double prescale_factor, double postscale_factor,
+                int priority, int process_set_id) {
   ThrowIfError(common::CheckInitialized());
 
+  if (StageOnCPU(tensor, process_set_id)) {
+    return DoAllreduceCudaOnCPU(tensor, output, divisor, name, reduce_op_int,
+                                prescale_factor, postscale_factor, priority,
+                                process_set_id);
+  }
+
   auto handle = handle_manager.AllocateHandle();
   auto device = GetDeviceID(tensor);
   auto ready_event = RecordReadyEvent(device);
@@ -84,7 +119,8 @@ int DoAllreduce(::torch::Tensor tensor, ::torch::Tensor output, int divisor,
           DivideInPlace(output, divisor);
         }
         handle_manager.MarkDone(handle, status);
-      }, reduce_op, prescale_factor, postscale_factor);
+      }, reduce_op, prescale_factor, postscale_factor, priority,
+      process_set_id);
   ThrowIfError(enqueue_result);
 
   return handle;
@@ -92,7 +128,8 @@ int DoAllreduce(::torch::Tensor tensor, ::torch::Tensor output, int divisor,
 
 int DoAllreduceCudaOnCPU(::torch::Tensor tensor, ::torch::Tensor output, int divisor,
                          const std::string& name, int reduce_op_int,
-                         double prescale_factor, double postscale_factor) {
+                         double prescale_factor, double postscale_factor,
+                         int priority, int process_set_id) {
   ThrowIfError(common::CheckInitialized());
 
   // Make async copy of input tensor to CPU tensor and record completion event.
@@ -120,7 +157,8 @@ int DoAllreduceCudaOnCPU(::torch::Tensor tensor, ::torch::Tensor output, int div
           DivideInPlace(output, divisor);
         }
         handle_manager.MarkDone(handle, status);
-      }, reduce_op, prescale_factor, postscale_factor);
+      }, reduce_op, prescale_factor, postscale_factor, priority,
+      process_set_id);
   ThrowIfError(enqueue_result);
 
   return handle;
@@ -129,9 +167,17 @@ int DoAllreduceCudaOnCPU(::torch::Tensor tensor, ::torch::Tensor output, int div
 int DoGroupedAllreduce(const std::vector<::torch::Tensor>& tensors,
                        const std::vector<::torch::Tensor>& outputs, int divisor,
                        const std::string& name, int reduce_op_int,
-                       double prescale_factor, double postscale_factor) {
+                       double prescale_factor, double postscale_factor,
+                       int priority, int process_set_id) {
   ThrowIfError(common::CheckInitialized());
 
+  if (StageOnCPU(tensors[0], process_set_id)) {
+    return DoGroupedAllreduceCudaOnCPU(tensors, outputs, divisor, name,
+                                       reduce_op_int, prescale_factor,
+                                       postscale_factor, priority,
+                                       process_set_id);
+  }
+
   auto handle = handle_manager.AllocateHandle();
   auto device = GetDeviceID(tensors[0]);
   auto ready_event = RecordReadyEvent(device);
@@ -185,7 +231,8 @@ int DoGroupedAllreduce(const std::vector<::torch::Tensor>& tensors,
 
   auto enqueue_result = EnqueueTensorAllreduces(
       hvd_contexts, hvd_tensors, hvd_outputs, ready_events,
-      names, device, callbacks, reduce_op, prescale_factor, postscale_factor);
+      names, device, callbacks, reduce_op, prescale_factor, postscale_factor,
+      priority, process_set_id);
   ThrowIfError(enqueue_result);
 
   return handle;
@@ -194,7 +241,8 @@ int DoGroupedAllreduce(const std::vector<::torch::Tensor>& tensors,
 int DoGroupedAllreduceCudaOnCPU(const std::vector<::torch::Tensor>& tensors,
                        const std::vector<::torch::Tensor>& outputs, int divisor,
                        const std::string& name, int reduce_op_int,
-                       double prescale_factor, double postscale_factor) {
+                       double prescale_factor, double postscale_factor,
+                       int priority, int process_set_id) {
   ThrowIfError(common::CheckInitialized());
 
   auto handle = handle_manager.AllocateHandle();
@@ -252,15 +300,21 @@ int DoGroupedAllreduceCudaOnCPU(const std::vector<::torch::Tensor>& tensors,
 
   auto enqueue_result = EnqueueTensorAllreduces(
       hvd_contexts, cpu_buffers, cpu_buffers, ready_events,
-      names, device, callbacks, reduce_op, prescale_factor, postscale_factor);
+      names, device, callbacks, reduce_op, prescale_factor, postscale_factor,
+      priority, process_set_id);
   ThrowIfError(enqueue_result);
 
   return handle;
 }
 
-int DoAllgather(::torch::Tensor tensor, ::torch::Tensor output, const std::string& name) {
+int DoAllgather(::torch::Tensor tensor, ::torch::Tensor output,
+                const std::string& name, int process_set_id) {
   ThrowIfError(common::CheckInitialized());
 
+  if (StageOnCPU(tensor, process_set_id)) {
+    return DoAllgatherCudaOnCPU(tensor, output, name, process_set_id);
+  }
+
   auto device = GetDeviceID(tensor);
   auto ready_event = RecordReadyEvent(device);
   auto hvd_tensor = std::make_shared<TorchTensor>(tensor);
@@ -272,14 +326,14 @@ int DoAllgather(::torch::Tensor tensor, ::torch::Tensor output, const std::strin
                              GetOpName("allgather", name, handle), device,
                              [handle](const Status& status) {
                                handle_manager.MarkDone(handle, status);
-                             });
+                             }, process_set_id);
   ThrowIfError(enqueue_result);
 
   return handle;
 }
 
 int DoAllgatherCudaOnCPU(::torch::Tensor tensor, ::torch::Tensor output,
-                         const std::string& name) {
+                         const std::string& name, int process_set_id) {
   ThrowIfError(common::CheckInitialized());
 
   // Make async copy of input tensor to CPU tensor and record completion event.
@@ -306,22 +360,27 @@ int DoAllgatherCudaOnCPU(::torch::Tensor tensor, ::torch::Tensor output,
         output.resize_(cpu_output.sizes());
         output.copy_(cpu_output);
         handle_manager.MarkDone(handle, status);
-      });
+      }, process_set_id);
   ThrowIfError(enqueue_result);
 
   return handle;
 }
 
 int DoBroadcast(::torch::Tensor tensor, ::torch::Tensor output, int root_rank,
-                const std::string& name) {
+                const std::string& name, int process_set_id) {
   ThrowIfError(common::CheckInitialized());
 
+  if (StageOnCPU(tensor, process_set_id)) {
+    return DoBroadcastCudaOnCPU(tensor, output, root_rank, name,
+                                process_set_id);
+  }
+
   auto device = GetDeviceID(tensor);
   auto ready_event = RecordReadyEvent(device);
   auto hvd_tensor = std::make_shared<TorchTensor>(tensor);
   auto hvd_context = std::make_shared<TorchOpContext>(device, output);
   std::shared_ptr<Tensor> hvd_output = nullptr;
-  if (horovod_rank() == root_rank) {
+  if (horovod_process_set_rank(process_set_id) == root_rank) {
     if (tensor.data_ptr() != output.data_ptr()) {
       with_device device_guard(device);
       output.copy_(tensor);
@@ -336,14 +395,14 @@ int DoBroadcast(::torch::Tensor tensor, ::torch::Tensor output, int root_rank,
                              ready_event, GetOpName("broadcast", name, handle),
                              device, [handle](const Status& status) {
                                handle_manager.MarkDone(handle, status);
-                             });
+                             }, process_set_id);
   ThrowIfError(enqueue_result);
 
   return handle;
 }
 
 int DoBroadcastCudaOnCPU(::torch::Tensor tensor, ::torch::Tensor output, int root_rank,
-                         const std::string& name) {
+                         const std::string& name, int process_set_id) {
   ThrowIfError(common::CheckInitialized());
 
   // Make async copy of input tensor to CPU tensor and record completion event.
@@ -366,7 +425,140 @@ int DoBroadcastCudaOnCPU(::torch::Tensor tensor, ::torch::Tensor output, int roo
         with_device device_guard(device);
         output.copy_(cpu_buffer);
         handle_manager.MarkDone(handle, status);
-      });
+      }, process_set_id);
+  ThrowIfError(enqueue_result);
+
+  return handle;
+}
+
+int DoGroupedBroadcast(const std::vector<::torch::Tensor>& tensors,
+                       const std::vector<::torch::Tensor>& outputs, int root_rank,
+                       const std::string& name, int process_set_id) {
+  ThrowIfError(common::CheckInitialized());
+
+  if (StageOnCPU(tensors[0], process_set_id)) {
+    return DoGroupedBroadcastCudaOnCPU(tensors, outputs, root_rank, name,
+                                       process_set_id);
+  }
+
+  auto handle = handle_manager.AllocateHandle();
+  auto device = GetDeviceID(tensors[0]);
+  auto ready_event = RecordReadyEvent(device);
+
+  std::vector<std::shared_ptr<Tensor>> hvd_tensors;
+  std::vector<std::shared_ptr<OpContext>> hvd_contexts;
+  std::vector<std::shared_ptr<Tensor>> hvd_outputs;
+  std::vector<std::shared_ptr<ReadyEvent>> ready_events;
+  std::vector<StatusCallback> callbacks;
+  std::vector<std::string> names;
+
+  auto num_tensors = tensors.size();
+  hvd_tensors.reserve(num_tensors);
+  hvd_contexts.reserve(num_tensors);
+  hvd_outputs.reserve(num_tensors);
+  ready_events.reserve(num_tensors);
+  names.reserve(num_tensors);
+  callbacks.reserve(num_tensors);
+
+  auto base_name = GetOpName("grouped_broadcast", name, handle);
+
+  auto callback_mutex = std::make_shared<std::mutex>();
+  auto callback_count = std::make_shared<int>(0);
+  for (int i = 0; i < num_tensors; ++i) {
+    if (GetDeviceID(tensors[i]) != device) {
+      throw std::logic_error("Tensors in list must be on same device.");
+    }
+    hvd_tensors.emplace_back(std::make_shared<TorchTensor>(tensors[i]));
+    hvd_contexts.emplace_back(std::make_shared<TorchOpContext>(device, outputs[i]));
+    if (horovod_process_set_rank(process_set_id) == root_rank) {
+      if (tensors[i].data_ptr() != outputs[i].data_ptr()) {
+        with_device device_guard(device);
+        outputs[i].copy_(tensors[i]);
+      }
+      hvd_outputs.emplace_back(nullptr);
+    } else {
+      hvd_outputs.emplace_back(std::make_shared<TorchTensor>(outputs[i]));
+    }
+    ready_events.emplace_back(ready_event); // Same for all tensors
+    names.emplace_back(base_name + "_" + std::to_string(i+1) + "of" + std::to_string(num_tensors));
+    callbacks.emplace_back(
+      [handle, callback_mutex, callback_count, num_tensors](const Status& status) {
+        // Must only call MarkDone on last tensor.
+        std::lock_guard<std::mutex> guard(*callback_mutex);
+        (*callback_count)++;
+        if (*callback_count == num_tensors) {
+          handle_manager.MarkDone(handle, status);
+        }
+      }
+    );
+  }
+
+  auto enqueue_result = EnqueueTensorBroadcasts(
+      hvd_contexts, hvd_tensors, hvd_outputs, root_rank, ready_events,
+      names, device, callbacks, process_set_id);
+  ThrowIfError(enqueue_result);
+
+  return handle;
+}
+
+int DoGroupedBroadcastCudaOnCPU(const std::vector<::torch::Tensor>& tensors,
+                                const std::vector<::torch::Tensor>& outputs,
+                                int root_rank, const std::string& name,
+                                int process_set_id) {
+  ThrowIfError(common::CheckInitialized());
+
+  auto handle = handle_manager.AllocateHandle();
+  auto device = GetDeviceID(tensors[0]);
+
+  std::vector<std::shared_ptr<Tensor>> cpu_buffers;
+  std::vector<std::shared_ptr<OpContext>> hvd_contexts;
+  std::vector<std::shared_ptr<ReadyEvent>> ready_events;
+  std::vector<StatusCallback> callbacks;
+  std::vector<std::string> names;
+
+  auto num_tensors = tensors.size();
+  cpu_buffers.reserve(num_tensors);
+  hvd_contexts.reserve(num_tensors);
+  ready_events.reserve(num_tensors);
+  names.reserve(num_tensors);
+  callbacks.reserve(num_tensors);
+
+  auto base_name = GetOpName("grouped_broadcast", name, handle);
+
+  auto callback_mutex = std::make_shared<std::mutex>();
+  auto callback_count = std::make_shared<int>(0);
+  for (int i = 0; i < num_tensors; ++i) {
+    if (GetDeviceID(tensors[i]) != device) {
+      throw std::logic_error("Tensors in list must be on same device.");
+    }
+    auto cpu_buffer =
+        tensors[i].to(::torch::Device(::torch::kCPU), /*non_blocking=*/true);
+    cpu_buffers.emplace_back(std::make_shared<TorchTensor>(cpu_buffer));
+    hvd_contexts.emplace_back(std::make_shared<TorchOpContext>(CPU_DEVICE_ID, cpu_buffer));
+    ready_events.emplace_back(RecordReadyEvent(device));
+    names.emplace_back(base_name + "_" + std::to_string(i+1) + "of" + std::to_string(num_tensors));
+    auto output = outputs[i];
+    callbacks.emplace_back(
+      [handle, cpu_buffer, output, device, callback_mutex, callback_count,
+       num_tensors](const Status& status) mutable {
+        // Since the operation was on CPU, need to perform copy with the GPU
+        // device guard.
+        with_device device_guard(device);
+        output.copy_(cpu_buffer);
+
+        // Must only call MarkDone on last tensor.
+        std::lock_guard<std::mutex> guard(*callback_mutex);
+        (*callback_count)++;
+        if (*callback_count == num_tensors) {
+          handle_manager.MarkDone(handle, status);
+        }
+      }
+    );
+  }
+
+  auto enqueue_result = EnqueueTensorBroadcasts(
+      hvd_contexts, cpu_buffers, cpu_buffers, root_rank, ready_events,
+      names, CPU_DEVICE_ID, callbacks, process_set_id);
   ThrowIfError(enqueue_result);
 
   return handle;
@@ -471,8 +663,78 @@ int DoAlltoallCudaOnCPU(::torch::Tensor tensor, ::torch::Tensor splits,
   return handle;
 }
 
+int DoReducescatter(::torch::Tensor tensor, ::torch::Tensor output,
+                    const std::string& name, int reduce_op_int,
+                    double prescale_factor, double postscale_factor,
+                    int process_set_id) {
+  ThrowIfError(common::CheckInitialized());
+
+  if (StageOnCPU(tensor, process_set_id)) {
+    return DoReducescatterCudaOnCPU(tensor, output, name, reduce_op_int,
+                                    prescale_factor, postscale_factor,
+                                    process_set_id);
+  }
+
+  auto device = GetDeviceID(tensor);
+  auto ready_event = RecordReadyEvent(device);
+  auto hvd_tensor = std::make_shared<TorchTensor>(tensor);
+  auto hvd_context = std::make_shared<TorchOpContext>(device, output);
+
+  ReduceOp reduce_op = static_cast<ReduceOp>(reduce_op_int);
+  auto handle = handle_manager.AllocateHandle();
+  auto enqueue_result = EnqueueTensorReducescatter(
+      hvd_context, hvd_tensor, ready_event,
+      GetOpName("reducescatter", name, handle), device,
+      [handle](const Status& status) {
+        handle_manager.MarkDone(handle, status);
+      }, reduce_op, prescale_factor, postscale_factor, process_set_id);
+  ThrowIfError(enqueue_result);
+
+  return handle;
+}
+
+int DoReducescatterCudaOnCPU(::torch::Tensor tensor, ::torch::Tensor output,
+                             const std::string& name, int reduce_op_int,
+                             double prescale_factor, double postscale_factor,
+                             int process_set_id) {
+  ThrowIfError(common::CheckInitialized());
+
+  // Make async copy of input tensor to CPU tensor and record completion event.
+  auto device = GetDeviceID(tensor);
+  auto cpu_tensor =
+      tensor.to(::torch::Device(::torch::kCPU), /*non_blocking=*/true);
+  auto hvd_cpu_tensor = std::make_shared<TorchTensor>(cpu_tensor);
+  auto ready_event = RecordReadyEvent(device);
+
+  auto cpu_output = ::torch::empty_like(cpu_tensor);
+  auto hvd_context =
+      std::make_shared<TorchOpContext>(CPU_DEVICE_ID, cpu_output);
+
+  ReduceOp reduce_op = static_cast<ReduceOp>(reduce_op_int);
+  auto handle = handle_manager.AllocateHandle();
+  auto enqueue_result = EnqueueTensorReducescatter(
+      hvd_context, hvd_cpu_tensor, ready_event,
+      GetOpName("reducescatter", name, handle), CPU_DEVICE_ID,
+      [handle, cpu_output, output, device](const Status& status) mutable {
+        // Since the operation was on CPU, need to perform copy with the GPU
+        // device guard.
+        with_device device_guard(device);
+        // output needs to be resized before copying in the CPU tensor.
+        output.resize_(cpu_output.sizes());
+        output.copy_(cpu_output);
+        handle_manager.MarkDone(handle, status);
+      }, reduce_op, prescale_factor, postscale_factor, process_set_id);
+  ThrowIfError(enqueue_result);
+
+  return handle;
+}
+
 int PollHandle(int handle) { return handle_manager.PollHandle(handle) ? 1 : 0; }
 
+int WaitAny(const std::vector<int>& handles, double timeout) {
+  return handle_manager.WaitAny(handles, timeout);
+}
+
 void WaitAndClear(int handle) {
   while (true) {
     if (handle_manager.PollHandle(handle)) break;
@@ -636,6 +898,43 @@ PYBIND11_MODULE(mpi_lib_v2, m) {
         &DoBroadcastCudaOnCPU);
 #endif
 
+  // grouped broadcast
+  m.def("horovod_torch_grouped_broadcast_async_torch_ByteTensor", &DoGroupedBroadcast);
+  m.def("horovod_torch_grouped_broadcast_async_torch_CharTensor", &DoGroupedBroadcast);
+  m.def("horovod_torch_grouped_broadcast_async_torch_ShortTensor", &DoGroupedBroadcast);
+  m.def("horovod_torch_grouped_broadcast_async_torch_IntTensor", &DoGroupedBroadcast);
+  m.def("horovod_torch_grouped_broadcast_async_torch_LongTensor", &DoGroupedBroadcast);
+  m.def("horovod_torch_grouped_broadcast_async_torch_HalfTensor", &DoGroupedBroadcast);
+  m.def("horovod_torch_grouped_broadcast_async_torch_FloatTensor", &DoGroupedBroadcast);
+  m.def("horovod_torch_grouped_broadcast_async_torch_DoubleTensor", &DoGroupedBroadcast);
+#if HOROVOD_GPU_BROADCAST
+  m.def("horovod_torch_grouped_broadcast_async_torch_cuda_ByteTensor", &DoGroupedBroadcast);
+  m.def("horovod_torch_grouped_broadcast_async_torch_cuda_CharTensor", &DoGroupedBroadcast);
+  m.def("horovod_torch_grouped_broadcast_async_torch_cuda_ShortTensor", &DoGroupedBroadcast);
+  m.def("horovod_torch_grouped_broadcast_async_torch_cuda_IntTensor", &DoGroupedBroadcast);
+  m.def("horovod_torch_grouped_broadcast_async_torch_cuda_LongTensor", &DoGroupedBroadcast);
+  m.def("horovod_torch_grouped_broadcast_async_torch_cuda_HalfTensor", &DoGroupedBroadcast);
+  m.def("horovod_torch_grouped_broadcast_async_torch_cuda_FloatTensor", &DoGroupedBroadcast);
+  m.def("horovod_torch_grouped_broadcast_async_torch_cuda_DoubleTensor", &DoGroupedBroadcast);
+#else
+  m.def("horovod_torch_grouped_broadcast_async_torch_cuda_ByteTensor",
+        &DoGroupedBroadcastCudaOnCPU);
+  m.def("horovod_torch_grouped_broadcast_async_torch_cuda_CharTensor",
+        &DoGroupedBroadcastCudaOnCPU);
+  m.def("horovod_torch_grouped_broadcast_async_torch_cuda_ShortTensor",
+        &DoGroupedBroadcastCudaOnCPU);
+  m.def("horovod_torch_grouped_broadcast_async_torch_cuda_IntTensor",
+        &DoGroupedBroadcastCudaOnCPU);
+  m.def("horovod_torch_grouped_broadcast_async_torch_cuda_LongTensor",
+        &DoGroupedBroadcastCudaOnCPU);
+  m.def("horovod_torch_grouped_broadcast_async_torch_cuda_HalfTensor",
+        &DoGroupedBroadcastCudaOnCPU);
+  m.def("horovod_torch_grouped_broadcast_async_torch_cuda_FloatTensor",
+        &DoGroupedBroadcastCudaOnCPU);
+  m.def("horovod_torch_grouped_broadcast_async_torch_cuda_DoubleTensor",
+        &DoGroupedBroadcastCudaOnCPU);
+#endif
+
   // alltoall
   m.def("horovod_torch_alltoall_async_torch_ByteTensor", &DoAlltoall);
   m.def("horovod_torch_alltoall_async_torch_CharTensor", &DoAlltoall);
@@ -673,11 +972,31 @@ PYBIND11_MODULE(mpi_lib_v2, m) {
         &DoAlltoallCudaOnCPU);
 #endif
 
+  // reducescatter
+  m.def("horovod_torch_reducescatter_async_torch_IntTensor", &DoReducescatter);
+  m.def("horovod_torch_reducescatter_async_torch_LongTensor", &DoReducescatter);
+  m.def("horovod_torch_reducescatter_async_torch_HalfTensor", &DoReducescatter);
+  m.def("horovod_torch_reducescatter_async_torch_FloatTensor", &DoReducescatter);
+  m.def("horovod_torch_reducescatter_async_torch_DoubleTensor", &DoReducescatter);
+  m.def("horovod_torch_reducescatter_async_torch_cuda_IntTensor",
+        &DoReducescatterCudaOnCPU);
+  m.def("horovod_torch_reducescatter_async_torch_cuda_LongTensor",
+        &DoReducescatterCudaOnCPU);
+  m.def("horovod_torch_reducescatter_async_torch_cuda_HalfTensor",
+        &DoReducescatterCudaOnCPU);
+  m.def("horovod_torch_reducescatter_async_torch_cuda_FloatTensor",
+        &DoReducescatterCudaOnCPU);
+  m.def("horovod_torch_reducescatter_async_torch_cuda_DoubleTensor",
+        &DoReducescatterCudaOnCPU);
+
   // join
   m.def("horovod_torch_join", &DoJoin);
 
   // basics
   m.def("horovod_torch_poll", &PollHandle);
+  // The GIL is released so that other Python threads run while waiting
+  m.def("horovod_torch_wait_any", &WaitAny,
+        py::call_guard<py::gil_scoped_release>());
   m.def("horovod_torch_wait_and_clear", &WaitAndClear);
   m.def("horovod_torch_reset", &Reset);
 }
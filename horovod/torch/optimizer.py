@@ -14,6 +14,8 @@
 # limitations under the License.
 # ==============================================================================
 
+import collections
+import copy
 import os
 import warnings
 
@@ -21,23 +23,88 @@ from contextlib import contextmanager
 
 import torch
 
-from horovod.common.util import split_list
+from horovod.common.util import fusion_threshold_bytes, split_list, split_list_by_size
 
-from horovod.torch.compression import Compression
+from horovod.torch.compression import Compression, PowerSGDCompressor, QuantizingCompressor, SparseCompressor
 from horovod.torch.functions import broadcast_object
-from horovod.torch.mpi_ops import allreduce_async_, grouped_allreduce_async_, sparse_allreduce_async
-from horovod.torch.mpi_ops import synchronize
-from horovod.torch.mpi_ops import size
+from horovod.torch.mpi_ops import allreduce_async, allreduce_async_, grouped_allreduce_async_, sparse_allreduce_async
+from horovod.torch.mpi_ops import allgather_async, _allgather_async, reducescatter_async
+from horovod.torch.mpi_ops import quantized_allreduce_async
+from horovod.torch.mpi_ops import as_completed, synchronize
+from horovod.torch.mpi_ops import rank, size
 from horovod.torch.mpi_ops import Average, Adasum, Sum
 from horovod.torch.mpi_ops import rocm_built
 
+# Matches the default HOROVOD_FUSION_THRESHOLD
+_DEFAULT_BUCKET_CAP_MB = 64
+
+
+class _GradientBucket(object):
+    """
+    A set of parameters of the same dtype and device whose gradients are packed
+    into a single preallocated flat buffer and reduced with one allreduce.
+    """
+    def __init__(self, index, params):
+        self.name = 'allreduce.bucket.%d' % index
+        self.params = tuple(params)
+        self.offsets = []
+        self._index = {}
+        offset = 0
+        for i, p in enumerate(self.params):
+            self.offsets.append(offset)
+            self._index[p] = i
+            offset += p.numel()
+        self.buffer = self.params[0].data.new_zeros(offset)
+        self.packed = set()
+
+    def view(self, i, flat=None):
+        """Returns the slot of the i-th parameter in `flat` (defaults to the bucket buffer)."""
+        flat = self.buffer if flat is None else flat
+        p = self.params[i]
+        return flat.narrow(0, self.offsets[i], p.numel()).view_as(p)
+
+    def pack(self, p, sparse_as_dense=False):
+        """Copies the gradient of `p` into its slot in the bucket buffer."""
+        i = self._index[p]
+        grad = p.grad
+        if grad.is_sparse:
+            if not sparse_as_dense:
+                raise ValueError('Gradient bucketing does not support sparse gradients, '
+                                 'use sparse_as_dense=True or disable bucketing.')
+            grad = grad.to_dense()
+        slot = self.view(i)
+        # Gradients that were scattered back as views of the buffer during the
+        # previous step are accumulated in place, so no copy is needed.
+        if grad.data_ptr() != slot.data_ptr():
+            slot.copy_(grad)
+        self.packed.add(p)
+
+    def ready(self):
+        return len(self.packed) == len(self.params)
+
+    def reset(self):
+        self.packed.clear()
+
+    def attach_views(self):
+        """Makes the gradient of every parameter a view into the bucket buffer."""
+        for i, p in enumerate(self.params):
+            view = self.view(i)
+            if p.grad is None:
+                p.grad = view
+            elif p.grad.data_ptr() != view.data_ptr():
+                view.copy_(p.grad)
+                p.grad.set_(view)
+
 
 class _DistributedOptimizer(torch.optim.Optimizer):
     def __init__(self, params, named_parameters, compression,
                  backward_passes_per_step=1, op=Average,
                  gradient_predivide_factor=1.0,
                  groups=None,
-                 sparse_as_dense=False):
+                 sparse_as_dense=False,
+                 bucket_cap_mb=None,
+                 gradient_as_bucket_view=False,
+                 overlap_step=False):
         super(self.__class__, self).__init__(params)
         self._compression = compression
 
@@ -79,12 +146,13 @@ class _DistributedOptimizer(torch.optim.Optimizer):
         self._handles = {}
         self._grad_accs = []
         self._requires_update = set()
+        self._priorities = {}
         self._synchronized = False
         self._should_synchronize = True
 
         if groups is not None:
-            if not (isinstance(groups, list) or groups > 0):
-                raise ValueError('groups should be a non-negative integer or '
+            if not (isinstance(groups, list) or groups == 'auto' or groups > 0):
+                raise ValueError('groups should be a non-negative integer, \'auto\' or '
                                 'a list of list of torch.Tensor.')
             if isinstance(groups, list):
                 grouped_parameter_ids = set()
@@ -99,6 +167,28 @@ class _DistributedOptimizer(torch.optim.Optimizer):
         self._p_to_group = {}
         self._group_counts = {}
 
+        if gradient_as_bucket_view:
+            if sparse_as_dense:
+                raise ValueError('gradient_as_bucket_view does not support sparse gradients.')
+            if bucket_cap_mb is None:
+                bucket_cap_mb = _DEFAULT_BUCKET_CAP_MB
+        self._gradient_as_bucket_view = gradient_as_bucket_view
+        self._overlap_step = overlap_step
+
+        if isinstance(compression, (SparseCompressor, PowerSGDCompressor, QuantizingCompressor)) and \
+                (groups is not None or bucket_cap_mb is not None):
+            raise ValueError('Sparse, PowerSGD and quantizing compression cannot be used together '
+                             'with groups or bucketing.')
+
+        if bucket_cap_mb is not None:
+            if bucket_cap_mb <= 0:
+                raise ValueError('bucket_cap_mb should be a positive number.')
+            if groups is not None:
+                raise ValueError('bucket_cap_mb cannot be used together with groups.')
+        self._bucket_cap_bytes = int(bucket_cap_mb * 1024 * 1024) if bucket_cap_mb is not None else None
+        self._buckets = []
+        self._p_to_bucket = {}
+
         if size() > 1 or os.environ.get('HOROVOD_ELASTIC') == '1':
             self._register_hooks()
 
@@ -108,6 +198,10 @@ class _DistributedOptimizer(torch.optim.Optimizer):
         self._should_synchronize = True
         for p in self._allreduce_delay:
             self._allreduce_delay[p] = self.backward_passes_per_step
+        for bucket in self._buckets:
+            bucket.reset()
+        if isinstance(self._compression, (SparseCompressor, PowerSGDCompressor, QuantizingCompressor)):
+            self._compression.reset()
         super(self.__class__, self).load_state_dict(*args, **kwargs)
 
     @staticmethod
@@ -125,20 +219,49 @@ class _DistributedOptimizer(torch.optim.Optimizer):
         for p in self._allreduce_delay:
             self._allreduce_delay[p] = self.backward_passes_per_step
 
+    def _ordered_params(self):
+        p_list = []
+        # Get list of parameters with grads
+        for param_group in self.param_groups:
+            for p in param_group['params']:
+                if p.requires_grad:
+                    p_list.append(p)
+
+        # To ensure parameter order and group formation is consistent, broadcast p_list order
+        # from rank 0 and use for every worker
+        p_list_names = [self._parameter_names.get(p) for p in p_list]
+        p_list_names = broadcast_object(p_list_names, root_rank=0)
+        return sorted(p_list, key=lambda p: p_list_names.index(self._parameter_names.get(p)))
+
+    def _make_buckets(self):
+        # Gradients become ready roughly in reverse registration order during the
+        # backward pass, so buckets are filled starting from the last parameter.
+        buckets = []
+        current, current_bytes = [], 0
+        for p in reversed(self._ordered_params()):
+            p_bytes = p.numel() * p.element_size()
+            if current and (p.dtype != current[0].dtype or p.device != current[0].device or
+                            current_bytes + p_bytes > self._bucket_cap_bytes):
+                buckets.append(current)
+                current, current_bytes = [], 0
+            current.append(p)
+            current_bytes += p_bytes
+        if current:
+            buckets.append(current)
+
+        self._buckets = [_GradientBucket(i, b) for i, b in enumerate(buckets)]
+        for bucket in self._buckets:
+            for p in bucket.params:
+                self._p_to_bucket[p] = bucket
+            if self._gradient_as_bucket_view:
+                bucket.attach_views()
+
     def _register_hooks(self):
+        if self._bucket_cap_bytes is not None:
+            self._make_buckets()
+
         if self._groups is not None:
-            p_list = []
-            # Get list of parameters with grads
-            for param_group in self.param_groups:
-                for p in param_group['params']:
-                    if p.requires_grad:
-                        p_list.append(p)
-
-            # To ensure parameter order and group formation is consistent, broadcast p_list order
-            # from rank 0 and use for every worker
-            p_list_names = [self._parameter_names.get(p) for p in p_list]
-            p_list_names = broadcast_object(p_list_names, root_rank=0)
-            p_list = sorted(p_list, key=lambda p: p_list_names.index(self._parameter_names.get(p)))
+            p_list = self._ordered_params()
 
             # Form groups
             if isinstance(self._groups, list):
@@ -152,6 +275,11 @@ class _DistributedOptimizer(torch.optim.Optimizer):
                 for p in p_list:
                     if id(p) not in grouped_id:
                         p_groups.append([p])
+            elif self._groups == 'auto':
+                sizes = [p.numel() * p.element_size() for p in p_list]
+                dtypes = [p.dtype for p in p_list]
+                p_groups = [[p_list[i] for i in group]
+                            for group in split_list_by_size(sizes, dtypes, fusion_threshold_bytes())]
             else:
                 p_groups = split_list(p_list, self._groups)
 
@@ -165,6 +293,10 @@ class _DistributedOptimizer(torch.optim.Optimizer):
             for p in param_group['params']:
                 if p.requires_grad:
                     self._requires_update.add(p)
+                    # Parameters registered first are needed first in the next forward
+                    # pass, but their gradients are computed last, so they are reduced
+                    # with the highest priority.
+                    self._priorities[p] = -len(self._priorities)
                     p_tmp = p.expand_as(p)
                     grad_acc = p_tmp.grad_fn.next_functions[0][0]
                     grad_acc.register_hook(self._make_hook(p))
@@ -183,14 +315,6 @@ class _DistributedOptimizer(torch.optim.Optimizer):
         name = self._parameter_names.get(p)
         tensor = p.grad
 
-        if p.grad.is_sparse:
-            if self.sparse_as_dense:
-                tensor = tensor.to_dense()
-            else:
-                return self._sparse_allreduce_grad_async(p, name)
-
-        tensor_compressed, ctx = self._compression.compress(tensor)
-
         if self.op == Average:
             # Split average operation across pre/postscale factors
             # C++ backend will apply additional 1 / size() factor to postscale_factor for op == Average.
@@ -200,20 +324,71 @@ class _DistributedOptimizer(torch.optim.Optimizer):
             prescale_factor = 1.0
             postscale_factor = 1.0
 
+        if p.grad.is_sparse:
+            if self.sparse_as_dense:
+                tensor = tensor.to_dense()
+            else:
+                return self._sparse_allreduce_grad_async(p, name, prescale_factor, postscale_factor)
+
+        if isinstance(self._compression, SparseCompressor):
+            tensor_compressed, ctx = self._compression.compress(tensor, name=name)
+            if tensor_compressed.is_sparse:
+                handle = sparse_allreduce_async(tensor_compressed, name=name, op=self.op,
+                                                prescale_factor=prescale_factor,
+                                                postscale_factor=postscale_factor)
+                return handle, ctx
+        elif isinstance(self._compression, QuantizingCompressor):
+            if tensor.dtype.is_floating_point:
+                handle = quantized_allreduce_async(tensor, self._compression, name=name, op=self.op,
+                                                   prescale_factor=prescale_factor,
+                                                   postscale_factor=postscale_factor)
+                return handle, None
+            tensor_compressed, ctx = tensor, None
+        else:
+            tensor_compressed, ctx = self._compression.compress(tensor)
+
         handle = allreduce_async_(tensor_compressed, name=name, op=self.op,
                                   prescale_factor=prescale_factor,
-                                  postscale_factor=postscale_factor)
+                                  postscale_factor=postscale_factor,
+                                  priority=self._priorities.get(p, 0))
         return handle, ctx
 
     def _grouped_allreduce_grad_async(self, ps):
         name = self._parameter_names.get(ps[0])
         tensors_compressed, ctxs = zip(*[self._compression.compress(p.grad) for p in ps])
 
-        handle = grouped_allreduce_async_(tensors_compressed, name=name, op=self.op)
+        handle = grouped_allreduce_async_(tensors_compressed, name=name, op=self.op,
+                                          priority=max(self._priorities.get(p, 0) for p in ps))
         return handle, ctxs
 
-    def _sparse_allreduce_grad_async(self, p, name):
-        handle = sparse_allreduce_async(p.grad, name=name, op=self.op)
+    def _bucket_allreduce_grad_async(self, bucket):
+        # Parameters whose gradients were never computed on this rank still need
+        # to take part in the reduction, as other ranks may have computed them.
+        for p in bucket.params:
+            if p not in bucket.packed:
+                if p.grad is None:
+                    p.grad = p.data.new(p.size()).zero_()
+                bucket.pack(p, self.sparse_as_dense)
+
+        tensor_compressed, ctx = self._compression.compress(bucket.buffer)
+
+        if self.op == Average:
+            prescale_factor = 1.0 / self.gradient_predivide_factor
+            postscale_factor = self.gradient_predivide_factor
+        else:
+            prescale_factor = 1.0
+            postscale_factor = 1.0
+
+        handle = allreduce_async_(tensor_compressed, name=bucket.name, op=self.op,
+                                  prescale_factor=prescale_factor,
+                                  postscale_factor=postscale_factor,
+                                  priority=max(self._priorities.get(p, 0) for p in bucket.params))
+        return handle, ctx
+
+    def _sparse_allreduce_grad_async(self, p, name, prescale_factor, postscale_factor):
+        handle = sparse_allreduce_async(p.grad, name=name, op=self.op,
+                                        prescale_factor=prescale_factor,
+                                        postscale_factor=postscale_factor)
         return handle, None
 
     def _make_hook(self, p):
@@ -230,7 +405,19 @@ class _DistributedOptimizer(torch.optim.Optimizer):
             handle, ctx = None, None
             self._allreduce_delay[p] -= 1
             if self._allreduce_delay[p] == 0:
-                if self._groups is not None:
+                if isinstance(self._compression, PowerSGDCompressor):
+                    # All gradients are reduced together in synchronize()
+                    pass
+                elif self._buckets:
+                    bucket = self._p_to_bucket[p]
+                    bucket.pack(p, self.sparse_as_dense)
+                    if bucket.ready():
+                        self._handles[bucket] = self._bucket_allreduce_grad_async(bucket)
+                        # Remove any None entries from previous no-op hook calls
+                        for bp in bucket.params:
+                            self._handles.pop(bp, None)
+                        return
+                elif self._groups is not None:
                     group = self._p_to_group[p]
                     self._group_counts[group] += 1
                     if self._group_counts[group] == len(group):
@@ -246,10 +433,60 @@ class _DistributedOptimizer(torch.optim.Optimizer):
             self._handles[p] = (handle, ctx)
         return hook
 
+    def _low_rank_synchronize(self):
+        # Sort by name so that every rank reduces the gradients in the same order
+        params = sorted(self._requires_update, key=lambda p: self._parameter_names.get(p))
+        grads = []
+        for p in params:
+            if p.grad is None:
+                p.grad = p.data.new(p.size()).zero_()
+            if p.grad.is_sparse:
+                if not self.sparse_as_dense:
+                    raise ValueError('PowerSGD compression does not support sparse gradients, '
+                                     'use sparse_as_dense=True.')
+                grads.append(p.grad.to_dense())
+            else:
+                grads.append(p.grad)
+
+        names = [self._parameter_names.get(p) for p in params]
+        outputs = self._compression.reduce(grads, names, op=self.op)
+        for p, output in zip(params, outputs):
+            self._allreduce_delay[p] = self.backward_passes_per_step
+            if p.grad.is_sparse:
+                p.grad.zero_().add_(output.to_sparse())
+            else:
+                p.grad.set_(output)
+        self._handles.clear()
+
+        self._synchronized = True
+
     def synchronize(self):
+        if isinstance(self._compression, PowerSGDCompressor):
+            return self._low_rank_synchronize()
+
+        self._submit_missing()
+        for p, output in self._completed_handles():
+            self._unpack_output(p, output)
+        self._handles.clear()
+
+        self._synchronized = True
+
+    def _submit_missing(self):
+        # Every bucket is reduced each step, including partially filled ones
+        for bucket in self._buckets:
+            if bucket not in self._handles:
+                self._handles[bucket] = self._bucket_allreduce_grad_async(bucket)
+                for bp in bucket.params:
+                    self._handles.pop(bp, None)
+
         completed = set()
         for x in self._handles.keys():
-          completed.update(x) if isinstance(x, tuple) else completed.add(x)
+            if isinstance(x, _GradientBucket):
+                completed.update(x.params)
+            elif isinstance(x, tuple):
+                completed.update(x)
+            else:
+                completed.add(x)
         missing_p = self._requires_update - completed
         for p in missing_p:
             handle, ctx = self._allreduce_grad_async(p)
@@ -259,31 +496,63 @@ class _DistributedOptimizer(torch.optim.Optimizer):
             if handle is None:
                 handle, ctx = self._allreduce_grad_async(p)
                 self._handles[p] = (handle, ctx)
-        for p, (handle, ctx) in self._handles.items():
 
-            if isinstance(p, tuple):
-                # This was a grouped result, need to unpack
-                outputs = synchronize(handle)
-                for gp, output, gctx in zip(p, outputs, ctx):
-                    self._allreduce_delay[gp] = self.backward_passes_per_step
-                    gp.grad.set_(self._compression.decompress(output, gctx))
+    def _unpack_output(self, p, output):
+        """Sets the reduced gradients of the handle key `p` and returns their parameters."""
+        ctx = self._handles[p][1]
+
+        if isinstance(p, _GradientBucket):
+            # Scatter the reduced buffer back to the gradients as views, without copying
+            output = self._compression.decompress(output, ctx)
+            if self._gradient_as_bucket_view and output.data_ptr() != p.buffer.data_ptr():
+                # Compression produced a new tensor, keep the gradients in the bucket
+                p.buffer.copy_(output)
+                output = p.buffer
+            for i, bp in enumerate(p.params):
+                self._allreduce_delay[bp] = self.backward_passes_per_step
+                view = p.view(i, output)
+                if bp.grad.is_sparse:
+                    bp.grad.zero_().add_(view.to_sparse())
+                elif bp.grad.data_ptr() != view.data_ptr():
+                    bp.grad.set_(view)
+            p.reset()
+            return p.params
+        elif isinstance(p, tuple):
+            # This was a grouped result, need to unpack
+            for gp, goutput, gctx in zip(p, output, ctx):
+                self._allreduce_delay[gp] = self.backward_passes_per_step
+                gp.grad.set_(self._compression.decompress(goutput, gctx))
+            return p
+        else:
+            self._allreduce_delay[p] = self.backward_passes_per_step
+            if p.grad.is_sparse:
+                aggregated = self._compression.decompress(output, ctx)
+                if not aggregated.is_sparse:
+                    # When sparse_as_dense=True we need to convert the grad back to sparse before update
+                    aggregated = aggregated.to_sparse()
+
+                # Sparse grads do not support set_ for some reason, so we do this as an equivalent
+                p.grad.zero_().add_(aggregated)
             else:
-                # When handle is a callable function, it returns the aggregated tensor result
-                output = synchronize(handle) if not callable(handle) else handle()
-                self._allreduce_delay[p] = self.backward_passes_per_step
-                if p.grad.is_sparse:
-                    aggregated = self._compression.decompress(output, ctx)
-                    if not aggregated.is_sparse:
-                        # When sparse_as_dense=True we need to convert the grad back to sparse before update
-                        aggregated = aggregated.to_sparse()
-
-                    # Sparse grads do not support set_ for some reason, so we do this as an equivalent
-                    p.grad.zero_().add_(aggregated)
-                else:
-                    p.grad.set_(self._compression.decompress(output, ctx))
-        self._handles.clear()
-
-        self._synchronized = True
+                p.grad.set_(self._compression.decompress(output, ctx))
+            return (p,)
+
+    def _completed_handles(self):
+        # Reductions are unpacked in the order they complete rather than the order they
+        # were submitted in, so one slow tensor does not hold up the others.
+        pending = {}
+        for p, (handle, _) in self._handles.items():
+            if not callable(handle):
+                pending[handle] = p
+        for handle, output in as_completed(list(pending)):
+            yield pending[handle], output
+        # When handle is a callable function, it returns the aggregated tensor result.
+        # These submit further collectives and block on them, so they run in the order
+        # of the parameter names, which unlike the order of the hooks is the same on
+        # every rank.
+        callables = [(p, handle) for p, (handle, _) in self._handles.items() if callable(handle)]
+        for p, handle in sorted(callables, key=lambda item: self._parameter_names.get(item[0])):
+            yield p, handle()
 
     @contextmanager
     def skip_synchronize(self):
@@ -314,16 +583,66 @@ class _DistributedOptimizer(torch.optim.Optimizer):
                               "slowdown. You may want to consider using "
                               "optimizer.skip_synchronize() context if you use "
                               "optimizer.synchronize() in your code.")
+            elif self._overlap_step and closure is None:
+                self._overlapped_step()
+                return None
             self.synchronize()
         self._synchronized = False
         return super(self.__class__, self).step(closure)
 
-    def zero_grad(self):
+    def _overlapped_step(self):
+        # Parameters are updated as soon as their reduction completes, so the optimizer
+        # math of the first reduced gradients overlaps with the communication of the rest.
+        self._submit_missing()
+        updated = set()
+        for p, output in self._completed_handles():
+            params = self._unpack_output(p, output)
+            self._step_params(params)
+            updated.update(params)
+        self._handles.clear()
+
+        # Parameters without a reduction (e.g. with a single worker) are updated last
+        remaining = [p for group in self.param_groups for p in group['params'] if p not in updated]
+        if remaining:
+            self._step_params(remaining)
+        self._synchronized = False
+
+    def add_param_group(self, param_group):
+        super(self.__class__, self).add_param_group(param_group)
+        # The base class adds the initial param groups through this method as well,
+        # so the index is always in sync with self.param_groups.
+        self._p_to_group_index = {p: i
+                                  for i, group in enumerate(self.param_groups)
+                                  for p in group['params']}
+
+    def _step_params(self, params):
+        # The wrapped optimizer updates each param group independently, so restricting
+        # the groups to a subset of their parameters runs its update for that subset only.
+        group_params = [[] for _ in self.param_groups]
+        for p in params:
+            group_params[self._p_to_group_index[p]].append(p)
+        stashed_params = [group['params'] for group in self.param_groups]
+        try:
+            for group, subset in zip(self.param_groups, group_params):
+                group['params'] = subset
+            super(self.__class__, self).step()
+        finally:
+            for group, stashed in zip(self.param_groups, stashed_params):
+                group['params'] = stashed
+
+    def zero_grad(self, *args, **kwargs):
         if self._handles:
             raise AssertionError("optimizer.zero_grad() was called after loss.backward() "
                                  "but before optimizer.step() or optimizer.synchronize(). "
                                  "This is prohibited as it can cause a race condition.")
-        return super(self.__class__, self).zero_grad()
+        if self._gradient_as_bucket_view and self._buckets:
+            # Gradients must stay views into the buckets, so zero the buffers in
+            # place instead of releasing or zeroing every gradient separately.
+            for bucket in self._buckets:
+                bucket.buffer.zero_()
+                bucket.attach_views()
+            return
+        return super(self.__class__, self).zero_grad(*args, **kwargs)
 
 
 class _DistributedAdasumOptimizer(torch.optim.Optimizer):
@@ -497,13 +816,397 @@ class _DistributedAdasumOptimizer(torch.optim.Optimizer):
         return super(self.__class__, self).zero_grad()
 
 
+def _shard_sizes(numel, size):
+    # Matches the split of reducescatter, the lowest ranks get one extra element
+    return [numel // size + (1 if r < numel % size else 0) for r in range(size)]
+
+
+class _ShardedBucket(object):
+    """
+    The parameters of one param group with the same dtype and device, laid out one
+    after the other. The reduce-scatter of their flattened gradients leaves every rank
+    with the reduced gradient of one contiguous shard, which is the only part of the
+    bucket the rank keeps a copy of, keeps optimizer state for and updates.
+    """
+    def __init__(self, index, name, params, rank, size):
+        self.name = name
+        self.index = index
+        self.params = tuple(params)
+        self.offsets = []
+        self._index = {}
+        offset = 0
+        for i, p in enumerate(self.params):
+            self.offsets.append(offset)
+            self._index[p] = i
+            offset += p.numel()
+        self.numel = offset
+        self.shard_sizes = _shard_sizes(offset, size)
+        self.shard_offset = sum(self.shard_sizes[:rank])
+        self.shard = self.params[0].data.new_empty(self.shard_sizes[rank])
+        for i, start, length, shard_start in self.shard_slices():
+            self.shard.narrow(0, shard_start, length).copy_(
+                self.params[i].data.reshape(-1).narrow(0, start, length))
+        self.packed = set()
+
+    def shard_slices(self):
+        """
+        Yields the parameters overlapping the local shard as tuples of the parameter index,
+        the start and length of the overlap within the parameter, and its start in the shard.
+        """
+        shard_end = self.shard_offset + self.shard.numel()
+        for i, p in enumerate(self.params):
+            start = max(self.offsets[i], self.shard_offset)
+            end = min(self.offsets[i] + p.numel(), shard_end)
+            if start < end:
+                yield i, start - self.offsets[i], end - start, start - self.shard_offset
+
+    def view(self, i, flat):
+        """Returns the slot of the i-th parameter in the full-size `flat` tensor."""
+        p = self.params[i]
+        return flat.narrow(0, self.offsets[i], p.numel()).view_as(p)
+
+    def pack(self, p):
+        """Marks the gradient of `p` as final for this step."""
+        self.packed.add(p)
+
+    def flat_grads(self):
+        """Returns the gradients of the bucket flattened into a single new tensor."""
+        grads = []
+        for p in self.params:
+            if p.grad is None:
+                # Gradient was not computed, but other ranks may have computed it
+                grads.append(p.data.new_zeros(p.numel()))
+            elif p.grad.is_sparse:
+                grads.append(p.grad.to_dense().reshape(-1))
+            else:
+                grads.append(p.grad.reshape(-1))
+        return torch.cat(grads)
+
+    def ready(self):
+        return len(self.packed) == len(self.params)
+
+    def reset(self):
+        self.packed.clear()
+
+    def unpack(self, flat):
+        """Copies the gathered parameters in `flat` back into the model parameters."""
+        for i, p in enumerate(self.params):
+            p.data.copy_(self.view(i, flat))
+
+
+class _ShardedOptimizer(object):
+    """Marks optimizers whose state is partitioned across ranks."""
+
+
+class _ShardedDistributedOptimizer(torch.optim.Optimizer):
+    def __init__(self, params, named_parameters, backward_passes_per_step=1, op=Average,
+                 gradient_predivide_factor=1.0):
+        super(self.__class__, self).__init__(params)
+
+        if named_parameters is not None:
+            named_parameters = list(named_parameters)
+        else:
+            named_parameters = [(f'sharded.noname.{i}.{j}', v)
+                                for i, param_group in enumerate(self.param_groups)
+                                for j, v in enumerate(param_group['params'])]
+        if any([not isinstance(p, tuple) for p in named_parameters]):
+            raise ValueError('named_parameters should be a sequence of '
+                             'tuples (name, parameter), usually produced by '
+                             'model.named_parameters().')
+
+        dups = _DistributedOptimizer.find_duplicates([k for k, _ in named_parameters])
+        if len(dups) > 0:
+            raise ValueError('Parameter names in named_parameters must be unique. '
+                             'Found duplicates: %s' % ', '.join(dups))
+
+        all_param_ids = {id(v)
+                         for param_group in self.param_groups
+                         for v in param_group['params']}
+        named_param_ids = {id(v) for k, v in named_parameters}
+        unnamed_param_ids = all_param_ids - named_param_ids
+        if len(unnamed_param_ids):
+            raise ValueError('named_parameters was specified, but one or more model '
+                             'parameters were not named. Python object ids: '
+                             '%s' % ', '.join(str(id) for id in unnamed_param_ids))
+
+        self._parameter_names = {v: k for k, v in sorted(named_parameters)}
+        self.backward_passes_per_step = backward_passes_per_step
+        self.op = op
+        self.gradient_predivide_factor = gradient_predivide_factor
+
+        # The model parameters of every param group, the param groups of the wrapped
+        # optimizer only hold the local shards
+        self._group_params = [list(group['params']) for group in self.param_groups]
+        self._requires_update = [p for params in self._group_params for p in params
+                                 if p.requires_grad]
+        self._allreduce_delay = {p: self.backward_passes_per_step for p in self._requires_update}
+        self._handles = {}
+        self._grad_accs = []
+        self._synchronized = False
+        self._should_synchronize = True
+        self._buckets = []
+        self._p_to_bucket = {}
+        self._make_buckets()
+
+        if size() > 1 or os.environ.get('HOROVOD_ELASTIC') == '1':
+            self._register_hooks()
+
+    def _make_buckets(self):
+        # Shard boundaries depend on the rank and the number of ranks, so the
+        # buckets are rebuilt from the current parameters whenever the state is loaded
+        self._buckets = []
+        self._p_to_bucket = {}
+        for group, params in zip(self.param_groups, self._group_params):
+            group_buckets = []
+            by_type = {}
+            for p in params:
+                if p.requires_grad:
+                    by_type.setdefault((p.dtype, p.device), []).append(p)
+            for bucket_params in by_type.values():
+                index = len(self._buckets)
+                name = 'sharded.%d.%s' % (index, self._parameter_names.get(bucket_params[0]))
+                bucket = _ShardedBucket(index, name, bucket_params, rank(), size())
+                self._buckets.append(bucket)
+                group_buckets.append(bucket)
+                for p in bucket.params:
+                    self._p_to_bucket[p] = bucket
+            group['params'] = [bucket.shard for bucket in group_buckets]
+        self.state = collections.defaultdict(dict)
+
+        # The updated parameters of the buckets are gathered one bucket after the other
+        # into a single staging buffer per dtype and device, sized for the largest bucket
+        self._staging = {}
+        for bucket in self._buckets:
+            key = (bucket.shard.dtype, bucket.shard.device)
+            if key not in self._staging or self._staging[key].numel() < bucket.numel:
+                self._staging[key] = bucket.shard.new_empty(bucket.numel)
+
+    def _register_hooks(self):
+        for p in self._requires_update:
+            p_tmp = p.expand_as(p)
+            grad_acc = p_tmp.grad_fn.next_functions[0][0]
+            grad_acc.register_hook(self._make_hook(p))
+            self._grad_accs.append(grad_acc)
+
+    def set_backward_passes_per_step(self, passes):
+        self.backward_passes_per_step = passes
+        for p in self._allreduce_delay:
+            self._allreduce_delay[p] = self.backward_passes_per_step
+
+    def _reduce_grad_async(self, bucket):
+        prescale_factor = 1.0
+        postscale_factor = 1.0
+        if self.op == Average:
+            # Split the averaging before and after the sum, the collectives
+            # divide by the number of ranks themselves
+            prescale_factor = 1.0 / self.gradient_predivide_factor
+            postscale_factor = self.gradient_predivide_factor
+        if bucket.shard.is_cuda:
+            # Reducescatter copies GPU tensors to host memory, allreduce them on the
+            # GPU instead and keep the local shard in synchronize()
+            return allreduce_async(bucket.flat_grads(), name='allreduce.%s' % bucket.name, op=self.op,
+                                   prescale_factor=prescale_factor,
+                                   postscale_factor=postscale_factor)
+        return reducescatter_async(bucket.flat_grads(), name='reducescatter.%s' % bucket.name, op=self.op,
+                                   prescale_factor=prescale_factor,
+                                   postscale_factor=postscale_factor)
+
+    def _make_hook(self, p):
+        def hook(*ignore):
+            if self._allreduce_delay[p] <= 0:
+                raise AssertionError(
+                    "Gradients were computed more than "
+                    "backward_passes_per_step times before call "
+                    "to step(). Increase backward_passes_per_step to "
+                    "accumulate gradients locally.")
+            assert not p.grad.requires_grad
+            self._allreduce_delay[p] -= 1
+            if self._allreduce_delay[p] == 0:
+                bucket = self._p_to_bucket[p]
+                bucket.pack(p)
+                if bucket.ready():
+                    self._handles[bucket] = self._reduce_grad_async(bucket)
+        return hook
+
+    def synchronize(self):
+        # Every bucket is reduced each step, including partially filled ones
+        for bucket in self._buckets:
+            if bucket not in self._handles:
+                for p in bucket.params:
+                    if p not in bucket.packed:
+                        bucket.pack(p)
+                self._handles[bucket] = self._reduce_grad_async(bucket)
+
+        buckets = {handle: bucket for bucket, handle in self._handles.items()}
+        for handle, output in as_completed(list(buckets)):
+            bucket = buckets[handle]
+            if bucket.shard.is_cuda:
+                output = output.narrow(0, bucket.shard_offset, bucket.shard.numel()).clone()
+            bucket.shard.grad = output
+            bucket.reset()
+        for p in self._allreduce_delay:
+            self._allreduce_delay[p] = self.backward_passes_per_step
+        self._handles.clear()
+
+        self._synchronized = True
+
+    skip_synchronize = _DistributedOptimizer.skip_synchronize
+
+    def step(self, closure=None):
+        if self._should_synchronize:
+            if self._synchronized:
+                warnings.warn("optimizer.step() called without "
+                              "optimizer.skip_synchronize() context after "
+                              "optimizer.synchronize(). This can cause training "
+                              "slowdown. You may want to consider using "
+                              "optimizer.skip_synchronize() context if you use "
+                              "optimizer.synchronize() in your code.")
+            self.synchronize()
+        self._synchronized = False
+        loss = super(self.__class__, self).step(closure)
+
+        # Every rank updated its own shard, gather the updated parameters of each bucket
+        # into the staging buffer of its type
+        for bucket in self._buckets:
+            staging = self._staging[(bucket.shard.dtype, bucket.shard.device)].narrow(0, 0, bucket.numel)
+            handle = _allgather_async(bucket.shard, staging, 'allgather.%s' % bucket.name)
+            bucket.unpack(synchronize(handle))
+        return loss
+
+    def zero_grad(self, *args, **kwargs):
+        if self._handles:
+            raise AssertionError("optimizer.zero_grad() was called after loss.backward() "
+                                 "but before optimizer.step() or optimizer.synchronize(). "
+                                 "This is prohibited as it can cause a race condition.")
+        super(self.__class__, self).zero_grad(*args, **kwargs)
+        # The model parameters are not part of the wrapped param groups, their
+        # gradients have been packed into the buckets and can be released
+        for p in self._requires_update:
+            p.grad = None
+
+    def state_dict(self):
+        """
+        Returns the full optimizer state, gathered from the shards of all ranks, in the
+        format of the wrapped optimizer. Must be called on every rank.
+        """
+        index = {}
+        param_groups = []
+        for group, params in zip(self.param_groups, self._group_params):
+            packed = {k: v for k, v in group.items() if k != 'params'}
+            packed['params'] = [index.setdefault(p, len(index)) for p in params]
+            param_groups.append(packed)
+
+        state = {}
+        handles = []
+        for bucket in self._buckets:
+            shard_state = self.state.get(bucket.shard, {})
+            for key in sorted(shard_state):
+                value = shard_state[key]
+                if torch.is_tensor(value) and value.shape == bucket.shard.shape:
+                    handles.append((bucket, key, allgather_async(
+                        value, name='allgather.%s.state.%s' % (bucket.name, key))))
+                else:
+                    for p in bucket.params:
+                        state.setdefault(index[p], {})[key] = copy.deepcopy(value)
+        for bucket, key, handle in handles:
+            flat = synchronize(handle)
+            for i, p in enumerate(bucket.params):
+                state.setdefault(index[p], {})[key] = bucket.view(i, flat).clone()
+
+        return {'state': state, 'param_groups': param_groups}
+
+    def load_state_dict(self, state_dict):
+        """
+        Loads a full optimizer state as returned by ``state_dict()``, keeping only the
+        shard of the local rank. The state may have been saved with a different number
+        of ranks or with the wrapped optimizer itself.
+        """
+        groups = state_dict['param_groups']
+        if len(groups) != len(self.param_groups):
+            raise ValueError('loaded state dict has a different number of parameter groups')
+        if any(len(g['params']) != len(params) for g, params in zip(groups, self._group_params)):
+            raise ValueError("loaded state dict contains a parameter group "
+                             "that doesn't match the size of optimizer's group")
+
+        for group, saved in zip(self.param_groups, groups):
+            group.update({k: v for k, v in saved.items() if k != 'params'})
+        self._repartition()
+
+        saved_state = {p: state_dict['state'][i]
+                       for saved, params in zip(groups, self._group_params)
+                       for i, p in zip(saved['params'], params)
+                       if i in state_dict['state']}
+        for bucket in self._buckets:
+            states = [saved_state.get(p, {}) for p in bucket.params]
+            keys = sorted(set(key for s in states for key in s))
+            shard_state = {}
+            for key in keys:
+                values = [s.get(key) for s in states]
+                if all(torch.is_tensor(v) and v.shape == p.shape
+                       for v, p in zip(values, bucket.params) if v is not None):
+                    # Floating point state follows the dtype of the parameters
+                    present = [v for v in values if v is not None]
+                    shard = bucket.shard.new_zeros(bucket.shard.shape)
+                    if not present[0].is_floating_point():
+                        shard = shard.to(present[0].dtype)
+                    for i, start, length, shard_start in bucket.shard_slices():
+                        if values[i] is not None:
+                            shard.narrow(0, shard_start, length).copy_(
+                                values[i].reshape(-1).narrow(0, start, length))
+                    shard_state[key] = shard
+                else:
+                    shard_state[key] = copy.deepcopy(next(v for v in values if v is not None))
+            if shard_state:
+                self.state[bucket.shard] = shard_state
+
+    def _repartition(self):
+        """
+        Rebuilds the shards from the model parameters for the current rank and number
+        of ranks, dropping the optimizer state and any pending reductions.
+        """
+        self._handles = {}
+        self._synchronized = False
+        self._should_synchronize = True
+        for p in self._allreduce_delay:
+            self._allreduce_delay[p] = self.backward_passes_per_step
+        self._make_buckets()
+
+    def _shard_state_dict(self):
+        """
+        Returns a copy of the options of the param groups and of the state of the local
+        shards, which only ``_load_shard_state_dict()`` with the same ranks can load.
+        """
+        return {
+            'rank': rank(),
+            'size': size(),
+            'param_groups': [{k: copy.deepcopy(v) for k, v in group.items() if k != 'params'}
+                             for group in self.param_groups],
+            'state': {bucket.index: copy.deepcopy(self.state[bucket.shard])
+                      for bucket in self._buckets if bucket.shard in self.state},
+        }
+
+    def _load_shard_state_dict(self, shard_state_dict):
+        """Loads the state of the local shards as returned by ``_shard_state_dict()``."""
+        if (shard_state_dict['rank'], shard_state_dict['size']) != (rank(), size()):
+            raise ValueError('shard state was saved with a different rank or number of ranks')
+        for group, options in zip(self.param_groups, shard_state_dict['param_groups']):
+            group.update(copy.deepcopy(options))
+        self.state = collections.defaultdict(dict)
+        for bucket in self._buckets:
+            if bucket.index in shard_state_dict['state']:
+                self.state[bucket.shard] = copy.deepcopy(shard_state_dict['state'][bucket.index])
+
+
 def DistributedOptimizer(optimizer, named_parameters=None,
                          compression=Compression.none,
                          backward_passes_per_step=1,
                          op=Average,
                          gradient_predivide_factor=1.0,
                          num_groups=0, groups=None,
-                         sparse_as_dense=False):
+                         sparse_as_dense=False,
+                         bucket_cap_mb=None,
+                         gradient_as_bucket_view=False,
+                         overlap_step=False):
     """
     An optimizer that wraps another torch.optim.Optimizer, using an allreduce to
     combine gradient values before applying gradients to model weights.
@@ -536,7 +1239,13 @@ def DistributedOptimizer(optimizer, named_parameters=None,
                           allreduce operations. Typically just ``model.named_parameters()``.
         compression: Compression algorithm used during allreduce to reduce the amount
                      of data sent during the each parameter update step.  Defaults to
-                     not using compression.
+                     not using compression. Sparse compressors such as
+                     ``hvd.Compression.topk(ratio)`` exchange the selected elements with
+                     an allgather and keep the remainder as per-parameter residuals.
+                     ``hvd.Compression.powersgd(rank)`` reduces low-rank approximations
+                     of all gradients together when the optimizer synchronizes.
+                     Quantizing compressors such as ``hvd.Compression.int8()`` reduce
+                     dequantized shards exchanged with an alltoall and an allgather.
         backward_passes_per_step: Number of expected backward passes to perform
                                   before calling step()/synchronize(). This
                                   allows accumulating gradients over multiple
@@ -546,18 +1255,44 @@ def DistributedOptimizer(optimizer, named_parameters=None,
                                    before and after the sum. Gradients are scaled by
                                    1.0 / gradient_predivide_factor before the sum and
                                    gradient_predivide_factor / size after the sum.
+                                   Not supported with PowerSGD compression.
         num_groups: Number of groups to assign gradient allreduce ops to for explicit
                     grouping. Defaults to no explicit groups.
         groups: The parameter to group the gradient allreduce ops. Accept values is a
-                non-negative integer or a list of list of torch.Tensor.
+                non-negative integer, 'auto' or a list of list of torch.Tensor.
                 If groups is a non-negative integer, it is the number of groups to assign
                 gradient allreduce ops to for explicit grouping.
+                If groups is 'auto', gradients are grouped by data type into groups of at most
+                the tensor fusion threshold (HOROVOD_FUSION_THRESHOLD) bytes, in the order
+                the backward pass produces them.
                 If groups is a list of list of torch.Tensor. Tensors in the same
                 inner list will be assigned to the same group, while parameter that does
                 not appear in any list will form a group itself.
                 Defaults as None, which is no explicit groups.
         sparse_as_dense: If set True, convert all sparse gradients to dense and perform allreduce, then
                          convert back to sparse before applying the update.
+        bucket_cap_mb: If set, gradients are packed in reverse registration order into preallocated
+                       contiguous buffers of at most this many megabytes (a single larger parameter
+                       gets a bucket of its own). Each bucket is reduced with a single allreduce as
+                       soon as its last gradient is ready, and the reduced gradients are exposed as
+                       views into the bucket. Cannot be combined with groups.
+                       Defaults as None, which is one allreduce per parameter.
+        gradient_as_bucket_view: If set True, the gradient of every parameter is a view into its
+                                 bucket for the whole training run. The autograd engine then
+                                 accumulates gradients directly into the buckets, which are
+                                 reduced in place without copying gradients in or out.
+                                 ``zero_grad()`` zeroes the buckets in place. Implies bucketing
+                                 with a default ``bucket_cap_mb`` of 64 if it is not set.
+                                 Does not support sparse gradients.
+        overlap_step: If set True, ``step()`` updates the parameters of every reduced
+                      tensor, group or bucket as soon as its reduction completes, by
+                      running the wrapped optimizer on the corresponding subset of each
+                      param group. The optimizer updates of the first reduced gradients
+                      then overlap with the communication of the remaining ones. Requires
+                      an optimizer that updates every parameter independently, which holds
+                      for the ``torch.optim`` optimizers except ``LBFGS``. Gradient clipping
+                      across all parameters needs ``synchronize()`` before ``step()``, which
+                      disables the overlap. A closure passed to ``step()`` also disables it.
     """
     # We dynamically create a new class that inherits from the optimizer that was passed in.
     # The goal is to override the `step()` method with an allreduce implementation.
@@ -566,6 +1301,8 @@ def DistributedOptimizer(optimizer, named_parameters=None,
             raise ValueError('gradient_predivide_factor not supported yet with ROCm')
         if op != Average:
             raise ValueError('gradient_predivide_factor not supported with op != Average')
+        if isinstance(compression, PowerSGDCompressor):
+            raise ValueError('gradient_predivide_factor not supported with PowerSGD compression')
 
     if num_groups != 0:
         warnings.warn('Parameter `num_groups` has been replaced by `groups` '
@@ -573,12 +1310,86 @@ def DistributedOptimizer(optimizer, named_parameters=None,
         if groups is None:
             groups = num_groups
 
+    if op == Adasum and isinstance(compression, (SparseCompressor, PowerSGDCompressor, QuantizingCompressor)):
+        raise ValueError('Sparse, PowerSGD and quantizing compression are not supported with op == Adasum')
+
+    if overlap_step:
+        if op == Adasum:
+            raise ValueError('overlap_step is not supported with op == Adasum')
+        if isinstance(compression, PowerSGDCompressor):
+            raise ValueError('overlap_step is not supported with PowerSGD compression, '
+                             'which reduces all gradients together')
+        if isinstance(optimizer, torch.optim.LBFGS):
+            raise ValueError('overlap_step is not supported with torch.optim.LBFGS')
+
     if op != Adasum or size() == 1:
         cls = type(optimizer.__class__.__name__, (optimizer.__class__,),
                    dict(_DistributedOptimizer.__dict__))
         return cls(optimizer.param_groups, named_parameters, compression, backward_passes_per_step, op,
-                   gradient_predivide_factor, groups, sparse_as_dense)
+                   gradient_predivide_factor, groups, sparse_as_dense, bucket_cap_mb,
+                   gradient_as_bucket_view, overlap_step)
     else:
         cls = type(optimizer.__class__.__name__, (optimizer.__class__,),
                    dict(_DistributedAdasumOptimizer.__dict__))
         return cls(optimizer.param_groups, named_parameters, compression, backward_passes_per_step)
+
+
+def ShardedDistributedOptimizer(optimizer, named_parameters=None,
+                                backward_passes_per_step=1,
+                                op=Average,
+                                gradient_predivide_factor=1.0):
+    """
+    An optimizer that wraps another torch.optim.Optimizer and partitions its state
+    across ranks, similar to stage 1 of ZeRO. The trainable parameters of every param
+    group are flattened per dtype and device, and every rank keeps optimizer state
+    (e.g. momentum or Adam moments) only for its own contiguous shard, reducing the
+    optimizer memory of each rank to about ``1 / hvd.size()``.
+
+    The gradients of a bucket are flattened and combined with a reducescatter as soon as
+    ``loss.backward()`` has computed all of them, so that each rank only receives the
+    reduced gradients of its shard. Reducescatter runs on the CPU, so the gradients of
+    buckets on the GPU are allreduced instead and every rank keeps its shard of the
+    result. ``step()`` updates the local shard with the wrapped
+    optimizer and allgathers the updated shards, one bucket after the other through a
+    single staging buffer, back into the model parameters of every rank. Besides the
+    model, every rank only keeps its shard of the parameters and of the optimizer state.
+
+    ``state_dict()`` gathers the full state of all ranks in the format of the wrapped
+    optimizer and must be called on every rank. ``load_state_dict()`` must also be
+    called on every rank, each of which keeps its own shard of the loaded state. The
+    state can be loaded with a different number of ranks. Elastic training only commits
+    the shard of every rank and exchanges the committed shards between the workers when
+    the ranks change; the state of the shards of workers that failed or were removed is
+    lost, in which case the optimizer state is reset. ``hvd.broadcast_optimizer_state()``
+    gathers the full state, takes the hyperparameters and the unsharded state, such as
+    step counts, from the root rank, and leaves every rank with its shard of the result.
+
+    Arguments:
+        optimizer: Optimizer to use for computing gradients and applying updates.
+        named_parameters: A mapping between parameter names and values. Used for naming of
+                          reducescatter and allreduce operations. Typically just
+                          ``model.named_parameters()``.
+        backward_passes_per_step: Number of expected backward passes to perform
+                                  before calling step()/synchronize(). This
+                                  allows accumulating gradients over multiple
+                                  mini-batches before reducing and applying them.
+        op: The reduction operation to use when combining gradients across different ranks,
+            either Average or Sum.
+        gradient_predivide_factor: If op == Average, gradient_predivide_factor splits the averaging
+                                   before and after the sum. Gradients are scaled by
+                                   1.0 / gradient_predivide_factor before the sum and
+                                   gradient_predivide_factor / size after the sum.
+    """
+    if op not in (Average, Sum):
+        raise ValueError('ShardedDistributedOptimizer only supports op == Average or op == Sum')
+    if gradient_predivide_factor != 1.0 and op != Average:
+        raise ValueError('gradient_predivide_factor not supported with op != Average')
+    if isinstance(optimizer, torch.optim.LBFGS):
+        raise ValueError('ShardedDistributedOptimizer does not support torch.optim.LBFGS')
+
+    # The marker base lets the elastic state and broadcast_optimizer_state() recognize
+    # the optimizer, as the class itself is created dynamically.
+    cls = type(optimizer.__class__.__name__, (optimizer.__class__, _ShardedOptimizer),
+               dict(_ShardedDistributedOptimizer.__dict__))
+    return cls(optimizer.param_groups, named_parameters, backward_passes_per_step, op,
+               gradient_predivide_factor)
@@ -17,7 +17,10 @@ import os
 import unittest
 import warnings
 
-from horovod.common.util import _cache, extension_available, gloo_built, mpi_built
+from horovod.common.util import _cache, allgather_object_chunks, assign_roots, broadcast_object_chunks, \
+    deserialize_object, extension_available, gloo_built, mpi_built, serialize_object, split_list_by_size
+from horovod.common.process_sets import ProcessSet, global_process_set, process_set_by_id, \
+    process_set_id
 
 
 class CommonTests(unittest.TestCase):
@@ -82,3 +85,80 @@ class CommonTests(unittest.TestCase):
         state['key'] = 2
         value = fn()
         assert value == 1
+
+    def test_serialize_object(self):
+        """Test that objects survive serialization, including padding to a minimum size."""
+        obj = {'a': list(range(100)), 'b': bytearray(b'x' * 1000)}
+        assert deserialize_object(serialize_object(obj)) == obj
+
+        buf = serialize_object(obj, min_size=10000)
+        assert len(buf) == 10000
+        assert deserialize_object(buf) == obj
+        assert deserialize_object(bytes(buf)) == obj
+
+    def test_object_chunks(self):
+        """Test that small and large objects are broadcast and allgathered in chunks."""
+        for n in [1, 20]:
+            obj = {'n': n, 'data': bytearray(range(256)) * n}
+            sent = []
+
+            def root_chunk(chunk, index):
+                sent.append(bytes(chunk))
+                return chunk
+
+            # Non-root ranks receive the chunks sent by the root
+            def broadcast_chunk(chunk, index):
+                assert len(chunk) == len(sent[index])
+                return sent[index]
+
+            assert broadcast_object_chunks(obj, True, root_chunk,
+                                           first_chunk_size=512, chunk_size=1024) is obj
+            assert broadcast_object_chunks(obj, False, broadcast_chunk,
+                                           first_chunk_size=512, chunk_size=1024) == obj
+            # The first chunk carries the size and the start of the object, small objects
+            # take a single broadcast and the rest of larger ones is streamed
+            size = len(serialize_object(obj))
+            assert len(sent[0]) == 512 and sum(len(c) for c in sent) == max(size, 512)
+            assert len(sent) == 1 + (max(size - 512, 0) + 1023) // 1024
+            assert (len(sent) == 1) == (n == 1)
+
+            # Simulates two ranks contributing the same object
+            def allgather_chunk(chunk, index):
+                return bytes(chunk) * 2
+
+            assert allgather_object_chunks(obj, allgather_chunk,
+                                           first_chunk_size=4096, chunk_size=1024) == [obj, obj]
+
+    def test_assign_roots(self):
+        """Test that tensors are spread evenly and deterministically over the holders."""
+        sizes = [100, 10, 60, 40, 50, 0]
+        roots = assign_roots(sizes, [3, 1])
+        assert roots == assign_roots(sizes, [1, 3])
+        assert set(roots) == {1, 3}
+        loads = {r: sum(s for s, root in zip(sizes, roots) if root == r) for r in (1, 3)}
+        assert loads == {1: 140, 3: 120}
+        assert assign_roots(sizes, [0]) == [0] * len(sizes)
+
+    def test_split_list_by_size(self):
+        """Test that tensors are grouped by type up to the size limit in backward order."""
+        sizes = [40, 30, 10, 50, 20, 200]
+        dtypes = ['f', 'f', 'h', 'f', 'h', 'f']
+        groups = split_list_by_size(sizes, dtypes, 100)
+        assert groups == [[5], [2, 4], [1, 3], [0]]
+        assert split_list_by_size(sizes, dtypes, 0) == [[i] for i in reversed(range(len(sizes)))]
+        assert split_list_by_size([], [], 100) == []
+
+    def test_process_set_ranks(self):
+        """Test that process sets normalize their ranks and require registration."""
+        process_set = ProcessSet([3, 1, 1, 0])
+        assert process_set.ranks == [0, 1, 3]
+        assert process_set.process_set_id is None
+        with self.assertRaises(ValueError):
+            process_set.size()
+        with self.assertRaises(ValueError):
+            process_set_id(process_set)
+
+        assert process_set_id(global_process_set) == 0
+        assert process_set_by_id(0) is global_process_set
+        with self.assertRaises(ValueError):
+            process_set_by_id(-1)
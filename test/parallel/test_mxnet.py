@@ -566,6 +566,44 @@ class MXTests(unittest.TestCase):
                 'hvd.broadcast produces incorrect broadcasted tensor'
             count += 1
 
+    def test_horovod_grouped_broadcast(self):
+        """Test that the grouped broadcast correctly broadcasts lists of tensors."""
+        hvd.init()
+        rank = hvd.rank()
+        size = hvd.size()
+
+        # This test does not apply if there is only one worker.
+        if size == 1:
+            self.skipTest("Only one worker available")
+
+        dtypes = ['int32',   'int64',
+                  'float32', 'float64']
+        dims = [1, 2, 3]
+        ctx = self._current_context()
+        count = 0
+        shapes = [(), (17), (17, 17), (17, 17, 17)]
+        root_ranks = list(range(size))
+        for dim, root_rank in itertools.product(dims, root_ranks):
+            tensors = [(mx.nd.ones(shapes[dim], ctx=ctx) * rank).astype(dtype)
+                       for dtype in dtypes]
+            root_tensors = [(mx.nd.ones(shapes[dim], ctx=ctx) * root_rank).astype(dtype)
+                            for dtype in dtypes]
+
+            broadcast_tensors = hvd.grouped_broadcast(tensors, root_rank=root_rank,
+                                                      name=str(count))
+            for tensor, root_tensor, broadcast_tensor in zip(tensors, root_tensors, broadcast_tensors):
+                if rank != root_rank:
+                    assert not same(tensor.asnumpy(), root_tensor.asnumpy()), \
+                        'hvd.grouped_broadcast modifies source tensor'
+                assert same(broadcast_tensor.asnumpy(), root_tensor.asnumpy()), \
+                    'hvd.grouped_broadcast produces incorrect broadcasted tensor'
+
+            hvd.grouped_broadcast_(tensors, root_rank=root_rank, name=str(count) + '_')
+            for tensor, root_tensor in zip(tensors, root_tensors):
+                assert same(tensor.asnumpy(), root_tensor.asnumpy()), \
+                    'hvd.grouped_broadcast_ produces incorrect broadcasted tensor'
+            count += 1
+
     def test_horovod_broadcast_inplace(self):
         """Test that the broadcast correctly broadcasts 1D, 2D, 3D tensors."""
         hvd.init()
@@ -884,6 +922,29 @@ class MXTests(unittest.TestCase):
         # To prevent premature shutdown from rank 0 for this test
         mx.nd.waitall()
 
+    def test_horovod_reducescatter(self):
+        """Test that the reducescatter correctly sums and scatters 1D, 2D, 3D tensors."""
+        hvd.init()
+        rank = hvd.rank()
+        size = hvd.size()
+        dtypes = ['int32',   'int64',
+                  'float32', 'float64']
+        dims = [1, 2, 3]
+        ctx = self._current_context()
+        for dtype, dim in itertools.product(dtypes, dims):
+            # The first dimension is not divisible by the number of workers, so
+            # the lower ranks receive an extra row.
+            dim0 = 2 * size + 1
+            tensor = mx.nd.arange(dim0 * 4 ** (dim - 1), ctx=ctx, dtype=dtype)
+            tensor = tensor.reshape([dim0] + [4] * (dim - 1))
+            reduced = hvd.reducescatter(tensor, average=False)
+
+            offset = rank * (dim0 // size) + min(rank, dim0 % size)
+            rows = dim0 // size + (1 if rank < dim0 % size else 0)
+            expected = tensor.asnumpy()[offset:offset + rows] * size
+            assert reduced.shape == expected.shape, 'hvd.reducescatter produces incorrect shape'
+            assert np.array_equal(reduced.asnumpy(), expected), 'hvd.reducescatter produces incorrect results'
+
     def test_horovod_alltoall(self):
         """Test that the alltoall correctly distributes 1D, 2D, and 3D tensors."""
         hvd.init()
@@ -257,6 +257,23 @@ class TensorFlowTests(tf.test.TestCase):
         self.assertTrue(self.evaluate(tf.reduce_all(tests)),
                         "hvd.allreduce produces incorrect results")
 
+    def test_horovod_allreduce_cpu_priority(self):
+        """Test on CPU that prioritized allreduces produce correct results."""
+        hvd.init()
+        size = hvd.size()
+        tests = []
+        with tf.device("/cpu:0"):
+            for i in range(10):
+                tensor = self.random_uniform([17, 17], -100, 100, dtype=tf.int32)
+                summed = hvd.allreduce(tensor, op=hvd.Sum, name='allreduce_priority_%d' % i,
+                                       priority=-i)
+                tests.append(tf.reduce_max(tf.abs(summed - tensor * size)) <= 0)
+            tensors = [self.random_uniform([17], -100, 100, dtype=tf.int32) for _ in range(3)]
+            summed = hvd.grouped_allreduce(tensors, op=hvd.Sum, priority=10)
+            tests += [tf.reduce_max(tf.abs(s - t * size)) <= 0 for s, t in zip(summed, tensors)]
+        self.assertTrue(self.evaluate(tf.reduce_all(tests)),
+                        "hvd.allreduce produces incorrect results")
+
     # Note: TF does not support FP64 op attributes so scaling factor is cast to FP32
     # by op and loses precision. We skip FP64 version of pre/postscale tests for this reason.
     # See https://github.com/tensorflow/tensorflow/pull/39452 for PR to resolve this limitation.
@@ -1571,6 +1588,31 @@ class TensorFlowTests(tf.test.TestCase):
                     tf.cast(root_tensor, tf.int32), tf.cast(broadcasted_tensor, tf.int32)))),
                 "hvd.broadcast produces incorrect broadcasted tensor")
 
+    def test_horovod_grouped_broadcast_cpu(self):
+        """Test that the grouped broadcast correctly broadcasts tensors of mixed types on CPU."""
+        hvd.init()
+        rank = hvd.rank()
+        size = hvd.size()
+
+        # This test does not apply if there is only one worker.
+        if size == 1:
+            self.skipTest("Only one worker available")
+
+        dtypes = [tf.uint8, tf.int32, tf.int64, tf.float16, tf.float32, tf.float64]
+        dims = [1, 2, 3]
+        root_ranks = list(range(size))
+        for dim, root_rank in itertools.product(dims, root_ranks):
+            with tf.device("/cpu:0"):
+                tensors = [tf.cast(tf.ones([17] * dim) * rank, dtype=dtype) for dtype in dtypes]
+                root_tensors = [tf.cast(tf.ones([17] * dim) * root_rank, dtype=dtype) for dtype in dtypes]
+                broadcasted_tensors = hvd.grouped_broadcast(tensors, root_rank)
+            for root_tensor, broadcasted_tensor in zip(root_tensors, broadcasted_tensors):
+                self.assertEqual(root_tensor.dtype, broadcasted_tensor.dtype)
+                self.assertTrue(
+                    self.evaluate(tf.reduce_all(tf.equal(
+                        tf.cast(root_tensor, tf.int32), tf.cast(broadcasted_tensor, tf.int32)))),
+                    "hvd.grouped_broadcast produces incorrect broadcasted tensor")
+
     def test_horovod_broadcast_gpu(self):
         """Test that the broadcast correctly broadcasts 1D, 2D, 3D tensors on GPU."""
         # Only do this test if there are GPUs available.
@@ -1752,6 +1794,62 @@ class TensorFlowTests(tf.test.TestCase):
                             "gradient %s differs from expected %s, "
                             "error: %s" % (grad_out, expected, str(err)))
 
+    def test_horovod_reducescatter_cpu(self):
+        """Test that the reducescatter correctly sums and scatters 1D, 2D, 3D tensors."""
+        hvd.init()
+        rank = hvd.rank()
+        size = hvd.size()
+        dtypes = self.filter_supported_types([tf.int32, tf.int64, tf.float32, tf.float64])
+        dims = [1, 2, 3]
+        for dtype, dim in itertools.product(dtypes, dims):
+            with tf.device("/cpu:0"):
+                # The first dimension is not divisible by the number of
+                # workers, so the lower ranks receive an extra row.
+                dim0 = 2 * size + 1
+                tensor = tf.reshape(tf.range(dim0 * 4 ** (dim - 1)), [dim0] + [4] * (dim - 1))
+                tensor = tf.cast(tensor, dtype=dtype)
+                reduced = hvd.reducescatter(tensor, op=hvd.Sum)
+
+            offset = rank * (dim0 // size) + min(rank, dim0 % size)
+            rows = dim0 // size + (1 if rank < dim0 % size else 0)
+            expected = self.evaluate(tensor)[offset:offset + rows] * size
+            reduced = self.evaluate(reduced)
+            self.assertSequenceEqual(reduced.shape, expected.shape)
+            self.assertTrue(np.array_equal(reduced, expected),
+                            "hvd.reducescatter produces incorrect results")
+
+    def test_horovod_reducescatter_grad_cpu(self):
+        """Test the correctness of the reducescatter gradient on CPU."""
+        hvd.init()
+        size = hvd.size()
+
+        # As of TensorFlow v1.9, gradients are not supported on
+        # integer tensors
+        dtypes = [tf.float32, tf.float64]
+        dims = [1, 2, 3]
+        for dtype, dim in itertools.product(dtypes, dims):
+            with tf.device("/cpu:0"):
+                if _executing_eagerly():
+                    tensor = self.tfe.Variable(
+                        tf.ones([size * 2] + [17] * (dim - 1), dtype=dtype))
+                    with tf.GradientTape() as tape:
+                        reduced = hvd.reducescatter(tensor, op=hvd.Average)
+                    grad_ys = tf.ones([2] + [17] * (dim - 1), dtype=dtype)
+                    grad_out = tape.gradient(reduced, tensor, grad_ys)
+                else:
+                    tensor = tf.ones([size * 2] + [17] * (dim - 1), dtype=dtype)
+                    reduced = hvd.reducescatter(tensor, op=hvd.Average)
+                    grad_ys = tf.ones([2] + [17] * (dim - 1), dtype=dtype)
+                    grad = tf.gradients(reduced, tensor, grad_ys)[0]
+                    grad_out = self.evaluate(grad)
+
+            expected = np.ones([size * 2] + [17] * (dim - 1)) / size
+            err = np.linalg.norm(expected - grad_out)
+            self.assertLess(err, 0.00000001,
+                            "gradient %s differs from expected %s, "
+                            "error: %s" %
+                            (grad_out, expected, str(err)))
+
     def test_horovod_alltoall_cpu(self):
         """Test that the alltoall correctly distributes 1D, 2D, and 3D tensors."""
         hvd.init()
@@ -2545,6 +2643,56 @@ class TensorFlowTests(tf.test.TestCase):
 
         hvd.broadcast_global_variables(root_rank=0)
 
+    def test_horovod_allreduce_xla(self):
+        """Test that allreduces compile into a jit_compile'd function on the CPU."""
+        if not _executing_eagerly() or LooseVersion(tf.__version__) < LooseVersion('2.7.0'):
+            self.skipTest("XLA ops require TensorFlow 2.7 in eager mode")
+        if os.environ.get('HOROVOD_ENABLE_XLA_OPS') != '1':
+            self.skipTest("HOROVOD_ENABLE_XLA_OPS is not set")
+
+        hvd.init()
+        rank = hvd.rank()
+        size = hvd.size()
+
+        @tf.function(jit_compile=True)
+        def step(x, y):
+            summed = hvd.allreduce(x * 2.0, op=hvd.Sum)
+            averaged, grouped = hvd.grouped_allreduce([x, y], op=hvd.Average)
+            return summed, averaged, grouped
+
+        with tf.device("/cpu:0"):
+            x = tf.fill([3, 5], float(rank))
+            y = tf.fill([7], float(rank + 1))
+            for _ in range(2):
+                summed, averaged, grouped = step(x, y)
+                self.assertAllClose(summed, np.full([3, 5], size * (size - 1)))
+                self.assertAllClose(averaged, np.full([3, 5], (size - 1) / 2))
+                self.assertAllClose(grouped, np.full([7], (size + 1) / 2))
+
+    def test_horovod_broadcast_variables(self):
+        """Test that variables of mixed dtypes and shapes are broadcast from the root rank."""
+        hvd.init()
+        rank = hvd.rank()
+        size = hvd.size()
+
+        with tf.device("/cpu:0"):
+            variables = [tf.Variable(np.full([2, 3], rank, dtype=np.float32)),
+                         tf.Variable(np.full([4], rank, dtype=np.int64)),
+                         tf.Variable(float(rank)),
+                         tf.Variable(np.full([3, 1], rank, dtype=np.float32)),
+                         tf.Variable(np.full([2], rank, dtype=np.float64))]
+            if not hvd._executing_eagerly():
+                self.evaluate(tf.variables_initializer(variables))
+
+            for root_rank in range(size):
+                bcast_op = hvd.broadcast_variables(variables, root_rank)
+                if not hvd._executing_eagerly():
+                    self.evaluate(bcast_op)
+                for var in variables:
+                    value = self.evaluate(var)
+                    self.assertEqual(value.shape, tuple(var.shape.as_list()))
+                    self.assertAllEqual(value, np.full(value.shape, root_rank))
+
     def test_compression_fp16(self):
         valid_dtypes = [tf.float16, tf.float32, tf.float64]
         invalid_dtypes = [tf.uint8, tf.int8, tf.uint16, tf.int16,
@@ -2581,6 +2729,115 @@ class TensorFlowTests(tf.test.TestCase):
             err = np.linalg.norm(expected - actual)
             self.assertLess(err, 0.00000001)
 
+    def test_compression_sparse(self):
+        """Test that sparse compressors select elements and keep the remainder as residual."""
+        if not _executing_eagerly():
+            self.skipTest("Residual variables are initialized eagerly in this test")
+
+        tensor = tf.constant([[0.1, -4.0, 0.2], [3.0, 0.0, -0.5]])
+
+        compression = hvd.Compression.topk(ratio=2.0 / 6)
+        tensor_compressed, ctx = compression.compress(tensor, name='t')
+        self.assertIsInstance(tensor_compressed, tf.IndexedSlices)
+        self.assertEqual(tensor_compressed.values.shape[0], 2)
+
+        actual = self.evaluate(compression.decompress(tensor_compressed, ctx))
+        expected = np.array([[0.0, -4.0, 0.0], [3.0, 0.0, 0.0]])
+        self.assertAllClose(actual, expected)
+
+        # Elements that were not sent are fed back on the next compression
+        tensor_compressed, ctx = compression.compress(tf.zeros_like(tensor), name='t')
+        actual = self.evaluate(compression.decompress(tensor_compressed, ctx))
+        expected = np.array([[0.0, 0.0, 0.2], [0.0, 0.0, -0.5]])
+        self.assertAllClose(actual, expected)
+
+        compression = hvd.Compression.threshold(threshold=1.0)
+        tensor_compressed, ctx = compression.compress(tensor)
+        self.assertEqual(tensor_compressed.values.shape[0], 2)
+
+        # Integer tensors are not compressed
+        int_tensor = tf.ones([5], dtype=tf.int32)
+        tensor_compressed, ctx = compression.compress(int_tensor, name='i')
+        self.assertNotIsInstance(tensor_compressed, tf.IndexedSlices)
+
+    def test_horovod_allreduce_sparse_compression(self):
+        """Test that allreduce with top-k compression matches the allreduce of the selected elements."""
+        if not _executing_eagerly():
+            self.skipTest("Residual variables are initialized eagerly in this test")
+
+        hvd.init()
+        size = hvd.size()
+        with tf.device("/cpu:0"):
+            # Every rank has the same tensor, so top-k selects the same elements
+            tensor = tf.reshape(tf.range(12, dtype=tf.float32), [3, 4])
+            compression = hvd.Compression.topk(ratio=0.25)
+            reduced = hvd.allreduce(tensor, op=hvd.Sum, compression=compression,
+                                    name='allreduce_sparse_compression')
+
+        expected = np.zeros([12])
+        expected[-3:] = np.arange(9, 12) * size
+        self.assertAllClose(self.evaluate(reduced), expected.reshape([3, 4]))
+
+    def test_horovod_allreduce_indexed_slices(self):
+        """Test that sparse allreduce sums duplicate rows, with and without switching to dense."""
+        hvd.init()
+        size = hvd.size()
+        old_threshold = os.environ.get('HOROVOD_SPARSE_DENSITY_THRESHOLD')
+        try:
+            for threshold in ['0', '1000']:
+                os.environ['HOROVOD_SPARSE_DENSITY_THRESHOLD'] = threshold
+                with tf.device("/cpu:0"):
+                    values = tf.ones([5, 4]) * (hvd.rank() + 1)
+                    tensor = tf.IndexedSlices(values, tf.constant([1, 3, 1, 1, 7]),
+                                              dense_shape=tf.constant([10, 4]))
+                    reduced = hvd.allreduce(tensor, op=hvd.Sum)
+
+                expected = np.zeros([10, 4])
+                expected[[1, 3, 7]] = np.array([[3], [1], [1]]) * size * (size + 1) / 2
+                self.assertIsInstance(reduced, tf.IndexedSlices)
+                self.assertAllClose(self.evaluate(tf.convert_to_tensor(reduced)), expected)
+        finally:
+            if old_threshold is None:
+                del os.environ['HOROVOD_SPARSE_DENSITY_THRESHOLD']
+            else:
+                os.environ['HOROVOD_SPARSE_DENSITY_THRESHOLD'] = old_threshold
+
+    def test_compression_powersgd(self):
+        """Test that PowerSGD reconstructs low-rank gradients and reduces the others exactly."""
+        if not _executing_eagerly():
+            self.skipTest("PowerSGD state variables are initialized eagerly in this test")
+
+        hvd.init()
+        size = hvd.size()
+        with tf.device("/cpu:0"):
+            u = tf.reshape(tf.range(1, 9, dtype=tf.float32), [8, 1])
+            v = tf.reshape(tf.range(1, 7, dtype=tf.float32), [1, 6])
+            # Every rank has a rank-1 gradient, so a single power iteration is exact
+            matrix = tf.matmul(u, v) * (hvd.rank() + 1)
+            bias = tf.ones([6]) * (hvd.rank() + 1)
+
+            compression = hvd.Compression.powersgd(rank=1)
+            reduced_matrix, reduced_bias = compression.reduce([matrix, bias], ['matrix', 'bias'],
+                                                              op=hvd.Sum)
+
+        scale = size * (size + 1) / 2
+        self.assertAllClose(self.evaluate(reduced_matrix), self.evaluate(tf.matmul(u, v)) * scale,
+                            rtol=1e-4)
+        self.assertAllClose(self.evaluate(reduced_bias), np.ones([6]) * scale)
+
+    def test_horovod_allreduce_quantized(self):
+        """Test that quantized allreduce reduces dequantized values without overflowing."""
+        hvd.init()
+        size = hvd.size()
+        with tf.device("/cpu:0"):
+            # The same values on every rank would overflow int8 if the codes were summed
+            tensor = tf.reshape(tf.linspace(-1.0, 1.0, 5000), [50, 100])
+            for compression in [hvd.Compression.int8(), hvd.Compression.bf16()]:
+                name = 'allreduce_quantized_%s' % type(compression).__name__
+                reduced = hvd.allreduce(tensor, op=hvd.Sum, compression=compression, name=name)
+                self.assertAllClose(self.evaluate(reduced), self.evaluate(tensor) * size,
+                                    atol=0.02 * size)
+
     def test_broadcast_object(self):
         hvd.init()
 
@@ -2827,6 +3084,30 @@ class TensorFlowTests(tf.test.TestCase):
                 self.assertAllClose(self.evaluate(sync_bn.moving_mean), self.evaluate(bn.moving_mean))
                 self.assertAllClose(self.evaluate(sync_bn.moving_variance), self.evaluate(bn.moving_variance))
 
+    def test_flat_gradient_accumulator(self):
+        """Test that gradients are accumulated per dtype and device and read back in order."""
+        if not _executing_eagerly():
+            self.skipTest("Accumulator variables are created eagerly in this test")
+
+        from horovod.tensorflow.gradient_aggregation import FlatGradientAccumulator
+
+        with tf.device("/cpu:0"):
+            grads = [tf.ones([2, 3]), tf.ones([4], dtype=tf.float64), tf.ones([]), tf.ones([3, 1])]
+            accumulator = FlatGradientAccumulator(
+                grads, lambda name, initial_value: tf.Variable(initial_value, trainable=False))
+            self.assertEqual(len(accumulator), len(grads))
+            self.assertEqual(len(accumulator.variables), 2)
+
+            for step in range(1, 3):
+                accumulator.add([g * step for g in grads])
+            for grad, value in zip(grads, accumulator.read()):
+                self.assertEqual(value.dtype, grad.dtype)
+                self.assertAllClose(value, grad * 3)
+
+            accumulator.clear()
+            for grad, value in zip(grads, accumulator.read()):
+                self.assertAllClose(value, tf.zeros_like(grad))
+
     def test_local_gradient_aggregation(self):
         """Test that local gradient aggregation works as expected."""
 
@@ -37,6 +37,13 @@ import torch.nn.functional as F
 
 import horovod.torch as hvd
 
+try:
+    # MPI initialized by mpi4py outlives Horovod shutdown, so tests can
+    # re-initialize Horovod on MPI
+    from mpi4py import MPI
+except ImportError:
+    MPI = None
+
 sys.path.append(os.path.join(os.path.dirname(__file__), os.pardir, 'utils'))
 
 from common import mpi_env_rank_and_size, skip_or_fail_gpu_test, temppath
@@ -78,6 +85,43 @@ class TorchTests(unittest.TestCase):
            types = [t for t in types if t in ccl_supported_types]
         return types
 
+    def local_batch(self):
+        # Every rank trains on different data
+        torch.manual_seed(hvd.rank())
+        return torch.randn(8, 10)
+
+    def create_mlp(self):
+        # Every rank starts from the same weights
+        torch.manual_seed(123)
+        return nn.Sequential(nn.Linear(10, 20), nn.ReLU(), nn.Linear(20, 5))
+
+    def train_steps(self, model, optimizer, x, steps=3):
+        for _ in range(steps):
+            optimizer.zero_grad()
+            model(x).sum().backward()
+            optimizer.step()
+
+    def synchronized_grads(self, x, steps=2, **kwargs):
+        # Returns the optimizer and the reduced gradients of every step
+        model = self.create_mlp()
+        optimizer = hvd.DistributedOptimizer(torch.optim.SGD(model.parameters(), lr=0.1),
+                                             named_parameters=model.named_parameters(), **kwargs)
+        grads = []
+        for _ in range(steps):
+            optimizer.zero_grad()
+            model(x).sum().backward()
+            optimizer.synchronize()
+            grads.append([p.grad.clone() for p in model.parameters()])
+            with optimizer.skip_synchronize():
+                optimizer.step()
+        return optimizer, grads
+
+    def assert_params_in_sync(self, model, name, atol=1e-8):
+        for param_name, p in model.named_parameters():
+            gathered = hvd.allgather(p.data.unsqueeze(0), name=name + '.' + param_name)
+            for i in range(hvd.size()):
+                assert torch.allclose(gathered[i], p.data, atol=atol)
+
     def test_gpu_required(self):
         if not torch.cuda.is_available():
             skip_or_fail_gpu_test(self, "No GPUs available")
@@ -292,6 +336,240 @@ class TorchTests(unittest.TestCase):
 
             assert torch.allclose(summed, multiplied, threshold), 'hvd.allreduce produces incorrect results'
 
+    def test_horovod_allreduce_as_completed(self):
+        """Test that as_completed synchronizes every handle once and runs the
+        attached callbacks with the results."""
+        hvd.init()
+        size = hvd.size()
+        tensors = {}
+        for i in range(10):
+            torch.manual_seed(1234 + i)
+            tensor = torch.FloatTensor(17, 17).random_(-100, 100)
+            handle = hvd.allreduce_async(tensor, name='as_completed.%d' % i, op=hvd.Sum)
+            tensors[handle] = tensor
+
+        results = {}
+        for handle in tensors:
+            hvd.add_done_callback(handle, lambda output, handle=handle: results.setdefault(handle, output))
+
+        done = hvd.wait_any(tensors.keys())
+        assert done in tensors
+        assert hvd.poll(done)
+
+        seen = []
+        for handle, summed in hvd.as_completed(tensors.keys(), timeout=60):
+            seen.append(handle)
+            assert results[handle] is summed
+            assert torch.allclose(summed, tensors[handle] * size), 'hvd.allreduce produces incorrect results'
+        assert sorted(seen) == sorted(tensors.keys())
+
+        with self.assertRaises(ValueError):
+            hvd.add_done_callback(seen[0], lambda output: None)
+
+    def test_horovod_allreduce_async_priority(self):
+        """Test that prioritized allreduces produce correct results regardless of
+        the order they are scheduled in."""
+        hvd.init()
+        size = hvd.size()
+        tests = []
+        for i in range(10):
+            torch.manual_seed(1234 + i)
+            tensor = torch.FloatTensor(17, 17).random_(-100, 100)
+            handle = hvd.allreduce_async(tensor, op=hvd.Sum, name='priority.%d' % i, priority=-i)
+            tests.append((tensor * size, handle))
+
+        tensors = [torch.FloatTensor(17).random_(-100, 100) for _ in range(3)]
+        grouped_handle = hvd.grouped_allreduce_async(tensors, op=hvd.Sum, name='priority.grouped',
+                                                     priority=10)
+
+        for multiplied, handle in tests:
+            summed = hvd.synchronize(handle)
+            assert torch.allclose(summed, multiplied), 'hvd.allreduce produces incorrect results'
+        for tensor, summed in zip(tensors, hvd.synchronize(grouped_handle)):
+            assert torch.allclose(summed, tensor * size), 'hvd.grouped_allreduce produces incorrect results'
+
+    @pytest.mark.skipif(platform.system() == 'Darwin', reason='Reinit not supported on macOS')
+    def test_horovod_allreduce_partitioned(self):
+        """Test that tensors larger than the partition size are reduced correctly."""
+        gloo_rank = int(os.getenv('HOROVOD_RANK', -1))
+        if gloo_rank == -1:
+            # Horovod cannot be re-initialized after shutdown when using MPI, so
+            # this test can only be done using the Gloo controller
+            self.skipTest("Gloo is not available")
+
+        hvd.init()
+        hvd.shutdown()
+        os.environ['HOROVOD_TENSOR_PARTITION_SIZE'] = str(1000)
+        try:
+            hvd.init()
+            size = hvd.size()
+
+            torch.manual_seed(1234)
+            large = torch.FloatTensor(100, 17).random_(-100, 100)
+            small = torch.FloatTensor(17).random_(-100, 100)
+            large_handle = hvd.allreduce_async(large, op=hvd.Sum, name='partitioned.large')
+            small_handle = hvd.allreduce_async(small, op=hvd.Sum, name='partitioned.small')
+            inplace = large.clone()
+            inplace_handle = hvd.allreduce_async_(inplace, op=hvd.Sum, name='partitioned.inplace')
+
+            summed = hvd.synchronize(large_handle)
+            self.assertEqual(summed.shape, large.shape)
+            assert torch.allclose(summed, large * size), 'hvd.allreduce produces incorrect results'
+            assert torch.allclose(hvd.synchronize(small_handle), small * size)
+            hvd.synchronize(inplace_handle)
+            assert torch.allclose(inplace, large * size)
+        finally:
+            del os.environ['HOROVOD_TENSOR_PARTITION_SIZE']
+            hvd.shutdown()
+            hvd.init()
+
+    def test_horovod_allreduce_shm(self):
+        """Test that the shared memory allreduce reduces tensors larger than its slots correctly."""
+        gloo_rank = int(os.getenv('HOROVOD_RANK', -1))
+        if gloo_rank == -1:
+            # Horovod cannot be re-initialized after shutdown when using MPI, so
+            # this test can only be done using the Gloo controller
+            self.skipTest("Gloo is not available")
+
+        hvd.init()
+        if hvd.local_size() < 2:
+            self.skipTest("Shared memory allreduce requires more than one worker on a host")
+
+        hvd.shutdown()
+        os.environ['HOROVOD_SHM_ALLREDUCE'] = '1'
+        try:
+            hvd.init()
+            rank = hvd.rank()
+            size = hvd.size()
+
+            # More than fits into a 4 MB slot, with a partial last piece
+            num_elements = 3 * 1024 * 1024 + 7
+            dtypes = self.filter_supported_types([torch.HalfTensor, torch.IntTensor])
+            for i, dtype in enumerate(dtypes):
+                # Small integers keep the fp16 sums exact
+                prescale, postscale = (0.5, 2.0) if dtype == torch.HalfTensor else (2.0, 3.0)
+                expected = torch.zeros(num_elements, dtype=torch.float64)
+                for r in range(size):
+                    torch.manual_seed(1234 + r)
+                    tensor = torch.IntTensor(num_elements).random_(-8, 8)
+                    expected += tensor.double() * prescale
+                    if r == rank:
+                        local = tensor.type(dtype)
+                expected *= postscale
+
+                summed = hvd.allreduce(local, op=hvd.Sum, name='shm.%d' % i,
+                                       prescale_factor=prescale, postscale_factor=postscale)
+                assert summed.type() == local.type()
+                assert torch.equal(summed.double(), expected), \
+                    'hvd.allreduce produces incorrect results with shared memory'
+        finally:
+            del os.environ['HOROVOD_SHM_ALLREDUCE']
+            hvd.shutdown()
+            hvd.init()
+
+    def test_horovod_allreduce_cpu_reduction_threads(self):
+        """Test that fused buffers reduced by several CPU threads are summed correctly."""
+        gloo_rank = int(os.getenv('HOROVOD_RANK', -1))
+        if gloo_rank == -1:
+            # The CPU reduction kernels are used by the Gloo operations, and
+            # Horovod cannot be re-initialized after shutdown when using MPI
+            self.skipTest("Gloo is not available")
+
+        hvd.init()
+        hvd.shutdown()
+        os.environ['HOROVOD_CPU_REDUCTION_THREADS'] = '4'
+        try:
+            hvd.init()
+            rank = hvd.rank()
+            size = hvd.size()
+
+            # Each tensor holds several 256 KB chunks and an odd tail, and the
+            # tensors of a type are fused into a buffer of several MB
+            lengths = [1024 * 1024 + 13, 512 * 1024 + 1, 777777]
+            dtypes = self.filter_supported_types([torch.HalfTensor, torch.FloatTensor,
+                                                  torch.IntTensor])
+            handles = []
+            for i, dtype in enumerate(dtypes):
+                for j, length in enumerate(lengths):
+                    expected = torch.zeros(length, dtype=torch.float64)
+                    for r in range(size):
+                        torch.manual_seed(1234 + 100 * r + j)
+                        # Small integers keep the fp16 sums exact
+                        tensor = torch.IntTensor(length).random_(-8, 8)
+                        expected += tensor.double()
+                        if r == rank:
+                            local = tensor.type(dtype)
+                    handle = hvd.allreduce_async(local, op=hvd.Sum,
+                                                 name='reduction_threads.%d.%d' % (i, j))
+                    handles.append((handle, expected))
+
+            for handle, expected in handles:
+                summed = hvd.synchronize(handle)
+                assert torch.equal(summed.double(), expected), \
+                    'hvd.allreduce produces incorrect results with several reduction threads'
+        finally:
+            del os.environ['HOROVOD_CPU_REDUCTION_THREADS']
+            hvd.shutdown()
+            hvd.init()
+
+    def test_horovod_process_set_allreduce(self):
+        """Test that collectives on a process set only involve its members."""
+        gloo_rank = int(os.getenv('HOROVOD_RANK', -1))
+        if gloo_rank == -1 and MPI is None:
+            # Horovod cannot be re-initialized after shutdown when it
+            # finalizes MPI itself
+            self.skipTest("mpi4py is not available")
+
+        hvd.init()
+        size = hvd.size()
+        if size < 2:
+            self.skipTest("Only one worker available")
+
+        hvd.shutdown()
+        even_set = hvd.ProcessSet(range(0, size, 2))
+        odd_set = hvd.ProcessSet(range(1, size, 2))
+        try:
+            hvd.init(process_sets=[even_set, odd_set])
+            rank = hvd.rank()
+            process_set = even_set if rank % 2 == 0 else odd_set
+            other_set = odd_set if rank % 2 == 0 else even_set
+            assert process_set.included() and not other_set.included()
+            assert process_set.size() == len(process_set.ranks)
+            assert process_set.rank() == process_set.ranks.index(rank)
+
+            tensor = torch.FloatTensor(17).fill_(rank)
+            summed = hvd.allreduce(tensor, op=hvd.Sum, name='process_set.allreduce',
+                                   process_set=process_set)
+            assert torch.allclose(summed, torch.FloatTensor(17).fill_(sum(process_set.ranks))), \
+                'hvd.allreduce produces incorrect results on a process set'
+
+            gathered = hvd.allgather(tensor.view(1, 17), name='process_set.allgather',
+                                     process_set=process_set)
+            assert gathered[:, 0].tolist() == process_set.ranks
+
+            root_rank = process_set.size() - 1
+            broadcasted = hvd.broadcast(tensor, root_rank, name='process_set.broadcast',
+                                        process_set=process_set)
+            assert torch.equal(broadcasted, torch.FloatTensor(17).fill_(process_set.ranks[root_rank]))
+
+            if torch.cuda.is_available():
+                # GPU tensors are staged through host memory
+                summed = hvd.allreduce(tensor.cuda(hvd.local_rank()), op=hvd.Sum,
+                                       name='process_set.allreduce.cuda',
+                                       process_set=process_set)
+                assert summed.is_cuda
+                assert torch.allclose(summed.cpu(), torch.FloatTensor(17).fill_(sum(process_set.ranks)))
+
+            # Global collectives are unaffected by the process sets
+            summed = hvd.allreduce(tensor, op=hvd.Sum, name='process_set.global')
+            assert torch.allclose(summed, torch.FloatTensor(17).fill_(sum(range(size))))
+
+            with pytest.raises(ValueError):
+                hvd.allreduce(tensor, name='process_set.other', process_set=other_set)
+        finally:
+            hvd.shutdown()
+            hvd.init()
+
     def test_horovod_allreduce_multi_gpu(self):
         """Test that the allreduce works on multiple GPUs."""
         # Only do this test if there are GPUs available.
@@ -1061,6 +1339,45 @@ class TorchTests(unittest.TestCase):
             assert (broadcasted_tensor == root_tensor).min() == 1, \
                 'hvd.broadcast produces incorrect broadcasted tensor'
 
+    def test_horovod_grouped_broadcast(self):
+        """Test that the grouped broadcast correctly broadcasts lists of tensors of mixed types."""
+        hvd.init()
+        rank = hvd.rank()
+        size = hvd.size()
+
+        # This test does not apply if there is only one worker.
+        if size == 1:
+            self.skipTest("Only one worker available")
+
+        dtypes = [torch.ByteTensor, torch.IntTensor, torch.LongTensor,
+                  torch.FloatTensor, torch.DoubleTensor]
+        if torch.cuda.is_available():
+            dtypes += [torch.cuda.IntTensor, torch.cuda.LongTensor,
+                       torch.cuda.FloatTensor, torch.cuda.DoubleTensor]
+        dims = [1, 2, 3]
+        root_ranks = list(range(size))
+        for dtype, dim, root_rank in itertools.product(dtypes, dims, root_ranks):
+            # Mix the dtype under test with float tensors on the same device
+            float_dtype = torch.cuda.FloatTensor if dtype.is_cuda else torch.FloatTensor
+            dtypes_group = [dtype if i % 2 == 0 else float_dtype for i in range(5)]
+            tensors = [self.cast_and_place(torch.FloatTensor(*([17] * dim)).fill_(i + 1).mul_(rank), t)
+                       for i, t in enumerate(dtypes_group)]
+            root_tensors = [self.cast_and_place(torch.FloatTensor(*([17] * dim)).fill_(i + 1).mul_(root_rank), t)
+                            for i, t in enumerate(dtypes_group)]
+
+            broadcasted_tensors = hvd.grouped_broadcast(tensors, root_rank)
+            for tensor, root_tensor, broadcasted_tensor in zip(tensors, root_tensors, broadcasted_tensors):
+                if root_rank != rank:
+                    assert (tensor != root_tensor).max() == 1, \
+                        'hvd.grouped_broadcast modifies source tensor'
+                assert (broadcasted_tensor == root_tensor).min() == 1, \
+                    'hvd.grouped_broadcast produces incorrect broadcasted tensor'
+
+            hvd.grouped_broadcast_(tensors, root_rank)
+            for tensor, root_tensor in zip(tensors, root_tensors):
+                assert (tensor == root_tensor).min() == 1, \
+                    'hvd.grouped_broadcast_ produces incorrect broadcasted tensor'
+
     def test_horovod_broadcast_error(self):
         """Test that the broadcast returns an error if any dimension besides
         the first is different among the tensors being broadcasted."""
@@ -1177,6 +1494,73 @@ class TorchTests(unittest.TestCase):
                             "gradient %s differs from expected %s, "
                             "error: %s" % (grad_out, expected, str(err)))
 
+    def test_horovod_reducescatter(self):
+        """Test that the reducescatter correctly sums and scatters 1D, 2D, 3D tensors."""
+        hvd.init()
+        rank = hvd.rank()
+        size = hvd.size()
+        dtypes = self.filter_supported_types([torch.IntTensor, torch.LongTensor,
+                                              torch.FloatTensor, torch.DoubleTensor])
+        if torch.cuda.is_available():
+            dtypes += [torch.cuda.IntTensor, torch.cuda.LongTensor,
+                       torch.cuda.FloatTensor, torch.cuda.DoubleTensor]
+        dims = [1, 2, 3]
+        ops = [hvd.Sum, hvd.Average]
+        for dtype, dim, op in itertools.product(dtypes, dims, ops):
+            # The first dimension is not divisible by the number of workers, so
+            # the lower ranks receive an extra row.
+            dim0 = 2 * size + 1
+            tensor = torch.arange(dim0 * 4 ** (dim - 1)).view([dim0] + [4] * (dim - 1))
+            tensor = self.cast_and_place(tensor, dtype)
+            reduced = hvd.reducescatter(tensor, op=op)
+
+            offset = rank * (dim0 // size) + min(rank, dim0 % size)
+            rows = dim0 // size + (1 if rank < dim0 % size else 0)
+            expected = tensor.narrow(0, offset, rows)
+            if op == hvd.Sum:
+                expected = expected * size
+            self.assertEqual(list(reduced.shape), list(expected.shape))
+            assert torch.equal(reduced.cpu(), expected.cpu()), 'hvd.reducescatter produces incorrect results'
+
+    def test_horovod_reducescatter_grad(self):
+        """Test the correctness of the reducescatter gradient."""
+        hvd.init()
+        rank = hvd.rank()
+        size = hvd.size()
+
+        # Only Tensors of floating point dtype can require gradients
+        dtypes = [torch.FloatTensor, torch.DoubleTensor]
+        if torch.cuda.is_available():
+            dtypes += [torch.cuda.FloatTensor, torch.cuda.DoubleTensor]
+        dims = [1, 2, 3]
+        for dtype, dim in itertools.product(dtypes, dims):
+            tensor = torch.FloatTensor(*([size * 2] + [17] * (dim - 1))).uniform_(-100, 100)
+            tensor = self.cast_and_place(tensor, dtype)
+            tensor.requires_grad_()
+            reduced = hvd.reducescatter(tensor, op=hvd.Sum)
+
+            reduced.backward(self.cast_and_place(torch.ones([2] + [17] * (dim - 1)), dtype))
+            grad_out = tensor.grad.data.cpu().numpy()
+
+            expected = np.ones([size * 2] + [17] * (dim - 1))
+            err = np.linalg.norm(expected - grad_out)
+            self.assertLess(err, 0.00000001,
+                            "gradient %s differs from expected %s, "
+                            "error: %s" % (grad_out, expected, str(err)))
+
+    def test_horovod_reducescatter_grad_scaled(self):
+        """Test that the reducescatter gradient applies the prescale and postscale factors."""
+        hvd.init()
+        size = hvd.size()
+
+        for op in [hvd.Sum, hvd.Average]:
+            tensor = torch.ones(size * 2, 17, requires_grad=True)
+            reduced = hvd.reducescatter(tensor, op=op, prescale_factor=0.5, postscale_factor=3.0)
+            reduced.backward(torch.ones(2, 17))
+
+            expected = 1.5 / size if op == hvd.Average else 1.5
+            assert torch.allclose(tensor.grad, torch.full_like(tensor, expected))
+
     def test_horovod_alltoall(self):
         """Test that the alltoall correctly distributes 1D, 2D, and 3D tensors."""
         hvd.init()
@@ -1723,6 +2107,28 @@ class TorchTests(unittest.TestCase):
         assert optimizer.param_groups[0]['params'][0].grad is None
         assert torch.all(torch.eq(grad, bgrad)).item()
 
+    def test_broadcast_state_mixed_dtypes(self):
+        """Test that optimizer states of different dtypes are broadcast through flat buffers."""
+        hvd.init()
+
+        model = torch.nn.Sequential(torch.nn.Linear(4, 8), torch.nn.Linear(8, 2))
+        optimizer = torch.optim.Adam(model.parameters(), lr=0.001)
+        model(torch.rand(3, 4)).sum().backward()
+        optimizer.step()
+
+        for i, p in enumerate(model.parameters()):
+            state = optimizer.state[p]
+            state['exp_avg'].fill_(hvd.rank() + i)
+            state['counter'] = torch.full([2], hvd.rank() + i, dtype=torch.int64)
+
+        hvd.broadcast_optimizer_state(optimizer, root_rank=0)
+
+        for i, p in enumerate(model.parameters()):
+            state = optimizer.state[p]
+            assert torch.all(torch.eq(state['exp_avg'], float(i))).item()
+            assert torch.all(torch.eq(state['counter'], i)).item()
+            assert state['counter'].dtype == torch.int64
+
     def test_broadcast_object(self):
         hvd.init()
 
@@ -1751,6 +2157,24 @@ class TorchTests(unittest.TestCase):
         self.assertEqual(len(results), hvd.size())
         self.assertListEqual(results, expected)
 
+    def test_broadcast_allgather_large_object(self):
+        """Test that objects larger than the first chunk are streamed in chunks."""
+        hvd.init()
+
+        expected_obj = {'rank': 0, 'data': bytearray(range(256)) * 1024}
+        obj = expected_obj if hvd.rank() == 0 else {}
+
+        obj = hvd.broadcast_object(obj, root_rank=0, name='large_object')
+        self.assertDictEqual(obj, expected_obj)
+
+        # Objects of different sizes take a different number of chunks on every rank
+        d = {'rank': hvd.rank(), 'data': bytearray(range(256)) * 1024 * (hvd.rank() + 1)}
+        results = hvd.allgather_object(d, name='large_objects')
+
+        expected = [{'rank': i, 'data': bytearray(range(256)) * 1024 * (i + 1)}
+                    for i in range(hvd.size())]
+        self.assertListEqual(results, expected)
+
     def test_compression_fp16(self):
         valid_dtypes = [torch.float32, torch.float64]
         invalid_dtypes = [torch.uint8, torch.int8, torch.int16,
@@ -1786,6 +2210,150 @@ class TorchTests(unittest.TestCase):
                 err = np.linalg.norm(expected - tensor_decompressed.data.numpy())
                 self.assertLess(err, 0.00000001)
 
+    def test_compression_sparse(self):
+        """Test that sparse compressors select elements and keep the remainder as residual."""
+        tensor = torch.tensor([[0.1, -4.0, 0.2], [3.0, 0.0, -0.5]])
+
+        compression = hvd.Compression.topk(ratio=2.0 / 6)
+        tensor_compressed, ctx = compression.compress(tensor, name='t')
+        self.assertTrue(tensor_compressed.is_sparse)
+        self.assertEqual(tensor_compressed._nnz(), 2)
+
+        tensor_decompressed = compression.decompress(tensor_compressed, ctx)
+        expected = torch.tensor([[0.0, -4.0, 0.0], [3.0, 0.0, 0.0]])
+        self.assertTrue(torch.equal(tensor_decompressed, expected))
+
+        # Elements that were not sent are fed back on the next compression
+        tensor_compressed, ctx = compression.compress(torch.zeros_like(tensor), name='t')
+        tensor_decompressed = compression.decompress(tensor_compressed, ctx)
+        expected = torch.tensor([[0.0, 0.0, 0.2], [0.0, 0.0, -0.5]])
+        self.assertTrue(torch.allclose(tensor_decompressed, expected))
+
+        compression = hvd.Compression.threshold(threshold=1.0)
+        tensor_compressed, ctx = compression.compress(tensor)
+        self.assertEqual(tensor_compressed._nnz(), 2)
+
+        compression = hvd.Compression.randomk(ratio=0.5)
+        tensor_compressed, ctx = compression.compress(tensor, name='t')
+        self.assertEqual(tensor_compressed._nnz(), 3)
+        tensor_decompressed = compression.decompress(tensor_compressed, ctx)
+        residual = compression._residuals['t'].view(ctx)
+        self.assertTrue(torch.allclose(tensor_decompressed + residual, tensor))
+
+        # Integer tensors are not compressed
+        int_tensor = torch.ones(5, dtype=torch.int32)
+        tensor_compressed, ctx = compression.compress(int_tensor, name='i')
+        self.assertFalse(tensor_compressed.is_sparse)
+        self.assertTrue(torch.equal(compression.decompress(tensor_compressed, ctx), int_tensor))
+
+    def test_sparse_compression_optimizer(self):
+        """Test that DistributedOptimizer exchanges sparsified gradients with error feedback."""
+        hvd.init()
+        size = hvd.size()
+
+        # This test does not apply if there is only one worker.
+        if size == 1:
+            self.skipTest("Only one worker available")
+
+        model = self.create_mlp()
+        optimizer = torch.optim.SGD(model.parameters(), lr=0.1)
+        optimizer = hvd.DistributedOptimizer(optimizer, named_parameters=model.named_parameters(),
+                                             compression=hvd.Compression.topk(ratio=0.1))
+        self.train_steps(model, optimizer, self.local_batch())
+
+        # Parameters must remain identical across ranks
+        self.assert_params_in_sync(model, 'sparse_compression')
+
+        with self.assertRaises(ValueError):
+            hvd.DistributedOptimizer(torch.optim.SGD(model.parameters(), lr=0.1),
+                                     named_parameters=model.named_parameters(),
+                                     compression=hvd.Compression.topk(ratio=0.1),
+                                     bucket_cap_mb=25)
+
+    def test_compression_powersgd(self):
+        """Test that PowerSGD reconstructs low-rank gradients and reduces the others exactly."""
+        hvd.init()
+        size = hvd.size()
+
+        u = torch.arange(1., 9.).view(8, 1)
+        v = torch.arange(1., 7.).view(1, 6)
+        # Every rank has a rank-1 gradient, so a single power iteration is exact
+        matrix = (u @ v) * (hvd.rank() + 1)
+        bias = torch.ones(6) * (hvd.rank() + 1)
+
+        compression = hvd.Compression.powersgd(rank=1)
+        reduced_matrix, reduced_bias = compression.reduce([matrix, bias], ['matrix', 'bias'],
+                                                          name='powersgd_test', op=hvd.Sum)
+        scale = size * (size + 1) / 2
+        assert torch.allclose(reduced_matrix, (u @ v) * scale, rtol=1e-4)
+        assert torch.allclose(reduced_bias, torch.ones(6) * scale)
+
+        # The approximation was exact, so there is no error to feed back
+        assert torch.allclose(compression._errors['matrix'], torch.zeros(8, 6), atol=1e-3)
+        assert 'bias' not in compression._errors
+
+    def test_powersgd_optimizer(self):
+        """Test that DistributedOptimizer keeps parameters in sync with PowerSGD compression."""
+        hvd.init()
+        size = hvd.size()
+
+        # This test does not apply if there is only one worker.
+        if size == 1:
+            self.skipTest("Only one worker available")
+
+        model = self.create_mlp()
+        optimizer = torch.optim.SGD(model.parameters(), lr=0.1)
+        optimizer = hvd.DistributedOptimizer(optimizer, named_parameters=model.named_parameters(),
+                                             compression=hvd.Compression.powersgd(rank=2))
+        self.train_steps(model, optimizer, self.local_batch())
+
+        self.assert_params_in_sync(model, 'powersgd', atol=1e-5)
+
+    def test_compression_quantize(self):
+        """Test that quantizing compressors round trip within their precision."""
+        torch.manual_seed(0)
+        tensor = torch.randn(3, 1000)
+
+        for compression, tolerance in [(hvd.Compression.int8(chunk_size=256), 0.02),
+                                       (hvd.Compression.bf16(), 0.01)]:
+            tensor_compressed, ctx = compression.compress(tensor, num_shards=4)
+            codes, scales = tensor_compressed
+            # Chunks are padded to a multiple of the number of shards
+            self.assertEqual(codes.shape[0] % 4, 0)
+            tensor_decompressed = compression.decompress(tensor_compressed, ctx)
+            self.assertEqual(tensor_decompressed.shape, tensor.shape)
+            self.assertEqual(tensor_decompressed.dtype, tensor.dtype)
+            self.assertLess((tensor_decompressed - tensor).abs().max().item(), tolerance * 4)
+
+        # One bit keeps the signs and the mean magnitude, and feeds back the error
+        compression = hvd.Compression.onebit(chunk_size=8)
+        tensor = torch.tensor([1.0, -2.0, 3.0, -4.0, 5.0, -6.0, 7.0, -8.0])
+        tensor_compressed, ctx = compression.compress(tensor, name='t')
+        tensor_decompressed = compression.decompress(tensor_compressed, ctx)
+        expected = torch.tensor([4.5, -4.5, 4.5, -4.5, 4.5, -4.5, 4.5, -4.5])
+        self.assertTrue(torch.allclose(tensor_decompressed, expected))
+        self.assertTrue(torch.allclose(compression._residuals['t'], tensor - expected))
+
+    def test_horovod_quantized_allreduce(self):
+        """Test that quantized allreduce reduces dequantized values without overflowing."""
+        hvd.init()
+        size = hvd.size()
+
+        # The same values on every rank would overflow int8 if the codes were summed
+        tensor = torch.linspace(-1, 1, 5000).view(50, 100)
+        for compression in [hvd.Compression.int8(), hvd.Compression.bf16()]:
+            handle = hvd.quantized_allreduce_async(tensor, compression,
+                                                   name='quantized.%s' % type(compression).__name__,
+                                                   op=hvd.Sum)
+            reduced = handle()
+            self.assertEqual(reduced.shape, tensor.shape)
+            assert torch.allclose(reduced, tensor * size, atol=0.02 * size)
+
+            handle = hvd.quantized_allreduce_async(tensor, compression,
+                                                   name='quantized.avg.%s' % type(compression).__name__,
+                                                   op=hvd.Average)
+            assert torch.allclose(handle(), tensor, atol=0.02)
+
     def test_force_allreduce(self):
         """Test that allreduce is forced on all gradients during opt.step()."""
         hvd.init()
@@ -2038,6 +2606,245 @@ class TorchTests(unittest.TestCase):
         with optimizer.skip_synchronize():
             optimizer.step()
 
+    def test_optimizer_bucketing(self):
+        """Test that bucketed allreduce produces the same gradients as per-parameter allreduce."""
+        hvd.init()
+        size = hvd.size()
+
+        # This test does not apply if there is only one worker.
+        if size == 1:
+            self.skipTest("Only one worker available")
+
+        x = self.local_batch()
+
+        _, expected = self.synchronized_grads(x)
+        # A tiny cap forces several buckets, a large one packs everything together
+        for bucket_cap_mb in [0.001, 25]:
+            optimizer, actual = self.synchronized_grads(x, bucket_cap_mb=bucket_cap_mb)
+            if bucket_cap_mb < 1:
+                assert len(optimizer._buckets) > 1
+            else:
+                assert len(optimizer._buckets) == 1
+            for expected_step, actual_step in zip(expected, actual):
+                for e, a in zip(expected_step, actual_step):
+                    assert torch.allclose(e, a, 1e-6)
+
+        with self.assertRaises(ValueError):
+            model = nn.Linear(10, 5)
+            optimizer = torch.optim.SGD(model.parameters(), lr=0.1)
+            hvd.DistributedOptimizer(optimizer, named_parameters=model.named_parameters(),
+                                     bucket_cap_mb=25, groups=1)
+
+    def test_optimizer_gradient_as_bucket_view(self):
+        """Test that gradients stay views into the buckets and match per-parameter allreduce."""
+        hvd.init()
+        size = hvd.size()
+
+        # This test does not apply if there is only one worker.
+        if size == 1:
+            self.skipTest("Only one worker available")
+
+        x = self.local_batch()
+
+        _, expected = self.synchronized_grads(x)
+        for compression in [hvd.Compression.none, hvd.Compression.fp16]:
+            optimizer, actual = self.synchronized_grads(x, gradient_as_bucket_view=True,
+                                                        compression=compression)
+            for bucket in optimizer._buckets:
+                for i, p in enumerate(bucket.params):
+                    assert p.grad.data_ptr() == bucket.view(i).data_ptr()
+            for expected_step, actual_step in zip(expected, actual):
+                for e, a in zip(expected_step, actual_step):
+                    assert torch.allclose(e, a, 1e-3)
+
+    def test_optimizer_overlap_step(self):
+        """Test that overlapping the step with the reductions gives the same parameters."""
+        hvd.init()
+
+        x = self.local_batch()
+
+        def train(optimizer_cls, **kwargs):
+            model = self.create_mlp()
+            optimizer = optimizer_cls([{'params': model[0].parameters()},
+                                       {'params': model[2].parameters(), 'lr': 0.05}], lr=0.1)
+            optimizer = hvd.DistributedOptimizer(
+                optimizer, named_parameters=model.named_parameters(), **kwargs)
+            self.train_steps(model, optimizer, x)
+            return model
+
+        for optimizer_cls in [torch.optim.SGD, torch.optim.Adam]:
+            expected = train(optimizer_cls)
+            for kwargs in [{}, {'bucket_cap_mb': 0.001}, {'groups': 2}, {'groups': 'auto'}]:
+                actual = train(optimizer_cls, overlap_step=True, **kwargs)
+                for e, a in zip(expected.parameters(), actual.parameters()):
+                    assert torch.allclose(e, a, atol=1e-6)
+
+        # Param groups added after wrapping the optimizer are stepped as well
+        model = nn.Linear(10, 5)
+        extra = nn.Parameter(torch.ones(5))
+        optimizer = hvd.DistributedOptimizer(torch.optim.SGD(model.parameters(), lr=0.1),
+                                             named_parameters=model.named_parameters(),
+                                             overlap_step=True)
+        optimizer.add_param_group({'params': [extra]})
+        model(x).sum().backward()
+        extra.grad = torch.ones(5)
+        optimizer.step()
+        assert torch.allclose(extra, torch.full((5,), 0.9))
+
+        with self.assertRaises(ValueError):
+            model = nn.Linear(10, 5)
+            optimizer = torch.optim.LBFGS(model.parameters(), lr=0.1)
+            hvd.DistributedOptimizer(optimizer, named_parameters=model.named_parameters(),
+                                     overlap_step=True)
+
+    def test_sharded_optimizer(self):
+        """Test that the sharded optimizer updates parameters like the full optimizer."""
+        hvd.init()
+        size = hvd.size()
+
+        x = self.local_batch()
+
+        def train(sharded):
+            model = self.create_mlp()
+            optimizer = torch.optim.Adam(model.parameters(), lr=0.01)
+            if sharded:
+                optimizer = hvd.ShardedDistributedOptimizer(
+                    optimizer, named_parameters=model.named_parameters())
+            else:
+                optimizer = hvd.DistributedOptimizer(
+                    optimizer, named_parameters=model.named_parameters())
+            self.train_steps(model, optimizer, x)
+            return model, optimizer
+
+        expected_model, expected_optimizer = train(sharded=False)
+        model, optimizer = train(sharded=True)
+        for e, a in zip(expected_model.parameters(), model.parameters()):
+            assert torch.allclose(e, a, atol=1e-5)
+
+        # Every rank only keeps the state of its own shard
+        numel = sum(p.numel() for p in model.parameters())
+        shard_numel = sum(bucket.shard.numel() for bucket in optimizer._buckets)
+        assert shard_numel == numel // size + (1 if hvd.rank() < numel % size else 0)
+
+        # The gathered state matches the state of the full optimizer
+        expected_state = expected_optimizer.state_dict()['state']
+        state = optimizer.state_dict()['state']
+        assert sorted(state.keys()) == sorted(expected_state.keys())
+        for i in state:
+            for key in ('exp_avg', 'exp_avg_sq'):
+                assert torch.allclose(state[i][key], expected_state[i][key], atol=1e-5)
+
+        # Loading the full state re-partitions it and training continues identically
+        _, reloaded = train(sharded=True)
+        reloaded.load_state_dict(optimizer.state_dict())
+        for bucket, reloaded_bucket in zip(optimizer._buckets, reloaded._buckets):
+            for key in ('exp_avg', 'exp_avg_sq'):
+                assert torch.allclose(optimizer.state[bucket.shard][key],
+                                      reloaded.state[reloaded_bucket.shard][key])
+
+        # Broadcasting the state keeps the shard state of every rank
+        hvd.broadcast_optimizer_state(reloaded, root_rank=0)
+        for bucket, reloaded_bucket in zip(optimizer._buckets, reloaded._buckets):
+            for key in ('exp_avg', 'exp_avg_sq'):
+                assert torch.allclose(optimizer.state[bucket.shard][key],
+                                      reloaded.state[reloaded_bucket.shard][key])
+
+        # The local shard state is restored without communication
+        shard_state = optimizer._shard_state_dict()
+        saved = {bucket.index: optimizer.state[bucket.shard]['exp_avg'].clone()
+                 for bucket in optimizer._buckets}
+        for bucket in optimizer._buckets:
+            optimizer.state[bucket.shard]['exp_avg'].zero_()
+        optimizer._load_shard_state_dict(shard_state)
+        for bucket in optimizer._buckets:
+            assert torch.equal(optimizer.state[bucket.shard]['exp_avg'], saved[bucket.index])
+
+        with self.assertRaises(ValueError):
+            model = nn.Linear(10, 5)
+            optimizer = torch.optim.SGD(model.parameters(), lr=0.1)
+            hvd.ShardedDistributedOptimizer(optimizer, op=hvd.Adasum)
+
+    def test_sharded_optimizer_cuda(self):
+        """Test that the sharded optimizer updates GPU parameters like the full optimizer."""
+        if not torch.cuda.is_available():
+            self.skipTest("No GPUs available")
+
+        hvd.init()
+        device = torch.device('cuda', hvd.local_rank())
+        x = self.local_batch().to(device)
+
+        def train(sharded):
+            model = self.create_mlp().to(device)
+            optimizer = torch.optim.Adam(model.parameters(), lr=0.01)
+            if sharded:
+                optimizer = hvd.ShardedDistributedOptimizer(
+                    optimizer, named_parameters=model.named_parameters())
+            else:
+                optimizer = hvd.DistributedOptimizer(
+                    optimizer, named_parameters=model.named_parameters())
+            self.train_steps(model, optimizer, x)
+            return model, optimizer
+
+        expected_model, _ = train(sharded=False)
+        model, optimizer = train(sharded=True)
+        for e, a in zip(expected_model.parameters(), model.parameters()):
+            assert torch.allclose(e, a, atol=1e-5)
+
+        # The gradients are allreduced on the GPU, but only the shard is kept
+        for bucket in optimizer._buckets:
+            assert bucket.shard.grad.is_cuda
+            assert bucket.shard.grad.numel() == bucket.shard.numel()
+
+    def test_sharded_optimizer_elastic_repartition(self):
+        """Test that elastic sync re-partitions the committed shards of a different number of workers."""
+        from horovod.torch.elastic.state import _repartition_shards
+
+        hvd.init()
+        x = self.local_batch()
+
+        def train():
+            model = self.create_mlp()
+            optimizer = hvd.ShardedDistributedOptimizer(
+                torch.optim.Adam(model.parameters(), lr=0.01),
+                named_parameters=model.named_parameters())
+            self.train_steps(model, optimizer, x)
+            return optimizer
+
+        optimizer = train()
+        expected = optimizer.state_dict()['state']
+
+        # Commits only keep the local shards
+        state = hvd.elastic.TorchState(optimizer=optimizer)
+        saved = state._handlers['optimizer']._saved_shard_state
+        assert (saved['rank'], saved['size']) == (hvd.rank(), hvd.size())
+        assert not hasattr(state._handlers['optimizer'], '_saved_optimizer_state')
+
+        # Pretend rank 0 committed the whole state as the only worker
+        index = {p: i for i, p in enumerate(p for params in optimizer._group_params for p in params)}
+        saved = optimizer._shard_state_dict()
+        saved.update(rank=0, size=1)
+        for bucket in optimizer._buckets:
+            saved['state'][bucket.index].update({
+                key: torch.cat([expected[index[p]][key].reshape(-1) for p in bucket.params])
+                for key in ('exp_avg', 'exp_avg_sq')})
+
+        repartitioned = train()
+        partitions = [(0, 1)] + [(r, hvd.size()) for r in range(1, hvd.size())]
+        _repartition_shards(repartitioned, saved, partitions, holders=[0])
+        state = repartitioned.state_dict()['state']
+        for i in expected:
+            for key in ('exp_avg', 'exp_avg_sq'):
+                assert torch.allclose(state[i][key], expected[i][key])
+
+        # Shards of workers that are gone cannot be restored
+        if hvd.size() > 1:
+            partitions = [(0, hvd.size())] * hvd.size()
+            with warnings.catch_warnings(record=True) as ws:
+                warnings.simplefilter('always')
+                _repartition_shards(repartitioned, saved, partitions, holders=[0])
+            assert any('was lost' in str(w.message) for w in ws)
+            assert len(repartitioned.state) == 0
+
     def test_synchronize_step_warning(self):
         """
         Test that .synchronize() followed by .step() without
@@ -2440,6 +3247,61 @@ class TorchTests(unittest.TestCase):
         for reduced, gathered in zip(allreduced_tensors, allgathered_tensors):
             assert torch.allclose(reduced, gathered.to_dense(), 1e-6)
 
+    def test_async_sparse_allreduce_duplicates(self):
+        """Test that duplicate entries are summed and dense tensors are used above the density threshold."""
+        hvd.init()
+        size = hvd.size()
+
+        indices = torch.tensor([[1, 3, 1, 1, 7]])
+        values = torch.ones(5, 4) * (hvd.rank() + 1)
+        tensor = torch.sparse_coo_tensor(indices, values, (10, 4))
+        expected = tensor.to_dense() * sum(range(1, size + 1))
+
+        old_threshold = os.environ.get('HOROVOD_SPARSE_DENSITY_THRESHOLD')
+        try:
+            for threshold in ['0', '1000']:
+                os.environ['HOROVOD_SPARSE_DENSITY_THRESHOLD'] = threshold
+                reduced = hvd.sparse_allreduce_async(tensor, name='sparse_dup.' + threshold, op=hvd.Sum)()
+                assert reduced.is_sparse
+                assert reduced.is_coalesced()
+                assert reduced._nnz() <= 3
+                assert torch.allclose(reduced.to_dense(), expected)
+        finally:
+            if old_threshold is None:
+                del os.environ['HOROVOD_SPARSE_DENSITY_THRESHOLD']
+            else:
+                os.environ['HOROVOD_SPARSE_DENSITY_THRESHOLD'] = old_threshold
+
+    def test_elastic_sampler_sync(self):
+        """Test that syncing an elastic sampler combines the processed indices of all workers."""
+        from horovod.torch.elastic import state as elastic_state
+
+        hvd.init()
+        rank, size = hvd.rank(), hvd.size()
+
+        # This test does not apply if there is only one worker.
+        if size == 1:
+            self.skipTest("Only one worker available")
+
+        def processed(r):
+            # Overlapping indices that set bits in the first and the last partial byte
+            return set(range(r, 1003, size + 1)) | {1002 - r}
+
+        old_chunk_bytes = elastic_state._BITMAP_SYNC_CHUNK_BYTES
+        try:
+            # Whole bitmaps and chunks smaller than the number of workers
+            for chunk_bytes in [old_chunk_bytes, 1, 3, 40]:
+                elastic_state._BITMAP_SYNC_CHUNK_BYTES = chunk_bytes
+                sampler = hvd.elastic.ElasticSampler(list(range(1003)), shuffle=False)
+                state = hvd.elastic.TorchState(sampler=sampler)
+                sampler.record_indices(processed(rank))
+                state.sync()
+
+                expected = set().union(*[processed(r) for r in range(size)])
+                assert sampler.processed_indices == expected
+                assert set(sampler.remaining_indices.tolist()) == set(range(1003)) - expected
+        finally:
+            elastic_state._BITMAP_SYNC_CHUNK_BYTES = old_chunk_bytes
 
 
 if __name__ == "__main__":
@@ -62,19 +62,27 @@ class RunTests(unittest.TestCase):
     def test_params_args(self):
         with override_args('horovodrun', '-np', '2',
                            '--fusion-threshold-mb', '10',
+                           '--tensor-partition-mb', '4',
+                           '--cpu-reduction-threads', '2',
                            '--cycle-time-ms', '20',
                            '--cache-capacity', '512',
                            '--hierarchical-allreduce',
-                           '--hierarchical-allgather'):
+                           '--hierarchical-allgather',
+                           '--hierarchical-reducescatter',
+                           '--shm-allreduce'):
             args = parse_args()
             env = {}
             config_parser.set_env_from_args(env, args)
 
             self.assertEqual(env.get(config_parser.HOROVOD_FUSION_THRESHOLD), str(10 * 1024 * 1024))
+            self.assertEqual(env.get(config_parser.HOROVOD_TENSOR_PARTITION_SIZE), str(4 * 1024 * 1024))
+            self.assertEqual(env.get(config_parser.HOROVOD_CPU_REDUCTION_THREADS), '2')
             self.assertEqual(env.get(config_parser.HOROVOD_CYCLE_TIME), '20.0')
             self.assertEqual(env.get(config_parser.HOROVOD_CACHE_CAPACITY), '512')
             self.assertEqual(env.get(config_parser.HOROVOD_HIERARCHICAL_ALLREDUCE), '1')
             self.assertEqual(env.get(config_parser.HOROVOD_HIERARCHICAL_ALLGATHER), '1')
+            self.assertEqual(env.get(config_parser.HOROVOD_HIERARCHICAL_REDUCESCATTER), '1')
+            self.assertEqual(env.get(config_parser.HOROVOD_SHM_ALLREDUCE), '1')
 
     def test_autotune_args(self):
         with override_args('horovodrun', '-np', '2',
@@ -99,7 +107,9 @@ class RunTests(unittest.TestCase):
         with override_args('horovodrun', '-np', '2',
                            '--autotune',
                            '--cache-capacity', '1024',
-                           '--no-hierarchical-allgather'):
+                           '--no-hierarchical-allgather',
+                           '--no-hierarchical-reducescatter',
+                           '--no-shm-allreduce'):
             args = parse_args()
             env = {}
             config_parser.set_env_from_args(env, args)
@@ -109,6 +119,8 @@ class RunTests(unittest.TestCase):
             self.assertEqual(env.get(config_parser.HOROVOD_CACHE_CAPACITY), '1024')
             self.assertNotIn(config_parser.HOROVOD_HIERARCHICAL_ALLREDUCE, env)
             self.assertEqual(env.get(config_parser.HOROVOD_HIERARCHICAL_ALLGATHER), '0')
+            self.assertEqual(env.get(config_parser.HOROVOD_HIERARCHICAL_REDUCESCATTER), '0')
+            self.assertEqual(env.get(config_parser.HOROVOD_SHM_ALLREDUCE), '0')
 
     def test_timeline_args(self):
         with override_args('horovodrun', '-np', '2',
@@ -88,6 +88,67 @@ class TorchElasticTests(unittest.TestCase):
         assert state.batch == 21
         assert state.epoch == 11
 
+    def test_elastic_state_inplace_snapshot(self):
+        hvd.init()
+
+        torch.manual_seed(hvd.rank())
+        model = torch.nn.Sequential(torch.nn.Linear(2, 2), torch.nn.Linear(2, 2))
+        optimizer = torch.optim.SGD(model.parameters(), lr=0.1, momentum=0.9)
+        state = hvd.elastic.TorchState(model, optimizer, inplace_snapshot=True, track_changes=True)
+        handler = state._handlers['model']
+        saved = handler._saved_model_state
+        data_ptrs = {k: v.data_ptr() for k, v in saved.items()}
+
+        model(torch.ones(1, 2)).sum().backward()
+        optimizer.step()
+        state.commit()
+
+        # Commits copy into the buffers allocated by the first one
+        assert handler._saved_model_state is saved
+        assert {k: v.data_ptr() for k, v in saved.items()} == data_ptrs
+        for k, v in model.state_dict().items():
+            assert torch.equal(saved[k], v)
+        committed = {k: v.clone() for k, v in model.state_dict().items()}
+        momentum = optimizer.state_dict()['state'][0]['momentum_buffer'].clone()
+
+        with torch.no_grad():
+            model[0].weight.add_(1.0)
+        optimizer.step()
+        state.restore()
+        for k, v in model.state_dict().items():
+            assert torch.equal(v, committed[k])
+        assert torch.equal(optimizer.state_dict()['state'][0]['momentum_buffer'], momentum)
+
+        # Only tensors modified since the last commit are copied
+        state.commit()
+        with torch.no_grad():
+            saved['1.bias'].fill_(42.0)
+            model[0].bias.add_(1.0)
+        state.commit()
+        assert torch.equal(saved['0.bias'], model[0].bias)
+        assert (saved['1.bias'] == 42.0).all()
+
+    def test_elastic_state_sync_holders(self):
+        hvd.init()
+
+        model = torch.nn.Sequential(torch.nn.Linear(2, 2))
+        optimizer = torch.optim.SGD(model.parameters(), lr=0.1)
+        state = hvd.elastic.TorchState(model, optimizer)
+
+        # Workers cannot be compared before their first sync
+        assert state.sync_holders() == [0]
+
+        # Synced workers that committed together all hold the state of rank 0
+        state.sync()
+        state.commit()
+        assert state.sync_holders() == list(range(hvd.size()))
+
+        # A sync that finds all workers holding the state keeps them unchanged
+        weights = [p.detach().clone() for p in model.parameters()]
+        state.sync()
+        for w, p in zip(weights, model.parameters()):
+            assert torch.equal(w, p)
+
     def test_elastic_sampler(self):
         hvd.init()
 
@@ -184,3 +245,35 @@ class TorchElasticTests(unittest.TestCase):
         for _ in enumerate(data_loader):
             total_batches += 1
         assert total_batches == samples_per_worker / batch_size
+
+    def test_elastic_sampler_bitmap(self):
+        hvd.init()
+
+        dataset = list(range(1003))
+        sampler = hvd.elastic.ElasticSampler(dataset, shuffle=True, seed=7)
+        assert sampler.processed_bitmap.nbytes == 126
+
+        sampler.record_indices([0, 7, 8, 1002])
+        sampler.record_indices({7, 500})
+        assert sampler.processed_indices == {0, 7, 8, 500, 1002}
+
+        # Checkpoints holding a set of processed indices can still be loaded
+        restored = hvd.elastic.ElasticSampler(dataset, shuffle=True, seed=7)
+        restored.load_state_dict(dict(epoch=3, processed_indices={1, 2, 3}))
+        assert restored.epoch == 3
+        assert restored.processed_indices == {1, 2, 3}
+
+        restored.load_state_dict(sampler.state_dict())
+        sampler.record_indices([9])
+        assert 9 not in restored.processed_indices
+
+        # The remaining indices are shuffled and partitioned without duplicates
+        sampler.reset()
+        indices = list(sampler)
+        assert len(indices) == len(sampler)
+        remaining = set(range(1003)) - sampler.processed_indices
+        assert set(sampler.remaining_indices.tolist()) == remaining
+        assert len(set(indices)) == len(indices) or hvd.size() > 1
+        assert set(indices) <= remaining
+        assert sampler.get_indices(0, 4) == indices[:4]
+        assert sampler.indices.dtype == np.int32